@@ -37,6 +37,8 @@ Requires: python3-tqdm
 Recommends: logrotate
 Recommends: httpd
 Recommends: icecast
+Recommends: python3-orjson
+Recommends: python3-msgpack
 
 
 %description
@@ -58,6 +58,9 @@ setuptools.setup(
             "pillow",
             "tqdm"
             ],
+        extras_require  = {
+            "fast": ["orjson", "msgpack"],
+            },
         python_requires = ">=3.9",
         keywords        = "music streaming cloud music-player music-library music-collection music-streaming music-manager streaming-audio musicdb",
         license         = "GPL",
@@ -30,8 +30,12 @@ from musicdb.lib.cfg.csv    import CSVFile
 from musicdb.lib.db.musicdb import MusicDatabase
 import time
 import logging
+import threading
 import os
 
+StateRevision     = 0   # Incremented with each change of the WebUI state (filter lists and UI mode)
+StateRevisionLock = threading.Lock()
+
 class META:
     pass
 class QUEUE:
@@ -78,6 +82,9 @@ class MDBState(Config, object):
     It accesses a section ``SubgenreFilter:$genre`` where ``$genre`` is the main genre name.
     The sections are created and updated via :meth:`~UpdateSubgenreFilterList`.
 
+    Each change of the genre filters or the UI mode via the methods of this class increments a global revision number.
+    It can be read via :meth:`~GetRevision`, so that clients can check if their copy of the state is still up to date.
+
     Args:
         path: Absolute path to the MusicDB state directory
         musicdb: Instance of the MusicDB Database (can be None)
@@ -394,6 +401,7 @@ class MDBState(Config, object):
 
         self.Reload()
         self.Set("GenreFilter", genre, enable)
+        self.__IncrementRevision()
         logging.debug("Filter list updated for genre %s -> %s. New list: %s", genre, str(enable), str(self.GetGenreFilterList()))
         return
 
@@ -456,6 +464,7 @@ class MDBState(Config, object):
 
         self.Reload()
         self.Set("SubgenreFilter:" + genre, subgenre, enable)
+        self.__IncrementRevision()
         logging.debug("Filter list updated for sub genre %s:%s -> %s. New list: %s",
                 genre, subgenre, str(enable), str(self.GetSubgenreFilterList(genre)))
         return
@@ -615,7 +624,30 @@ class MDBState(Config, object):
             raise ValueError("Mode must be \"audio\" or \"video\"")
 
         self.Set("MusicDB", "uimode", mode) 
+        self.__IncrementRevision()
         return None
 
+
+
+    def __IncrementRevision(self):
+        global StateRevision
+        with StateRevisionLock:
+            StateRevision += 1
+
+
+
+    def GetRevision(self):
+        """
+        Returns the revision of the state.
+        The revision gets incremented with each change via
+        :meth:`~UpdateGenreFilterList`, :meth:`~UpdateSubgenreFilterList` or :meth:`~SetUIMode`.
+        It starts with ``0`` each time MusicDB gets started.
+
+        Returns:
+            The revision as integer
+        """
+        with StateRevisionLock:
+            return StateRevision
+
 # vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
 
@@ -139,6 +139,7 @@ class MusicDBConfig(Config):
         self.directories.tasks      = self.directories.data + "/tasks"
         self.directories.state      = self.directories.data + "/state"
         self.directories.config     = self.directories.data + "/config"
+        self.directories.mp3cache   = self.directories.data + "/mp3cache"
         self.directories.share      = "/usr/share/musicdb"
         self.directories.artwork    = self.directories.webdata + "/artwork"
 
@@ -153,6 +154,21 @@ class MusicDBConfig(Config):
         self.files.webuijsconfig    = self.directories.webdata + "/config.js"
 
 
+        # [database]
+        self.database = DATABASE()
+        self.database.entitycache   = self.Get(int, "database", "entitycache",  4096)
+        if self.database.entitycache < 0:
+            logging.warning("[database]->entitycache must not be negative! \033[1;30m(Cache will be disabled)")
+            self.database.entitycache = 0
+        self.database.wal           = self.Get(bool,"database", "wal",          True)
+        self.database.mmapsize      = self.Get(int, "database", "mmapsize",     64)
+        self.database.cachesize     = self.Get(int, "database", "cachesize",    16)
+        if self.database.mmapsize < 0 or self.database.cachesize < 0:
+            logging.warning("[database]->mmapsize and [database]->cachesize must not be negative! \033[1;30m(SQLite defaults will be used)")
+            self.database.mmapsize  = 0
+            self.database.cachesize = 0
+
+
         # [log]
         self.log = SECTION()
         self.log.logfile            = self.Get(str, "log",      "logfile",      "journal")
@@ -181,6 +197,19 @@ class MusicDBConfig(Config):
         self.websocket.port         = self.Get(int, "websocket",    "port",         9000)
         self.websocket.opentimeout  = self.Get(int, "websocket",    "opentimeout",  10)
         self.websocket.closetimeout = self.Get(int, "websocket",    "closetimeout",  5)
+        self.websocket.workers      = self.Get(int, "websocket",    "workers",      4)
+        if self.websocket.workers < 0:
+            logging.warning("[websocket]->workers must not be negative! \033[1;30m(All calls will be executed in the main thread)")
+            self.websocket.workers = 0
+        self.websocket.coalescetime = self.Get(int, "websocket",    "coalescetime", 0)
+        if self.websocket.coalescetime < 0:
+            logging.warning("[websocket]->coalescetime must not be negative! \033[1;30m(Coalescing notifications will be disabled)")
+            self.websocket.coalescetime = 0
+        self.websocket.compression  = self.Get(bool,"websocket",    "compression",  True)
+        self.websocket.compressionthreshold = self.Get(int, "websocket", "compressionthreshold", 1024)
+        if self.websocket.compressionthreshold < 0:
+            logging.warning("[websocket]->compressionthreshold must not be negative! \033[1;30m(All messages will be compressed)")
+            self.websocket.compressionthreshold = 0
         self.websocket.cert         = self.Get(str, "websocket", "cert", self.directories.data + "websocket.cert")
         self.websocket.key          = self.Get(str, "websocket", "key",  self.directories.data + "websocket.key")
         # The certificate and key files are validated in detail when MusicDB starts. No need to check them here.
@@ -203,6 +232,32 @@ class MusicDBConfig(Config):
         self.icecast.user           = self.Get(str, "Icecast",  "user",         "source")
         self.icecast.password       = self.Get(str, "Icecast",  "password",     None)
         self.icecast.mountname      = self.Get(str, "Icecast",  "mountname",    "/stream")
+        self.icecast.chunktime      = self.Get(int, "Icecast",  "chunktime",    250)
+        if self.icecast.chunktime < 0:
+            logging.warning("[Icecast]->chunktime must not be negative! \033[1;30m(Each frame will be sent separately)")
+            self.icecast.chunktime = 0
+        self.icecast.extramounts    = []
+        for extramount in self.Get(str, "Icecast",  "extramounts",  [], islist=True):
+            if not extramount:
+                continue
+            try:
+                mountname, bitrate = extramount.rsplit(":", 1)
+                bitrate = int(bitrate)
+            except ValueError:
+                logging.warning("Invalid entry \"%s\" in [Icecast]->extramounts! \033[1;30m(Expected \"mountname:bitrate\", entry will be ignored)", extramount)
+                continue
+            if not mountname.startswith("/") or bitrate <= 0:
+                logging.warning("Invalid entry \"%s\" in [Icecast]->extramounts! \033[1;30m(Expected \"/mountname:bitrate\", entry will be ignored)", extramount)
+                continue
+            self.icecast.extramounts.append((mountname, bitrate))
+
+
+        # [mp3cache]
+        self.mp3cache = SECTION()
+        self.mp3cache.size          = self.Get(int, "mp3cache", "size",         1024)
+        if self.mp3cache.size < 0:
+            logging.warning("[mp3cache]->size must not be negative! \033[1;30m(Cache will be disabled)")
+            self.mp3cache.size = 0
 
 
         # [music]
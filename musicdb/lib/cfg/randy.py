@@ -63,6 +63,10 @@ MaxAge (time in hours as integer):
 MaxTries (number ∈ ℕ):
    Maximum amount of tries to find a valid random songs.
    This prevents spending infinite amount of time getting a song even if the data base does not provide enough songs.
+
+ReservoirDepth (number ∈ ℕ):
+   Amount of random songs that get selected in advance (``0`` to disable the reservoir).
+   See :mod:`musicdb.mdbapi.randy` for details.
 """
 
 from musicdb.lib.cfg.config import Config
@@ -103,6 +107,7 @@ class RandyConfiguration(Config):
             self.Set("BlackLists",  "VideoListLength",    3)
             self.Set("BlackLists",  "MaxAge",            24)
             self.Set("Limits",      "MaxTries",          10)
+            self.Set("Limits",      "ReservoirDepth",     3)
 
         self.Reload()
 
@@ -130,7 +135,8 @@ class RandyConfiguration(Config):
         self.blacklists.videolistlength  = self.Get(int,  "BlackLists",  "VideoListLength",    3)
         self.blacklists.maxage           = self.Get(int,  "BlackLists",  "MaxAge",            24)
 
-        self.limits.maxtries = self.Get(int,  "Limits",      "MaxTries",          10)
+        self.limits.maxtries       = self.Get(int,  "Limits",      "MaxTries",          10)
+        self.limits.reservoirdepth = self.Get(int,  "Limits",      "ReservoirDepth",     3)
 
 
 
@@ -166,7 +172,8 @@ class RandyConfiguration(Config):
         cfg["BlackLists"]["MaxAge"]             = self.blacklists.maxage
 
         cfg["Limits"] = {}
-        cfg["Limits"]["MaxTries"] = self.limits.maxtries
+        cfg["Limits"]["MaxTries"]       = self.limits.maxtries
+        cfg["Limits"]["ReservoirDepth"] = self.limits.reservoirdepth
 
         return cfg
     
@@ -197,6 +204,8 @@ class RandyConfiguration(Config):
         self.Set("BlackLists",  "VideoListLength",  cfg["BlackLists"]["VideoListLength"])
         self.Set("BlackLists",  "MaxAge",           cfg["BlackLists"]["MaxAge"])
         self.Set("Limits",      "MaxTries",         cfg["Limits"]["MaxTries"])
+        if "ReservoirDepth" in cfg["Limits"]:
+            self.Set("Limits",  "ReservoirDepth",   cfg["Limits"]["ReservoirDepth"])
 
         self.Reload()
         return
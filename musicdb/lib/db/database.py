@@ -14,9 +14,187 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+"""
+This module provides the base class for all database classes of MusicDB and a connection manager
+that handles the actual connections to the SQLite databases.
+
+Each thread gets its own connection to a database file.
+The connections are managed by a global instance of the :class:`~DatabaseConnectionManager` class named ``DatabaseConnections``.
+All :class:`~Database` objects used inside the same thread share the connection to a database file.
+When a thread terminates, its connections get closed the next time a new connection gets established.
+
+The connections are configured by the following settings.
+They can be changed via :meth:`~DatabaseConnectionManager.Configure`.
+MusicDB applies the settings from the ``[database]`` section of the MusicDB Configuration before opening any database.
+
+    * **Journal Mode:** By default the databases use *write-ahead logging* (``PRAGMA journal_mode=WAL``).
+      In this mode, readers do not get blocked by a writer and a writer does not get blocked by readers.
+      In WAL mode, ``PRAGMA synchronous=NORMAL`` gets set as well.
+    * **Memory Map Size:** Maximum number of bytes of the database file that get memory mapped (``PRAGMA mmap_size``).
+    * **Cache Size:** Size of the page cache of each connection in KiB (``PRAGMA cache_size``).
+
+By default, each call of :meth:`~Database.Execute` gets committed immediately.
+To combine multiple writes into one transaction, the :meth:`~Database.Transaction` context manager can be used.
+Then the changes get committed at the end of the ``with`` block, or rolled back as a unit if the block raises an exception.
+
+Example:
+
+    .. code-block:: python
+
+        DatabaseConnections.Configure(wal=True, mmapsize=64*1024*1024, cachesize=16*1024)
+        db = Database("test.db")
+
+"""
+
 import sqlite3
 import logging
 import gzip
+import threading
+import contextlib
+
+
+
+class DatabaseConnection(sqlite3.Connection):
+    """
+    An ``sqlite3.Connection`` that knows how many :meth:`~Database.Transaction` blocks are currently open.
+    """
+    def __init__(self, *args, **kwargs):
+        sqlite3.Connection.__init__(self, *args, **kwargs)
+        self.transactiondepth = 0
+
+
+
+class DatabaseConnectionManager(object):
+    """
+    This class manages the connections to SQLite databases.
+    Each thread gets its own connection for each database file.
+    The connections get opened on demand and get reused by all :class:`~Database` objects of a thread.
+
+    The connection timeout is set to ``20``.
+    """
+    def __init__(self):
+        self.lock        = threading.Lock()
+        self.connections = {}   # (path, thread ID) -> (thread, connection, cursor)
+        self.wal         = True
+        self.mmapsize    = 0    # 0: Do not change the SQLite default
+        self.cachesize   = 0    # 0: Do not change the SQLite default
+
+
+
+    def Configure(self, wal=True, mmapsize=0, cachesize=0):
+        """
+        This method sets up how new connections get configured.
+        Already existing connections are not affected.
+
+        Args:
+            wal (bool): Use write-ahead logging as journal mode
+            mmapsize (int): Maximum number of bytes that get memory mapped. ``0`` keeps the SQLite default.
+            cachesize (int): Size of the page cache in KiB. ``0`` keeps the SQLite default.
+
+        Returns:
+            *Nothing*
+
+        Raises:
+            TypeError: When *wal* is not a boolean or *mmapsize*, *cachesize* are not integers
+            ValueError: When *mmapsize* or *cachesize* are negative
+        """
+        if type(wal) != bool:
+            raise TypeError("wal must be a boolean")
+        if type(mmapsize) != int or type(cachesize) != int:
+            raise TypeError("mmapsize and cachesize must be integers")
+        if mmapsize < 0 or cachesize < 0:
+            raise ValueError("mmapsize and cachesize must not be negative")
+
+        self.wal       = wal
+        self.mmapsize  = mmapsize
+        self.cachesize = cachesize
+        return
+
+
+
+    def GetConnection(self, path):
+        """
+        This method returns the connection and its cursor of the calling thread to the database *path*.
+        If the thread does not have a connection yet, a new one gets established.
+
+        Args:
+            path (str): Path to the database file
+
+        Returns:
+            A tuple of an ``sqlite3.Connection`` and an ``sqlite3.Cursor`` object
+        """
+        thread = threading.current_thread()
+        key    = (path, thread.ident)
+
+        with self.lock:
+            entry = self.connections.get(key)
+            if entry and entry[0] is thread:
+                return entry[1], entry[2]
+
+            # Clean up before adding a new connection
+            self.__CloseDeadConnections()
+
+            connection = self.__Connect(path)
+            cursor     = connection.cursor()
+            self.connections[key] = (thread, connection, cursor)
+
+        return connection, cursor
+
+
+
+    def CloseConnections(self):
+        """
+        Closes all connections of the calling thread.
+        The next access to a database opens a new connection.
+
+        Returns:
+            *Nothing*
+        """
+        ident = threading.get_ident()
+        with self.lock:
+            keys = [key for key in self.connections if key[1] == ident]
+            for key in keys:
+                self.connections[key][1].close()
+                del self.connections[key]
+        return
+
+
+
+    def __CloseDeadConnections(self):
+        # Thread IDs can be reused. So the thread object itself needs to be checked.
+        keys = [key for key, entry in self.connections.items() if not entry[0].is_alive()]
+        for key in keys:
+            try:
+                self.connections[key][1].close()
+            except Exception as e:
+                logging.debug("Closing connection of terminated thread failed with error: %s", str(e))
+            del self.connections[key]
+        return
+
+
+
+    def __Connect(self, path):
+        # Each connection is only used by one thread.
+        # Checking the thread must be disabled to be able to close connections of terminated threads.
+        connection = sqlite3.connect(path, timeout=20, check_same_thread=False, factory=DatabaseConnection)
+
+        try:
+            if self.wal:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+            if self.mmapsize > 0:
+                connection.execute("PRAGMA mmap_size=%i"%(self.mmapsize))
+            if self.cachesize > 0:
+                connection.execute("PRAGMA cache_size=%i"%(-self.cachesize))   # negative values are KiB
+        except Exception as e:
+            logging.warning("Configuring connection to %s failed with error: %s \033[1;30m(Default settings will be used)", path, str(e))
+
+        return connection
+
+
+
+DatabaseConnections = DatabaseConnectionManager()
+
 
 
 class Database(object):
@@ -24,6 +202,9 @@ class Database(object):
     This is the base class for all database classes in MusicDB.
     It establishes the connection to the sqlite3 databases.
 
+    The connections are managed by the global :class:`~DatabaseConnectionManager` object ``DatabaseConnections``.
+    So each thread uses its own connection, even when a :class:`~Database` object gets shared between threads.
+
     The connection timeout is set to ``20``.
 
     Args:
@@ -39,8 +220,19 @@ class Database(object):
             raise TypeError("A valid database path is necessary")
 
         # connect to database
-        self.db_connection = sqlite3.connect(path, timeout=20)
-        self.db_cursor     = self.db_connection.cursor()
+        self.db_path = path
+        DatabaseConnections.GetConnection(self.db_path)
+
+
+    @property
+    def db_connection(self):
+        connection, cursor = DatabaseConnections.GetConnection(self.db_path)
+        return connection
+
+    @property
+    def db_cursor(self):
+        connection, cursor = DatabaseConnections.GetConnection(self.db_path)
+        return cursor
 
 
     def Compress(self, string):
@@ -74,6 +266,68 @@ class Database(object):
         return gzip.decompress(blob).decode("utf-8")
         
 
+    def InTransaction(self):
+        """
+        This method checks if the calling thread is inside a :meth:`~Transaction` block.
+
+        Returns:
+            ``True`` if there is an open transaction, otherwise ``False``
+        """
+        return self.db_connection.transactiondepth > 0
+
+
+
+    @contextlib.contextmanager
+    def Transaction(self):
+        """
+        This method returns a context manager that combines all writes inside its ``with`` block into one transaction.
+        Inside the block, :meth:`~Execute` and :meth:`~ExecuteMany` do not commit their changes.
+        The changes get committed when the block gets left.
+        If the block gets left by an exception, all changes get rolled back and the exception gets raised again.
+        A failing statement inside the block does not roll back the previous statements by itself.
+
+        Transactions can be nested.
+        Then the inner blocks are part of the outermost transaction.
+        Only the outermost block commits or rolls back.
+
+        The transaction acquires the write lock of the database at its beginning.
+        Other threads and processes can still read the database, but have to wait with writing until the transaction ends.
+        So, expensive work should be done before entering the transaction.
+
+        .. warning::
+
+            Do not call :meth:`~ExecuteScript` inside a transaction.
+            SQLite commits the transaction before executing a script.
+
+        Example:
+
+            .. code-block:: python
+
+                db = Database("test.db")
+
+                with db.Transaction():
+                    for name, content in values:
+                        db.Execute("INSERT INTO valuetable (name, content) VALUES (?, ?)", (name, content))
+        """
+        connection = self.db_connection
+        if connection.transactiondepth == 0:
+            connection.execute("BEGIN IMMEDIATE")
+        connection.transactiondepth += 1
+
+        try:
+            yield self
+        except BaseException:
+            connection.transactiondepth -= 1
+            if connection.transactiondepth == 0:
+                connection.rollback()
+            raise
+        else:
+            connection.transactiondepth -= 1
+            if connection.transactiondepth == 0:
+                connection.commit()
+
+
+
     def Execute(self, sql, values=None):
         """
         This method executes a SQL command.
@@ -128,10 +382,74 @@ class Database(object):
                 self.db_cursor.execute(sql)
 
         except Exception as e:
-            self.db_connection.rollback()
+            if not self.InTransaction():
+                self.db_connection.rollback()
             raise e
 
-        self.db_connection.commit()
+        if not self.InTransaction():
+            self.db_connection.commit()
+        return None
+
+
+
+    def ExecuteMany(self, sql, valuelist):
+        """
+        This method executes a SQL command once for each set of values in *valuelist*.
+        Like :meth:`~Execute`, the changes get committed when the method is not called inside a :meth:`~Transaction` block.
+        When the command fails, the database gets rolled back.
+        So, either the command got executed for all values or for none.
+
+        Each element of *valuelist* can be a list, a dictionary or a tuple.
+
+        Args:
+            sql (str): SQL command
+            valuelist (list): A list of arguments used for each execution of the command
+
+        Returns:
+            ``None``
+
+        Raises:
+            TypeError: When *sql* is not a string or *valuelist* is not a list
+
+        Example:
+
+            .. code-block:: python
+
+                db = Database("test.db")
+
+                sql    = "INSERT INTO valuetable (name, content) VALUES (?, ?)"
+                values = [("Name", 1000), ("Other Name", 2000)]
+
+                db.ExecuteMany(sql, values)
+        """
+        if type(sql) != str:
+            raise TypeError("Invalid sql-type. String expected!")
+        if type(valuelist) != list:
+            raise TypeError("Invalid valuelist-type. List expected!")
+
+        if not valuelist:
+            return None
+
+        # executemany is one statement. In case it fails inside a transaction,
+        # only its own changes must be undone. A savepoint allows this.
+        intransaction = self.InTransaction()
+        try:
+            if intransaction:
+                self.db_cursor.execute("SAVEPOINT executemany")
+            self.db_cursor.executemany(sql, valuelist)
+
+        except Exception as e:
+            if intransaction:
+                self.db_cursor.execute("ROLLBACK TO SAVEPOINT executemany")
+                self.db_cursor.execute("RELEASE SAVEPOINT executemany")
+            else:
+                self.db_connection.rollback()
+            raise e
+
+        if intransaction:
+            self.db_cursor.execute("RELEASE SAVEPOINT executemany")
+        else:
+            self.db_connection.commit()
         return None
 
 
@@ -224,12 +542,53 @@ class Database(object):
             data = self.db_cursor.fetchall()
 
         except Exception as e:
-            self.db_connection.rollback()
+            if not self.InTransaction():
+                self.db_connection.rollback()
             raise e
 
         return data
 
 
 
+    def GetQueryPlan(self, sql, values=None):
+        """
+        This method returns the query plan SQLite would use to execute a SQL command.
+        The command itself gets not executed.
+        It can be used to check if a query gets answered by an index or if it requires a full table scan.
+
+        Each returned string describes one step of the plan as reported by ``EXPLAIN QUERY PLAN``.
+        For example ``"SCAN songs"`` or ``"SEARCH songs USING INDEX songs_albumid (albumid=?)"``.
+
+        Args:
+            sql (str): SQL command
+            values: Optional arguments used in the command
+
+        Returns:
+            A list of strings, one for each step of the query plan
+
+        Raises:
+            TypeError: When *sql* is not a string
+
+        Example:
+
+            .. code-block:: python
+
+                db = Database("test.db")
+
+                plan = db.GetQueryPlan("SELECT * FROM valuetable WHERE name = ?", "Name")
+                for step in plan:
+                    print(step)
+        """
+        if type(sql) != str:
+            raise TypeError("Invalid sql-type. String expected!")
+
+        result = self.GetFromDatabase("EXPLAIN QUERY PLAN " + sql, values)
+
+        # Each row is a tuple (id, parent, notused, detail)
+        plan = [row[3] for row in result]
+        return plan
+
+
+
 # vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
 
@@ -127,6 +127,7 @@ The following methods exist to handle song entries in the database:
 
     * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.AddSong`
     * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.AddFullSong`
+    * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.AddFullSongs`
     * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetSongById`
     * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetSongByPath`
     * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetSongsByArtistId`
@@ -338,6 +339,7 @@ A lyrics entry could look like the following example:
 
     * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetLyrics`
     * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.SetLyrics`
+    * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.FindLyrics`
 
 The *lyrics* column can have the following states:
 
@@ -347,6 +349,22 @@ The *lyrics* column can have the following states:
     * ``SONG_LYRICSSTATE_FROMUSER`` - The lyrics were reviewed by the user. This noted the highest state of quality for lyrics.
     * ``SONG_LYRICSSTATE_NONE`` - There are no lyrics for this song - it is an instrumental song.
 
+Full-Text Search
+^^^^^^^^^^^^^^^^
+
+The lyrics can be searched via :meth:`~musicdb.lib.db.musicdb.MusicDatabase.FindLyrics`.
+Therefore the database contains the SQLite `FTS5 <https://www.sqlite.org/fts5.html>`_ table *fulltext*.
+It has one row for each song with the song ID as *rowid*:
+
+    +-------+----------+-----------+------------+--------+
+    | rowid | songname | albumname | artistname | lyrics |
+    +-------+----------+-----------+------------+--------+
+
+The table is a copy of the names and lyrics.
+It gets updated by triggers of the database whenever a song gets added, removed or moved,
+when the name of a song, album or artist changes, or when lyrics get added, changed or removed.
+So it also stays up to date when the database gets changed by other processes or tools.
+
 Tags Table
 ----------
 
@@ -458,8 +476,10 @@ Tag Related Methods
     * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.DeleteTagById`
     * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.ModifyTag`
     * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.SetTargetTag`
+    * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.SetTargetTags`
     * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.RemoveTargetTag`
     * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetTargetTags`
+    * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetTargetTagsBulk`
     * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetSubgenresOfGenre`
     * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.SplitTagsByClass`
 
@@ -470,11 +490,65 @@ The following tag classes exist:
     * ``MusicDatabase.TAG_CLASS_MOOD``: Moods like Lucky, Sad, …
 
 A target can be "song", "video" or "album".
+
+
+Entity Cache
+------------
+
+Artists, albums, songs and videos are read by their ID over and over again, for example by the WebSocket API.
+To avoid accessing the database for each of those reads, the entries can be cached in memory.
+The cache is an instance of :class:`~musicdb.lib.db.musicdb.MusicDatabaseCache` and gets shared by all
+instances of the :class:`~musicdb.lib.db.musicdb.MusicDatabase` class inside one process.
+Beside the entries read by the following methods, the tag lists of songs, albums and videos get cached as well.
+
+    * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetArtistById`
+    * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetAlbumById`
+    * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetSongById`
+    * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetVideoById`
+    * :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetTargetTags` and :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetTargetTagsBulk`
+
+All methods of the :class:`~musicdb.lib.db.musicdb.MusicDatabase` class that change an entry remove this entry from the cache.
+Changes done by other processes (like the MusicDB command line modules) are not visible to the cache.
+So after such changes, the cache must be cleared via :meth:`~musicdb.lib.db.musicdb.MusicDatabase.ClearCache`.
+This is done by the server when it gets the signal to update its caches.
+
+Writes inside a :meth:`~musicdb.lib.db.musicdb.MusicDatabase.Transaction` block get committed at the end of the block.
+Then the changed entries get removed from the cache a second time,
+because other threads may have cached the old state of an entry while the transaction was open.
+
+By default the cache is disabled.
+It can be enabled by setting its size via :meth:`~musicdb.lib.db.musicdb.MusicDatabase.SetCacheSize`.
+The MusicDB server does this with the size configured in the MusicDB Configuration (``[database]->entitycache``).
+
+Change Notification
+-------------------
+
+Other components like :class:`~musicdb.mdbapi.randy.Randy` maintain their own data derived from the database.
+To keep them up to date, callback functions can be registered via :meth:`~musicdb.lib.db.musicdb.MusicDatabase.RegisterCallback`.
+They get called with the database path, the entry type and the entry ID whenever an entry gets changed,
+added or removed by a method of this class.
+The entry types are the same as used for the `Entity Cache`_ (``"artist"``, ``"album"``, ``"song"``, ``"video"``,
+``"songtags"``, ``"albumtags"``, ``"videotags"``).
+When the entry ID is ``None``, all entries of that type may have changed.
+When the entry type is ``None`` as well, the whole database may have changed (for example after :meth:`~musicdb.lib.db.musicdb.MusicDatabase.ClearCache`).
+
+Like for the cache, all changes made inside a transaction get notified a second time after the transaction was committed.
+
+Name Change Counter
+-------------------
+
+The ``meta`` table contains a counter behind the key ``namechanges``.
+It gets incremented by triggers of the database whenever an artist, album or song gets added or removed, or when its name changes.
+So it also counts changes done by other processes or tools.
+The counter can be read via :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetNameChangeCounter`.
+It is used to check if the persistent search index of :mod:`musicdb.mdbapi.mise` is up to date.
 """
 
 import random
 import logging
 import threading
+import contextlib
+from collections import OrderedDict
 from musicdb.lib.db.database import Database
 
 SONG_LYRICSSTATE_EMPTY    = 0
@@ -485,6 +559,189 @@ SONG_LYRICSSTATE_NONE     = 4 # for instrumental songs
 
 MusicDatabaseLock = threading.RLock() # RLock is mandatory for nested calles!
 
+
+
+class MusicDatabaseCache(object):
+    """
+    This class implements a bounded *least recently used* (LRU) cache for database entries.
+    When the cache is full, the entry that was not used for the longest time gets removed.
+
+    The cache stores copies of the entries and also returns copies.
+    So changing a returned entry does not change the cached one.
+    Entries are dictionaries or lists of dictionaries.
+
+    The keys are tuples of the database path, the type of the entry and the ID of the entry.
+    For example ``("/var/lib/musicdb/music.db", "song", 1000)``.
+
+    A size of ``0`` disables the cache.
+
+    Args:
+        maxsize (int): Maximum number of entries in the cache
+    """
+    def __init__(self, maxsize=0):
+        self.lock      = threading.Lock()
+        self.entries   = OrderedDict()
+        self.maxsize   = maxsize
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+
+
+    def __Copy(self, entry):
+        if type(entry) == list:
+            return [dict(element) for element in entry]
+        return dict(entry)
+
+
+    def SetSize(self, maxsize):
+        """
+        Sets the maximum number of entries in the cache.
+        If there are more entries in the cache, the least recently used ones get removed.
+
+        Args:
+            maxsize (int): Maximum number of entries. ``0`` disables the cache.
+
+        Returns:
+            *Nothing*
+
+        Raises:
+            TypeError: When *maxsize* is not an integer
+            ValueError: When *maxsize* is less than ``0``
+        """
+        if type(maxsize) != int:
+            raise TypeError("Cache size must be an integer")
+        if maxsize < 0:
+            raise ValueError("Cache size must not be negative")
+
+        with self.lock:
+            self.maxsize = maxsize
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return
+
+
+    def Get(self, key):
+        """
+        Returns a copy of the cached entry or ``None`` if there is no entry for *key*.
+
+        Args:
+            key (tuple): The key of the entry
+
+        Returns:
+            A copy of the entry or ``None``
+        """
+        if self.maxsize == 0:
+            return None
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+        return self.__Copy(entry)
+
+
+    def Put(self, key, entry):
+        """
+        Stores a copy of *entry* in the cache.
+
+        Args:
+            key (tuple): The key of the entry
+            entry (dict/list): The entry to cache
+
+        Returns:
+            *Nothing*
+        """
+        if self.maxsize == 0 or entry is None:
+            return
+
+        entry = self.__Copy(entry)
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return
+
+
+    def Invalidate(self, key):
+        """
+        Removes the entry for *key* from the cache.
+        If there is no such entry, nothing happens.
+
+        Args:
+            key (tuple): The key of the entry
+
+        Returns:
+            *Nothing*
+        """
+        with self.lock:
+            self.entries.pop(key, None)
+        return
+
+
+    def InvalidateType(self, entrytype):
+        """
+        Removes all entries of a specific type from the cache.
+
+        Args:
+            entrytype (str): Type of the entries to remove, for example ``"songtags"``
+
+        Returns:
+            *Nothing*
+        """
+        with self.lock:
+            keys = [key for key in self.entries if key[1] == entrytype]
+            for key in keys:
+                del self.entries[key]
+        return
+
+
+    def Clear(self):
+        """
+        Removes all entries from the cache.
+        The statistics are not reset.
+
+        Returns:
+            *Nothing*
+        """
+        with self.lock:
+            self.entries.clear()
+        return
+
+
+    def GetStatistics(self):
+        """
+        Returns the usage statistics of the cache as dictionary with the following keys:
+
+            * **size:** Number of entries in the cache
+            * **maxsize:** Maximum number of entries
+            * **hits:** Number of successful look ups
+            * **misses:** Number of look ups of entries that were not cached
+            * **evictions:** Number of entries that got removed because the cache was full
+
+        Returns:
+            A dictionary with statistics
+        """
+        with self.lock:
+            statistics = {}
+            statistics["size"]      = len(self.entries)
+            statistics["maxsize"]   = self.maxsize
+            statistics["hits"]      = self.hits
+            statistics["misses"]    = self.misses
+            statistics["evictions"] = self.evictions
+        return statistics
+
+
+MusicDatabaseEntityCache = MusicDatabaseCache() # Shared by all MusicDatabase instances
+MusicDatabaseTransactions= threading.local()    # Cache entries changed inside the transaction of a thread
+MusicDatabaseCallbacks   = []                   # Functions that get called when an entry changed
+
 class MusicDatabase(Database):
     """
     This class is the interface to the Music Database.
@@ -596,15 +853,16 @@ class MusicDatabase(Database):
 
     def __init__(self, path):
         Database.__init__(self, path)
+        self.databasepath = path
         try:
             result = self.GetFromDatabase("SELECT value FROM meta WHERE key = 'version'")
             version = int(result[0][0])
         except Exception as e:
             raise ValueError("Unable to read version number from Music Database")
 
-        if version != 5:
-            logging.error("Unexpected version number of Music Database. Got %i, expected %i"%(version, 5))
-            raise ValueError("Unexpected version number of Music Database. Got %i, expected %i"%(version, 5))
+        if version != 8:
+            logging.error("Unexpected version number of Music Database. Got %i, expected %i"%(version, 8))
+            raise ValueError("Unexpected version number of Music Database. Got %i, expected %i"%(version, 8))
         
 
     def __ArtistEntryToDict(self, entry):
@@ -723,6 +981,183 @@ class MusicDatabase(Database):
         return subgenre 
 
 
+    def __CacheKey(self, entrytype, entryid):
+        try:
+            entryid = int(entryid)
+        except (TypeError, ValueError):
+            return None
+        return (self.databasepath, entrytype, entryid)
+
+    def __GetCached(self, entrytype, entryid):
+        key = self.__CacheKey(entrytype, entryid)
+        if key == None:
+            return None
+        return MusicDatabaseEntityCache.Get(key)
+
+    def __PutCached(self, entrytype, entryid, entry):
+        key = self.__CacheKey(entrytype, entryid)
+        if key != None:
+            MusicDatabaseEntityCache.Put(key, entry)
+
+    def __InvalidateCached(self, entrytype, entryid):
+        key = self.__CacheKey(entrytype, entryid)
+        if key != None:
+            MusicDatabaseEntityCache.Invalidate(key)
+            self.__NotifyChange(entrytype, entryid)
+
+    def __InvalidateCachedTags(self):
+        for entrytype in ["songtags", "albumtags", "videotags"]:
+            MusicDatabaseEntityCache.InvalidateType(entrytype)
+            self.__NotifyChange(entrytype, None)
+
+    def __NotifyChange(self, entrytype, entryid):
+        if self.InTransaction():
+            if entryid == None:
+                self.__GetPendingInvalidations().add(entrytype)
+            else:
+                key = self.__CacheKey(entrytype, entryid)
+                if key != None:
+                    self.__GetPendingInvalidations().add(key)
+
+        for callback in list(MusicDatabaseCallbacks):
+            try:
+                callback(self.databasepath, entrytype, entryid)
+            except Exception as e:
+                logging.exception("A Music Database callback function crashed with error: %s", str(e))
+
+    def __GetPendingInvalidations(self):
+        if not hasattr(MusicDatabaseTransactions, "pending"):
+            MusicDatabaseTransactions.pending = set()
+        return MusicDatabaseTransactions.pending
+
+
+    @contextlib.contextmanager
+    def Transaction(self):
+        """
+        Like :meth:`musicdb.lib.db.database.Database.Transaction` this method returns a context manager
+        that combines all writes inside its ``with`` block into one transaction.
+
+        The ``MusicDatabaseLock`` is held for the whole transaction.
+        So other threads of MusicDB wait for the transaction instead of running into the timeout of the database.
+
+        Other threads may read the old state of a changed entry and put it into the entity cache
+        before the transaction gets committed.
+        Therefore all entries that got changed inside the transaction get removed from the cache again
+        when the outermost transaction ends.
+
+        Example:
+
+            .. code-block:: python
+
+                with musicdb.Transaction():
+                    musicdb.AddFullSongs(songs)
+                    for song in songs:
+                        musicdb.SetTargetTag("song", song["id"], tagid)
+        """
+        try:
+            with MusicDatabaseLock, Database.Transaction(self):
+                yield self
+        finally:
+            if not self.InTransaction():
+                pending = self.__GetPendingInvalidations()
+                for key in pending:
+                    if type(key) == str:
+                        MusicDatabaseEntityCache.InvalidateType(key)
+                        self.__NotifyChange(key, None)
+                    else:
+                        MusicDatabaseEntityCache.Invalidate(key)
+                        self.__NotifyChange(key[1], key[2])
+                pending.clear()
+
+
+    def SetCacheSize(self, maxsize):
+        """
+        Sets the maximum number of entries of the entity cache.
+        The cache is shared between all instances of this class.
+        See :meth:`musicdb.lib.db.musicdb.MusicDatabaseCache.SetSize` for details.
+
+        Args:
+            maxsize (int): Maximum number of cached entries. ``0`` disables the cache.
+
+        Returns:
+            *Nothing*
+        """
+        MusicDatabaseEntityCache.SetSize(maxsize)
+        return
+
+    def GetNameChangeCounter(self):
+        """
+        Returns the number of changes of artist, album and song names (see `Name Change Counter`_).
+
+        Returns:
+            The counter as integer
+        """
+        result = self.GetFromDatabase("SELECT value FROM meta WHERE key = 'namechanges'")
+        return int(result[0][0])
+
+    def ClearCache(self):
+        """
+        Removes all entries from the entity cache.
+        This is necessary when the database was changed by another process.
+
+        Returns:
+            *Nothing*
+        """
+        MusicDatabaseEntityCache.Clear()
+        self.__NotifyChange(None, None)
+        return
+
+    def GetCacheStatistics(self):
+        """
+        Returns the hit and miss counter of the entity cache.
+        See :meth:`musicdb.lib.db.musicdb.MusicDatabaseCache.GetStatistics` for details.
+
+        Returns:
+            A dictionary with statistics of the entity cache
+        """
+        return MusicDatabaseEntityCache.GetStatistics()
+
+
+    def RegisterCallback(self, function):
+        """
+        Register a callback function that gets called whenever an entry of the database changes.
+        The list of callback functions is shared by all instances of this class.
+        For more details see the module description at the top of this document.
+
+        The function gets called with three arguments: The path of the database, the entry type and the entry ID.
+        It gets called while the ``MusicDatabaseLock`` may be held.
+        So it must not block and should not access the database.
+
+        Args:
+            function: A function that shall be called when an entry changed.
+
+        Returns:
+            *Nothing*
+        """
+        global MusicDatabaseCallbacks
+        MusicDatabaseCallbacks.append(function)
+
+
+    def RemoveCallback(self, function):
+        """
+        Removes a function from the list of callback functions.
+
+        Args:
+            function: A function that shall be called removed.
+
+        Returns:
+            *Nothing*
+        """
+        global MusicDatabaseCallbacks
+
+        # Not registered? Then do nothing.
+        if not function in MusicDatabaseCallbacks:
+            logging.warning("A Music Database callback function should be removed, but did not exist in the list of callback functions!")
+            return
+
+        MusicDatabaseCallbacks.remove(function)
+
+
     def WriteArtist(self, artist):
         """
         Updates the whole row for an artist.
@@ -736,6 +1171,7 @@ class MusicDatabase(Database):
         """
         with MusicDatabaseLock:
             self.Execute(sql, artist)
+            self.__InvalidateCached("artist", artist["id"])
         return None
 
     def WriteAlbum(self, album):
@@ -762,6 +1198,7 @@ class MusicDatabase(Database):
         """
         with MusicDatabaseLock:
             self.Execute(sql, album)
+            self.__InvalidateCached("album", album["id"])
         return None
 
     def WriteSong(self, song):
@@ -798,6 +1235,7 @@ class MusicDatabase(Database):
         """
         with MusicDatabaseLock:
             self.Execute(sql, song)
+            self.__InvalidateCached("song", song["id"])
         return None
 
     def WriteVideo(self, video):
@@ -847,6 +1285,7 @@ class MusicDatabase(Database):
         """
         with MusicDatabaseLock:
             self.Execute(sql, video)
+            self.__InvalidateCached("video", video["id"])
         return None
 
     def WriteTag(self, tag):
@@ -868,6 +1307,7 @@ class MusicDatabase(Database):
         """
         with MusicDatabaseLock:
             self.Execute(sql, tag)
+            self.__InvalidateCachedTags()
         return None
 
 
@@ -960,6 +1400,37 @@ class MusicDatabase(Database):
         return retval
 
 
+    def __GetEntriesByIds(self, entrytype, tablename, idname, converter, entryids):
+        if type(entryids) != list:
+            raise TypeError("IDs must be a list!")
+
+        entryids = [int(entryid) for entryid in entryids]
+        entries  = {}
+        missing  = []
+
+        # Use the entries from the entity cache if available
+        for entryid in dict.fromkeys(entryids):     # unique IDs, order preserved
+            entry = self.__GetCached(entrytype, entryid)
+            if entry == None:
+                missing.append(entryid)
+            else:
+                entries[entryid] = entry
+
+        sql = "SELECT * FROM " + tablename + " WHERE " + idname + " IN ({places})"
+        with MusicDatabaseLock:
+            # Stay below the maximum number of SQL variables of older SQLite versions
+            for start in range(0, len(missing), 500):
+                chunk  = missing[start:start+500]
+                query  = sql.format(places = ",".join("?"*len(chunk)))
+                result = self.GetFromDatabase(query, chunk)
+
+                for row in result:
+                    entry = converter(row)
+                    entries[entry["id"]] = entry
+                    self.__PutCached(entrytype, entry["id"], entry)
+        return entries
+
+
     def GetArtistById(self, artistid):
         """
         Returns the artist by its ID
@@ -984,23 +1455,48 @@ class MusicDatabase(Database):
         if type(artistid) != int:
             raise TypeError("ArtistID must be of type int or str and is a decimal number!")
 
+        artist = self.__GetCached("artist", artistid)
+        if artist:
+            return artist
+
         # check if this artist exists
         sql = "SELECT * FROM artists WHERE artistid = ?"
         with MusicDatabaseLock:
             result = self.GetFromDatabase(sql, artistid)
 
-        # check result
-        if not result:
-            return None
-        
-        if len(result) > 1:
-            raise AssertionError("Multiple Artist entries for one ID in database!")
+            # check result
+            if not result:
+                return None
+            
+            if len(result) > 1:
+                raise AssertionError("Multiple Artist entries for one ID in database!")
 
-        entry = result[0] # remove the list thing, now it's just a tuple
-        retval = self.__ArtistEntryToDict(entry)
+            entry = result[0] # remove the list thing, now it's just a tuple
+            retval = self.__ArtistEntryToDict(entry)
+            self.__PutCached("artist", artistid, retval)
         return retval
 
 
+    def GetArtistsByIds(self, artistids):
+        """
+        Returns multiple artists.
+        This method behaves like :meth:`~GetArtistById` but reads all artists that are not in the entity cache with one query.
+        It should be preferred when a list of artists is needed.
+
+        The returned dictionary has an entry for each ID in *artistids* that exists in the database.
+
+        Args:
+            artistids (list): List of artist IDs
+
+        Returns:
+            A dictionary with the artist ID as key and the artist entry as value
+
+        Raises:
+            TypeError: If *artistids* is not a list
+        """
+        return self.__GetEntriesByIds("artist", "artists", "artistid", self.__ArtistEntryToDict, artistids)
+
+
     def RemoveArtist(self, artistid):
         """
         This method removes an artist entry and all related data from all tables.
@@ -1024,6 +1520,7 @@ class MusicDatabase(Database):
         with MusicDatabaseLock:
             sql = "DELETE FROM artists WHERE artistid = ?"
             self.Execute(sql, artistid)
+            self.__InvalidateCached("artist", artistid)
 
         return None
 
@@ -1125,22 +1622,48 @@ class MusicDatabase(Database):
         if type(albumid) != str and type(albumid) != int:
             raise TypeError("AlbumID must have a decimal value!")
 
+        album = self.__GetCached("album", albumid)
+        if album:
+            return album
+
         sql = "SELECT * FROM albums WHERE albumid = ?"
         with MusicDatabaseLock:
             result = self.GetFromDatabase(sql, albumid)
 
-        # check result
-        if not result:
-            return None
+            # check result
+            if not result:
+                return None
 
-        if len(result) > 1:
-            raise AssertionError("Multiple Album entries for one ID in the database!")
+            if len(result) > 1:
+                raise AssertionError("Multiple Album entries for one ID in the database!")
 
-        entry = result[0]
-        retval = self.__AlbumEntryToDict(entry)
+            entry = result[0]
+            retval = self.__AlbumEntryToDict(entry)
+            self.__PutCached("album", albumid, retval)
         return retval
 
 
+    def GetAlbumsByIds(self, albumids):
+        """
+        Returns multiple albums.
+        This method behaves like :meth:`~GetAlbumById` but reads all albums that are not in the entity cache with one query.
+        It should be preferred when a list of albums is needed.
+        Like :meth:`~GetAlbumById` it also returns hidden albums.
+
+        The returned dictionary has an entry for each ID in *albumids* that exists in the database.
+
+        Args:
+            albumids (list): List of album IDs
+
+        Returns:
+            A dictionary with the album ID as key and the album entry as value
+
+        Raises:
+            TypeError: If *albumids* is not a list
+        """
+        return self.__GetEntriesByIds("album", "albums", "albumid", self.__AlbumEntryToDict, albumids)
+
+
     def GetAllAlbums(self):
         """
         See :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetAlbums` (``GetAlbums(artistid=None, withsongs=False, hidden="include")``)
@@ -1159,6 +1682,42 @@ class MusicDatabase(Database):
         """
         return self.GetAlbums(artistid, hidden="no")
 
+    def GetAlbumsByArtistIds(self, artistids):
+        """
+        Returns the albums of multiple artists with one query.
+        Like :meth:`~GetAlbumsByArtistId`, hidden albums are not included.
+
+        The returned dictionary has an entry for each ID in *artistids*.
+        Artists without albums have an empty list.
+
+        Args:
+            artistids (list): List of artist IDs
+
+        Returns:
+            A dictionary with the artist ID as key and a list of albums as value
+
+        Raises:
+            TypeError: If *artistids* is not a list
+        """
+        if type(artistids) != list:
+            raise TypeError("Artist IDs must be a list!")
+
+        artistids = list(dict.fromkeys(int(artistid) for artistid in artistids))
+        albums    = {artistid: [] for artistid in artistids}
+
+        sql = "SELECT * FROM albums WHERE hidden = 0 AND artistid IN ({places})"
+        with MusicDatabaseLock:
+            # Stay below the maximum number of SQL variables of older SQLite versions
+            for start in range(0, len(artistids), 500):
+                chunk  = artistids[start:start+500]
+                query  = sql.format(places = ",".join("?"*len(chunk)))
+                result = self.GetFromDatabase(query, chunk)
+
+                for entry in result:
+                    album = self.__AlbumEntryToDict(entry)
+                    albums[album["artistid"]].append(album)
+        return albums
+
     def GetFilteredAlbumsByArtistId(self, artistid, genretree):
         """
         See :meth:`~musicdb.lib.db.musicdb.MusicDatabase.GetAlbums` (``GetAlbums(artistid, withsongs=False, hidden="no", genretree=genretree)``)
@@ -1244,13 +1803,17 @@ class MusicDatabase(Database):
         with MusicDatabaseLock:
             result = self.GetFromDatabase(sql, value)
 
+            if genretree:
+                albumids  = [entry[self.ALBUM_ID] for entry in result]
+                alltags   = self.GetTargetTagsBulk("album", albumids)
+
             albums = []
             for entry in result:
                 album = self.__AlbumEntryToDict(entry)
 
                 # Step 2: Check sub genres
                 if genretree:
-                    albumtags = self.GetTargetTags("album", album["id"])
+                    albumtags = alltags[album["id"]]
                     albumgenres, albumsubgenres, _ = self.SplitTagsByClass(albumtags)
                     albumgenreids    = [ genre["id"] for genre in albumgenres ]
                     albumsubgenreids = [ genre["id"] for genre in albumsubgenres ]
@@ -1326,6 +1889,8 @@ class MusicDatabase(Database):
             self.Execute(sql, albumid)
             sql = "DELETE FROM albumtags WHERE albumid = ?"
             self.Execute(sql, albumid)
+            self.__InvalidateCached("album",     albumid)
+            self.__InvalidateCached("albumtags", albumid)
 
         return None
 
@@ -1356,6 +1921,7 @@ class MusicDatabase(Database):
         sql = "UPDATE albums SET hidden=:hidden WHERE albumid=:albumid"
         with MusicDatabaseLock:
             self.Execute(sql, data)
+            self.__InvalidateCached("album", albumid)
         return None
 
 
@@ -1384,6 +1950,7 @@ class MusicDatabase(Database):
         sql = "UPDATE albums SET origin=:origin WHERE albumid=:albumid"
         with MusicDatabaseLock:
             self.Execute(sql, data)
+            self.__InvalidateCached("album", albumid)
         return None
 
 
@@ -1416,6 +1983,7 @@ class MusicDatabase(Database):
         sql = "UPDATE albums SET added=:added WHERE albumid=:albumid"
         with MusicDatabaseLock:
             self.Execute(sql, data)
+            self.__InvalidateCached("album", albumid)
         return None
 
 
@@ -1447,6 +2015,7 @@ class MusicDatabase(Database):
         sql = "UPDATE albums SET artworkpath = ? WHERE albumid = ?"
         with MusicDatabaseLock:
             self.Execute(sql, (artworkpath, albumid))
+            self.__InvalidateCached("album", albumid)
         return None
 
 
@@ -1490,6 +2059,7 @@ class MusicDatabase(Database):
         sql = "UPDATE albums SET " + colorname + "=:color WHERE albumid=:albumid"
         with MusicDatabaseLock:
             self.Execute(sql, data)
+            self.__InvalidateCached("album", albumid)
         return None
 
 
@@ -1538,6 +2108,7 @@ class MusicDatabase(Database):
 
             sql = "INSERT INTO songs (albumid, artistid, name, path) VALUES (?, ?, ?, ?)"
             self.Execute(sql, (albumid, artistid, name, path))
+            self.__NotifyChange("album", albumid)
         return None
 
 
@@ -1576,6 +2147,86 @@ class MusicDatabase(Database):
                 return False
 
         return True
+
+
+    def AddFullSongs(self, songs):
+        """
+        This method creates new entries for a list of songs and adds all their attributes into the database.
+        In contrast to :meth:`~musicdb.lib.db.musicdb.MusicDatabase.AddFullSong`,
+        all songs get inserted with one ``executemany`` call.
+        After inserting, the new song IDs get set to the dictionaries given as argument.
+
+        If a song with the same path is already in the database, its *artistid*, *albumid* and *name* get compared to the new entry.
+        If they match, a warning gets logged, the ID of the existing song gets set and the song gets not changed.
+        Otherwise a ``ValueError`` gets raised and nothing changes in the database.
+
+        When inserting the songs fails, no song gets added.
+        So, when this method returns ``False`` nothing changed in the database.
+
+        Args:
+            songs (list): A list of complete dictionaries with all keys of a MusicDB Song entry
+
+        Returns:
+            ``True`` on success, otherwise ``False`` which indicates that nothing changed in the database.
+
+        Raises:
+            TypeError: When *songs* is not a list
+            ValueError: If a song is already in the database **and** does not match the new entry
+        """
+        if type(songs) != list:
+            raise TypeError("Songs must be a list of song dictionaries!")
+
+        columns = ["albumid", "artistid", "name", "path", "number", "cd", "disabled", "playtime", "bitrate",
+                "likes", "dislikes", "favorite", "lyricsstate", "checksum", "lastplayed", "liverecording", "badaudio"]
+        sql  = "INSERT INTO songs (" + ", ".join(columns) + ")"
+        sql += " VALUES (" + ", ".join([":" + column for column in columns]) + ")"
+
+        with MusicDatabaseLock:
+            # Check which songs are already in the database
+            existing = {}
+            paths    = [song["path"] for song in songs]
+            for start in range(0, len(paths), 500):
+                chunk  = paths[start:start+500]
+                query  = "SELECT * FROM songs WHERE path IN (" + ",".join("?"*len(chunk)) + ")"
+                result = self.GetFromDatabase(query, chunk)
+                for entry in result:
+                    existing[entry[self.SONG_PATH]] = self.__SongEntryToDict(entry)
+
+            newsongs = []
+            for song in songs:
+                if song["path"] not in existing:
+                    newsongs.append(song)
+                    continue
+
+                entry = existing[song["path"]]
+                if entry["artistid"] != song["artistid"] or entry["albumid"] != song["albumid"] or entry["name"] != song["name"]:
+                    raise ValueError("There is a song with the same path already exists in the database but with other attributes!")
+
+                logging.warning("Song with path %s does already exist in database. \033[1;30m(It matches the artist ID and album ID so it will be skipped)", song["path"])
+                song["id"] = entry["id"]
+
+            try:
+                self.ExecuteMany(sql, newsongs)
+            except Exception as e:
+                logging.critical("The following Exception occurred: \"%s\". None of the %i songs got added to the database.", str(e), len(newsongs))
+                return False
+
+            # Get the new IDs
+            newids = {}
+            for start in range(0, len(newsongs), 500):
+                chunk  = [song["path"] for song in newsongs[start:start+500]]
+                query  = "SELECT songid, path FROM songs WHERE path IN (" + ",".join("?"*len(chunk)) + ")"
+                result = self.GetFromDatabase(query, chunk)
+                for songid, path in result:
+                    newids[path] = songid
+
+            for song in newsongs:
+                song["id"] = newids[song["path"]]
+
+            for albumid in { song["albumid"] for song in newsongs }:
+                self.__NotifyChange("album", albumid)
+
+        return True
         
 
     def GetSongById(self, songid):
@@ -1595,20 +2246,58 @@ class MusicDatabase(Database):
         if type(songid) != str and type(songid) != int:
             raise TypeError("SongID must be a decimal number of type integer or string!")
 
+        song = self.__GetCached("song", songid)
+        if song:
+            return song
+
         sql    = "SELECT * FROM songs WHERE songid = ?"
         with MusicDatabaseLock:
             result = self.GetFromDatabase(sql, (songid))
 
-        if not result:
-            return None
+            if not result:
+                return None
 
-        if len(result) > 1:
-            raise AssertionError("Multiple Song entries for one ID in the database!")
+            if len(result) > 1:
+                raise AssertionError("Multiple Song entries for one ID in the database!")
 
-        song   = self.__SongEntryToDict(result[0])
+            song   = self.__SongEntryToDict(result[0])
+            self.__PutCached("song", songid, song)
         return song
 
 
+    def GetSongsByIds(self, songids):
+        """
+        Returns multiple songs.
+        This method behaves like :meth:`~GetSongById` but reads all songs that are not in the entity cache with one query.
+        It should be preferred when a list of songs is needed.
+
+        The returned dictionary has an entry for each ID in *songids* that exists in the database.
+
+        Args:
+            songids (list): List of song IDs
+
+        Returns:
+            A dictionary with the song ID as key and the song entry as value
+
+        Raises:
+            TypeError: If *songids* is not a list
+        """
+        return self.__GetEntriesByIds("song", "songs", "songid", self.__SongEntryToDict, songids)
+
+
+    def GetDisabledOrHatedSongIds(self):
+        """
+        Returns the IDs of all songs that are disabled or hated (favorite is ``-1``).
+
+        Returns:
+            A list of song IDs
+        """
+        sql = "SELECT songid FROM songs WHERE disabled != 0 OR favorite = -1"
+        with MusicDatabaseLock:
+            result = self.GetFromDatabase(sql)
+        return [entry[0] for entry in result]
+
+
     def GetSongByPath(self, path):
         """
         Returns a song from the database that matches the *path*
@@ -2110,6 +2799,66 @@ class MusicDatabase(Database):
 
 
 
+    def FindLyrics(self, searchstring, limit=20):
+        """
+        This method searches through the lyrics and the names of all songs, their albums and artists
+        (see `Full-Text Search`_).
+        All words of the search string must be found.
+        The last word is also matched as prefix of a word, so the search works while the user is still typing.
+
+        The results are ordered by their relevance (BM25).
+        Matches in the song name count more than matches in the album or artist name, and those more than matches in the lyrics.
+        Each result is a dictionary with the following keys:
+
+            * **songid:** ID of the song
+            * **snippet:** A short part of the column that matches best, with the found words highlighted by ``<<…>>``
+            * **rank:** The relevance of the result. Lower values mean better matches.
+
+        Args:
+            searchstring (str): The words to search for
+            limit (int): Maximum number of results
+
+        Returns:
+            A list of search results
+
+        Raises:
+            TypeError: When *searchstring* is not a string
+
+        Example:
+
+            .. code-block:: python
+
+                results = musicdb.FindLyrics("lorem ipsum")
+                for result in results:
+                    print("%i: %s"%(result["songid"], result["snippet"]))
+        """
+        if type(searchstring) != str:
+            raise TypeError("Search string must be of type string!")
+
+        words = searchstring.split()
+        if not words:
+            return []
+
+        # Each word gets quoted, so that the user input does not get interpreted as FTS5 query syntax
+        query  = " ".join("\"" + word.replace("\"", "\"\"") + "\"" for word in words)
+        query += "*"
+
+        sql  = "SELECT rowid, snippet(fulltext, -1, '<<', '>>', '…', 12), bm25(fulltext, 4.0, 2.0, 2.0, 1.0) AS rank"
+        sql += " FROM fulltext WHERE fulltext MATCH ? ORDER BY rank LIMIT ?"
+        with MusicDatabaseLock:
+            result = self.GetFromDatabase(sql, (query, int(limit)))
+
+        results = []
+        for entry in result:
+            found = {}
+            found["songid"]  = entry[0]
+            found["snippet"] = entry[1]
+            found["rank"]    = entry[2]
+            results.append(found)
+        return results
+
+
+
     def UpdateVideoStatistic(self, videoid, stat, value):
         """
         Alias to :meth:`~UpdateMusicProperty` with last parameter ``musictype = "video"``.
@@ -2268,6 +3017,8 @@ class MusicDatabase(Database):
             self.Execute(sql, songid)
             sql = "DELETE FROM songtags WHERE songid = ?"
             self.Execute(sql, songid)
+            self.__InvalidateCached("song",     songid)
+            self.__InvalidateCached("songtags", songid)
 
         return None
 
@@ -2405,19 +3156,24 @@ class MusicDatabase(Database):
         if type(videoid) != str and type(videoid) != int:
             raise TypeError("AlbumID must have a decimal value!")
 
+        video = self.__GetCached("video", videoid)
+        if video:
+            return video
+
         sql = "SELECT * FROM videos WHERE videoid = ?"
         with MusicDatabaseLock:
             result = self.GetFromDatabase(sql, videoid)
 
-        # check result
-        if not result:
-            return None
+            # check result
+            if not result:
+                return None
 
-        if len(result) > 1:
-            raise AssertionError("Multiple Videos entries for one ID in the database!")
+            if len(result) > 1:
+                raise AssertionError("Multiple Videos entries for one ID in the database!")
 
-        entry = result[0]
-        retval = self.__VideoEntryToDict(entry)
+            entry = result[0]
+            retval = self.__VideoEntryToDict(entry)
+            self.__PutCached("video", videoid, retval)
         return retval
 
 
@@ -2662,6 +3418,7 @@ class MusicDatabase(Database):
 
         with MusicDatabaseLock:
             self.Execute(sql, data)
+            self.__InvalidateCached("video", videoid)
         return True
 
 
@@ -2706,6 +3463,7 @@ class MusicDatabase(Database):
         sql = "UPDATE videos SET " + colorname + "=:color WHERE videoid=:videoid"
         with MusicDatabaseLock:
             self.Execute(sql, data)
+            self.__InvalidateCached("video", videoid)
         return None
 
 
@@ -2740,6 +3498,7 @@ class MusicDatabase(Database):
         sql = "UPDATE videos SET vbegin=:vbegin, vend=:vend WHERE videoid=:videoid"
         with MusicDatabaseLock:
             self.Execute(sql, data)
+            self.__InvalidateCached("video", videoid)
         return None
 
 
@@ -2889,6 +3648,7 @@ class MusicDatabase(Database):
         sql = "DELETE FROM tags WHERE name = ? AND class = ?"
         with MusicDatabaseLock:
             self.Execute(sql, (tagname, tagclass))
+            self.__InvalidateCachedTags()
         return None
 
 
@@ -2922,6 +3682,7 @@ class MusicDatabase(Database):
             self.Execute("DELETE FROM albumtags WHERE tagid    = ?", tagid)
             self.Execute("DELETE FROM songtags  WHERE tagid    = ?", tagid)
             self.Execute("DELETE FROM videotags WHERE tagid    = ?", tagid)
+            self.__InvalidateCachedTags()
         return None
 
 
@@ -2982,6 +3743,7 @@ class MusicDatabase(Database):
         sql = "UPDATE tags SET " + columnname + "=:value WHERE name=:name AND class=:class"
         with MusicDatabaseLock:
             self.Execute(sql, data)
+            self.__InvalidateCachedTags()
         return None
 
 
@@ -3037,6 +3799,7 @@ class MusicDatabase(Database):
         sql = "UPDATE tags SET " + columnname + "=:value WHERE tagid=:id"
         with MusicDatabaseLock:
             self.Execute(sql, data)
+            self.__InvalidateCachedTags()
         return None
 
 
@@ -3130,6 +3893,138 @@ class MusicDatabase(Database):
                 sql = "INSERT INTO " + tablename + " (" + idname + ", tagid, confidence, approval) VALUES (?, ?, ?, ?)"
                 self.Execute(sql, (targetid, tagid, confidence, approval))
 
+            self.__InvalidateCached(tablename, targetid)
+
+        return None
+
+
+
+    def SetTargetTags(self, target, tags):
+        """
+        This method sets multiple tags for multiple targets of the same kind at once.
+        For each tag, it behaves like :meth:`~SetTargetTag`.
+        All existing associations get read with one query and all changes get written
+        with one ``executemany`` call for the updates and one for the new entries inside a :meth:`~Transaction`.
+        So, either all tags get set, or none.
+
+        Each element of the *tags* list is a tuple ``(targetid, tagid, approval, confidence)``.
+        The values are the same as for the arguments of :meth:`~SetTargetTag`.
+        *confidence* gets ignored for an *approval* of ``1`` or ``2``.
+
+        Args:
+            target (str): Target that shall be tagged (``"song"`` for a song, ``"video"`` for a video, ``"album"`` for an album)
+            tags (list): A list of tuples ``(targetid, tagid, approval, confidence)``
+
+        Return:
+            ``None``
+
+        Raises:
+            TypeError: If *tags* is not a list
+            ValueError: If ``target`` not in ``{"song", "album", "video"}``
+            TypeError: If ``approval == 0 and confidence == None``
+            ValueError: If ``approval`` not in ``{0,1,2}``
+            TypeError: If ``targetid == None or tagid == None``
+            AssertionError: If there already exists more than one entry
+            ValueError: When there is no tag existing with one of the given tag IDs
+
+        Example:
+
+            .. code-block:: python
+
+                # Set tag 1 to all songs of an album
+                songs = musicdb.GetSongsByAlbumId(albumid)
+                tags  = [(song["id"], 1, 1, None) for song in songs]
+                musicdb.SetTargetTags("song", tags)
+        """
+        if type(tags) != list:
+            raise TypeError("Tags must be a list of tuples!")
+
+        # select table
+        if target == "song":
+            tablename = "songtags"
+            idname    = "songid"
+        elif target == "video":
+            tablename = "videotags"
+            idname    = "videoid"
+        elif target == "album":
+            tablename = "albumtags"
+            idname    = "albumid"
+        else:
+            raise ValueError("target must be \"song\", \"video\" or \"album\"!")
+
+        # Check and normalize arguments
+        mappings = []
+        for targetid, tagid, approval, confidence in tags:
+            if targetid == None or tagid == None:
+                raise TypeError("Target ID and Tag ID must have a value!")
+
+            if approval == 1 or approval == 2:
+                confidence = 1.0
+            elif approval == 0:
+                if confidence == None:
+                    raise TypeError("If approval is 0 (tagged by AI), the confidence must be given!")
+            else:
+                raise ValueError("approval must be element of {0,1,2}!")
+
+            mappings.append((int(targetid), int(tagid), approval, confidence))
+
+        if not mappings:
+            return None
+
+        targetids = list({mapping[0] for mapping in mappings})
+        tagids    = list({mapping[1] for mapping in mappings})
+
+        with MusicDatabaseLock:
+            # check if tags exist
+            sql    = "SELECT tagid FROM tags WHERE tagid IN (" + ",".join("?"*len(tagids)) + ")"
+            result = self.GetFromDatabase(sql, tagids)
+            known  = {entry[0] for entry in result}
+            for tagid in tagids:
+                if tagid not in known:
+                    raise ValueError("Invalid tag ID %s! There is no tag with this ID."%(str(tagid)))
+
+            # get already tagged targets
+            existing = {}   # (targetid, tagid) -> map entry
+            for start in range(0, len(targetids), 500):
+                chunk  = targetids[start:start+500]
+                sql    = "SELECT * FROM " + tablename + " WHERE " + idname + " IN (" + ",".join("?"*len(chunk)) + ")"
+                result = self.GetFromDatabase(sql, chunk)
+                for entry in result:
+                    key = (entry[self.TAGMAP_TARGETID], entry[self.TAGMAP_TAGID])
+                    if key in existing:
+                        raise AssertionError("More that one tag entry found!")
+                    existing[key] = list(entry)
+
+            # separate updates from new entries
+            updates = {}    # entryid -> data
+            inserts = {}    # (targetid, tagid) -> values
+            for targetid, tagid, approval, confidence in mappings:
+                key = (targetid, tagid)
+                if key in existing:
+                    tag = existing[key]
+                    if tag[self.TAGMAP_APPROVAL] > approval:
+                        continue
+                    tag[self.TAGMAP_APPROVAL] = approval
+
+                    data = {}
+                    data["entryid"]    = tag[self.TAGMAP_ENTRYID]
+                    data["approval"]   = approval
+                    data["confidence"] = confidence
+                    updates[data["entryid"]] = data
+                else:
+                    if key in inserts and inserts[key][3] > approval:
+                        continue
+                    inserts[key] = (targetid, tagid, confidence, approval)
+
+            with self.Transaction():
+                sql = "UPDATE " + tablename + " SET confidence=:confidence, approval=:approval WHERE entryid=:entryid"
+                self.ExecuteMany(sql, list(updates.values()))
+                sql = "INSERT INTO " + tablename + " (" + idname + ", tagid, confidence, approval) VALUES (?, ?, ?, ?)"
+                self.ExecuteMany(sql, list(inserts.values()))
+
+                for targetid in targetids:
+                    self.__InvalidateCached(tablename, targetid)
+
         return None
 
 
@@ -3170,6 +4065,7 @@ class MusicDatabase(Database):
         sql = "DELETE FROM " + tablename + " WHERE " + idname + " = ? AND tagid = ?"
         with MusicDatabaseLock:
             self.Execute(sql, (targetid, tagid))
+            self.__InvalidateCached(tablename, targetid)
         return None
 
 
@@ -3212,6 +4108,47 @@ class MusicDatabase(Database):
 
         if targetid == None:
             raise TypeError("Target ID must have a value!")
+
+        tags = self.GetTargetTagsBulk(target, [targetid], tagclass)
+        return tags[int(targetid)]
+
+
+
+    def GetTargetTagsBulk(self, target, targetids, tagclass=None):
+        """
+        Returns the tags of multiple targets.
+        This method behaves like :meth:`~GetTargetTags` but reads the tags of all targets with one query.
+        It should be preferred when the tags of a list of songs, albums or videos are needed.
+
+        The returned dictionary has an entry for each ID in *targetids*.
+        The value behind the ID is a list of tags like returned by :meth:`~GetTargetTags`.
+        Targets without tags have an empty list.
+
+        Args:
+            target (str):   Target whose tags shall be returned (``"song"``, ``"album"`` or ``"video"``)
+            targetids (list): List of IDs of the targets (song, album or video IDs)
+            tagclass (int): If not ``None`` only tags of a specific class will be returned
+
+        Returns:
+            A dictionary with the target ID as key and a list of tags as value
+
+        Raises:
+            TypeError: If *targetids* is not a list
+            ValueError: If *tagclass* is set to an invalid value (``None`` is valid)
+            ValueError: If *target* not in *{"song", "album", "video"}*
+
+        Example:
+
+            .. code-block:: python
+                
+                songs = database.GetSongsByAlbumId(albumid)
+                tags  = database.GetTargetTagsBulk("song", [song["id"] for song in songs])
+                for song in songs:
+                    print("%s: %i tags"%(song["name"], len(tags[song["id"]])))
+
+        """
+        if type(targetids) != list:
+            raise TypeError("Target IDs must be a list!")
         if tagclass not in [None, self.TAG_CLASS_GENRE, self.TAG_CLASS_SUBGENRE, self.TAG_CLASS_MOOD]:
             raise ValueError("Invalid tag class")
 
@@ -3228,37 +4165,57 @@ class MusicDatabase(Database):
         else:
             raise ValueError("target must be \"song\", \"video\" or \"album\"!")
 
+        targetids = [int(targetid) for targetid in targetids]
+        alltags   = {}
+        missing   = []
+
+        # Use the tags from the entity cache if available
+        for targetid in dict.fromkeys(targetids):   # unique IDs, order preserved
+            tags = self.__GetCached(tablename, targetid)
+            if tags == None:
+                missing.append(targetid)
+            else:
+                alltags[targetid] = tags
+
+        # The mapping-columns are followed by all columns of the tags table.
+        # If the tag does not exist, all tag-columns are NULL
+        sql  = "SELECT map.*, tags.* FROM " + tablename + " AS map"
+        sql += " LEFT JOIN tags ON tags.tagid = map.tagid"
+        sql += " WHERE map." + idname + " IN ({places})"
+        sql += " ORDER BY map.entryid"
+
         with MusicDatabaseLock:
-            # get all tagids assigned to the target
-            sql    = "SELECT * FROM " + tablename + " WHERE " + idname + " = ?"
-            result = self.GetFromDatabase(sql, targetid)
+            # Stay below the maximum number of SQL variables of older SQLite versions
+            for start in range(0, len(missing), 500):
+                chunk  = missing[start:start+500]
+                query  = sql.format(places = ",".join("?"*len(chunk)))
+                result = self.GetFromDatabase(query, chunk)
 
-            # returns a list of tuples with one element: [(id1,), .., (idn,)]
-            if not result:
-                return [] # no tags set
+                for targetid in chunk:
+                    alltags[targetid] = []
 
-            # for each tagid
-            retval = []
-            for entry in result:
-                # Translate mapping 
-                mapping = self.__TagMapEntryToDict(entry, idname)
-
-                # Get mapped tag
-                sql      = "SELECT * FROM tags WHERE tagid = ?"
-                tagentry = self.GetFromDatabase(sql, mapping["tagid"])
-                if len(tagentry) == 0:
-                    logging.warning("\033[1;33mUnknown tag ID " + str(mapping["tagid"]) + " for " + target + " ID " + str(targetid))
-                    continue
+                for entry in result:
+                    mapping  = self.__TagMapEntryToDict(entry[:5], idname)
+                    tagentry = entry[5:]
+
+                    if tagentry[self.TAG_ID] == None:
+                        logging.warning("\033[1;33mUnknown tag ID " + str(mapping["tagid"]) + " for " + target + " ID " + str(mapping[idname]))
+                        continue
 
-                tag = self.__TagEntryToDict(tagentry[0])
+                    # Add tag-information to mapping
+                    mapping.update(self.__TagEntryToDict(tagentry))
+                    alltags[mapping[idname]].append(mapping)
 
-                # Check if it shall be filtered
-                if tagclass and tag["class"] != tagclass:
-                    continue
+                for targetid in chunk:
+                    self.__PutCached(tablename, targetid, alltags[targetid])
 
-                # Add tag-information to mapping
-                mapping.update(tag)
-                retval.append(mapping)
+        # Check if tags shall be filtered
+        retval = {}
+        for targetid in targetids:
+            if tagclass:
+                retval[targetid] = [tag for tag in alltags[targetid] if tag["class"] == tagclass]
+            else:
+                retval[targetid] = alltags[targetid]
 
         return retval
 
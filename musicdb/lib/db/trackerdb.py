@@ -368,5 +368,52 @@ class TrackerDatabase(Database):
         return None
 
 
+
+    def GetMostPlayed(self, target, limit):
+        """
+        This method returns the songs or videos that were played most often, depending on the value of *target*.
+        The result is a list of dictionaries sorted by the number of times the song or video was played, starting with the most played one.
+
+        Each dictionary contains the ID of the song or video and how often it was played.
+
+        Args:
+            target (str): ``"song"`` or ``"video"``
+            limit (int): Maximum number of songs or videos to return
+
+        Returns:
+            List of dictionaries with the keys ``"id"`` and ``"count"``. The list is empty if nothing was played yet.
+
+        Raises:
+            ValueError: If *target* not ``"song"`` or ``"video"``
+            TypeError: If *limit* is not of type ``int``
+
+        Example:
+
+            .. code-block:: python
+
+                songs = trackerdatabase.GetMostPlayed("song", 10)
+                for song in songs:
+                    print("Song ID %d was played %d times"%(song["id"], song["count"]))
+        """
+        if target not in ["song", "video"]:
+            raise ValueError("Unknown target \"%s\"! Only \"song\" and \"video\" allowed.", target)
+
+        if type(limit) != int:
+            raise TypeError("limit must be of type int!")
+
+        with TrackerDatabaseLock:
+            sql    = "SELECT "+target+"id, COUNT(*) AS count FROM played"+target+"s GROUP BY "+target+"id ORDER BY count DESC LIMIT ?"
+            played = self.GetFromDatabase(sql, limit)
+
+        results = []
+        for (xid, count) in played:
+            result = {}
+            result["id"]    = xid
+            result["count"] = count
+            results.append(result)
+
+        return results
+
+
 # vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
 
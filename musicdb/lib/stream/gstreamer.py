@@ -37,6 +37,7 @@ Example for Using Plugins
 """
 
 import logging
+import threading
 import gi
 gi.require_version('Gst', '1.0')
 from gi.repository import GObject, Gst
@@ -87,14 +88,21 @@ class GStreamerInterface(object):
 
     These state machine is independent from the `GStreamer Pipeline State Machine <https://gstreamer.freedesktop.org/documentation/design/states.html>`_!
 
+    Other threads do not need to poll the state.
+    They can block until the state machine reaches a specific state via :meth:`~WaitForState`,
+    or until the next state transition happened via :meth:`~WaitForStateChange`.
+
     Args:
         pipelinename (str): Optional name for the pipeline
 
     """
 
     def __init__(self, pipelinename="pipeline"):
-        self.pipeline = Gst.Pipeline.new(pipelinename)
-        self.state    = "IDLE"
+        self.pipeline     = Gst.Pipeline.new(pipelinename)
+        self.state        = "IDLE"
+        self.statechanges = 0   # Number of state transitions so far
+        self.statechanged = threading.Condition()
+        self.failed       = False
 
 
 
@@ -152,6 +160,54 @@ class GStreamerInterface(object):
         return element
 
 
+
+    def CreateBranches(self, name, source, branches):
+        """
+        This method splits the data flow behind the *source* element into several branches using a ``tee`` element.
+        Each branch starts with its own ``queue`` element, so that each branch gets processed in its own thread
+        and a slow branch does not stall the others immediately.
+        The elements of a branch must already be added to the pipeline via :meth:`~CreateElement`.
+        They get linked in the given order.
+
+        Args:
+            name (str): A unique name for the ``tee`` element. The ``queue`` elements get the name *name* + ``"queue"`` + index of the branch.
+            source: The GStreamer Element whose output shall be split
+            branches (list): A list of branches. Each branch is a list of GStreamer Elements.
+
+        Returns:
+            ``None`` on error, otherwise the instance of the ``tee`` element
+
+        Example:
+
+            Encoding the same audio data with two different bit rates:
+
+            .. code-block:: python
+
+                encoder320 = gstreamer.CreateElement("lamemp3enc", "encoder320")
+                encoder96  = gstreamer.CreateElement("lamemp3enc", "encoder96")
+                # … set up encoders and sinks …
+
+                gstreamer.CreateBranches("tee", converter, [[encoder320, sink320], [encoder96, sink96]])
+        """
+        tee = self.CreateElement("tee", name)
+        if not tee:
+            return None
+        source.link(tee)
+
+        for index, elements in enumerate(branches):
+            queue = self.CreateElement("queue", "%squeue%i"%(name, index))
+            if not queue:
+                return None
+            tee.link(queue)
+
+            previous = queue
+            for element in elements:
+                previous.link(element)
+                previous = element
+
+        return tee
+
+
     
     def GetState(self):
         """
@@ -163,14 +219,82 @@ class GStreamerInterface(object):
 
 
 
+    def __SetState(self, state):
+        with self.statechanged:
+            self.state         = state
+            self.statechanges += 1
+            self.statechanged.notify_all()
+
+
+
+    def GetStateChanges(self):
+        """
+        Returns:
+            The number of state transitions since the object was created. This value can be used for :meth:`~WaitForStateChange`.
+        """
+        return self.statechanges
+
+
+
+    def WaitForState(self, states, timeout=None):
+        """
+        This method blocks until the state machine is in one of the given states.
+
+        Args:
+            states (list): A list of state names
+            timeout (float): Optional maximum time to wait in seconds
+
+        Returns:
+            The current state of the GStreamer Pipeline execution as string
+        """
+        with self.statechanged:
+            self.statechanged.wait_for(lambda: self.state in states, timeout)
+            return self.state
+
+
+
+    def WaitForStateChange(self, statechanges, timeout=None):
+        """
+        This method blocks until the number of state transitions exceeds *statechanges*.
+        So when the value of :meth:`~GetStateChanges` was read before starting the pipeline,
+        this method waits until the pipeline execution left its IDLE state, even if it already reached the IDLE state again.
+
+        Args:
+            statechanges (int): Number of state transitions as returned by :meth:`~GetStateChanges`
+            timeout (float): Optional maximum time to wait in seconds
+
+        Returns:
+            The current state of the GStreamer Pipeline execution as string
+        """
+        with self.statechanged:
+            self.statechanged.wait_for(lambda: self.statechanges > statechanges, timeout)
+            return self.state
+
+
+
+    def HasFailed(self):
+        """
+        Returns:
+            ``True`` when the last execution of the pipeline got stopped by a GStreamer error, otherwise ``False``
+        """
+        return self.failed
+
+
+
     def Cancel(self):
         """
         This method cancels the current running execution of the GStreamer Pipeline.
         It sets the state to CANCEL only when the current state is RUNNING.
         Otherwise nothing will be changed.
+
+        The pipeline execution gets woken up immediately by posting an application message to the GStreamer bus.
         """
-        if self.state == "RUNNING":
-            self.state = "CANCEL"
+        with self.statechanged:
+            if self.state != "RUNNING":
+                return
+            self.__SetState("CANCEL")
+
+        self.pipeline.get_bus().post(Gst.Message.new_application(self.pipeline, Gst.Structure.new_empty("cancel")))
 
 
 
@@ -206,21 +330,24 @@ class GStreamerInterface(object):
         """
         if self.state != "IDLE":
             logging.error("GStreamer Interface was not in IDLE state but in %s state. Entering ERROR state!", self.state)
-            self.state = "ERROR"
+            self.__SetState("ERROR")
             return
 
+        self.failed = False
+
         # start playing
         ret = self.pipeline.set_state(Gst.State.PLAYING)
         if ret == Gst.StateChangeReturn.FAILURE:
             logging.error("Unable to set the GStreamer Pipeline to the PLAYING state")
-            self.state = "ERROR"
+            self.failed = True
+            self.__SetState("ERROR")
             return
 
         bus = self.pipeline.get_bus()
 
-        self.state = "RUNNING"
+        self.__SetState("RUNNING")
         while self.state == "RUNNING":
-            message = bus.timed_pop_filtered(0.1 * Gst.SECOND, Gst.MessageType.ERROR | Gst.MessageType.WARNING | Gst.MessageType.EOS)
+            message = bus.timed_pop_filtered(1 * Gst.SECOND, Gst.MessageType.ERROR | Gst.MessageType.WARNING | Gst.MessageType.EOS | Gst.MessageType.APPLICATION)
             if message:
                 messagetype = message.type
                 if messagetype == Gst.MessageType.ERROR:
@@ -228,6 +355,7 @@ class GStreamerInterface(object):
                     logging.error("GStreamer error for element %s: %s", message.src.get_name(), error.message)
                     if dbg:
                         logging.debug("Detailed information for previous GStreamer error: %s", dbg)
+                    self.failed = True
                     self.Cancel()
                 elif messagetype == Gst.MessageType.WARNING:
                     warn, dbg = message.parse_warning()
@@ -236,12 +364,14 @@ class GStreamerInterface(object):
                         logging.debug("Detailed information for previous GStreamer warning: %s", dbg)
                 elif messagetype == Gst.MessageType.EOS:
                     self.Cancel()
+                elif messagetype == Gst.MessageType.APPLICATION:
+                    pass    # Posted by Cancel to wake up this loop
                 else:
                     # this should never happen
                     logging.warning("Unexpected message received from GStreamer bus!")
 
         self.pipeline.set_state(Gst.State.NULL)
-        self.state = "IDLE"
+        self.__SetState("IDLE")
 
 
 
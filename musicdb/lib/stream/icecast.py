@@ -84,14 +84,76 @@ The ports will be configured in the ``icecast`` section of the configuration fil
         It must be the same like the one set in MusicDB's configuration: ``[Icecast]->mountname``
         Further more it must be equal to the name defined in the detailed mount specification: ``icecast/mount/mount-name``.
 
+
+Batched Sending
+---------------
+
+Sending each mp3 frame on its own would wake up the streaming thread about 38 times per second,
+each time with a call into libshout.
+Therefore :meth:`~IcecastInterface.StreamFile` collects frames into chunks of about ``[Icecast]->chunktime`` milliseconds of audio (250ms by default).
+Before a chunk gets sent, libshouts ``shout_delay`` tells how long to wait to keep the stream in real time.
+The thread sleeps exactly that time and then sends the whole chunk at once.
+Mute and other commands handled by the consumer of :meth:`~IcecastInterface.StreamFile` get applied with the next chunk.
+
+Some metrics about the sent data are collected and can be read via :meth:`~IcecastInterface.GetStatistics`.
+
+
+Further Mountpoints
+-------------------
+
+Beside the main Mountpoint, further Mountpoints with a lower bit rate can be configured via ``[Icecast]->extramounts``.
+Each of them gets its own *Source Client* connection to Icecast.
+The songs get decoded only once and encoded for all Mountpoints at the same time (see :doc:`/lib/mp3stream`).
+The chunks of the further Mountpoints get sent right after the chunk of the main Mountpoint,
+so all Mountpoints play the same part of the same song.
+
+Errors on these further connections do not interrupt the main stream.
+The first error gets logged as warning.
+Then the Mountpoint gets skipped and reconnected after a delay.
+This delay starts with ``ExtraMountMinRetryDelay`` seconds and gets doubled after each failed attempt, up to ``ExtraMountMaxRetryDelay`` seconds.
+When the stream is muted, each Mountpoint gets silent frames in its own bit rate (see :func:`~CreateSilentFrame`).
+
+Each further Mountpoint must also be configured in Icecast, like the main one.
 """
 
 import os
+import time
 import logging
 from musicdb.lib.stream.libshout2 import LibShout2
 from musicdb.lib.stream.libshout2 import Format     as ShoutFormat
 from musicdb.lib.stream.libshout2 import Protocol   as ShoutProtocol
 from musicdb.lib.stream.mp3stream import MP3Stream
+from musicdb.lib.stream.mp3stream import BitrateTable
+
+# Delay in seconds before reconnecting a further mountpoint whose connection failed
+ExtraMountMinRetryDelay = 5
+ExtraMountMaxRetryDelay = 5 * 60
+
+
+def CreateSilentFrame(bitrate):
+    """
+    Creates one MPEG-1 Layer III frame of pure silence with 44.1kHz stereo audio.
+    The side information and the main data of the frame are all zero, so the frame decodes to silence.
+    The frame has the same play time of about 26.122ms as the frames of the songs.
+
+    When *bitrate* is not a valid bit rate of MPEG-1 Layer III, the next lower valid bit rate gets used,
+    so that the silence never exceeds the bit rate of the Mountpoint.
+    The lowest possible bit rate is 32kb/s.
+
+    Args:
+        bitrate (int): Bit rate in kb/s
+
+    Returns:
+        The frame as bytes object
+    """
+    bitrates     = BitrateTable[1][2]
+    bitrateindex = max([index for index, rate in enumerate(bitrates[:-1]) if 0 < rate <= bitrate] or [1])
+
+    header    = 0xFFFB0000          # Sync word, MPEG-1, Layer III, no CRC, 44.1kHz, no padding, stereo
+    header   |= bitrateindex << 12
+    framesize = (144 * bitrates[bitrateindex] * 1000) // 44100
+    return header.to_bytes(4, "big") + b"\x00" * (framesize - 4)
+
 
 
 class IcecastInterface(object):
@@ -138,6 +200,9 @@ class IcecastInterface(object):
         user (str): Name of the source user
         password (str): The password of the source user
         mountname (str): Name of the mountpoint to use.
+        chunktime (int): Amount of audio in milliseconds that gets sent at once by :meth:`~StreamFile`
+        extramounts (list): Optional list of further mountpoint names. The n-th mountpoint gets the n-th extra bit rate of the streamed :class:`~musicdb.lib.stream.mp3stream.MP3Stream`.
+        extrabitrates (list): Optional list of the bit rates in kb/s of the further mountpoints, in the same order as *extramounts*. Needed to stream silence in the right bit rate. Default is 320kb/s.
 
     Example:
 
@@ -157,9 +222,44 @@ class IcecastInterface(object):
             icecast.Disconnect()
     """
 
-    def __init__(self, port, user, password, mountname):
+    def __init__(self, port, user, password, mountname, chunktime=250, extramounts=None, extrabitrates=None):
+
+        self.icecast = self.__CreateConnection(port, user, password, mountname)
+        self.extramounts = []
+        if extramounts:
+            if not extrabitrates:
+                extrabitrates = [320] * len(extramounts)
+            if len(extrabitrates) != len(extramounts):
+                raise ValueError("Number of extra bit rates does not match the number of extra mountpoints")
+
+            silentframes = {}   # One silent frame for each bit rate
+            for extramount, bitrate in zip(extramounts, extrabitrates):
+                if bitrate not in silentframes:
+                    silentframes[bitrate] = CreateSilentFrame(bitrate)
+
+                state = {}
+                state["name"]        = extramount
+                state["silentframe"] = silentframes[bitrate]
+                state["connection"]  = self.__CreateConnection(port, user, password, extramount)
+                state["connected"]   = False
+                state["failing"]     = False    # True after a failure until the next successful connect
+                state["retrytime"]   = 0.0      # time.monotonic() time when reconnecting shall be tried
+                state["retrydelay"]  = ExtraMountMinRetryDelay
+                self.extramounts.append(state)
 
-        self.icecast = LibShout2(
+        self.connectionstate = False
+        self.mutestate       = False
+        self.chunktime       = chunktime
+        self.statistics      = {}
+        self.lastsendtime    = None     # Time when the last chunk was sent
+        self.lastplaytime    = None     # Play time of the last chunk in seconds
+        self.ResetStatistics()
+        self.silentframe     = b"\xff\xfb\xe0\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00Info\x00\x00\x00\x0f\x00\x00\x00(\x00\x00\xa7X\x00\x0c\x0c\x12\x12\x18\x18\x18\x1f\x1f%%%++11188>>>DDJJJQQWWW]]cccjjpppvv|||\x83\x83\x89\x89\x89\x8f\x8f\x95\x95\x95\x9c\x9c\xa2\xa2\xa2\xa8\xa8\xae\xae\xae\xb5\xb5\xbb\xbb\xbb\xc1\xc1\xc7\xc7\xc7\xce\xce\xd4\xd4\xd4\xda\xda\xe0\xe0\xe0\xe7\xe7\xed\xed\xed\xf3\xf3\xf9\xf9\xf9\xff\xff\x00\x00\x00\x00Lavc57.10\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00$\x05|\x00\x00\x00\x00\x00\x00\xa7X\xa4\xd9\xdf&\x00\x00" + b"\x00"*850
+
+
+
+    def __CreateConnection(self, port, user, password, mountname):
+        return LibShout2(
                 host     = "localhost",
                 port     = port,
                 user     = user,
@@ -177,9 +277,43 @@ class IcecastInterface(object):
                 audio_info  = None
                 )
 
-        self.connectionstate = False
-        self.mutestate       = False
-        self.silentframe     = b"\xff\xfb\xe0\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00Info\x00\x00\x00\x0f\x00\x00\x00(\x00\x00\xa7X\x00\x0c\x0c\x12\x12\x18\x18\x18\x1f\x1f%%%++11188>>>DDJJJQQWWW]]cccjjpppvv|||\x83\x83\x89\x89\x89\x8f\x8f\x95\x95\x95\x9c\x9c\xa2\xa2\xa2\xa8\xa8\xae\xae\xae\xb5\xb5\xbb\xbb\xbb\xc1\xc1\xc7\xc7\xc7\xce\xce\xd4\xd4\xd4\xda\xda\xe0\xe0\xe0\xe7\xe7\xed\xed\xed\xf3\xf3\xf9\xf9\xf9\xff\xff\x00\x00\x00\x00Lavc57.10\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00$\x05|\x00\x00\x00\x00\x00\x00\xa7X\xa4\xd9\xdf&\x00\x00" + b"\x00"*850
+
+
+    def __OpenExtraMount(self, extramount):
+        try:
+            extramount["connection"].open()
+        except Exception as e:
+            self.__ExtraMountFailed(extramount, "Connecting to", e)
+            return False
+
+        if extramount["failing"]:
+            logging.info("Reconnected to further Icecast mountpoint %s", extramount["name"])
+        extramount["connected"]  = True
+        extramount["failing"]    = False
+        extramount["retrydelay"] = ExtraMountMinRetryDelay
+        return True
+
+
+
+    def __ExtraMountFailed(self, extramount, action, error):
+        # Only the first failure in a row gets logged as warning, the following retries as debug message
+        if extramount["failing"]:
+            logging.debug("%s further Icecast mountpoint %s failed again with error: %s", action, extramount["name"], str(error))
+        else:
+            logging.warning("%s further Icecast mountpoint %s failed with error: %s \033[1;30m(Trying to reconnect in %i seconds)",
+                    action, extramount["name"], str(error), extramount["retrydelay"])
+
+        if extramount["connected"]:
+            try:
+                extramount["connection"].close()
+            except Exception:
+                pass    # The connection is already broken
+
+        extramount["connected"]  = False
+        extramount["failing"]    = True
+        extramount["retrytime"]  = time.monotonic() + extramount["retrydelay"]
+        extramount["retrydelay"] = min(extramount["retrydelay"] * 2, ExtraMountMaxRetryDelay)
+        return
 
 
 
@@ -195,6 +329,9 @@ class IcecastInterface(object):
     def Connect(self):
         """
         Tries to connect to Icecast.
+        When further mountpoints are configured, they get connected as well.
+        A failing connection of a further mountpoint gets logged but does not let this method fail.
+        It gets reconnected later by :meth:`~StreamChunk`.
 
         If already connected, only ``True`` gets returned with out opening again.
 
@@ -213,7 +350,13 @@ class IcecastInterface(object):
             self.connectionstate = False
             return False
 
+        for extramount in self.extramounts:
+            extramount["failing"]    = False
+            extramount["retrydelay"] = ExtraMountMinRetryDelay
+            self.__OpenExtraMount(extramount)
+
         self.connectionstate = True
+        self.ResetStatistics()
         return True
 
 
@@ -241,6 +384,15 @@ class IcecastInterface(object):
             logging.error("Disconnecting from Icecast failed with the following exception: %s", str(e))
             return False
 
+        for extramount in self.extramounts:
+            if not extramount["connected"]:
+                continue
+            extramount["connected"] = False
+            try:
+                extramount["connection"].close()
+            except Exception as e:
+                logging.debug("Disconnecting from further Icecast mountpoint failed with the following exception: %s", str(e))
+
         return True
 
 
@@ -270,27 +422,41 @@ class IcecastInterface(object):
         except Exception as e:
             logging.warning("Sending title update to Icecast failed with error %s! \033[1;30m(Error will be ignored)", str(e))
             return False
+
+        for extramount in self.extramounts:
+            if not extramount["connected"]:
+                continue
+            try:
+                extramount["connection"].set_metadata_song(title)
+            except Exception as e:
+                logging.debug("Sending title update to further Icecast mountpoint failed with error %s!", str(e))
         return True
 
 
 
-    def StreamChunk(self, chunk):
+    def StreamChunk(self, chunk, playtime=None, extrachunks=None):
         """
         This method send a chunk of a file to the Icecast server.
-        The method synchronizes with Icecast before sending the data.
+        Before sending the data, the method waits as long as libshout's ``shout_delay`` demands to keep the stream in real time.
         This is a blocking process!
 
         When sending a chunk of data to Icecast fails,
         the method disconnects from the Server.
+
+        The optional *extrachunks* get sent to the further mountpoints right after the chunk got sent to the main mountpoint.
+        Failing to send them does not let this method fail.
+        Further mountpoints whose connection failed get skipped until it is time to reconnect them (see `Further Mountpoints`_).
         
         Args:
-            chunk (bytes): A chunk of a file to stream to Icecast
+            chunk (bytes/memoryview): A chunk of a file to stream to Icecast
+            playtime (float): Optional play time of the audio in the chunk in milliseconds. It is used to calculate the jitter statistics.
+            extrachunks (list): Optional list of chunks (bytes) for the further mountpoints, in the same order as the mountpoints
 
         Returns:
             ``True`` on success, ``False`` otherwise
 
         Raises:
-            TypeError: When ``chunk`` is not of type bytes
+            TypeError: When ``chunk`` is not of type bytes or memoryview
 
         Example:
 
@@ -308,30 +474,113 @@ class IcecastInterface(object):
                             print("ERROR")
                             break
         """
-        if type(chunk) != bytes:
-            raise TypeError("Chunks must be of type bytes!")
+        if type(chunk) == memoryview:
+            chunk = chunk.tobytes()     # libshout expects a char pointer
+        elif type(chunk) != bytes:
+            raise TypeError("Chunks must be of type bytes or memoryview!")
 
         if self.connectionstate == False:
             logging.warning("Not connected to Icecast! \033[1;30m(No data sent)")
             return False
 
         try:
-            self.icecast.sync()         # libshout doc recommends to call sync before send.
+            delay = self.icecast.delay()
+            if delay > 0:
+                time.sleep(delay / 1000)
+            sendtime = time.monotonic()
             self.icecast.send(chunk)
         except Exception as e:
             logging.error("Sending chunk to Icecast failed with error %s! - Disconnecting from Icecast", str(e))
             self.Disconnect()
             return False
+
+        if extrachunks:
+            for extramount, extrachunk in zip(self.extramounts, extrachunks):
+                if not extrachunk:
+                    continue
+                if not extramount["connected"]:
+                    if time.monotonic() < extramount["retrytime"] or not self.__OpenExtraMount(extramount):
+                        continue
+                try:
+                    extramount["connection"].send(extrachunk)
+                except Exception as e:
+                    self.__ExtraMountFailed(extramount, "Sending chunk to", e)
+
+        self.__UpdateStatistics(len(chunk), sendtime, playtime)
         return True
 
 
 
+    def __UpdateStatistics(self, size, sendtime, playtime):
+        self.statistics["bytes"]  += size
+        self.statistics["chunks"] += 1
+
+        # The jitter is the deviation of the time between two chunks from the play time of the previous chunk
+        if self.lastsendtime != None and self.lastplaytime != None:
+            jitter = abs((sendtime - self.lastsendtime) - self.lastplaytime) * 1000
+            self.statistics["jittersum"] += jitter
+            self.statistics["jittercount"] += 1
+            self.statistics["maxjitter"] = max(self.statistics["maxjitter"], jitter)
+
+        self.lastsendtime = sendtime
+        self.lastplaytime = playtime / 1000 if playtime != None else None
+
+
+
+    def ResetStatistics(self):
+        """
+        Resets the statistics returned by :meth:`~GetStatistics`.
+        This happens automatically when connecting to Icecast.
+
+        Returns:
+            *Nothing*
+        """
+        self.statistics = {
+                "bytes":        0,
+                "chunks":       0,
+                "jittersum":    0.0,
+                "jittercount":  0,
+                "maxjitter":    0.0,
+            }
+        self.lastsendtime = None
+        self.lastplaytime = None
+
+
+
+    def GetStatistics(self):
+        """
+        Returns some metrics about the data sent to Icecast since the connection was established.
+        The returned dictionary has the following keys:
+
+            * ``"bytes"`` (int): Number of sent bytes
+            * ``"chunks"`` (int): Number of sent chunks
+            * ``"jitter"`` (float): Average jitter in milliseconds
+            * ``"maxjitter"`` (float): Maximum jitter in milliseconds
+
+        The jitter is the deviation of the time between sending two chunks from the play time of the first of these chunks.
+
+        Returns:
+            A dictionary with the metrics
+        """
+        statistics = {}
+        statistics["bytes"]     = self.statistics["bytes"]
+        statistics["chunks"]    = self.statistics["chunks"]
+        statistics["maxjitter"] = self.statistics["maxjitter"]
+        if self.statistics["jittercount"] > 0:
+            statistics["jitter"] = self.statistics["jittersum"] / self.statistics["jittercount"]
+        else:
+            statistics["jitter"] = 0.0
+        return statistics
+
+
+
     def StreamFile(self, path):
         """
         This is a generator that sends a mp3 file to the Icecast server.
-        The mp3 file gets split into its frames, and sent frame wise.
+        The mp3 file gets split into its frames.
+        The frames get collected into chunks of about ``chunktime`` milliseconds of audio (see constructor) that get sent at once.
 
-        After sending one chunk, the generator returns a dictionary with exact the keys and values
+        After sending one chunk, the generator returns a dictionary for each frame of the chunk with exact the keys and values
         that gets returned by :meth:`musicdb.lib.stream.mp3stream.MP3Stream.Frames` and  :meth:`musicdb.lib.stream.mp3stream.MP3Stream.AnalyzeHeader`
 
         This frame dictionary gets extended by one further key: ``muted``.
@@ -340,6 +589,7 @@ class IcecastInterface(object):
         When ``False`` then the information are related to the actual sent frame.
 
         Streaming of the file using this method allows to pause the audio stream by calling the :meth:`~Mute` method.
+        The mute-state gets checked before each chunk.
         Then instead of the frames from the file, a hard coded frame of pure silence gets streamed as long as the mute-state persists.
         Instead of one silent frame, 10 frames will be streamed at once.
         This is about 261ms of silence.
@@ -352,17 +602,17 @@ class IcecastInterface(object):
                 size="5,8"
                 start           [label="Start"];
                 loadmp3         [shape=box,     label="Load mp3 file"]
-                getframe        [shape=box,     label="Get next frame"]
+                getframe        [shape=box,     label="Collect next frames\nfor one chunk"]
                 ismuted         [shape=diamond, label="state == muted ?"]
                 streamsilence   [shape=box,     label="Stream silence"]
-                yieldnextframe  [shape=box,     label="Return frame"]
-                streamframe     [shape=box,     label="Stream frame"]
-                yieldframe      [shape=box,     label="Return frame"]
+                yieldnextframe  [shape=box,     label="Return first frame"]
+                streamframe     [shape=box,     label="Stream chunk"]
+                yieldframe      [shape=box,     label="Return frames"]
                 end             [label="Stop generator"];
 
                 start           -> loadmp3
                 loadmp3         -> getframe
-                getframe        -> ismuted          [label="Frame available"]
+                getframe        -> ismuted          [label="Frames available"]
                 ismuted         -> streamsilence    [label="Yes"]
                 ismuted         -> streamframe      [label="No"]
                 streamsilence   -> yieldnextframe
@@ -384,8 +634,13 @@ class IcecastInterface(object):
                 ffmpeg -filter_complex aevalsrc=0 -acodec libmp3lame -ab 320k -t 1 monosilence.mp3
                 ffmpeg -i monosilence.mp3 -ab 320k -ac 2 stereosilence.mp3
 
+        The further mountpoints get silent frames in their own bit rate that are created by :func:`~CreateSilentFrame`.
+
+        Instead of a path, an already prepared :class:`~musicdb.lib.stream.mp3stream.MP3Stream` can be given,
+        for example a :class:`~musicdb.lib.stream.mp3stream.BufferedMP3Stream` that got started in advance.
+
         Args:
-            path (str): Absolute path to the mp3 file to stream. The encoding must be the same for all files!
+            path (str/MP3Stream): Absolute path to the mp3 file to stream, or an MP3Stream object. The encoding must be the same for all files!
 
         Returns:
             Returns a generator that returns the currently streamed frame.
@@ -407,30 +662,38 @@ class IcecastInterface(object):
 
         """
 
+        if isinstance(path, MP3Stream):
+            mp3  = path
+            path = mp3.path
+        else:
+            mp3  = None
+
         try:
-            mp3 = MP3Stream(path)
+            if mp3 == None:
+                mp3 = MP3Stream(path)
         except Exception as e:
             logging.error("Loading \"%s\" failed with error: %s", str(path), str(e))
             return
 
         try:
+            frames   = []
+            playtime = 0.0
             for frame in mp3.Frames():
-                # Muted -> stream silence
-                while self.mutestate == True:
-                    retval = self.StreamChunk(self.silentframe*10) # ~ 261ms silence
-                    if retval == False:
-                        break
+                frames.append(frame)
+                playtime += frame["header"]["frametime"]
+                if playtime < self.chunktime:
+                    continue
 
-                    frame["muted"] = True
-                    yield frame
-
-                # stream mp3 frame
-                retval = self.StreamChunk(frame["frame"])   # Stream whole mp3 frame
+                retval = yield from self.__StreamFrames(frames, playtime)
                 if retval == False:
-                    break
+                    return
+
+                frames   = []
+                playtime = 0.0
 
-                frame["muted"] = False
-                yield frame
+            # Send the rest of the file
+            if frames:
+                yield from self.__StreamFrames(frames, playtime)
 
         except ValueError as e:
             logging.error("Decoding \"%s\" failed with error: %s", str(path), str(e))
@@ -439,6 +702,38 @@ class IcecastInterface(object):
 
 
 
+    def __StreamFrames(self, frames, playtime):
+        # Sends a list of frames as one chunk and returns them one by one.
+        # The return value of this generator is False when sending failed.
+
+        # Muted -> stream silence
+        while self.mutestate == True:
+            silence = self.silentframe*10
+            extrasilence = [extramount["silentframe"]*10 for extramount in self.extramounts]
+            retval  = self.StreamChunk(silence, 10 * 26.122, extrasilence) # ~ 261ms silence
+            if retval == False:
+                return False
+
+            frames[0]["muted"] = True
+            yield frames[0]
+
+        # stream mp3 frames
+        chunk       = b"".join([frame["frame"] for frame in frames])
+        extrachunks = []
+        for index in range(len(self.extramounts)):
+            extrachunks.append(b"".join([frame["extraframes"][index] for frame in frames if index < len(frame.get("extraframes", []))]))
+
+        retval = self.StreamChunk(chunk, playtime, extrachunks)
+        if retval == False:
+            return False
+
+        for frame in frames:
+            frame["muted"] = False
+            yield frame
+        return True
+
+
+
     def Mute(self, state=True):
         """
         This method sets the Icecast Interface into a mute state (when ``state == True``).
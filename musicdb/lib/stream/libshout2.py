@@ -148,6 +148,8 @@ class LibShout2(object):
         lib.shout_open.argtypes = [c_void_p]
         lib.shout_send.argtypes = [c_void_p, c_char_p, c_size_t]
         lib.shout_sync.argtypes = [c_void_p]
+        lib.shout_delay.argtypes = [c_void_p]
+        lib.shout_delay.restype  = c_int
         lib.shout_close.argtypes = [c_void_p]
         lib.shout_free.argtypes = [c_void_p]
 
@@ -205,6 +207,10 @@ class LibShout2(object):
     def sync(self):
         return lib.shout_sync(self.obj)
 
+    def delay(self):
+        # Milliseconds until the next data should be sent
+        return lib.shout_delay(self.obj)
+
     @check_error_code
     def close(self):
         logging.debug("Close connection")
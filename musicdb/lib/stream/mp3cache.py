@@ -0,0 +1,434 @@
+# MusicDB,  a music manager with web-bases UI that focus on music.
+# Copyright (C) 2018 - 2022  Ralf Stemmer <ralf.stemmer@gmx.net>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+This module provides an on-disk cache for transcoded mp3 files.
+Transcoding a song via :doc:`/lib/mp3transcoder` is expensive,
+and songs that get played often would otherwise be transcoded again and again.
+
+Cache Entries
+-------------
+
+The cache is content addressed.
+The key of an entry is the SHA-256 hash of the songs checksum (see :meth:`musicdb.lib.db.musicdb.MusicDatabase.GetSongById`)
+combined with the encoder settings of the :class:`~musicdb.lib.stream.mp3transcoder.MP3Transcoder`.
+So when a song file gets replaced, or when the encoder settings change, the old entries simply do not get used anymore.
+They get removed by the eviction process.
+
+The file of an entry is stored at ``$directory/$key[:2]/$key.mp3``.
+The cache directory is the sub directory ``mp3cache`` inside the MusicDB data directory (see :doc:`/basics/data`).
+
+New entries get written into a temporary file first (see :class:`~MP3CacheEntry`).
+Only after the whole song got transcoded successfully, the temporary file gets renamed to the entries file name.
+So an incomplete transcoding process never leads to an incomplete cache entry.
+
+Temporary Files
+---------------
+
+The temporary files are named ``$key.mp3.$uuid.part``.
+Usually they get renamed or removed by :class:`~MP3CacheEntry`.
+When the server gets killed while transcoding a song, the temporary file remains in the cache directory.
+Each scan of the cache directory (see `Eviction`_) removes temporary files that were not modified for ``RescanInterval`` seconds.
+Transcoding a song into the cache never takes that long.
+:meth:`~MP3Cache.Clear` removes all temporary files.
+
+Eviction
+--------
+
+The size of the cache is limited by ``[mp3cache]->size``.
+When a new entry gets committed, the least recently used entries get removed until the cache fits into this limit.
+The modification time of the files is used to track the last usage.
+Each time an entry gets looked up via :meth:`~MP3Cache.Lookup`, its modification time gets updated.
+
+Scanning the whole cache directory after each song would be expensive for a large cache.
+Therefore the cache keeps a running total of the size of its files.
+The directory only gets scanned when the total exceeds the limit,
+or when the last scan is older than ``RescanInterval`` seconds.
+The latter catches entries that were added or removed by other processes, like ``musicdb mp3cache``.
+
+Writing into the cache is only an optimization.
+When writing an entry fails, for example because the disk is full, only this entry gets dropped (see :meth:`~MP3CacheEntry.Write`).
+
+When the size is set to ``0``, the cache is disabled.
+
+Example:
+
+    .. code-block:: python
+
+        cache = MP3Cache("/var/lib/musicdb/mp3cache", 1024 * 1024**2)
+
+        path  = cache.Lookup(song["checksum"])
+        if path == None:
+            entry = cache.CreateEntry(song["checksum"])
+            # … entry.Write(mp3frame) …
+            entry.Commit()
+"""
+
+import os
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from musicdb.lib.stream.mp3transcoder import GetEncoderSettings
+
+MP3CacheLock = threading.RLock()
+
+# Maximum age of the running size total of the cache and of temporary files in seconds (see Eviction)
+RescanInterval = 60 * 60
+
+
+
+class MP3Cache(object):
+    """
+    This class manages the cache directory.
+    It is thread safe.
+
+    Args:
+        directory (str/Path): Absolute path to the cache directory
+        maxsize (int): Maximum size of all cached files in bytes. ``0`` disables the cache.
+    """
+    def __init__(self, directory, maxsize):
+        self.directory = Path(directory)
+        self.maxsize   = maxsize
+        self.size      = None   # Running total of the size of all files, None when unknown
+        self.scantime  = 0      # Time of the last scan of the cache directory
+
+
+
+    def IsEnabled(self):
+        """
+        Returns:
+            ``True`` when the cache is enabled, otherwise ``False``
+        """
+        return self.maxsize > 0
+
+
+
+    def GetKey(self, checksum, bitrate=None):
+        """
+        Returns the key of a cache entry.
+        It is the SHA-256 hash of the songs checksum and the encoder settings of the :class:`~musicdb.lib.stream.mp3transcoder.MP3Transcoder`.
+
+        Args:
+            checksum (str): Checksum of the song file
+            bitrate (int): Optional bit rate in kb/s. Default is the bit rate of the ``EncoderSettings``.
+
+        Returns:
+            The key as hex string
+        """
+        encoder  = GetEncoderSettings(bitrate)
+        settings = ",".join(["%s=%s"%(key, str(encoder[key])) for key in sorted(encoder)])
+        key      = hashlib.sha256((checksum + ":" + settings).encode("utf-8"))
+        return key.hexdigest()
+
+
+
+    def GetPath(self, checksum, bitrate=None):
+        """
+        Returns the path where the transcoded file of a song is or would be stored.
+
+        Args:
+            checksum (str): Checksum of the song file
+            bitrate (int): Optional bit rate in kb/s
+
+        Returns:
+            Absolute path as ``Path`` object
+        """
+        key = self.GetKey(checksum, bitrate)
+        return self.directory / key[:2] / (key + ".mp3")
+
+
+
+    def Lookup(self, checksum, bitrate=None):
+        """
+        Checks if there is a transcoded file for the song with the given checksum.
+        If there is one, it gets marked as recently used.
+
+        Args:
+            checksum (str): Checksum of the song file
+            bitrate (int): Optional bit rate in kb/s
+
+        Returns:
+            Absolute path to the cached mp3 file, or ``None`` if the song is not cached or the cache is disabled
+        """
+        if not self.IsEnabled() or not checksum:
+            return None
+
+        path = self.GetPath(checksum, bitrate)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning("Accessing cached mp3 file %s failed with error: %s", str(path), str(e))
+            return None
+        return path
+
+
+
+    def CreateEntry(self, checksum, bitrate=None):
+        """
+        Creates a new cache entry for the song with the given checksum.
+        The returned :class:`~MP3CacheEntry` object must either be committed or aborted.
+
+        Args:
+            checksum (str): Checksum of the song file
+            bitrate (int): Optional bit rate in kb/s
+
+        Returns:
+            A new :class:`~MP3CacheEntry` object, or ``None`` if the cache is disabled or the entry cannot be created
+        """
+        if not self.IsEnabled() or not checksum:
+            return None
+
+        try:
+            entry = MP3CacheEntry(self, self.GetPath(checksum, bitrate))
+        except Exception as e:
+            logging.warning("Creating an entry in the mp3 cache at %s failed with error: %s \033[1;30m(The song will not be cached)", str(self.directory), str(e))
+            return None
+        return entry
+
+
+
+    def __GetEntries(self, tempfileage=RescanInterval):
+        entries = []
+        if not self.directory.is_dir():
+            return entries
+
+        for subdirectory in self.directory.iterdir():
+            if not subdirectory.is_dir():
+                continue
+            for path in subdirectory.glob("*.mp3"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            self.__RemoveTemporaryFiles(subdirectory, tempfileage)
+        return entries
+
+
+
+    def __RemoveTemporaryFiles(self, subdirectory, maxage):
+        # Temporary files of entries that never got committed or aborted (see Temporary Files)
+        for path in subdirectory.glob("*.part"):
+            try:
+                if time.time() - path.stat().st_mtime < maxage:
+                    continue
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logging.warning("Removing the temporary file %s from the mp3 cache failed with error: %s", str(path), str(e))
+                continue
+            logging.debug("Removed left over temporary file %s from the mp3 cache", str(path))
+        return
+
+
+
+    def Evict(self, addedsize=0):
+        """
+        Removes the least recently used files until the cache fits into its size limit.
+        When the cache is disabled, nothing happens.
+
+        The cache directory only gets scanned when the running total of the cache size exceeds the limit
+        or when it is outdated (see `Eviction`_).
+
+        Args:
+            addedsize (int): Size of a file that was added to the cache since the last call in bytes
+
+        Returns:
+            Number of removed files
+        """
+        if not self.IsEnabled():
+            return 0
+
+        with MP3CacheLock:
+            if self.size != None:
+                self.size += addedsize
+                if self.size <= self.maxsize and time.time() - self.scantime < RescanInterval:
+                    return 0
+
+            entries = self.__GetEntries()
+            size    = sum([entry[1] for entry in entries])
+            removed = 0
+            self.scantime = time.time()
+
+            entries.sort(key = lambda entry: entry[0])
+            for mtime, filesize, path in entries:
+                if size <= self.maxsize:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                size    -= filesize
+                removed += 1
+
+            self.size = size
+
+        if removed > 0:
+            logging.debug("Removed %i files from the mp3 cache", removed)
+        return removed
+
+
+
+    def Clear(self):
+        """
+        Removes all files from the cache, including all temporary files.
+        Entries that are currently written then fail to commit and get dropped.
+
+        Returns:
+            Number of removed files (without temporary files)
+        """
+        with MP3CacheLock:
+            entries = self.__GetEntries(tempfileage=0)
+            for mtime, filesize, path in entries:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            self.size = None
+        return len(entries)
+
+
+
+    def GetStatistics(self):
+        """
+        Returns some information about the current state of the cache.
+        The returned dictionary has the following keys:
+
+            * ``"files"`` (int): Number of cached files
+            * ``"size"`` (int): Size of all cached files in bytes
+            * ``"maxsize"`` (int): Maximum size of the cache in bytes
+
+        Returns:
+            A dictionary with the statistics
+        """
+        with MP3CacheLock:
+            entries = self.__GetEntries()
+
+        statistics = {}
+        statistics["files"]   = len(entries)
+        statistics["size"]    = sum([entry[1] for entry in entries])
+        statistics["maxsize"] = self.maxsize
+        return statistics
+
+
+
+class MP3CacheEntry(object):
+    """
+    This class represents a cache entry that gets written.
+    The data gets written to a temporary file in the same directory as the final entry.
+    It only becomes visible to :meth:`MP3Cache.Lookup` after calling :meth:`~Commit`.
+
+    Objects of this class shall be created by :meth:`MP3Cache.CreateEntry`.
+
+    Args:
+        cache (MP3Cache): The cache this entry belongs to
+        path (Path): Final path of the cached file
+    """
+    def __init__(self, cache, path):
+        self.cache    = cache
+        self.path     = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.temppath = path.with_name(path.name + "." + uuid.uuid4().hex + ".part")
+        self.file     = open(self.temppath, "wb")
+        self.size     = 0
+
+
+
+    def Write(self, data):
+        """
+        Appends data to the temporary file.
+
+        When writing fails, a warning gets printed and the entry gets aborted.
+        The caller should then drop the entry and go on without caching.
+        Writing to an aborted entry does nothing.
+
+        Args:
+            data (bytes): Data to write
+
+        Returns:
+            ``True`` on success, ``False`` when the entry got aborted
+        """
+        if self.file == None:
+            return False
+
+        try:
+            self.file.write(data)
+        except Exception as e:
+            logging.warning("Writing %s into the mp3 cache failed with error: %s \033[1;30m(The song will not be cached)", str(self.path), str(e))
+            self.Abort()
+            return False
+
+        self.size += len(data)
+        return True
+
+
+
+    def Commit(self):
+        """
+        Completes the entry and makes it available in the cache.
+        Afterwards :meth:`MP3Cache.Evict` gets called to keep the cache in its size limit.
+
+        Returns:
+            ``True`` on success, otherwise ``False``
+        """
+        if self.file == None:
+            return False
+
+        try:
+            self.file.close()
+            self.file = None
+            os.replace(self.temppath, self.path)
+        except Exception as e:
+            logging.warning("Committing %s to the mp3 cache failed with error: %s", str(self.path), str(e))
+            self.Abort()
+            return False
+
+        self.cache.Evict(self.size)
+        return True
+
+
+
+    def Abort(self):
+        """
+        Drops the entry and removes the temporary file.
+
+        Returns:
+            *Nothing*
+        """
+        if self.file != None:
+            try:
+                self.file.close()
+            except Exception:
+                pass    # Closing flushes the buffer, which fails again when the disk is full
+            self.file = None
+
+        try:
+            self.temppath.unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning("Removing the temporary file %s from the mp3 cache failed with error: %s", str(self.temppath), str(e))
+        return
+
+
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
+
@@ -16,10 +16,26 @@
 """
 This module provides a class to read any audio file and provide it as mp3 frames.
 Transcoding is done by the :doc:`/lib/mp3transcoder` module.
+
+The :class:`~BufferedMP3Stream` class transcodes the file in advance into a bounded buffer.
+It is used to prepare the next song while the current one is still streamed.
+
+When a :class:`~musicdb.lib.stream.mp3cache.MP3Cache` and the checksum of the song are given,
+the transcoded mp3 data get read from the cache instead of transcoding the file again.
+Songs that are not cached yet get stored in the cache while they get streamed.
+
+Beside the default bit rate, further bit rates can be requested via the *extrabitrates* argument.
+Then the file gets decoded once and encoded into all bit rates at the same time (see :doc:`/lib/mp3transcoder`).
+The frames of the further bit rates get aligned by their play time to the frames of the default bit rate.
 """
 import sys
+import queue
+import struct
 import logging
-from musicdb.lib.stream.mp3transcoder import MP3Transcoder
+import threading
+import functools
+import contextlib
+from musicdb.lib.stream.mp3transcoder import MP3Transcoder, EncoderSettings
 
 BitrateTable = [ # in kilo
             [ # MPEG-2 & 2.5
@@ -61,6 +77,10 @@ EmphaseTable = [ "none", "50/15 ms", "reserved", "CCIT J.17" ]
 
 SlotsizeTable = [ 4, 1, 1, None ]
 
+# Number of bytes read at once from the transcoder or the cached file.
+# 32KiB are about 0.8s of audio at 320kb/s.
+ReadBlockSize = 32 * 1024
+
 
 class MP3Stream(object):
     """
@@ -73,9 +93,17 @@ class MP3Stream(object):
 
     As soon as the object gets created, it starts the transcoding process.
 
+    If a *cache* and the *checksum* of the song file are given, the :doc:`/lib/mp3cache` gets used.
+
     Args:
         path (str/Path):
             An absolute path to a valid audio file
+        checksum (str):
+            Optional checksum of the audio file as stored in the music database
+        cache (:class:`~musicdb.lib.stream.mp3cache.MP3Cache`):
+            Optional cache for transcoded files
+        extrabitrates (list):
+            Optional list of further bit rates in kb/s the file shall be encoded in
 
     Example:
         
@@ -86,8 +114,11 @@ class MP3Stream(object):
                 print(frame["header"])
     """
 
-    def __init__(self, path):
-        self.path = path
+    def __init__(self, path, checksum=None, cache=None, extrabitrates=None):
+        self.path     = path
+        self.checksum = checksum
+        self.cache    = cache
+        self.extrabitrates = extrabitrates if extrabitrates else []
 
 
 
@@ -98,8 +129,12 @@ class MP3Stream(object):
 
         The returned dictionary contains the following information:
 
-            * ``"frame"`` (bytes): A complete MP3 Frame including the Frame Header and the Frame Data
+            * ``"frame"`` (memoryview): A complete MP3 Frame including the Frame Header and the Frame Data
             * ``"header"`` (dict): The interpretation of the MP3 Frame Header as returned by :meth:`AnalyzeHeader`
+            * ``"extraframes"`` (list of bytes): Only when further bit rates were requested: For each of these bit rates the frames that cover the same play time as ``"frame"``. This can also be an empty bytes object when the previous frames already covered the play time.
+
+        The frames are read-only views into larger blocks of mp3 data (see :meth:`~FrameViews`).
+        The header dictionary is shared between all frames with the same MP3 Frame Header and must not be modified.
 
         The following diagram shows how this method loads and processes the audio file:
 
@@ -147,19 +182,171 @@ class MP3Stream(object):
 
         """
 
-        VersionCheckWarningPrinted = False
+        if self.extrabitrates:
+            yield from self.__MultiBitrateFrames()
+            return
 
-        with MP3Transcoder(self.path) as transcoder:
-            while True:
-                # read the next frame header (4 bytes)
-                mp3header = transcoder.GetChunk(4)
-                if len(mp3header) == 0:
-                    break   # end of stream
+        for frame, header in self.FrameViews():
+            yield {"frame": frame, "header": header}
+
+
+
+    def __MultiBitrateFrames(self):
+        # Like FrameViews, but for the default bit rate and all extra bit rates at once
+        bitrates = [EncoderSettings["bitrate"]] + list(self.extrabitrates)
 
+        # Try to read the mp3 frames of all bit rates from the cache
+        if self.cache != None:
+            cachedpaths = [self.cache.Lookup(self.checksum, bitrate) for bitrate in bitrates]
+            if None not in cachedpaths:
+                logging.debug("Reading %s from mp3 cache", str(self.path))
+                with contextlib.ExitStack() as stack:
+                    mp3files = [stack.enter_context(open(path, "rb")) for path in cachedpaths]
+                    yield from self.__AlignFrames([self.__SplitFrames(mp3file.read) for mp3file in mp3files])
+                return
+
+            cacheentries = [self.cache.CreateEntry(self.checksum, bitrate) for bitrate in bitrates]
+        else:
+            cacheentries = [None] * len(bitrates)
+
+        # Transcode the file into all bit rates and store the frames in the cache on the way
+        with MP3Transcoder(self.path, bitrates) as transcoder:
+            # All branches get read in parallel, so only read what is available
+            readers = [functools.partial(transcoder.GetAvailableChunk, branch=index) for index in range(len(bitrates))]
+            try:
+                yield from self.__AlignFrames([self.__SplitFrames(read) for read in readers], cacheentries)
+            except BaseException:
+                for cacheentry in cacheentries:
+                    if cacheentry != None:
+                        cacheentry.Abort()
+                raise
+
+            for cacheentry in cacheentries:
+                if cacheentry == None:
+                    continue
+                if transcoder.HasFailed():
+                    cacheentry.Abort()
+                else:
+                    cacheentry.Commit()
+
+
+
+    def __AlignFrames(self, splitters, cacheentries=None):
+        # Returns the frames of the first splitter, each with the frames of the other splitters that cover the same play time
+        if cacheentries == None:
+            cacheentries = [None] * len(splitters)
+
+        extrasplitters = splitters[1:]
+        extratimes     = [0.0] * len(extrasplitters)
+        playtime       = 0.0
+
+        for frame, header in splitters[0]:
+            if cacheentries[0] != None and not cacheentries[0].Write(frame):
+                cacheentries[0] = None  # Writing into the cache failed, the song gets streamed anyway
+            playtime += header["frametime"]
+
+            extraframes = []
+            for index, splitter in enumerate(extrasplitters):
+                views = []
+                while extratimes[index] < playtime:
+                    item = next(splitter, None)
+                    if item == None:
+                        break
+                    extraframe, extraheader = item
+                    if cacheentries[index+1] != None and not cacheentries[index+1].Write(extraframe):
+                        cacheentries[index+1] = None
+                    views.append(extraframe)
+                    extratimes[index] += extraheader["frametime"]
+                extraframes.append(b"".join(views))
+
+            yield {"frame": frame, "header": header, "extraframes": extraframes}
+
+        # The extra bit rates may have some frames left. They are only needed for the cache.
+        for index, splitter in enumerate(extrasplitters):
+            for extraframe, extraheader in splitter:
+                if cacheentries[index+1] != None and not cacheentries[index+1].Write(extraframe):
+                    cacheentries[index+1] = None
+
+
+
+    def FrameViews(self):
+        """
+        This is a generator that returns a tuple ``(frame, header)`` for each mp3 frame.
+        It is the low level interface used by :meth:`~Frames` and does the actual work.
+
+        The mp3 data get read in blocks of ``ReadBlockSize`` bytes.
+        The ``frame`` is a ``memoryview`` into such a block, so the frame data do not get copied.
+        The ``header`` is the dictionary returned by :meth:`~AnalyzeHeader`.
+        Each distinct MP3 Frame Header gets only analyzed once per stream.
+        All frames with the same header share the same dictionary.
+
+        Returns:
+            A generator that returns a tuple of a ``memoryview`` of the mp3 frame and the header dictionary
+
+        Raises:
+            ValueError: When the MP3 Sync Bits are not correct
+        """
+        # Try to read the mp3 frames from the cache
+        if self.cache != None:
+            cachedpath = self.cache.Lookup(self.checksum)
+            if cachedpath != None:
+                logging.debug("Reading %s from mp3 cache %s", str(self.path), str(cachedpath))
+                with open(cachedpath, "rb") as mp3file:
+                    yield from self.__SplitFrames(mp3file.read)
+                return
+
+            cacheentry = self.cache.CreateEntry(self.checksum)
+        else:
+            cacheentry = None
+
+        # Transcode the file and store the frames in the cache on the way
+        with MP3Transcoder(self.path) as transcoder:
+            try:
+                for frame, header in self.__SplitFrames(transcoder.GetChunk):
+                    if cacheentry != None and not cacheentry.Write(frame):
+                        cacheentry = None   # Writing into the cache failed, the song gets streamed anyway
+                    yield frame, header
+            except BaseException:
+                # Also handles closing the generator before the stream was complete
+                if cacheentry != None:
+                    cacheentry.Abort()
+                raise
+
+            if cacheentry != None:
+                if transcoder.HasFailed():
+                    cacheentry.Abort()
+                else:
+                    cacheentry.Commit()
+
+
+
+    def __SplitFrames(self, read):
+        # Splits the mp3 data returned by the read(size) function into mp3 frames.
+        # The data get read block wise. The frames are views into these blocks.
+        VersionCheckWarningPrinted = False
+        headercache = {}    # MP3 Frame Header (int) -> AnalyzeHeader result
+        block       = bytes()
+        blockview   = memoryview(block)
+        position    = 0
+        endofstream = False
+
+        while True:
+            # Make sure the next frame header is in the block
+            while len(block) - position < 4 and not endofstream:
+                block, blockview, position, endofstream = self.__ReadBlock(read, block, position)
+
+            available = len(block) - position
+            if available < 4:
+                if available > 0:
+                    logging.debug("Dropping %i trailing bytes of an incomplete MP3 Frame Header", available)
+                break   # end of stream
+
+            mp3header = struct.unpack_from(">I", block, position)[0]
+            infos     = headercache.get(mp3header)
+            if infos == None:
                 # roughly check if the header is valid
-                headerchunk = int.from_bytes(mp3header[:2], byteorder='big', signed=False)  # Get first 2 bytes from header
-                syncbits    = headerchunk &  0xFFE0
-                version     = headerchunk & ~0xFFE0
+                syncbits = (mp3header >> 16) &  0xFFE0
+                version  = (mp3header >> 16) & ~0xFFE0 & 0xFFFF
 
                 if syncbits != 0xFFE0:
                     raise ValueError("Expected Frame Sync Bits wrong! First two bytes of the MP3 Frame Header should be \"0xFFFE\", not \"%s\"!", hex(syncbits))
@@ -168,16 +355,30 @@ class MP3Stream(object):
                     logging.warning("Unexpected MP3 Version Code \"%s\". Should be \"0x1b\". \033[1;30m(This only indicates an invalid MP3 file. Transcoding will be continued.)", hex(version))
                     VersionCheckWarningPrinted = True   # Print this warning only once per file
 
-                # Read MP3 Header
-                infos    = self.AnalyzeHeader(mp3header) # Analyze header
-                datasize = infos["framesize"] - 4        # 4 bytes MP3 Frame Header already read, rest are MP3 Frame Data
+                infos = self.AnalyzeHeader(mp3header)
+                headercache[mp3header] = infos
+
+            # Make sure the whole frame is in the block
+            framesize = infos["framesize"]
+            while len(block) - position < framesize and not endofstream:
+                block, blockview, position, endofstream = self.__ReadBlock(read, block, position)
+
+            frameend = min(position + framesize, len(block))
+            yield blockview[position:frameend], infos
+            position = frameend
+
 
-                # Drop Frame Tag
-                mp3frame = mp3header + transcoder.GetChunk(datasize)
-                frame = {}
-                frame["frame"] = mp3frame
-                frame["header"]= infos
-                yield frame
+
+    def __ReadBlock(self, read, block, position):
+        # Appends the next block of data to the not yet processed rest of the current block.
+        # Returns the new block, a view of it, the new position and if the end of the stream was reached
+        data = read(ReadBlockSize)
+        if len(data) == 0:
+            return block, memoryview(block), position, True
+
+        if position < len(block):
+            data = block[position:] + data
+        return data, memoryview(data), 0, False
 
 
 
@@ -328,5 +529,147 @@ class MP3Stream(object):
 
 
 
+class BufferedMP3Stream(MP3Stream):
+    """
+    This class behaves like :class:`~MP3Stream` but transcodes the audio file in a separate thread in advance.
+    The frames get collected in a buffer of limited size.
+    When the buffer is full, transcoding gets paused until frames got taken out of the buffer via :meth:`~Frames`.
+
+    So when the transcoding gets started via :meth:`~Start` some seconds before the frames are needed,
+    starting the GStreamer pipeline and opening the file does not delay the stream.
+
+    If the frames are not needed anymore, the transcoding must be stopped via :meth:`~Cancel`.
+    This also happens when the :meth:`~Frames` generator gets closed.
+
+    Args:
+        path (str/Path):
+            An absolute path to a valid audio file
+        checksum (str):
+            Optional checksum of the audio file as stored in the music database
+        cache (:class:`~musicdb.lib.stream.mp3cache.MP3Cache`):
+            Optional cache for transcoded files
+        extrabitrates (list):
+            Optional list of further bit rates in kb/s the file shall be encoded in
+        maxframes (int):
+            Maximum number of frames in the buffer. The default of 400 frames are about 10 seconds of audio.
+
+    Example:
+        
+        .. code-block:: python
+
+            mp3stream = BufferedMP3Stream("/tmp/test.m4a")
+            mp3stream.Start()                       # Start transcoding in background
+
+            # …
+
+            for frame in mp3stream.Frames():        # Access buffered mp3 frames
+                print(frame["header"])
+    """
+
+    def __init__(self, path, checksum=None, cache=None, extrabitrates=None, maxframes=400):
+        MP3Stream.__init__(self, path, checksum, cache, extrabitrates)
+        self.buffer   = queue.Queue(maxframes)
+        self.thread   = None
+        self.canceled = threading.Event()
+
+
+
+    def __TranscodingThread(self):
+        try:
+            for frame in MP3Stream.Frames(self):
+                while not self.canceled.is_set():
+                    try:
+                        self.buffer.put(frame, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+
+                if self.canceled.is_set():
+                    return
+        except Exception as e:
+            self.__Put(e)  # Forward error to the reader
+            return
+
+        self.__Put(None)   # End of stream
+
+
+
+    def __Put(self, item):
+        while not self.canceled.is_set():
+            try:
+                self.buffer.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+
+    def Start(self):
+        """
+        Starts transcoding the audio file in a separate thread.
+        If the transcoding was already started, nothing happens.
+
+        Returns:
+            *Nothing*
+        """
+        if self.thread != None:
+            return
+
+        logging.debug("Start look-ahead transcoding of %s", str(self.path))
+        self.thread = threading.Thread(target=self.__TranscodingThread)
+        self.thread.start()
+        return
+
+
+
+    def Cancel(self):
+        """
+        Stops the transcoding and drops all buffered frames.
+        The method blocks until the transcoding thread finished.
+
+        Returns:
+            *Nothing*
+        """
+        self.canceled.set()
+        if self.thread == None:
+            return
+
+        self.thread.join()
+        self.thread = None
+
+        while not self.buffer.empty():
+            self.buffer.get_nowait()
+        return
+
+
+
+    def Frames(self):
+        """
+        This is a generator that returns the buffered mp3 frames.
+        If the transcoding was not started yet, it gets started.
+        The returned frames are the same as returned by :meth:`musicdb.lib.stream.mp3stream.MP3Stream.Frames`.
+
+        When the generator gets closed, the transcoding gets canceled.
+
+        Returns:
+            A generator that returns a dictionary including a mp3 frame
+
+        Raises:
+            ValueError: When the MP3 Sync Bits are not correct
+        """
+        self.Start()
+        try:
+            while True:
+                item = self.buffer.get()
+                if item == None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            self.Cancel()
+
+
+
 # vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
 
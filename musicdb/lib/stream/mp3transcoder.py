@@ -49,6 +49,41 @@ These mp3 encoded data will then be provided by writing into a `UNIX Pipe`_ for
 
 The encoding is a MPEG v1 Layer III encoding with 320kb/s and Joint Stereo.
 
+Multiple Bit Rates
+^^^^^^^^^^^^^^^^^^
+
+When more than one bit rate is requested, the decoded audio data get split by a ``tee`` element
+(see :meth:`musicdb.lib.stream.gstreamer.GStreamerInterface.CreateBranches`).
+Each branch has its own ``lamemp3enc`` and ``fdsink`` element writing into its own UNIX Pipe.
+So the file gets only decoded once, no matter how many bit rates are needed.
+
+    .. graphviz::
+
+        digraph hierarchy {
+            size="5,8"
+
+            filesrc       [shape=box, label="filesrc"]
+            decodebin     [shape=box, label="decodebin"]
+            audioconvert  [shape=box, label="audioconvert"]
+            tee           [shape=box, label="tee"]
+            queue0        [shape=box, label="queue"]
+            queue1        [shape=box, label="queue"]
+            lamemp3enc0   [shape=box, label="lamemp3enc\n320kb/s"]
+            lamemp3enc1   [shape=box, label="lamemp3enc\n96kb/s"]
+            fdsink0       [shape=box, label="fdsink"]
+            fdsink1       [shape=box, label="fdsink"]
+
+            filesrc         -> decodebin
+            decodebin       -> audioconvert
+            audioconvert    -> tee
+            tee             -> queue0
+            tee             -> queue1
+            queue0          -> lamemp3enc0
+            queue1          -> lamemp3enc1
+            lamemp3enc0     -> fdsink0
+            lamemp3enc1     -> fdsink1
+        }
+
 The following example shows the bash representation of the pipeline:
 
     .. code-block:: bash
@@ -70,6 +105,8 @@ A UNIX Pipe is connected to the ``fdsink`` GStreamer Element.
 Then :meth:`MP3Transcoder.GetChunk` reads some chunks from the mp3 data encoded by the ``lamemp3enc`` Element.
 
 The pipe is accessed non-blocking.
+Instead of polling the pipe periodically, :meth:`MP3Transcoder.GetChunk` waits via ``poll`` until the pipe becomes readable.
+A second pipe is used to wake up the reader when the GStreamer Pipeline finished, so that the end of the stream gets detected without delay.
 
 Transcoding
 -----------
@@ -85,16 +122,41 @@ To safely work with the :class:`MP3Transcoder` class, you should use the provide
 """
 
 from threading import Thread
-import time
 import logging
+import select
 import sys
 import os
 from musicdb.lib.stream.gstreamer import GStreamerInterface
 
+# Properties of the lamemp3enc element.
+# They are also part of the key of the transcoded files cached by musicdb.lib.stream.mp3cache.
+EncoderSettings = {
+        "target":   1,      # Bitrate
+        "bitrate":  320,
+        "cbr":      True,
+    }
+
+def GetEncoderSettings(bitrate=None):
+    """
+    Returns the properties of the ``lamemp3enc`` element for a specific bit rate.
+
+    Args:
+        bitrate (int): Bit rate in kb/s. If ``None``, the default bit rate of 320kb/s is used.
+
+    Returns:
+        A dictionary with the encoder properties
+    """
+    settings = dict(EncoderSettings)
+    if bitrate != None:
+        settings["bitrate"] = bitrate
+    return settings
+
 class MP3Transcoder(object):
     """
     Args:
         path (str/Path): The absolute path of the audio file that shall be transcoded
+        bitrates (list): Optional list of bit rates in kb/s. Default is only the 320kb/s of the ``EncoderSettings``.
+            The index of a bit rate in this list is the *branch* argument of :meth:`~GetChunk`.
 
     Example:
         
@@ -107,28 +169,44 @@ class MP3Transcoder(object):
                         break
     """
 
-    def __init__(self, path):
+    def __init__(self, path, bitrates=None):
         self.path            = path
+        self.bitrates        = bitrates if bitrates else [EncoderSettings["bitrate"]]
         self.gstreamer       = GStreamerInterface("transcoder")
         self.gstreamerthread = None
 
         self.source    = self.gstreamer.CreateElement("filesrc",      "source")
         self.decoder   = self.gstreamer.CreateElement("decodebin",    "decoder")
         self.converter = self.gstreamer.CreateElement("audioconvert", "converter")
-        self.encoder   = self.gstreamer.CreateElement("lamemp3enc",   "encoder")
-        self.sink      = self.gstreamer.CreateElement("fdsink",       "sink")
 
-        self.unixpipesource, self.unixpipesink = os.pipe2(os.O_NONBLOCK)
+        self.wakeupsource, self.wakeupsink = os.pipe2(os.O_NONBLOCK)   # Written when the pipeline finished
+
+        # One encoder writing into one UNIX Pipe for each bit rate
+        self.branches = []
+        for index, bitrate in enumerate(self.bitrates):
+            branch = {}
+            branch["encoder"] = self.gstreamer.CreateElement("lamemp3enc", "encoder%i"%(index))
+            branch["sink"]    = self.gstreamer.CreateElement("fdsink",     "sink%i"%(index))
+            branch["pipesource"], branch["pipesink"] = os.pipe2(os.O_NONBLOCK)
+            branch["finished"]= False
+
+            branch["poller"]  = select.poll()
+            branch["poller"].register(branch["pipesource"], select.POLLIN)
+            branch["poller"].register(self.wakeupsource,    select.POLLIN)
+
+            for key, value in GetEncoderSettings(bitrate).items():
+                branch["encoder"].set_property(key, value)
+            branch["sink"].set_property("fd", branch["pipesink"])
+            branch["encoder"].link(branch["sink"])
+            self.branches.append(branch)
 
         self.source.set_property("location", str(self.path))
-        self.encoder.set_property("target", 1)
-        self.encoder.set_property("bitrate", 320)
-        self.encoder.set_property("cbr", True)
-        self.sink.set_property("fd", self.unixpipesink)
         
         self.source.link(self.decoder)
-        self.converter.link(self.encoder)
-        self.encoder.link(self.sink)
+        if len(self.branches) == 1:
+            self.converter.link(self.branches[0]["encoder"])
+        else:
+            self.gstreamer.CreateBranches("tee", self.converter, [[branch["encoder"]] for branch in self.branches])
         self.decoder.connect("pad-added", self.onDecoderPadAdded)
 
 
@@ -143,8 +221,11 @@ class MP3Transcoder(object):
         self.Cancel()
 
         # Close Unix pipes to GStreamer
-        os.close(self.unixpipesource)
-        os.close(self.unixpipesink)
+        for branch in self.branches:
+            os.close(branch["pipesource"])
+            os.close(branch["pipesink"])
+        os.close(self.wakeupsource)
+        os.close(self.wakeupsink)
 
         # Close GStreamer pipeline
         self.gstreamer = None   # Force Garbage Collection
@@ -194,14 +275,9 @@ class MP3Transcoder(object):
         """
         # Cancel when there is still a transcoding process
         self.gstreamer.Cancel()
-        while True:
-            gstate = self.gstreamer.GetState()
-            if gstate == "IDLE":
-                break
-            elif gstate == "ERROR":
-                logging.error("GStreamerInterface is in ERROR state!")
-                break
-            time.sleep(0.1)
+        gstate = self.gstreamer.WaitForState(["IDLE", "ERROR"])
+        if gstate == "ERROR":
+            logging.error("GStreamerInterface is in ERROR state!")
 
         # Wait until Execute thread is finished
         if self.gstreamerthread:
@@ -237,33 +313,48 @@ class MP3Transcoder(object):
         # Cancel when there is still a transcoding process
         self.Cancel()
 
+        # Reset the end-of-transcoding notification
+        try:
+            while os.read(self.wakeupsource, 64):
+                pass
+        except BlockingIOError:
+            pass
+        for branch in self.branches:
+            branch["finished"] = False
+
         # Setup new streaming thread
-        self.gstreamerthread = Thread(target=self.gstreamer.Execute)
+        statechanges = self.gstreamer.GetStateChanges()
+        self.gstreamerthread = Thread(target=self.__Execute)
         self.gstreamerthread.start()
 
-        # Make sure the pipeline gets started
-        while True:
-            gstate = self.gstreamer.GetState()
-            if gstate == "RUNNING":
-                return True
-            elif gstate != "IDLE":
-                logging.error("Unexpected GStreamerInterface state: %s", gstate)
-                return False
-            time.sleep(0.1)
+        # Make sure the pipeline gets started (It may even be completed already for very short files)
+        gstate = self.gstreamer.WaitForStateChange(statechanges)
+        if gstate == "ERROR":
+            logging.error("Unexpected GStreamerInterface state: %s", gstate)
+            return False
+        return True
 
 
 
-    def GetChunk(self, size):
+    def __Execute(self):
+        # Runs the GStreamer Pipeline and wakes up GetChunk when it finished
+        try:
+            self.gstreamer.Execute()
+        finally:
+            os.write(self.wakeupsink, b"\0")
+
+
+
+    def GetChunk(self, size, branch=0):
         r"""
         This method reads a chunk of data that gets provided by the GStreamer ``fdsink`` element from the GStreamer Pipeline.
         This element writes into a UNIX Pipe.
         It tries to read ``size`` bytes of data.
-        
-        When reading from the UNIX Pipe fails with an ``BlockingIOError``, than the state of the current transcoding gets checked.
-        If it is ``RUNNING``, than the method tries to read from the pipe again after 100ms.
-        Otherwise it is assumed that the process of transcoding is complete.
 
-        When 0 bytes were read and the state of the transcoding process is not ``RUNNING``, than it is also assumed that the process is competed.
+        When reading from the UNIX Pipe fails with an ``BlockingIOError``, than the method blocks via ``poll`` until
+        new data are available or until the GStreamer Pipeline finished.
+        So the data get consumed as soon as they were produced.
+        When the pipe is empty and the GStreamer Pipeline finished, it is assumed that the process of transcoding is complete.
 
         In all cases, all collected bytes were returned by this method.
         It may only be less that ``size``.
@@ -278,32 +369,32 @@ class MP3Transcoder(object):
                 start           [label="Start"];
 
                 read            [shape=box,     label="Read data from pipe"]
-                isrunningstate  [shape=diamond, label="Is GStreamer Pipeline\nprocess still running?"]
-                isempty         [shape=diamond, label="No further bytes\nto expect from pipe?"]
-                calcrest        [shape=box,     label="Calculate remaining bytes"]
+                isfinished      [shape=diamond, label="Did the GStreamer Pipeline\nprocess finish?"]
                 appendbytes     [shape=box,     label="Collect already read bytes"]
                 bytesremaining  [shape=diamond, label="Remaining\nbytes?"]
-                sleep           [shape=box,     label="Sleep for 0.1s"]
+                poll            [shape=box,     label="Wait until pipe is readable\nor pipeline finished"]
 
                 end             [label="Return chunk"];
 
                 start           -> read
-                read            -> isrunningstate   [style="dashed", label="Blocking IO Exception"]
-                isrunningstate  -> sleep            [label="yes"]
-                isrunningstate  -> end              [label="no"]
-                sleep           -> read
-                read            -> isempty
-                isempty         -> end              [label="yes"]
-                isempty         -> calcrest         [label="no"]
-                calcrest        -> appendbytes
+                read            -> isfinished       [style="dashed", label="Blocking IO Exception"]
+                isfinished      -> poll             [label="no"]
+                isfinished      -> end              [label="yes"]
+                poll            -> read
+                read            -> appendbytes
                 appendbytes     -> bytesremaining
-                bytesremaining  -> sleep            [label="yes"]
+                bytesremaining  -> read             [label="yes"]
                 bytesremaining  -> end              [label="no"]
 
             }
 
+        When transcoding into multiple bit rates, all branches must be read in parallel.
+        Otherwise the UNIX Pipe of one branch runs full and blocks the whole pipeline.
+        In this case, :meth:`~GetAvailableChunk` should be used.
+
         Args:
             size (int): Number of bytes to read
+            branch (int): Index of the bit rate to read the data from
 
         Returns:
             A chunk of data as type ``bytes``
@@ -330,31 +421,64 @@ class MP3Transcoder(object):
                 sinkfile.close()
 
         """
-        retval = bytes()
+        chunks = []
         while size > 0:
+            chunk = self.GetAvailableChunk(size, branch)
+            if len(chunk) == 0:
+                break
+
+            size -= len(chunk)
+            chunks.append(chunk)
+
+        return b"".join(chunks)
+
+
+
+    def GetAvailableChunk(self, size, branch=0):
+        """
+        This method reads the data that are currently available in the UNIX Pipe, but not more than ``size`` bytes.
+        If the pipe is empty, it waits until new data are available.
+        So in contrast to :meth:`~GetChunk`, less than ``size`` bytes does not mean that the transcoding is complete.
+        Only when ``0`` bytes were returned, the process of transcoding is complete.
+
+        Args:
+            size (int): Maximum number of bytes to read
+            branch (int): Index of the bit rate to read the data from
+
+        Returns:
+            A chunk of data as type ``bytes``
+        """
+        branch = self.branches[branch]
+        while True:
             try:
-                chunk = os.read(self.unixpipesource, size)
+                return os.read(branch["pipesource"], size)
             except BlockingIOError:
-                if self.gstreamer.GetState() == "RUNNING":
-                    # Buffer empty - just wait a bit for GStreamer, then continue
-                    time.sleep(0.1)
-                    continue
+                pass
 
-                self.gstreamerthread.join()
-                self.gstreamerthread = None
-                break
+            if not branch["finished"]:
+                # Pipe empty - wait until GStreamer provides new data or finished transcoding
+                for fd, event in branch["poller"].poll():
+                    if fd == self.wakeupsource:
+                        branch["finished"] = True
+                continue
 
-            if len(chunk) == 0 and self.gstreamer.GetState() != "RUNNING":
+            # Pipe empty and GStreamer finished
+            if self.gstreamerthread:
                 self.gstreamerthread.join()
                 self.gstreamerthread = None
-                break
+            return bytes()
 
-            size -= len(chunk)
-            retval += chunk
-            if size > 0:
-                time.sleep(0.01)
 
-        return retval
+
+    def HasFailed(self):
+        """
+        This method can be used after :meth:`~GetChunk` returned less data than requested
+        to check if the transcoding process was complete or if it was aborted due to a GStreamer error.
+
+        Returns:
+            ``True`` when the transcoding failed, otherwise ``False``
+        """
+        return self.gstreamer.HasFailed()
 
 
 
@@ -0,0 +1,295 @@
+# MusicDB,  a music manager with web-bases UI that focus on music.
+# Copyright (C) 2017 - 2022  Ralf Stemmer <ralf.stemmer@gmx.net>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+This module provides the registry of all methods of the MusicDB WebSocket API (see :doc:`/basics/webapi`).
+
+Each method of :class:`musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface` that can be called by a client
+gets registered via the :meth:`~WebSocketCall` decorator.
+The decorator describes how the method gets called:
+
+    * The name of the function used by the clients (``fncname``)
+    * Which arguments of the packet get passed to which parameter of the method
+    * If the method only reads data or also writes data
+    * If the method may block the event loop for a longer time
+    * If the result of another function shall be sent instead
+    * If the result shall be broadcast to all clients
+
+The description gets validated against the signature of the method when it gets registered.
+After all methods got registered, :meth:`~ValidateCallRegistry` checks the references between the registered functions.
+So errors in the description raise an exception when the module gets loaded, not when a client calls the function.
+
+Dispatching a call is a look-up in the ``CallRegistry`` dictionary.
+
+Example:
+
+    .. code-block:: python
+
+        class MusicDBWebSocketInterface(object):
+
+            @WebSocketCall("GetSong", arguments=["songid"])
+            def GetSong(self, songid):
+                ...
+
+            @WebSocketCall("SetSongLyrics", arguments=["songid", "lyrics", ("lyricsstate", "state")], access="write", response="GetSong", broadcast=True)
+            def SetSongLyrics(self, songid, lyrics, state):
+                ...
+
+Call Statistics
+---------------
+
+For each registered function, the number of calls and a histogram of their execution time is collected.
+They can be read via :meth:`~GetCallStatistics`.
+The histogram has one bin per upper limit listed in ``LatencyBins`` (in milliseconds) and one further bin for all slower calls.
+"""
+
+import inspect
+import threading
+
+CallRegistry    = {}    # fncname -> RegisteredCall
+StatisticsLock  = threading.Lock()
+LatencyBins     = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+
+class RegisteredCall(object):
+    """
+    This class describes one function of the WebSocket API.
+    Objects of this class get created by the :meth:`~WebSocketCall` decorator.
+    See the decorator for the description of the arguments.
+
+    Args:
+        function: The method that implements the function
+        name (str): Name of the function used by the clients
+        arguments (list): Required arguments
+        optional (list): Optional arguments
+        fixed (dict): Parameters with fixed values
+        argsparameter (str): Parameter that gets all arguments
+        access (str): ``"read"`` or ``"write"``
+        blocking (bool): ``True`` if the method may block the event loop
+        response (str): Name of a function whose result gets sent instead
+        broadcast (bool): Broadcast the response
+        deprecated (str): Name of the function that shall be used instead
+
+    Raises:
+        ValueError: When the description does not match the signature of the method
+    """
+    def __init__(self, function, name, arguments, optional, fixed, argsparameter, access, blocking, response, broadcast, deprecated):
+        self.function   = function
+        self.name       = name
+        self.arguments  = self.__NormalizeArguments(arguments)
+        self.optional   = self.__NormalizeArguments(optional)
+        self.fixed      = dict(fixed) if fixed else {}
+        self.argsparameter = argsparameter
+        self.access     = access
+        self.blocking   = blocking
+        self.response   = response
+        self.broadcast  = broadcast
+        self.deprecated = deprecated
+
+        self.calls      = 0
+        self.totaltime  = 0.0
+        self.histogram  = [0] * (len(LatencyBins) + 1)
+
+        self.__Validate()
+
+
+
+    def __NormalizeArguments(self, arguments):
+        # Arguments can be a name or a tuple (packet key, parameter name)
+        normalized = []
+        for argument in arguments:
+            if type(argument) == str:
+                normalized.append((argument, argument))
+            else:
+                normalized.append(tuple(argument))
+        return normalized
+
+
+
+    def __Validate(self):
+        if self.access not in ["read", "write"]:
+            raise ValueError("Access of %s must be \"read\" or \"write\""%(self.name))
+        if self.blocking and self.access != "read":
+            raise ValueError("Only reading functions can be blocking (%s)"%(self.name))
+
+        parameters = list(inspect.signature(self.function).parameters.values())[1:]    # Without self
+        names      = [parameter.name for parameter in parameters]
+
+        passed = [parameter for key, parameter in self.arguments + self.optional]
+        passed+= list(self.fixed.keys())
+        if self.argsparameter:
+            passed.append(self.argsparameter)
+
+        for parameter in passed:
+            if parameter not in names:
+                raise ValueError("%s has no parameter %s"%(self.function.__name__, parameter))
+        if len(passed) != len(set(passed)):
+            raise ValueError("Parameters of %s are passed more than once"%(self.name))
+
+        for parameter in parameters:
+            if parameter.default is inspect.Parameter.empty and parameter.name not in passed:
+                raise ValueError("Required parameter %s of %s is not passed"%(parameter.name, self.function.__name__))
+        return
+
+
+
+    def Call(self, interface, args):
+        """
+        Calls the method with the arguments from the packet.
+
+        Args:
+            interface: The :class:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface` object to call the method of
+            args (dict): The arguments of the packet
+
+        Returns:
+            The return value of the method
+
+        Raises:
+            KeyError: When a required argument is missing
+        """
+        parameters = dict(self.fixed)
+        for key, parameter in self.arguments:
+            parameters[parameter] = args[key]
+        for key, parameter in self.optional:
+            if key in args:
+                parameters[parameter] = args[key]
+        if self.argsparameter:
+            parameters[self.argsparameter] = args
+
+        # Look up the method by name, so that derived classes can override it
+        method = getattr(interface, self.function.__name__)
+        return method(**parameters)
+
+
+
+    def UpdateStatistics(self, duration):
+        """
+        Adds the execution time of one call to the statistics.
+
+        Args:
+            duration (float): Execution time in seconds
+
+        Returns:
+            *Nothing*
+        """
+        milliseconds = duration * 1000
+        index = 0
+        while index < len(LatencyBins) and milliseconds > LatencyBins[index]:
+            index += 1
+
+        with StatisticsLock:
+            self.calls     += 1
+            self.totaltime += duration
+            self.histogram[index] += 1
+        return
+
+
+
+def WebSocketCall(name, arguments=(), optional=(), fixed=None, argsparameter=None, access="read", blocking=False, response=None, broadcast=False, deprecated=None):
+    """
+    This decorator registers a method of :class:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface` as function of the WebSocket API.
+    A method can be registered multiple times with different names.
+
+    The arguments of the packet get passed as keyword arguments.
+    An entry in *arguments* or *optional* is either the name of the argument,
+    when the name of the parameter is the same, or a tuple of the name of the argument and the name of the parameter.
+
+    When a *response* function is given, its result gets sent instead of the result of the method.
+    The arguments for the response function are taken from the same packet.
+    If *broadcast* is ``True``, the response gets broadcast to all clients, independent of the method of the call.
+    Otherwise the response function only gets called for requests.
+    When *broadcast* is ``True`` but there is no *response* function, the result of the method itself gets broadcast.
+
+    Args:
+        name (str): Name of the function used by the clients
+        arguments (list): Arguments that must be in the packet
+        optional (list): Arguments that get only passed if they are in the packet
+        fixed (dict): Parameters that always get the given values
+        argsparameter (str): Name of a parameter that gets all arguments of the packet as dictionary
+        access (str): ``"read"`` if the method only reads data, ``"write"`` if it changes data
+        blocking (bool): ``True`` when the method may block the event loop for a longer time. Only allowed for reading methods.
+        response (str): Name of the function whose result gets sent instead
+        broadcast (bool): Broadcast the result of the *response* function, or of the method if there is no *response* function
+        deprecated (str): When set, calling this function logs a warning that the function with this name shall be used instead
+
+    Returns:
+        The decorator
+
+    Raises:
+        ValueError: When the function name is already registered or the description does not match the method
+    """
+    def Register(function):
+        if name in CallRegistry:
+            raise ValueError("WebSocket function %s registered twice"%(name))
+
+        CallRegistry[name] = RegisteredCall(function, name, arguments, optional, fixed, argsparameter, access, blocking, response, broadcast, deprecated)
+        return function
+    return Register
+
+
+
+def ValidateCallRegistry():
+    """
+    Checks that all functions referenced by other functions are registered
+    and that the packets of the referencing functions contain all arguments the response function requires.
+
+    Returns:
+        *Nothing*
+
+    Raises:
+        ValueError: When a reference is invalid
+    """
+    for entry in CallRegistry.values():
+        for reference in [entry.response, entry.deprecated]:
+            if reference and reference not in CallRegistry:
+                raise ValueError("%s references unknown function %s"%(entry.name, reference))
+
+        if entry.response:
+            available = [key for key, parameter in entry.arguments]
+            for key, parameter in CallRegistry[entry.response].arguments:
+                if key not in available:
+                    raise ValueError("Argument %s for response %s is not a required argument of %s"%(key, entry.response, entry.name))
+    return
+
+
+
+def GetCallStatistics():
+    """
+    Returns the statistics of all functions that got called at least once.
+    The returned dictionary maps the function name to a dictionary with the following keys:
+
+        * ``"calls"`` (int): Number of calls
+        * ``"average"`` (float): Average execution time in milliseconds
+        * ``"histogram"`` (list): Number of calls per bin of ``LatencyBins``, plus one bin for slower calls
+
+    Returns:
+        A dictionary with the statistics
+    """
+    statistics = {}
+    with StatisticsLock:
+        for name, entry in CallRegistry.items():
+            if entry.calls == 0:
+                continue
+            statistics[name] = {}
+            statistics[name]["calls"]     = entry.calls
+            statistics[name]["average"]   = entry.totaltime * 1000 / entry.calls
+            statistics[name]["histogram"] = list(entry.histogram)
+    return statistics
+
+
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
+
@@ -0,0 +1,179 @@
+# MusicDB,  a music manager with web-bases UI that focus on music.
+# Copyright (C) 2017 - 2022  Ralf Stemmer <ralf.stemmer@gmx.net>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+This module provides the encoding and decoding of the packets of the WebSocket API (see :doc:`/basics/webapi`).
+
+Two codecs are available:
+
+    * :class:`~JSONCodec`: The default codec used for text messages.
+      When the `orjson <https://github.com/ijl/orjson>`_ module is installed, it gets used to encode and decode the packets.
+      Otherwise the ``json`` module of the Python standard library gets used.
+    * :class:`~MessagePackCodec`: A codec for binary messages.
+      It is only available when the `msgpack <https://msgpack.org/>`_ module is installed.
+
+The codec gets negotiated for each connection via the WebSocket subprotocol (``Sec-WebSocket-Protocol`` header).
+A client that wants to use MessagePack offers the subprotocol ``"musicdb.msgpack"``.
+Clients that do not offer a subprotocol, like the MusicDB WebUI, use JSON.
+See :meth:`~SelectCodec`.
+
+Example:
+
+    .. code-block:: python
+
+        codec   = SelectCodec(["musicdb.msgpack", "musicdb.json"])
+        rawdata = codec.Encode(packet)
+        packet  = codec.Decode(rawdata)
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+
+class JSONCodec(object):
+    """
+    This codec encodes packets as UTF-8 encoded JSON strings, sent as text messages.
+    It uses ``orjson`` when installed, otherwise the ``json`` module from the standard library.
+    """
+    subprotocol = "musicdb.json"
+    isbinary    = False
+
+    def __init__(self):
+        self.backend = "orjson" if orjson else "json"
+
+
+
+    def Encode(self, packet):
+        """
+        Encodes a packet.
+        ``orjson`` cannot encode integers larger than 64 bit.
+        For such packets the ``json`` module gets used.
+
+        Args:
+            packet: The packet to encode
+
+        Returns:
+            The encoded packet as ``bytes``
+        """
+        if orjson:
+            try:
+                return orjson.dumps(packet, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:   # orjson.JSONEncodeError is a TypeError
+                pass
+        return json.dumps(packet).encode("utf-8")
+
+
+
+    def Decode(self, rawdata):
+        """
+        Decodes a packet.
+
+        Args:
+            rawdata (bytes): The UTF-8 encoded JSON string
+
+        Returns:
+            The decoded packet
+
+        Raises:
+            ValueError: When *rawdata* is not a valid UTF-8 encoded JSON string
+        """
+        if orjson:
+            return orjson.loads(rawdata)
+        return json.loads(rawdata.decode("utf-8"))
+
+
+
+class MessagePackCodec(object):
+    """
+    This codec encodes packets in the MessagePack format, sent as binary messages.
+    It requires the ``msgpack`` module.
+    """
+    subprotocol = "musicdb.msgpack"
+    isbinary    = True
+
+    def __init__(self):
+        self.backend = "msgpack"
+
+
+
+    def Encode(self, packet):
+        """
+        Encodes a packet.
+
+        Args:
+            packet: The packet to encode
+
+        Returns:
+            The encoded packet as ``bytes``
+        """
+        return msgpack.packb(packet, use_bin_type=True)
+
+
+
+    def Decode(self, rawdata):
+        """
+        Decodes a packet.
+
+        Args:
+            rawdata (bytes): The MessagePack encoded packet
+
+        Returns:
+            The decoded packet
+
+        Raises:
+            ValueError: When *rawdata* is not a valid MessagePack encoded packet
+        """
+        return msgpack.unpackb(rawdata, raw=False, strict_map_key=False)
+
+
+
+JSON        = JSONCodec()
+MessagePack = MessagePackCodec() if msgpack else None
+
+
+
+def SelectCodec(subprotocols):
+    """
+    Selects the codec for a connection.
+    The first subprotocol offered by the client that belongs to an available codec gets selected.
+    If there is none, the :class:`~JSONCodec` gets selected.
+
+    Args:
+        subprotocols (list): The subprotocols offered by the client, in the order of its preference
+
+    Returns:
+        The codec object
+    """
+    codecs = [codec for codec in [JSON, MessagePack] if codec != None]
+    for subprotocol in subprotocols:
+        for codec in codecs:
+            if codec.subprotocol == subprotocol:
+                return codec
+    return JSON
+
+
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
+
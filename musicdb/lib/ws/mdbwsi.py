@@ -77,6 +77,7 @@ Videos
 Queue
 
 * :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetSongQueue`
+* :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetSongQueueSnapshot`
 * :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetVideoQueue`
 * :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.AddSongToQueue`
 * :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.AddRandomSongToQueue`
@@ -110,6 +111,7 @@ Lyrics
 
 * :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetSongLyrics`
 * :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.SetSongLyrics`
+* :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.FindLyrics`
 
 Uploading
 
@@ -149,8 +151,26 @@ Other
 * :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetMDBState`
 * :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetTables`
 
+Blocking Methods
+^^^^^^^^^^^^^^^^
+
+All calls get handled in the asyncio event loop of the server.
+Some methods take much time, for example because they read large parts of the database or scan the music directory.
+While they get executed, no other client would be served.
+Therefore the methods registered with ``blocking=True`` (see :doc:`/lib/websockets`) get executed in a thread pool with ``[websocket]->workers`` threads.
+Each worker thread has its own connection to the databases (see :doc:`/lib/database`).
+The response gets sent from the event loop after the method returned.
+All other methods get executed directly in the event loop.
+
+A client may rely on the order of responses of calls with the same function signature (``fncsig``).
+So as long as a blocking call is executed, further calls of the same client with the same ``fncsig`` get delayed until the blocking call is done.
+Calls with a different ``fncsig`` get handled immediately and their responses may overtake the response of the blocking call.
+
 """
+import time
 import random
+import functools
+import collections
 from musicdb.lib.db.musicdb     import *
 from musicdb.lib.db.trackerdb   import TrackerDatabase
 from musicdb.lib.db.musicdb     import MusicDatabase
@@ -178,6 +198,7 @@ from musicdb.taskmanagement.importmanager   import ImportManager
 from musicdb.taskmanagement.artworkmanager  import ArtworkManager
 from musicdb.taskmanagement.filesystemmanager  import FilesystemManager
 import logging
+from musicdb.lib.ws.callregistry    import WebSocketCall, CallRegistry, ValidateCallRegistry
 from threading          import Thread
 import traceback
 
@@ -185,10 +206,12 @@ class MusicDBWebSocketInterface(object):
 
     def __init__(self):
         # Import global variables from the server
-        from musicdb.mdbapi.server import database, mise, cfg
+        from musicdb.mdbapi.server import database, mise, cfg, executor
         self.database   = database
         self.mise       = mise
         self.cfg        = cfg
+        self.executor   = executor
+        self.pendingcalls = {}  # fncsig -> calls waiting for a blocking call with the same signature
 
         # The autobahn framework silently hides all exceptions - that sucks
         # So all possible exceptions must be caught here, so that they can be made visible.
@@ -201,7 +224,7 @@ class MusicDBWebSocketInterface(object):
             self.videostream= VideoStreamManager(self.cfg, self.database)
             self.songqueue  = SongQueue(self.cfg, self.database)
             self.videoqueue = VideoQueue(self.cfg, self.database)
-            self.music      = MusicDBMusic(self.cfg, self.database)
+            self.music      = MusicDBMusic(self.cfg, self.database, self.mise)
             self.musicdirectory = MusicDirectory(self.cfg)
 
             self.taskmanager    = TaskManager(self.cfg, self.database)
@@ -242,7 +265,7 @@ class MusicDBWebSocketInterface(object):
         response["fncsig"]      = "on"+event
         response["arguments"]   = data
         response["pass"]        = None
-        success = self.SendPacket(response)
+        success = self.SendCoalescedPacket(response)
         return success
 
     def onVideoStreamEvent(self, event, data):
@@ -254,7 +277,7 @@ class MusicDBWebSocketInterface(object):
         response["fncsig"]      = "on"+event
         response["arguments"]   = data
         response["pass"]        = None
-        success = self.SendPacket(response)
+        success = self.SendCoalescedPacket(response)
         return success
 
     def onSongQueueEvent(self, event, data):
@@ -266,9 +289,23 @@ class MusicDBWebSocketInterface(object):
         response["fncsig"]      = "on"+event
         response["arguments"]   = data
         response["pass"]        = None
-        success = self.SendPacket(response)
+
+        # The changes of the queue must not get lost. Entry IDs are too large for JavaScript.
+        if event == "SongQueueChanged" and data:
+            response["arguments"] = dict(data)
+            response["arguments"]["changes"] = [self.__EncodeQueueChange(change) for change in data["changes"]]
+            return self.SendPacket(response)
+
+        success = self.SendCoalescedPacket(response)
         return success
 
+    def __EncodeQueueChange(self, change):
+        change = dict(change)
+        for key in ["entryid", "afterid"]:
+            if change.get(key) != None:
+                change[key] = str(change[key])
+        return change
+
     def onVideoQueueEvent(self, event, data):
         # This function is called from a different thread. Therefore NO sqlite3-access is allowed.
         # So there will be just a notification so that the clients can request related functions.
@@ -278,7 +315,7 @@ class MusicDBWebSocketInterface(object):
         response["fncsig"]      = "on"+event
         response["arguments"]   = data
         response["pass"]        = None
-        success = self.SendPacket(response)
+        success = self.SendCoalescedPacket(response)
         return success
 
     def onTaskEvent(self, notification, data):
@@ -300,263 +337,70 @@ class MusicDBWebSocketInterface(object):
 
 
     def HandleCall(self, fncname, method, fncsig, args, passthrough):
-        retval = None
-
-        # Request-Methods
-        if fncname == "Bounce":
-            retval = self.Bounce(args)
-        elif fncname == "GetArtists":
-            retval = self.GetArtists()
-        elif fncname == "GetArtistsWithAlbums":
-            retval = self.GetArtistsWithAlbums()
-        elif fncname == "GetFilteredArtistsWithAlbums":
-            retval = self.GetArtistsWithAlbums(applyfilter=True)
-        elif fncname == "GetFilteredArtistsWithVideos":
-            retval = self.GetFilteredArtistsWithVideos()
-        elif fncname == "GetHiddenAlbums":
-            retval = self.GetHiddenAlbums()
-        elif fncname == "GetAlbums":
-            retval = self.GetAlbums(args["artistid"], args["applyfilter"])
-        elif fncname == "GetAlbum":
-            retval = self.GetAlbum(args["albumid"])
-        elif fncname == "GetVideos":
-            retval = self.GetVideos(args["artistid"])
-        elif fncname == "GetVideo":
-            retval = self.GetVideo(args["videoid"])
-        elif fncname == "GetSortedAlbumCDs":
-            retval = self.GetSortedAlbumCDs(args["albumid"])
-        elif fncname == "GetSong":
-            retval = self.GetSong(args["songid"])
-        elif fncname == "GetTags":
-            retval = self.GetTags()
-        elif fncname == "GetTagsStatistics":
-            retval = self.GetTagsStatistics()
-        elif fncname == "GetSongTags":
-            retval = self.GetSongTags(args["songid"])
-        elif fncname == "GetAlbumTags":
-            retval = self.GetAlbumTags(args["albumid"])
-        elif fncname == "GetTables":
-            retval = self.GetTables(args["tables"])
-        elif fncname == "GetMDBState":
-            retval = self.GetMDBState()
-        elif fncname == "GetStreamState":
-            logging.warning("GetStreamState is deprecated! Use GetAudioStreamState instead. \033[1;30m(Calling GetAudioStreamState)")
-            retval = self.GetAudioStreamState()
-        elif fncname == "GetAudioStreamState":
-            retval = self.GetAudioStreamState()
-        elif fncname == "GetVideoStreamState":
-            retval = self.GetVideoStreamState()
-        elif fncname == "GetSongQueue":
-            retval = self.GetSongQueue()
-        elif fncname == "GetVideoQueue":
-            retval = self.GetVideoQueue()
-        elif fncname == "Find":
-            retval = self.Find(args["searchstring"], args["limit"])
-        elif fncname == "GetSongRelationship":
-            retval = self.GetSongRelationship(args["songid"])
-        elif fncname == "GetVideoRelationship":
-            retval = self.GetVideoRelationship(args["videoid"])
-        elif fncname == "GetSongLyrics":
-            retval = self.GetSongLyrics(args["songid"])
-        elif fncname == "LoadWebUIConfiguration":
-            retval = self.LoadWebUIConfiguration()
-        elif fncname == "LoadRandyConfiguration":
-            retval = self.LoadRandyConfiguration()
-        elif fncname == "FindNewContent":
-            retval = self.FindNewContent()
-        elif fncname == "FindAlbumSongFiles":
-            retval = self.FindAlbumSongFiles(args["albumpath"])
-        elif fncname == "RenameMusicFile":
-            retval = self.RenameMusicFile(args["oldpath"], args["newpath"])
-        elif fncname == "RenameAlbumDirectory":
-            retval = self.RenameAlbumDirectory(args["oldpath"], args["newpath"])
-        elif fncname == "RenameArtistDirectory":
-            retval = self.RenameArtistDirectory(args["oldpath"], args["newpath"])
-        elif fncname == "CreateArtistEntry":
-            retval = self.CreateArtistEntry(args["name"])
-        elif fncname == "RemoveArtistEntry":
-            retval = self.RemoveArtistEntry(args["artistid"])
-        elif fncname == "UpdateArtistEntry":
-            retval = self.UpdateArtistEntry(args["artistid"], args["newpath"])
-        elif fncname == "ChangeArtistDirectory":
-            retval = self.ChangeArtistDirectory(args["oldalbumpath"], args["newartistdirectory"])
-        elif fncname == "GetCurrentTasks":
-            retval = self.GetCurrentTasks()
-        elif fncname == "AnnotateUpload":
-            retval = self.AnnotateUpload(args["taskid"], args)
-        elif fncname == "InitiateContentIntegration":
-            retval = self.InitiateContentIntegration(args["taskid"], args["musicpath"])
-        elif fncname == "InitiateMusicImport":
-            retval = self.InitiateMusicImport(args["contenttype"], args["contentpath"])
-        elif fncname == "InitiateArtworkImport":
-            retval = self.InitiateArtworkImport(args["sourcepath"], args["targetpath"])
-        elif fncname == "InitiateFilesystemScan":
-            retval = self.InitiateFilesystemScan()
-        elif fncname == "RemoveUpload":
-            retval = self.RemoveUpload(args["taskid"])
-        # Call-Methods (retval will be ignored unless method gets not changed)
-        elif fncname == "SaveWebUIConfiguration":
-            retval = self.SaveWebUIConfiguration(args["config"])
-        elif fncname == "SaveRandyConfiguration":
-            retval = self.SaveRandyConfiguration(args["config"])
-        elif fncname == "SetMDBState":
-            retval = self.SetMDBState(args["category"], args["name"], args["value"])
-            retval = self.GetMDBState()
-            method = "broadcast"
-            fncname= "GetMDBState"
-        elif fncname == "SetSongTag":
-            if "approval" in args and "confidence" in args:
-                retval = self.SetSongTag(args["songid"], args["tagid"], args["approval"], args["confidence"])
-            else:
-                retval = self.SetSongTag(args["songid"], args["tagid"])
-            retval = self.GetSong(args["songid"])
-            method = "broadcast"
-            fncname= "GetSong"
-        elif fncname == "RemoveSongTag":
-            retval = self.RemoveSongTag(args["songid"], args["tagid"])
-            retval = self.GetSong(args["songid"])
-            method = "broadcast"
-            fncname= "GetSong"
-        elif fncname == "SetVideoTag":
-            retval = self.SetVideoTag(args["videoid"], args["tagid"])
-            retval = self.GetVideo(args["videoid"])
-            method = "broadcast"
-            fncname= "GetVideo"
-        elif fncname == "RemoveVideoTag":
-            retval = self.RemoveVideoTag(args["videoid"], args["tagid"])
-            retval = self.GetVideo(args["videoid"])
-            method = "broadcast"
-            fncname= "GetVideo"
-        elif fncname == "AddGenre":
-            retval = self.AddGenre(args["name"])
-            retval = self.GetTags()
-            method = "broadcast"
-            fncname= "GetTags"
-        elif fncname == "AddSubgenre":
-            retval = self.AddSubgenre(args["name"], args["parentname"])
-            retval = self.GetTags()
-            method = "broadcast"
-            fncname= "GetTags"
-        elif fncname == "AddMoodFlag":
-            retval = self.AddMoodFlag(args["name"], args["icon"], args["color"], args["posx"], args["posy"])
-            retval = self.GetTags()
-            method = "broadcast"
-            fncname= "GetTags"
-        elif fncname == "DeleteTag":
-            retval = self.DeleteTag(args["tagid"])
-            retval = self.GetTags()
-            method = "broadcast"
-            fncname= "GetTags"
-        elif fncname == "ModifyTag":
-            retval = self.ModifyTag(args["tagid"], args["attribute"], args["value"])
-            retval = self.GetTags()
-            method = "broadcast"
-            fncname= "GetTags"
-        elif fncname == "SetAlbumTag":
-            retval = self.SetAlbumTag(args["albumid"], args["tagid"])
-            retval = self.GetAlbum(args["albumid"])
-            method = "broadcast"
-            fncname= "GetAlbum"
-        elif fncname == "RemoveAlbumTag":
-            retval = self.RemoveAlbumTag(args["albumid"], args["tagid"])
-            retval = self.GetAlbum(args["albumid"])
-            method = "broadcast"
-            fncname= "GetAlbum"
-        elif fncname == "SetSongLyrics":
-            retval = self.SetSongLyrics(args["songid"], args["lyrics"], args["lyricsstate"])
-            retval = self.GetSong(args["songid"])
-            method = "broadcast"
-            fncname= "GetSong"
-        elif fncname == "HideAlbum":
-            retval = self.HideAlbum(args["albumid"], args["hide"])
-        elif fncname == "SetAlbumOrigin":
-            retval = self.SetAlbumOrigin(args["albumid"], args["origin"])
-        elif fncname == "SetAlbumImportTime":
-            retval = self.SetAlbumImportTime(args["albumid"], args["importtime"])
-        elif fncname == "SetAlbumColor":
-            retval = self.SetAlbumColor(args["albumid"], args["colorname"], args["color"])
-        elif fncname == "SetVideoColor":
-            retval = self.SetVideoColor(args["videoid"], args["colorname"], args["color"])
-        elif fncname == "SetVideoTimeFrame":
-            retval = self.SetVideoTimeFrame(args["videoid"], args["begin"], args["end"])
-        elif fncname == "UpdateSongStatistic":
-            retval = self.UpdateSongStatistic(args["songid"], args["statistic"], args["modifier"])
-            retval = self.GetSong(args["songid"])
-            method = "broadcast"
-            fncname= "GetSong"
-        elif fncname == "UpdateVideoStatistic":
-            retval = self.UpdateVideoStatistic(args["videoid"], args["statistic"], args["modifier"])
-            retval = self.GetVideo(args["videoid"])
-            method = "broadcast"
-            fncname= "GetVideo"
-        elif fncname == "AddSongToQueue":
-            retval = self.AddSongToQueue(args["songid"], args["position"])
-        elif fncname == "AddVideoToQueue":
-            retval = self.AddVideoToQueue(args["videoid"], args["position"])
-        elif fncname == "AddRandomVideoToQueue":
-            retval = self.AddRandomVideoToQueue(args["position"])
-        elif fncname == "AddAlbumToQueue":
-            if "cd" in args:
-                retval = self.AddAlbumToQueue(args["albumid"], args["position"], args["cd"])
-            else:
-                retval = self.AddAlbumToQueue(args["albumid"], args["position"])
-        elif fncname == "AddRandomSongToQueue":
-            if "albumid" in args:
-                retval = self.AddRandomSongToQueue(args["position"], args["albumid"])
-            else:
-                retval = self.AddRandomSongToQueue(args["position"])
-        elif fncname == "MoveSongInQueue":
-            retval = self.MoveSongInQueue(args["entryid"], args["afterid"])
-        elif fncname == "MoveVideoInQueue":
-            retval = self.MoveVideoInQueue(args["entryid"], args["afterid"])
-        elif fncname == "RemoveSongFromQueue":
-            retval = self.RemoveSongFromQueue(args["entryid"])
-        elif fncname == "RemoveVideoFromQueue":
-            retval = self.RemoveVideoFromQueue(args["entryid"])
-        elif fncname == "RemoveSongEntry":
-            retval = self.RemoveSongEntry(args["songid"])
-        elif fncname == "UpdateSongEntry":
-            retval = self.UpdateSongEntry(args["songid"], args["newpath"])
-        elif fncname == "CreateSongEntry":
-            retval = self.CreateSongEntry(args["newpath"])
-        elif fncname == "RemoveAlbumEntry":
-            retval = self.RemoveAlbumEntry(args["albumid"])
-        elif fncname == "UpdateAlbumEntry":
-            retval = self.UpdateAlbumEntry(args["albumid"], args["newpath"])
-        elif fncname == "CutSongRelationship":
-            retval = self.CutSongRelationship(args["songid"], args["relatedsongid"])
-            if method == "request":
-                retval = self.GetSongRelationship(args["songid"])
-                fncname= "GetSongRelationship"
-        elif fncname == "CutVideoRelationship":
-            retval = self.CutVideoRelationship(args["videoid"], args["relatedvideoid"])
-            if method == "request":
-                retval = self.GetVideoRelationship(args["videoid"])
-                fncname= "GetVideoRelationship"
-        elif fncname == "SetStreamState":
-            logging.warning("SetStreamState is deprecated! Use SetAudioStreamState instead. \033[1;30m(Calling SetAudioStreamState)")
-            retval = self.SetAudioStreamState(args["state"])
-        elif fncname == "SetAudioStreamState":
-            retval = self.SetAudioStreamState(args["state"])
-        elif fncname == "SetVideoStreamState":
-            retval = self.SetVideoStreamState(args["state"])
-        elif fncname == "PlayNextSong":
-            retval = self.PlayNextSong()
-        elif fncname == "PlayNextVideo":
-            retval = self.PlayNextVideo()
-        elif fncname == "VideoEnded":
-            retval = self.VideoEnded(args["entryid"])
-        elif fncname == "SetVideoThumbnail":
-            retval = self.SetVideoThumbnail(args["videoid"], args["timestamp"])
-        elif fncname == "InitiateUpload":
-            retval = self.InitiateUpload(args["taskid"], args["mimetype"], args["contenttype"], args["filesize"], args["checksum"], args["filename"])
-        elif fncname == "UploadChunk":
-            retval = self.UploadChunk(args["taskid"], args["chunkdata"])
-        else:
+        result = self.ExecuteCall(fncname, method, args)
+        if result == None:
+            return None
+
+        fncname, method, retval = result
+        self.SendResponse(fncname, method, fncsig, retval, passthrough)
+        return None
+
+
+
+    def ExecuteCall(self, fncname, method, args):
+        """
+        Executes the method addressed by *fncname*.
+        Some methods change the name of the function and the method of the response.
+        For example calls that change a tag return the updated song as broadcast.
+
+        This method does not send anything and can also be called by the worker threads.
+
+        Args:
+            fncname (str): Name of the function to call
+            method (str): Method of the call
+            args: Arguments of the call
+
+        Returns:
+            A tuple ``(fncname, method, retval)`` for the response, or ``None`` if the function is unknown
+        """
+        entry = CallRegistry.get(fncname)
+        if entry == None:
             logging.warning("Unknown function: %s! \033[0;33m(will be ignored)", str(fncname))
             return None
 
-        # prepare return behaviour
+        if entry.deprecated:
+            logging.warning("%s is deprecated! Use %s instead. \033[1;30m(Calling %s)", fncname, entry.deprecated, entry.deprecated)
+
+        starttime = time.perf_counter()
+        retval    = entry.Call(self, args)
+
+        # Some functions respond with the result of another function
+        if entry.response and (entry.broadcast or method == "request"):
+            fncname = entry.response
+            retval  = CallRegistry[fncname].Call(self, args)
+        if entry.broadcast:
+            method = "broadcast"
+
+        entry.UpdateStatistics(time.perf_counter() - starttime)
+        return fncname, method, retval
+
+
+
+    def SendResponse(self, fncname, method, fncsig, retval, passthrough):
+        """
+        Sends the result of a call to the client (method ``"request"``) or to all clients (method ``"broadcast"``).
+        For the method ``"call"`` nothing gets sent.
+
+        Args:
+            fncname (str): Name of the function
+            method (str): Method of the call
+            fncsig (str): Function signature given by the client
+            retval: Return value of the function
+            passthrough: Pass-through value given by the client
+
+        Returns:
+            *Nothing*
+        """
         response    = {}
         response["fncname"]     = fncname
         response["fncsig"]      = fncsig
@@ -596,6 +440,26 @@ class MusicDBWebSocketInterface(object):
             logging.warning("Unknown call-method: %s! \033[0;33m(Call will be ignored)", str(method))
             return False
 
+        call = (fncname, method, fncsig, arguments, passthrough)
+        if fncsig in self.pendingcalls:
+            # Keep the order of calls with the same signature
+            self.pendingcalls[fncsig].append(call)
+            return True
+
+        return self.__DispatchCall(call)
+
+
+
+    def __DispatchCall(self, call):
+        fncname, method, fncsig, arguments, passthrough = call
+
+        entry = CallRegistry.get(fncname)
+        if self.executor and entry and entry.blocking:
+            self.pendingcalls[fncsig] = collections.deque()
+            future = self.factory.eventloop.run_in_executor(self.executor, self.ExecuteCall, fncname, method, arguments)
+            future.add_done_callback(functools.partial(self.__OnBlockingCallDone, call))
+            return True
+
         try:
             self.HandleCall(fncname, method, fncsig, arguments, passthrough)
         except Exception as e:
@@ -606,6 +470,31 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    def __OnBlockingCallDone(self, call, future):
+        # Gets called inside the event loop when a blocking call returned
+        fncname, method, fncsig, arguments, passthrough = call
+
+        try:
+            result = future.result()
+            if result != None:
+                fncname, method, retval = result
+                self.SendResponse(fncname, method, fncsig, retval, passthrough)
+        except Exception as e:
+            logging.exception("Unexpected error for blocking call-function: %s!", str(fncname))
+
+        # Continue with the calls that waited for this one
+        waitingcalls = self.pendingcalls.pop(fncsig, collections.deque())
+        while waitingcalls:
+            self.__DispatchCall(waitingcalls.popleft())
+            if fncsig in self.pendingcalls:
+                # Blocking call again. The remaining calls have to wait for it.
+                self.pendingcalls[fncsig].extend(waitingcalls)
+                break
+        return
+
+
+
+    @WebSocketCall("Bounce", argsparameter="args")
     def Bounce(self, args):
         """
         This is a special method that does nothing but returning the arguments given to it.
@@ -627,6 +516,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("GetArtists")
     def GetArtists(self):
         """
         Returns a list of artists.
@@ -647,6 +537,8 @@ class MusicDBWebSocketInterface(object):
         return artists
 
 
+    @WebSocketCall("GetArtistsWithAlbums", blocking=True)
+    @WebSocketCall("GetFilteredArtistsWithAlbums", fixed={"applyfilter": True}, blocking=True)
     def GetArtistsWithAlbums(self, applyfilter=False):
         """
         This method returns a list of artists and their albums.
@@ -712,6 +604,7 @@ class MusicDBWebSocketInterface(object):
         return artistlist 
 
 
+    @WebSocketCall("GetFilteredArtistsWithVideos", blocking=True)
     def GetFilteredArtistsWithVideos(self):
         """
         This method returns a list of artists and their videos.
@@ -766,6 +659,7 @@ class MusicDBWebSocketInterface(object):
         return artistlist 
 
 
+    @WebSocketCall("GetHiddenAlbums", blocking=True)
     def GetHiddenAlbums(self):
         """
         GetHiddenAlbums returns a list of all albums that are flagged as *hidden*.
@@ -812,9 +706,11 @@ class MusicDBWebSocketInterface(object):
         albums = sorted(albums, key = lambda k: k["path"])
 
         # assign tags to albums
+        albumids  = [album["id"] for album in albums]
+        alltags   = self.database.GetTargetTagsBulk("album", albumids)
         albumlist = []
         for album in albums:
-            tags  = self.GetAlbumTags(album["id"])
+            tags  = self.__CategorizeTags("albumid", album["id"], alltags[album["id"]])
             entry = {}
             entry["album"]   = album
             entry["tags"]    = tags
@@ -823,6 +719,7 @@ class MusicDBWebSocketInterface(object):
         return albumlist
 
 
+    @WebSocketCall("GetAlbums", arguments=["artistid", "applyfilter"])
     def GetAlbums(self, artistid, applyfilter=False):
         """
         GetAlbums returns a list of albums of an artist.
@@ -877,16 +774,19 @@ class MusicDBWebSocketInterface(object):
         albums = sorted(albums, key = lambda k: k["release"] if type(k["release"]) is int else 0)
 
         # assign tags to albums
+        albumids  = [album["id"] for album in albums]
+        alltags   = self.database.GetTargetTagsBulk("album", albumids)
         albumlist = []
         for album in albums:
             entry = {}
             entry["album"] = album
-            entry["tags"]  = self.GetAlbumTags(album["id"]) # returns a categorized dict of tags
+            entry["tags"]  = self.__CategorizeTags("albumid", album["id"], alltags[album["id"]]) # returns a categorized dict of tags
             albumlist.append(entry)
 
         return albumlist
 
 
+    @WebSocketCall("GetVideos", arguments=["artistid"])
     def GetVideos(self, artistid, applyfilter=False):
         """
         GetVideos returns a list of videos of an artist.
@@ -938,9 +838,11 @@ class MusicDBWebSocketInterface(object):
             filterset = set(self.mdbstate.GetGenreFilterList())
 
         # assign tags to videos
+        videoids  = [video["id"] for video in videos]
+        alltags   = self.database.GetTargetTagsBulk("video", videoids)
         videolist = []
         for video in videos:
-            tags   = self.GetVideoTags(video["id"])
+            tags   = self.__CategorizeTags("videoid", video["id"], alltags[video["id"]])
             genres = tags["genres"]
 
             # if no tags are available, show the album!
@@ -960,6 +862,7 @@ class MusicDBWebSocketInterface(object):
         return videolist
 
 
+    @WebSocketCall("GetVideo", arguments=["videoid"])
     def GetVideo(self, videoid):
         """
         This method returns a video entry from the Music Database.
@@ -1018,6 +921,7 @@ class MusicDBWebSocketInterface(object):
         return retval
 
 
+    @WebSocketCall("UpdateVideoStatistic", arguments=["videoid", "statistic", "modifier"], access="write", response="GetVideo", broadcast=True)
     def UpdateVideoStatistic(self, videoid, statistic, modifier):
         """
         This video allows setting some statistics and properties for a video.
@@ -1040,6 +944,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("GetSortedAlbumCDs", arguments=["albumid"])
     def GetSortedAlbumCDs(self, albumid):
         """
         This method returns a sorted list of CDs of an album.
@@ -1065,9 +970,11 @@ class MusicDBWebSocketInterface(object):
             return []
 
         # annotate all songs with additional infos like genre-tags
+        songids  = [song["id"] for song in songs]
+        alltags  = self.database.GetTargetTagsBulk("song", songids)
         songlist = []
         for song in songs:
-            tags = self.GetSongTags(song["id"])
+            tags = self.__CategorizeTags("songid", song["id"], alltags[song["id"]])
             songentry = {}
             songentry["song"]      = song
             songentry["tags"]      = tags
@@ -1097,6 +1004,7 @@ class MusicDBWebSocketInterface(object):
         return sortedcds
 
 
+    @WebSocketCall("GetAlbum", arguments=["albumid"])
     def GetAlbum(self, albumid):
         """
         This method returns an album and its songs, separated by CDs.
@@ -1155,6 +1063,7 @@ class MusicDBWebSocketInterface(object):
         return retval
 
 
+    @WebSocketCall("GetSong", arguments=["songid"])
     def GetSong(self, songid):
         """
         This method returns the information of a song, its album and artist, and its tags.
@@ -1206,6 +1115,7 @@ class MusicDBWebSocketInterface(object):
         return retval
 
 
+    @WebSocketCall("GetTags")
     def GetTags(self):
         """
         This method returns all tags that are available, separated by the tag classes.
@@ -1247,6 +1157,7 @@ class MusicDBWebSocketInterface(object):
         return tags
 
 
+    @WebSocketCall("GetTagsStatistics", blocking=True)
     def GetTagsStatistics(self):
         """
         This method returns the usage statistics as a dictionary with an entry for each tag.
@@ -1300,6 +1211,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("GetSongTags", arguments=["songid"])
     def GetSongTags(self, songid):
         """
         Returns a dictionary with the following keys:
@@ -1345,28 +1257,17 @@ class MusicDBWebSocketInterface(object):
                 }
         """
         tags = self.database.GetTargetTags("song", songid)
-        genres, subgenres, moods = self.database.SplitTagsByClass(tags)
-        tags = {}
-        tags["songid"]    = songid  # this is necessary to not loose context
-        tags["genres"]    = genres
-        tags["subgenres"] = subgenres
-        tags["moods"]     = moods
-        return tags
+        return self.__CategorizeTags("songid", songid, tags)
 
 
+    @WebSocketCall("GetAlbumTags", arguments=["albumid"])
     def GetAlbumTags(self, albumid):
         """
         Similar to :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetSongTags`.
         This method returns the tags for an Album.
         """
         tags = self.database.GetTargetTags("album", albumid)
-        genres, subgenres, moods = self.database.SplitTagsByClass(tags)
-        tags = {}
-        tags["albumid"]   = albumid  # this is necessary to not loose context
-        tags["genres"]    = genres
-        tags["subgenres"] = subgenres
-        tags["moods"]     = moods
-        return tags
+        return self.__CategorizeTags("albumid", albumid, tags)
 
 
     def GetVideoTags(self, videoid):
@@ -1375,15 +1276,34 @@ class MusicDBWebSocketInterface(object):
         This method returns the tags for a Video.
         """
         tags = self.database.GetTargetTags("video", videoid)
+        return self.__CategorizeTags("videoid", videoid, tags)
+
+
+    def __CategorizeTags(self, idname, targetid, tags):
+        """
+        This method sorts a list of tags by their class as it is done by
+        :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetSongTags`,
+        :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetAlbumTags` and
+        :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetVideoTags`.
+
+        Args:
+            idname (str): Name of the ID key: ``"songid"``, ``"albumid"`` or ``"videoid"``
+            targetid (int): ID of the song, album or video the tags belong to
+            tags (list): A list of tags as returned by :meth:`musicdb.lib.db.musicdb.MusicDatabase.GetTargetTags`
+
+        Returns:
+            A dict of tags sorted by classes
+        """
         genres, subgenres, moods = self.database.SplitTagsByClass(tags)
-        tags = {}
-        tags["videoid"]   = videoid  # this is necessary to not loose context
-        tags["genres"]    = genres
-        tags["subgenres"] = subgenres
-        tags["moods"]     = moods
-        return tags
+        retval = {}
+        retval[idname]      = targetid  # this is necessary to not loose context
+        retval["genres"]    = genres
+        retval["subgenres"] = subgenres
+        retval["moods"]     = moods
+        return retval
 
 
+    @WebSocketCall("GetTables", arguments=[("tables", "tablenames")], blocking=True)
     def GetTables(self, tablenames):
         """
         Returns a dictionary that contains for each requested table a key.
@@ -1435,6 +1355,7 @@ class MusicDBWebSocketInterface(object):
         return retval
 
 
+    @WebSocketCall("SetMDBState", arguments=["category", "name", "value"], access="write", broadcast=True)
     def SetMDBState(self, category, name, value):
         """
         This method sets the global state of MDB clients
@@ -1445,8 +1366,17 @@ class MusicDBWebSocketInterface(object):
         then *name* must be a Genre-Name and *value* is ``True`` or ``False``.
         If a genre gets set to true, all albums for that genre are included in the list of returned albums by methods that use the filter.
 
-        After executing this method, the MusicDB server broadcasts the result of :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetMDBState`. (``method = "broadcast", fncname = "GetMDBState"``)
+        After executing this method, the MusicDB server broadcasts the changes of the state. (``method = "broadcast", fncname = "SetMDBState"``)
         So each client gets informed about the new state.
+        The broadcast is a dictionary with the following keys:
+
+            * **base:** The revision of the state before the change
+            * **revision:** The revision of the state after the change
+            * **changes:** The changed parts of the state in the same structure as returned by :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetMDBState`.
+              For example ``{GenreFilter: ["Metal", "NDH"]}`` or ``{SubgenreFilter: {Metal: ["Dark Metal"]}}``.
+
+        When *base* is the revision of the clients copy of the state, it can merge the changes into its copy.
+        Otherwise the client missed a change and should request the whole state via :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetMDBState`.
 
         The following categories are valid:
         
@@ -1460,7 +1390,7 @@ class MusicDBWebSocketInterface(object):
             value: Value of the state
 
         Returns:
-            ``None``
+            The changes of the state
 
         Example:
             .. code-block:: javascript
@@ -1468,33 +1398,48 @@ class MusicDBWebSocketInterface(object):
                 MusicDB.Call("SetMDBState", {category:"GenreFilter", name:"Metal", value:true});
                 MusicDB.Call("SetMDBState", {category:"SubgenreFilter:Metal", name:"Dark Metal", value:false});
         """
+        base    = self.mdbstate.GetRevision()
+        changes = {}
+
         if category == "GenreFilter":
             try:
                 self.mdbstate.UpdateGenreFilterList(name, value)
             except Exception as e:
                 logging.warning("Setting Genre Filter failed with error \"%s\"", str(e))
+            changes["GenreFilter"] = self.mdbstate.GetGenreFilterList()
 
         elif category.split(":")[0] == "SubgenreFilter":
+            genre = category.split(":")[1]
             try:
-                self.mdbstate.UpdateSubgenreFilterList(category.split(":")[1], name, value)
+                self.mdbstate.UpdateSubgenreFilterList(genre, name, value)
             except Exception as e:
                 logging.warning("Setting Sub Genre Filter failed with error \"%s\"", str(e))
+            changes["SubgenreFilter"] = {}
+            changes["SubgenreFilter"][genre] = self.mdbstate.GetSubgenreFilterList(genre)
 
         elif category == "MusicDB" and name == "uimode":
             try:
                 self.mdbstate.SetUIMode(value)
             except Exception as e:
                 logging.warning("Setting MusicDB UI Mode failed with error \"%s\"", str(e))
+            changes["MusicDB"] = {}
+            changes["MusicDB"]["uimode"] = self.mdbstate.GetUIMode()
 
-        return None
+        delta = {}
+        delta["base"]     = base
+        delta["revision"] = self.mdbstate.GetRevision()
+        delta["changes"]  = changes
+        return delta
 
 
+    @WebSocketCall("GetMDBState")
     def GetMDBState(self):
         """
         This method returns the current global state of MusicDB and the WebUIs
 
         The state is a dictionary with the following information:
 
+            * **revision:** The revision of the state. See :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.SetMDBState`
             * **GenreFilter:** a list of tag-names of class Genre that are selected as genre filter
             * **SubgenreFilter:** a dictionary with each existing genre as key. Its values are a list of tag-names representing the selected sub genres
             * **MusicDB:**
@@ -1534,6 +1479,9 @@ class MusicDBWebSocketInterface(object):
                     }
                 }
         """
+        # Read the revision first. Changes made while reading the state get broadcast with a newer revision.
+        revision = self.mdbstate.GetRevision()
+
         # Get all selected genres
         genrefilter = self.mdbstate.GetGenreFilterList()
 
@@ -1560,6 +1508,7 @@ class MusicDBWebSocketInterface(object):
 
         # put everything together
         state = {}
+        state["revision"]       = revision
         state["GenreFilter"]    = genrefilter
         state["SubgenreFilter"] = subgenrefilter
         state["MusicDB"] = {}
@@ -1575,6 +1524,7 @@ class MusicDBWebSocketInterface(object):
         return state
 
 
+    @WebSocketCall("LoadRandyConfiguration")
     def LoadRandyConfiguration(self):
         """
         This method loads the configuration for the Random Song Selection algorithm (Randy) from the MusicDB state directory.
@@ -1604,6 +1554,7 @@ class MusicDBWebSocketInterface(object):
         return randycfg.LoadConfig()
 
 
+    @WebSocketCall("SaveRandyConfiguration", arguments=["config"], access="write")
     def SaveRandyConfiguration(self, config):
         """
         This method saves the whole configuration for Randy back into the MusicDB state directory.
@@ -1637,6 +1588,7 @@ class MusicDBWebSocketInterface(object):
         return randycfg.LoadConfig()
 
 
+    @WebSocketCall("LoadWebUIConfiguration")
     def LoadWebUIConfiguration(self):
         """
         This method loads the configuration for the WebUI from the MusicDB data directory.
@@ -1666,6 +1618,7 @@ class MusicDBWebSocketInterface(object):
         return webuicfg.LoadConfig()
 
 
+    @WebSocketCall("SaveWebUIConfiguration", arguments=["config"], access="write")
     def SaveWebUIConfiguration(self, config):
         """
         This method saves the whole configuration back into the MusicDB data directory.
@@ -1703,6 +1656,8 @@ class MusicDBWebSocketInterface(object):
         return webuicfg.LoadConfig()
 
 
+    @WebSocketCall("GetAudioStreamState")
+    @WebSocketCall("GetStreamState", deprecated="GetAudioStreamState")
     def GetAudioStreamState(self):
         """
         This method returns the state of the Streaming Thread. (See :doc:`/mdbapi/audiostream`)
@@ -1778,6 +1733,7 @@ class MusicDBWebSocketInterface(object):
         return state
 
 
+    @WebSocketCall("GetVideoStreamState")
     def GetVideoStreamState(self):
         """
         This method returns the state of the Video Streaming Thread. (See :doc:`/mdbapi/videostream`)
@@ -1848,6 +1804,7 @@ class MusicDBWebSocketInterface(object):
         return state
 
 
+    @WebSocketCall("GetSongQueue")
     def GetSongQueue(self):
         """
         This method returns a list of songs, albums and artists for each song in the song queue.
@@ -1883,7 +1840,54 @@ class MusicDBWebSocketInterface(object):
                 }
         """
         entries = self.songqueue.GetQueue()
+        return self.__ExpandSongQueue(entries)
+
+
+    @WebSocketCall("GetSongQueueSnapshot")
+    def GetSongQueueSnapshot(self):
+        """
+        This method returns the song queue as :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetSongQueue` does,
+        together with the revision of the queue.
+
+        When the queue changes, the clients get notified with the changes and the new revision of the queue (``fncname = "MusicDB:SongQueue", fncsig = "onSongQueueChanged"``).
+        The arguments of this notification are described in :doc:`/mdbapi/songqueue` (see "Song Queue Revisions").
+        The entry IDs are strings like in the entries returned by this method.
+        When the ``base`` revision of the notification is the revision of the clients copy of the queue, the client can apply the changes to its copy.
+        Otherwise the client missed a change and should call this method to get the whole queue again.
+
+        The returned dictionary has the following keys:
+
+            * **revision:** The revision of the queue
+            * **entries:** The entries of the queue as returned by :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetSongQueue`
+
+        Returns:
+            A dictionary with the revision and the entries of the song queue
 
+        Example:
+            .. code-block:: javascript
+
+                MusicDB_Request("GetSongQueueSnapshot", "UpdateQueue");
+
+                // …
+
+                function onMusicDBMessage(fnc, sig, args, pass)
+                {
+                    if(fnc == "GetSongQueueSnapshot" && sig == "UpdateQueue")
+                    {
+                        queuerevision = args.revision;
+                        queueentries  = args.entries;
+                    }
+                }
+        """
+        revision, entries = self.songqueue.GetSnapshot()
+
+        snapshot = {}
+        snapshot["revision"] = revision
+        snapshot["entries"]  = self.__ExpandSongQueue(entries)
+        return snapshot
+
+
+    def __ExpandSongQueue(self, entries):
         # return empty list if there is no queue
         if not entries:
             return []
@@ -1906,6 +1910,7 @@ class MusicDBWebSocketInterface(object):
         return queue
 
 
+    @WebSocketCall("GetVideoQueue")
     def GetVideoQueue(self):
         """
         This method returns a list of videos, albums and artists for each video in the video queue.
@@ -1974,6 +1979,7 @@ class MusicDBWebSocketInterface(object):
         return queue
 
 
+    @WebSocketCall("Find", arguments=["searchstring", "limit"], blocking=True)
     def Find(self, searchstring, limit):
         """
         This method starts a search for *searchstring* on songnames, albumnames and artistnames.
@@ -2023,56 +2029,66 @@ class MusicDBWebSocketInterface(object):
                     }
                 }
         """
-        (foundartists, foundalbums, foundsongs) = self.mise.Find(searchstring)
-
+        self.mise.UpdateSongFilter(self.database)
+        (foundartists, foundalbums, foundsongs) = self.mise.Find(searchstring, limit, filtersongs=True)
+        if foundartists == None:
+            (foundartists, foundalbums, foundsongs) = ([], [], [])
+
+        foundartists = foundartists[:limit]
+        foundalbums  = foundalbums[:limit]
+        foundsongs   = foundsongs[:limit]
+
+        # Read all entries of the results with as few queries as possible
+        songentries   = self.database.GetSongsByIds([songid for songid, _ in foundsongs])
+        albumids      = [albumid for albumid, _ in foundalbums]
+        albumids     += [song["albumid"] for song in songentries.values()]
+        albumentries  = self.database.GetAlbumsByIds(albumids)
+        artistids     = [artistid for artistid, _ in foundartists]
+        artistids    += [album["artistid"] for album in albumentries.values()]
+        artistids    += [song["artistid"] for song in songentries.values()]
+        artistentries = self.database.GetArtistsByIds(artistids)
+        artistalbums  = self.database.GetAlbumsByArtistIds([artistid for artistid, _ in foundartists])
 
         # process found artists
-        artists     = []
-        artistcount = min(limit, len(foundartists))
-        for i in range(artistcount):
-            artistid = foundartists[i][0]
-            artist   = self.database.GetArtistById(artistid)
+        artists = []
+        for artistid, _ in foundartists:
+            if artistid not in artistentries:
+                continue
 
-            # Get albums by this artist and sort for release year
-            albums = self.database.GetAlbumsByArtistId(artistid)
-            albums = sorted(albums, key = lambda k: k["release"])
+            # Sort albums by this artist for release year
+            albums = sorted(artistalbums[artistid], key = lambda k: k["release"])
 
             entry = {}
-            entry["artist"] = artist
+            entry["artist"] = artistentries[artistid]
             entry["albums"] = albums
             artists.append(entry)
 
         # process found albums
-        albums     = []
-        albumcount = min(limit, len(foundalbums))
-        for i in range(albumcount):
-            albumid = foundalbums[i][0]
-            album   = self.database.GetAlbumById(albumid)
-            artist  = self.database.GetArtistById(album["artistid"])
+        albums = []
+        for albumid, _ in foundalbums:
+            if albumid not in albumentries:
+                continue
+            album = albumentries[albumid]
 
             entry = {}
-            entry["artist"] = artist
+            entry["artist"] = artistentries.get(album["artistid"])
             entry["album"]  = album
             albums.append(entry)
 
         # process found songs
-        songs     = []
-        songcount = len(foundsongs) # Do not limit the songlist length at this point. There may be songs removed
-        for i in range(songcount):
-            songid  = foundsongs[i][0]
-            song    = self.database.GetSongById(songid)
+        songs = []
+        for songid, _ in foundsongs:
+            if songid not in songentries:
+                continue
+            song = songentries[songid]
             if song["disabled"] or song["favorite"] == -1:
-                continue    # Skip hated and disabled songs
-            album   = self.database.GetAlbumById(song["albumid"])
-            artist  = self.database.GetArtistById(song["artistid"])
+                continue    # Skip hated and disabled songs the song filter did not know about yet
 
             entry = {}
-            entry["artist"] = artist
-            entry["album"]  = album
+            entry["artist"] = artistentries.get(song["artistid"])
+            entry["album"]  = albumentries.get(song["albumid"])
             entry["song"]   = song
             songs.append(entry)
-            if len(songs) >= limit:
-                break
 
         results = {}
         results["artists"] = artists
@@ -2081,6 +2097,8 @@ class MusicDBWebSocketInterface(object):
         return results
 
 
+    @WebSocketCall("SetAudioStreamState", arguments=["state"], access="write")
+    @WebSocketCall("SetStreamState", arguments=["state"], access="write", deprecated="SetAudioStreamState")
     def SetAudioStreamState(self, state):
         """
         This method can be used to set the  *playing*-state of the audio stream (see :doc:`/mdbapi/audiostream`)
@@ -2121,6 +2139,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("SetVideoStreamState", arguments=["state"], access="write")
     def SetVideoStreamState(self, state):
         """
         This method can be used to set the *streaming*-state of the video stream (see :doc:`/mdbapi/videostream`)
@@ -2161,6 +2180,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("PlayNextSong", access="write")
     def PlayNextSong(self):
         """
         This method skips the current playing song.
@@ -2179,6 +2199,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("PlayNextVideo", access="write")
     def PlayNextVideo(self):
         """
         This method skips the current playing video.
@@ -2197,6 +2218,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("VideoEnded", arguments=["entryid"], access="write")
     def VideoEnded(self, entryid):
         """
         Notify the Video Queue that the current played video with a specific entry id ended.
@@ -2224,6 +2246,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("SetVideoThumbnail", arguments=["videoid", "timestamp"], access="write")
     def SetVideoThumbnail(self, videoid, timestamp):
         """
         This method sets a new video thumbnail via :meth:`~musicdb.mdbapi.videoframes.VideoFrames.ChangeThumbnail`.
@@ -2252,6 +2275,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("AddSongToQueue", arguments=["songid", "position"], access="write")
     def AddSongToQueue(self, songid, position):
         """
         This method adds a new song to the queue of songs that will be streamed.
@@ -2296,6 +2320,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("AddRandomSongToQueue", arguments=["position"], optional=["albumid"], access="write")
     def AddRandomSongToQueue(self, position, albumid=None):
         """
         Similar to :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.AddSongToQueue`.
@@ -2329,6 +2354,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("AddVideoToQueue", arguments=["videoid", "position"], access="write")
     def AddVideoToQueue(self, videoid, position):
         """
         This method adds a new video to the queue of videos that will be played.
@@ -2373,6 +2399,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("AddRandomVideoToQueue", arguments=["position"], access="write")
     def AddRandomVideoToQueue(self, position):
         """
         Similar to :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.AddVideoToQueue`.
@@ -2399,6 +2426,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("AddAlbumToQueue", arguments=["albumid", "position"], optional=["cd"], access="write")
     def AddAlbumToQueue(self, albumid, position, cd=None):
         """
         This method adds all songs of an album at any position of the queue.
@@ -2459,6 +2487,7 @@ class MusicDBWebSocketInterface(object):
         return None
     
         
+    @WebSocketCall("RemoveSongFromQueue", arguments=["entryid"], access="write")
     def RemoveSongFromQueue(self, entryid):
         """
         This method removes a song from song queue.
@@ -2496,6 +2525,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("RemoveVideoFromQueue", arguments=["entryid"], access="write")
     def RemoveVideoFromQueue(self, entryid):
         """
         This method removes a video from the video queue.
@@ -2532,6 +2562,7 @@ class MusicDBWebSocketInterface(object):
         return None
     
     
+    @WebSocketCall("MoveSongInQueue", arguments=["entryid", "afterid"], access="write")
     def MoveSongInQueue(self, entryid, afterid):
         """
         This is a direct interface to :meth:`musicdb.mdbapi.songqueue.SongQueue.MoveSong`.
@@ -2599,6 +2630,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("MoveVideoInQueue", arguments=["entryid", "afterid"], access="write")
     def MoveVideoInQueue(self, entryid, afterid):
         """
         This is a direct interface to :meth:`musicdb.mdbapi.videoqueue.VideoQueue.MoveVideo`.
@@ -2626,6 +2658,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("GetSongRelationship", arguments=["songid"], blocking=True)
     def GetSongRelationship(self, songid):
         """
         This method returns the relationship of a song.
@@ -2694,15 +2727,20 @@ class MusicDBWebSocketInterface(object):
             if song["favorite"] == -1 or song["disabled"]:
                 continue
 
-            tags   = self.GetSongTags(songid)
             entry["song"]    = song
-            entry["tags"]    = tags
             entry["weight"]  = weight
             entry["album"]   = self.database.GetAlbumById(song["albumid"])
             entry["artist"]  = self.database.GetArtistById(song["artistid"])
 
             entries.append(entry)
 
+        # get the tags of all remaining songs at once
+        songids = [entry["song"]["id"] for entry in entries]
+        alltags = self.database.GetTargetTagsBulk("song", songids)
+        for entry in entries:
+            songid = entry["song"]["id"]
+            entry["tags"] = self.__CategorizeTags("songid", songid, alltags[songid])
+
         # Sort by Artist-ID and Album-ID
         entries.sort(key = lambda k:( 
             k["artist"]["name"], 
@@ -2721,6 +2759,7 @@ class MusicDBWebSocketInterface(object):
         return packet 
 
 
+    @WebSocketCall("GetVideoRelationship", arguments=["videoid"], blocking=True)
     def GetVideoRelationship(self, videoid):
         """
         This method returns the relationship of a video to other videos.
@@ -2782,14 +2821,19 @@ class MusicDBWebSocketInterface(object):
             if video["favorite"] == -1 or video["disabled"]:
                 continue
 
-            tags   = self.GetVideoTags(videoid)
             entry["video"]   = video
-            entry["tags"]    = tags
             entry["weight"]  = weight
             entry["artist"]  = self.database.GetArtistById(video["artistid"])
 
             entries.append(entry)
 
+        # get the tags of all remaining videos at once
+        videoids = [entry["video"]["id"] for entry in entries]
+        alltags  = self.database.GetTargetTagsBulk("video", videoids)
+        for entry in entries:
+            videoid = entry["video"]["id"]
+            entry["tags"] = self.__CategorizeTags("videoid", videoid, alltags[videoid])
+
         # Sort by Artist-ID and Album-ID
         entries.sort(key = lambda k:( 
             k["artist"]["name"], 
@@ -2802,6 +2846,7 @@ class MusicDBWebSocketInterface(object):
         return packet 
 
 
+    @WebSocketCall("GetSongLyrics", arguments=["songid"])
     def GetSongLyrics(self, songid):
         """
         This method returns the lyrics of a song.
@@ -2847,6 +2892,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("SetSongLyrics", arguments=["songid", "lyrics", ("lyricsstate", "state")], access="write", response="GetSong", broadcast=True)
     def SetSongLyrics(self, songid, lyrics, state):
         """
         This method is a direct interface to :meth:`~musicdb.lib.db.musicdb.MusicDatabase.SetLyrics`.
@@ -2870,6 +2916,70 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("FindLyrics", arguments=["searchstring", "limit"], blocking=True)
+    def FindLyrics(self, searchstring, limit):
+        """
+        This method searches for *searchstring* in the lyrics and in the names of songs, albums and artists.
+        Other than :meth:`~Find`, the search is not fuzzy.
+        All words of the search string must be found, the last one may be incomplete.
+        The search gets done by :meth:`musicdb.lib.db.musicdb.MusicDatabase.FindLyrics`.
+
+        The returned value is a list ordered by relevance.
+        Each entry is a dictionary with the following information:
+
+            * **song:** The song entry from the database
+            * **album:** The related album entry from the database
+            * **artist:** The related artist entry from the database
+            * **snippet:** A short part of the lyrics or names where the words were found.
+              The found words are highlighted with ``<<…>>`` like in the lyrics markup.
+
+        Args:
+            searchstring (str): The words to search for
+            limit (int): Maximum number of results
+
+        Returns:
+            A list of search results
+
+        Example:
+            .. code-block:: javascript
+
+                MusicDB_Request("FindLyrics", "ShowResults", {searchstring:"lorem ipsum", limit:10});
+
+                // …
+
+                function onMusicDBMessage(fnc, sig, args, pass)
+                {
+                    if(fnc == "FindLyrics" && sig == "ShowResults")
+                    {
+                        for(let entry of args)
+                            console.log(entry.song.name + ": " + entry.snippet);
+                    }
+                }
+        """
+        found = self.database.FindLyrics(searchstring, limit)
+
+        # Read all entries of the results with as few queries as possible
+        songentries   = self.database.GetSongsByIds([result["songid"] for result in found])
+        albumentries  = self.database.GetAlbumsByIds([song["albumid"] for song in songentries.values()])
+        artistentries = self.database.GetArtistsByIds([song["artistid"] for song in songentries.values()])
+
+        results = []
+        for result in found:
+            song = songentries.get(result["songid"])
+            if not song:
+                continue
+
+            entry = {}
+            entry["song"]    = song
+            entry["album"]   = albumentries.get(song["albumid"])
+            entry["artist"]  = artistentries.get(song["artistid"])
+            entry["snippet"] = result["snippet"]
+            results.append(entry)
+        return results
+
+
+
+    @WebSocketCall("HideAlbum", arguments=["albumid", "hide"], access="write")
     def HideAlbum(self, albumid, hide):
         """
         Hides or shows an album depending on the *hide* state.
@@ -2896,6 +3006,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("SetAlbumOrigin", arguments=["albumid", "origin"], access="write")
     def SetAlbumOrigin(self, albumid, origin):
         """
         This method updates the origin of an album.
@@ -2925,6 +3036,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("SetAlbumImportTime", arguments=["albumid", "importtime"], access="write")
     def SetAlbumImportTime(self, albumid, importtime):
         """
         This method updates the import time ("added" entry) of an album.
@@ -2957,6 +3069,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("SetAlbumColor", arguments=["albumid", "colorname", "color"], access="write")
     def SetAlbumColor(self, albumid, colorname, color):
         """
         Sets a color scheme for an album.
@@ -3005,6 +3118,7 @@ class MusicDBWebSocketInterface(object):
         return True
 
 
+    @WebSocketCall("SetVideoColor", arguments=["videoid", "colorname", "color"], access="write")
     def SetVideoColor(self, videoid, colorname, color):
         """
         Sets a color scheme for a video.
@@ -3053,6 +3167,7 @@ class MusicDBWebSocketInterface(object):
         return True
         
 
+    @WebSocketCall("SetVideoTimeFrame", arguments=["videoid", "begin", "end"], access="write")
     def SetVideoTimeFrame(self, videoid, begin, end):
         """
         Set the time frame for a video.
@@ -3117,6 +3232,7 @@ class MusicDBWebSocketInterface(object):
         return True
 
 
+    @WebSocketCall("SetAlbumTag", arguments=["albumid", "tagid"], access="write", response="GetAlbum", broadcast=True)
     def SetAlbumTag(self, albumid, tagid):
         """
         Sets a tag for an album.
@@ -3145,6 +3261,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("RemoveAlbumTag", arguments=["albumid", "tagid"], access="write", response="GetAlbum", broadcast=True)
     def RemoveAlbumTag(self, albumid, tagid):
         """
         Removes a tag from an album
@@ -3171,6 +3288,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("SetSongTag", arguments=["songid", "tagid"], optional=["approval", "confidence"], access="write", response="GetSong", broadcast=True)
     def SetSongTag(self, songid, tagid, approval=1, confidence=None):
         """
         Sets a tag for a song.
@@ -3232,6 +3350,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("RemoveSongTag", arguments=["songid", "tagid"], access="write", response="GetSong", broadcast=True)
     def RemoveSongTag(self, songid, tagid):
         """
         Removes a tag from a song
@@ -3268,6 +3387,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("SetVideoTag", arguments=["videoid", "tagid"], access="write", response="GetVideo", broadcast=True)
     def SetVideoTag(self, videoid, tagid):
         """
         Sets a tag for a video.
@@ -3315,6 +3435,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("RemoveVideoTag", arguments=["videoid", "tagid"], access="write", response="GetVideo", broadcast=True)
     def RemoveVideoTag(self, videoid, tagid):
         """
         Removes a tag from a video.
@@ -3345,6 +3466,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("AddGenre", arguments=["name"], access="write", response="GetTags", broadcast=True)
     def AddGenre(self, name):
         """
         This method creates a new genre.
@@ -3367,6 +3489,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("AddSubgenre", arguments=["name", "parentname"], access="write", response="GetTags", broadcast=True)
     def AddSubgenre(self, name, parentname):
         """
         This method creates a new subgenre.
@@ -3395,6 +3518,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("AddMoodFlag", arguments=["name", "icon", "color", "posx", "posy"], access="write", response="GetTags", broadcast=True)
     def AddMoodFlag(self, name, icon, color, posx, posy):
         """
         This method creates a new Mood Flag.
@@ -3435,6 +3559,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("DeleteTag", arguments=["tagid"], access="write", response="GetTags", broadcast=True)
     def DeleteTag(self, tagid):
         """
         This method deletes a tag addressed by its tag ID.
@@ -3464,6 +3589,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("ModifyTag", arguments=["tagid", "attribute", "value"], access="write", response="GetTags", broadcast=True)
     def ModifyTag(self, tagid, attribute, value):
         """
         This method allows to modify most of the attributes of a tag.
@@ -3500,6 +3626,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("UpdateSongStatistic", arguments=["songid", "statistic", "modifier"], access="write", response="GetSong", broadcast=True)
     def UpdateSongStatistic(self, songid, statistic, modifier):
         """
         When this method got called direct via the JavaScript API, the MusicDB server broadcasts the result of :meth:`~musicdb.lib.ws.mdbwsi.MusicDBWebSocketInterface.GetSong`. (``method = "broadcast", fncname = "GetSong"``)
@@ -3522,6 +3649,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("CutSongRelationship", arguments=["songid", "relatedsongid"], access="write", response="GetSongRelationship")
     def CutSongRelationship(self, songid, relatedsongid):
         """
         This method removes the relation between two songs.
@@ -3545,6 +3673,7 @@ class MusicDBWebSocketInterface(object):
         return None
 
 
+    @WebSocketCall("CutVideoRelationship", arguments=["videoid", "relatedvideoid"], access="write", response="GetVideoRelationship")
     def CutVideoRelationship(self, videoid, relatedvideoid):
         """
         This method removes the relation between two videos.
@@ -3569,6 +3698,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("RemoveSongEntry", arguments=["songid"], access="write")
     def RemoveSongEntry(self, songid):
         """
         This method removes a song from the database.
@@ -3591,6 +3721,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("CreateSongEntry", arguments=["newpath"], access="write")
     def CreateSongEntry(self, newpath):
         """
         This method creates a new song entry in the database.
@@ -3619,6 +3750,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("UpdateSongEntry", arguments=["songid", "newpath"], access="write")
     def UpdateSongEntry(self, songid, newpath):
         """
         This method updates the database entry of the song with the ID *songid*.
@@ -3642,6 +3774,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("UpdateAlbumEntry", arguments=["albumid", "newpath"], access="write")
     def UpdateAlbumEntry(self, albumid, newpath):
         """
         This method updates the database entry of the album with the ID *albumid*.
@@ -3666,6 +3799,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("RemoveAlbumEntry", arguments=["albumid"], access="write")
     def RemoveAlbumEntry(self, albumid):
         """
         This method removes an album and all its songs from the database.
@@ -3688,6 +3822,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("UpdateArtistEntry", arguments=["artistid", "newpath"], access="write")
     def UpdateArtistEntry(self, artistid, newpath):
         """
         This method updates the database entry of the artist with the ID *artistid*.
@@ -3713,6 +3848,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("RemoveArtistEntry", arguments=["artistid"], access="write")
     def RemoveArtistEntry(self, artistid):
         """
         This method removes an artist and all its albums and songs from the database.
@@ -3735,6 +3871,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("FindNewContent", blocking=True)
     def FindNewContent(self):
         """
         This method uses :meth:`musicdb.mdbapi.music.MusicDBMusic.FindNewPaths` to get all new albums and videos.
@@ -3825,6 +3962,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("FindAlbumSongFiles", arguments=["albumpath"], blocking=True)
     def FindAlbumSongFiles(self, albumpath):
         """
         This method returns a list of song files and information from the given album path.
@@ -3925,6 +4063,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("RenameMusicFile", arguments=["oldpath", "newpath"], access="write")
     def RenameMusicFile(self, oldpath, newpath):
         """
         Renames a song or video file.
@@ -4024,6 +4163,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("RenameAlbumDirectory", arguments=["oldpath", "newpath"], access="write")
     def RenameAlbumDirectory(self, oldpath, newpath):
         """
         Renames an album directory.
@@ -4107,6 +4247,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("RenameArtistDirectory", arguments=["oldpath", "newpath"], access="write")
     def RenameArtistDirectory(self, oldpath, newpath):
         """
         Renames an artist directory.
@@ -4171,6 +4312,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("CreateArtistEntry", arguments=["name"], access="write")
     def CreateArtistEntry(self, name):
         """
         This method creates a new Artist with the name ``name``.
@@ -4198,6 +4340,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("ChangeArtistDirectory", arguments=["oldalbumpath", "newartistdirectory"], access="write")
     def ChangeArtistDirectory(self, oldalbumpath, newartistdirectory):
         """
         This method changes the artist directory of an album.
@@ -4316,6 +4459,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("InitiateUpload", arguments=["taskid", "mimetype", "contenttype", "filesize", "checksum", "filename"], access="write")
     def InitiateUpload(self, taskid, mimetype, contenttype, filesize, checksum, filename):
         """
         This method uses :meth:`musicdb.mdbapi.uploadmanager.UploadManager.InitiateUpload`.
@@ -4341,6 +4485,7 @@ class MusicDBWebSocketInterface(object):
         return taskid
 
 
+    @WebSocketCall("UploadChunk", arguments=["taskid", "chunkdata"], access="write")
     def UploadChunk(self, taskid, chunkdata):
         """
         Args:
@@ -4355,6 +4500,7 @@ class MusicDBWebSocketInterface(object):
         return
 
 
+    @WebSocketCall("GetCurrentTasks")
     def GetCurrentTasks(self):
         """
         This method gets all tasks from the :mod:`~musicdb.taskmanagement.taskmanager`.
@@ -4413,6 +4559,7 @@ class MusicDBWebSocketInterface(object):
         return retval
 
 
+    @WebSocketCall("AnnotateUpload", arguments=["taskid"], argsparameter="annotations", access="write")
     def AnnotateUpload(self, taskid, annotations):
         """
         Adds some information to an uploaded file that can help during the import process.
@@ -4434,6 +4581,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("InitiateContentIntegration", arguments=["taskid", "musicpath"], access="write")
     def InitiateContentIntegration(self, taskid, musicpath):
         """
         This method integrates uploaded content into the Music Directory.
@@ -4458,6 +4606,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("InitiateMusicImport", arguments=["contenttype", "contentpath"], access="write")
     def InitiateMusicImport(self, contenttype, contentpath):
         """
         This method uses :meth:`musicdb.mdbapi.importmanager.ImportManager.InitiateImport` to prepare and start an import task.
@@ -4502,6 +4651,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("InitiateArtworkImport", arguments=["sourcepath", "targetpath"], access="write")
     def InitiateArtworkImport(self, sourcepath, targetpath):
         """
         Similar to :meth:`~InitiateMusicImport`, but uses
@@ -4523,6 +4673,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("InitiateFilesystemScan", access="write")
     def InitiateFilesystemScan(self):
         """
         This method can be used to scan the file system and find lost paths inside the database.
@@ -4569,6 +4720,7 @@ class MusicDBWebSocketInterface(object):
 
 
 
+    @WebSocketCall("RemoveUpload", arguments=["taskid"], access="write")
     def RemoveUpload(self, taskid):
         """
         This method triggers removing a specific upload.
@@ -4586,5 +4738,8 @@ class MusicDBWebSocketInterface(object):
         return
 
 
+
+ValidateCallRegistry()
+
 # vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
 
@@ -16,6 +16,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 This module provides the server infrastructure of the server.
+
+The server runs an asyncio event loop via :meth:`~musicdb.lib.ws.server.MusicDBWebSocketServer.Run` until
+:meth:`~musicdb.lib.ws.server.MusicDBWebSocketServer.StopEventLoop` gets called.
+So incoming messages get handled as soon as they arrive.
+Other threads must not access the connections directly.
+They have to schedule their work inside the event loop (see :meth:`musicdb.lib.ws.websocket.MusicDBWebSocketFactory.CallInEventLoop`).
 """
 
 from musicdb.lib.ws.websocket           import WebSocket, MusicDBWebSocketFactory
@@ -67,7 +73,7 @@ class MusicDBWebSocketServer(object):
             logging.warning("Expected to get an event loop from asyncio. Got none, so I create and set a new one!")
             self.eventloop = asyncio.new_event_loop()
             asyncio.set_event_loop(self.eventloop)
-        self.factory    = MusicDBWebSocketFactory()
+        self.factory    = MusicDBWebSocketFactory(self.eventloop)
         self.factory.protocol = MusicDBWebSocketProtocol
         self.coro       = None
         self.server     = None
@@ -170,10 +176,12 @@ class MusicDBWebSocketServer(object):
         return True
 
 
-    def HandleEvents(self):
+    def Run(self):
         """
-        This method handles the events inside the *Autobahn* internal event loop.
-        It should be called in a loop as long as the server shall work.
+        This method runs the event loop that handles all WebSocket connections.
+        It blocks until :meth:`~StopEventLoop` gets called.
+
+        Signal handlers can be installed via the ``add_signal_handler`` method of the event loop (``self.eventloop``) before calling this method.
 
         Returns:
             *Nothing*
@@ -182,16 +190,23 @@ class MusicDBWebSocketServer(object):
 
             .. code-block:: python
 
-                    while True:
-                        server.HandleEvents()
-                        
-                        if shutdown:
-                            server.Stop()
-                            break
+                server.eventloop.add_signal_handler(signal.SIGTERM, server.StopEventLoop)
+                server.Run()    # Returns after SIGTERM
+                server.Stop()
+        """
+        self.eventloop.run_forever()
+
+
 
-                        time.sleep(.1)  # Avoid high CPU load
+    def StopEventLoop(self):
+        """
+        This method lets :meth:`~Run` return.
+        It can be called from any thread as well as from a signal handler.
+
+        Returns:
+            *Nothing*
         """
-        self.eventloop.run_until_complete(self.task)
+        self.eventloop.call_soon_threadsafe(self.eventloop.stop)
 
 
     def Stop(self):
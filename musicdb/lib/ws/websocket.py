@@ -21,33 +21,184 @@ Most interesting are the following methods:
     * :meth:`~musicdb.lib.ws.websocket.WebSocket.SendPacket`
     * :meth:`~musicdb.lib.ws.websocket.WebSocket.BroadcastPacket`
     * :meth:`~musicdb.lib.ws.websocket.WebSocket.onMessage`
+
+The WebSocket connections are handled by an asyncio event loop running in the main thread of the server.
+Autobahn is not thread safe, but packets also get sent from other threads, for example by the callbacks of the streaming threads.
+Therefore :meth:`~musicdb.lib.ws.websocket.WebSocket.SendPacket` and :meth:`~musicdb.lib.ws.websocket.MusicDBWebSocketFactory.BroadcastPacket`
+hand over the sending to the event loop via :meth:`~musicdb.lib.ws.websocket.MusicDBWebSocketFactory.CallInEventLoop`
+when they get called outside of the event loop.
+
+The packets get encoded by the codec negotiated for each connection (see :mod:`musicdb.lib.ws.codec`).
+By default this is JSON, sent as text messages.
+
+Broadcasts get serialized only once per codec.
+The encoded packet gets prepared as WebSocket message via Autobahns ``prepareMessage`` and the same prepared message gets sent to all clients using this codec.
+
+Notifications that can occur in bursts (like the time updates of the audio stream)
+can be sent via :meth:`~musicdb.lib.ws.websocket.WebSocket.SendCoalescedPacket`.
+Then, for each client, only the latest packet of a burst gets sent when ``[websocket]->coalescetime`` is greater than ``0``.
+
+Compression
+-----------
+
+When ``[websocket]->compression`` is ``True``, the server accepts the *permessage-deflate* extension offered by the clients.
+Only messages with at least ``[websocket]->compressionthreshold`` bytes get compressed.
+Small messages like notifications would not get much smaller, but compressing them costs time.
+
+The factory counts the bytes of all sent messages before compression and the bytes that got written to the connections.
+They can be read via :meth:`~musicdb.lib.ws.websocket.MusicDBWebSocketFactory.GetTrafficStatistics`.
 """
 
-import json
 import time
+import asyncio
 import traceback
 import logging
 
 import txaio
 txaio.use_asyncio()
 from autobahn.asyncio.websocket import WebSocketServerProtocol, WebSocketServerFactory
+from autobahn.websocket.compress import PerMessageDeflateOffer, PerMessageDeflateOfferAccept
+from musicdb.lib.ws.codec       import JSON, SelectCodec
 
 
 class MusicDBWebSocketFactory(WebSocketServerFactory):
     """
     Derived from ``WebSocketServerFactory``.
     Implements some basic configuration and a broadcasting infrastructure to send packets to all connected clients.
+
+    Args:
+        eventloop: The asyncio event loop the connections get handled in. If ``None``, the current event loop gets used.
     """
-    def __init__(self):
-        WebSocketServerFactory.__init__(self)
+    def __init__(self, eventloop=None):
+        WebSocketServerFactory.__init__(self, loop=eventloop)
         logging.debug("Using WebSocket module " + str(self.server))
         from musicdb.mdbapi.server import cfg
 
         self.openHandshakeTimeout   = cfg.websocket.opentimeout
         self.closeHandshakeTimeout  = cfg.websocket.closetimeout
+        self.coalescetime           = cfg.websocket.coalescetime
+        self.compressionthreshold   = cfg.websocket.compressionthreshold
+
+        if cfg.websocket.compression:
+            self.setProtocolOptions(perMessageCompressionAccept=self.AcceptCompressionOffers)
 
+        self.eventloop  = self.loop
         self.clients    = []    # for broadcast
 
+        self.statistics = {}
+        self.statistics["messages"]     = 0 # Number of sent messages
+        self.statistics["compressed"]   = 0 # Number of messages that were allowed to be compressed
+        self.statistics["payloadbytes"] = 0 # Size of all sent messages before compression
+        self.statistics["wirebytes"]    = 0 # Bytes written to closed connections
+        self.statistics["connections"]  = 0
+        self.statistics["deflate"]      = 0 # Connections that negotiated permessage-deflate
+
+
+
+    def AcceptCompressionOffers(self, offers):
+        """
+        This method gets called by Autobahn during the opening handshake with the compression extensions offered by the client.
+        The first *permessage-deflate* offer gets accepted.
+
+        Args:
+            offers (list): Offers of the client
+
+        Returns:
+            A ``PerMessageDeflateOfferAccept`` object, or ``None`` when there is no *permessage-deflate* offer
+        """
+        for offer in offers:
+            if isinstance(offer, PerMessageDeflateOffer):
+                return PerMessageDeflateOfferAccept(offer)
+        return None
+
+
+
+    def ShallCompress(self, rawdata, receivers=1):
+        """
+        Decides if a message shall be compressed, and counts the message for the traffic statistics.
+        Messages smaller than ``[websocket]->compressionthreshold`` do not get compressed.
+
+        Args:
+            rawdata (bytes): The encoded message
+            receivers (int): Number of clients the message gets sent to
+
+        Returns:
+            ``True`` when the message shall be compressed, otherwise ``False``
+        """
+        compress = len(rawdata) >= self.compressionthreshold
+        self.statistics["messages"]     += receivers
+        self.statistics["payloadbytes"] += receivers * len(rawdata)
+        if compress:
+            self.statistics["compressed"] += receivers
+        return compress
+
+
+
+    def GetTrafficStatistics(self):
+        """
+        Returns the statistics of the sent messages.
+        The returned dictionary has the following keys:
+
+            * ``"messages"`` (int): Number of sent messages
+            * ``"compressed"`` (int): Number of messages that were large enough to get compressed
+            * ``"payloadbytes"`` (int): Size of all messages before compression
+            * ``"wirebytes"`` (int): Bytes written to the connections, including the WebSocket frame headers
+            * ``"connections"`` (int): Number of established connections
+            * ``"deflate"`` (int): Number of connections that use *permessage-deflate*
+
+        The connections count their traffic themselves.
+        So messages to connections that are still open are counted as wire bytes as well.
+
+        Returns:
+            A dictionary with the statistics
+        """
+        statistics = dict(self.statistics)
+        for client in self.clients:
+            statistics["wirebytes"] += client.GetWireBytes()
+        return statistics
+
+
+
+    def IsEventLoopThread(self):
+        """
+        Checks if the calling thread is the one that runs the event loop of the WebSocket connections.
+
+        Returns:
+            ``True`` when called from inside the running event loop, otherwise ``False``
+        """
+        try:
+            return asyncio.get_running_loop() is self.eventloop
+        except RuntimeError:
+            return False
+
+
+
+    def CallInEventLoop(self, callback, *args):
+        """
+        This method calls *callback* with the given arguments inside the event loop.
+        When called from the event loop thread, the callback gets called immediately.
+        Otherwise the call gets scheduled via the thread safe ``call_soon_threadsafe`` method of the event loop
+        and this method returns without waiting for the call.
+        This wakes up the event loop immediately.
+
+        Args:
+            callback: A callable object
+            args: Arguments for the callback
+
+        Returns:
+            *Nothing*
+        """
+        if self.IsEventLoopThread():
+            callback(*args)
+            return
+
+        try:
+            self.eventloop.call_soon_threadsafe(callback, *args)
+        except RuntimeError as e:
+            # The event loop is already closed
+            logging.debug("Cannot call %s in event loop: %s \033[1;30m(Call will be ignored)", str(callback), str(e))
+        return
+
 
 
     def AddToBroadcast(self, client):
@@ -85,6 +236,10 @@ class MusicDBWebSocketFactory(WebSocketServerFactory):
 
         The ``method`` value in the packet gets forced to ``"broadcast"``.
 
+        The packet gets encoded only once for all clients.
+
+        This method can be called from any thread (see :meth:`~CallInEventLoop`).
+
         Args:
             packet: A packet dictionary that shall be send to all clients
 
@@ -93,12 +248,34 @@ class MusicDBWebSocketFactory(WebSocketServerFactory):
         """
         packet["method"] = "broadcast"
         logging.debug("Sending Broadcast Message. \033[1;30m(fncname = %s, fncsig = %s)", packet["fncname"], packet["fncsig"])
+        rawdata = JSON.Encode(packet)   # Most clients use JSON
+        self.CallInEventLoop(self.__SendToClients, packet, rawdata)
+
+
 
+    def __SendToClients(self, packet, jsondata):
+        if not self.clients:
+            return
+
+        # Group clients by codec
+        receivers = {}
         for client in self.clients:
+            receivers.setdefault(client.codec, []).append(client)
+
+        for codec, clients in receivers.items():
             try:
-                client.SendPacket(packet)
+                rawdata  = jsondata if codec is JSON else codec.Encode(packet)
+                compress = self.ShallCompress(rawdata, len(clients))
+                message  = self.prepareMessage(rawdata, isBinary=codec.isbinary, doNotCompress=not compress)
             except Exception as e:
-                logging.warning("Sending broadcast packet failed for one client with error: %s\033[1;30m (Ignoring that client)", str(e))
+                logging.warning("Encoding broadcast packet with %s failed with error: %s\033[1;30m (Ignoring %i clients)", codec.backend, str(e), len(clients))
+                continue
+
+            for client in clients:
+                try:
+                    client.SendPreparedMessage(message)
+                except Exception as e:
+                    logging.warning("Sending broadcast packet failed for one client with error: %s\033[1;30m (Ignoring that client)", str(e))
 
 
     def CloseConnections(self):
@@ -125,6 +302,8 @@ class WebSocket(WebSocketServerProtocol):
     def __init__(self):
         WebSocketServerProtocol.__init__(self)
         self.connected = False
+        self.codec     = JSON       # Selected in onConnect
+        self.coalescewindows = {}   # (fncname, fncsig) -> latest message during the coalescing time, or None
 
 
 
@@ -205,10 +384,14 @@ class WebSocket(WebSocketServerProtocol):
             .. code-block:: python
 
                 #packet  = self.BeautifyValues(packet, "name", "∕", "/");
-                rawdata = json.dumps(packet)        # Python Dict to JSON string
-                rawdata = rawdata.encode("utf-8")   # Encode as UTF-8
-                self.sendMessage(rawdata, False)    # isBinary = False
+                rawdata = self.codec.Encode(packet)             # Python Dict to JSON or MessagePack
+                self.sendMessage(rawdata, self.codec.isbinary)  # JSON gets sent as text
         
+        This method can be called from any thread.
+        When it gets called outside of the event loop, the packet gets encoded by the calling thread
+        and the actual sending gets scheduled in the event loop (see :meth:`musicdb.lib.ws.websocket.MusicDBWebSocketFactory.CallInEventLoop`).
+        In this case ``True`` gets returned when the packet got scheduled.
+
         There is a race condition allowing calling ``SendPacket`` before the connection process is complete.
         To prevent problems, this method returns ``False`` if the connection is not established yet.
         Further more the state of the connection gets checked.
@@ -250,9 +433,116 @@ class WebSocket(WebSocketServerProtocol):
 
         #packet  = self.BeautifyValues(packet, "name", "∕",   "/");
         #packet  = self.BeautifyValues(packet, "name", " - ", " – ");
-        rawdata = json.dumps(packet)
-        rawdata = rawdata.encode("utf-8")
-        
+        rawdata = self.codec.Encode(packet)
+
+        if not self.factory.IsEventLoopThread():
+            self.factory.CallInEventLoop(self.__SendMessage, rawdata)
+            return True
+        return self.__SendMessage(rawdata)
+
+
+
+    def SendCoalescedPacket(self, packet):
+        """
+        This method works like :meth:`~SendPacket`, but bursts of packets with the same ``fncname`` and ``fncsig`` get combined.
+        When no such packet was sent during the last ``[websocket]->coalescetime`` milliseconds, the packet gets sent immediately.
+        Otherwise it gets delayed until the end of this time.
+        When further packets arrive in the meanwhile, only the latest one gets sent.
+
+        So this method must only be used for packets that describe a state, where only the latest one is relevant.
+
+        If the coalescing time is ``0``, this method is the same as :meth:`~SendPacket`.
+
+        Args:
+            packet: A packet dictionary that will be send to the client
+
+        Returns:
+            ``True`` on success, otherwise ``False``
+        """
+        if self.factory.coalescetime <= 0:
+            return self.SendPacket(packet)
+
+        if type(packet) != dict:
+            raise TypeError("Expecting a dictionary")
+
+        if self.connected == False:
+            logging.warning("Socket not conneced! \033[1;30m(message will be discard) %s", str(self))
+            return False
+
+        key     = (packet["fncname"], packet["fncsig"])
+        rawdata = self.codec.Encode(packet)
+        self.factory.CallInEventLoop(self.__CoalesceMessage, key, rawdata)
+        return True
+
+
+
+    def __CoalesceMessage(self, key, rawdata):
+        if key in self.coalescewindows:
+            self.coalescewindows[key] = rawdata     # Replace older messages of this burst
+            return
+
+        self.__SendMessage(rawdata)
+        self.__OpenCoalesceWindow(key)
+
+
+
+    def __OpenCoalesceWindow(self, key):
+        self.coalescewindows[key] = None
+        self.factory.eventloop.call_later(self.factory.coalescetime / 1000, self.__CloseCoalesceWindow, key)
+
+
+
+    def __CloseCoalesceWindow(self, key):
+        rawdata = self.coalescewindows.pop(key, None)
+        if rawdata == None:
+            return
+
+        # There was a burst. Send its latest message and keep combining further messages.
+        if self.connected:
+            self.__SendMessage(rawdata)
+            self.__OpenCoalesceWindow(key)
+
+
+
+    def SendPreparedMessage(self, message):
+        """
+        Sends a message prepared via Autobahns ``prepareMessage`` method of the factory.
+        This method must be called inside the event loop.
+        It is used by :meth:`musicdb.lib.ws.websocket.MusicDBWebSocketFactory.BroadcastPacket`.
+
+        Args:
+            message: A prepared message
+
+        Returns:
+            ``True`` on success, otherwise ``False``
+        """
+        if not self.__IsOpen():
+            return False
+
+        try:
+            self.sendPreparedMessage(message)
+        except Exception as e:
+            logging.warning("Unexpected error while trying to send a message: %s! \033[0;33m(message will be discard)", str(e))
+            return False
+        return True
+
+
+
+    def __SendMessage(self, rawdata):
+        if not self.__IsOpen():
+            return False
+
+        compress = self.factory.ShallCompress(rawdata)
+        try:
+            self.sendMessage(rawdata, self.codec.isbinary, doNotCompress=not compress)
+        except Exception as e:
+            logging.warning("Unexpected error while trying to send a message: %s! \033[0;33m(message will be discard)", str(e))
+            return False
+        return True
+
+
+
+    def __IsOpen(self):
         if not hasattr(self, "state"):
             # This can hatten in some strange situation where Autobahn seems to be in a half-connected state.
             # Usually this should never happen, but happend at least once.
@@ -268,15 +558,22 @@ class WebSocket(WebSocketServerProtocol):
             # STATE_CLOSING = 2
             # STATE_OPEN = 3
             return False
-
-        try:
-            self.sendMessage(rawdata, False)
-        except Exception as e:
-            logging.warning("Unexpected error while trying to send a message: %s! \033[0;33m(message will be discard)", str(e))
-            return False
         return True
 
 
+    def GetWireBytes(self):
+        """
+        Returns the number of bytes written to the connection after the opening handshake, as counted by Autobahn.
+
+        Returns:
+            Number of bytes
+        """
+        trafficstats = getattr(self, "trafficStats", None)
+        if trafficstats == None:
+            return 0
+        return trafficstats.outgoingOctetsWireLevel
+
+
     def BroadcastPacket(self, packet):
         """
         This method works line :meth:`~musicdb.lib.ws.websocket.WebSocket.SendPacket` only that the packet gets send to all clients.
@@ -295,15 +592,20 @@ class WebSocket(WebSocketServerProtocol):
 
     def onConnect(self, request):
         """
-        Just prints the IP address of the connecting client.
-        See  for details.
-        `ConnectionRequest in the Autobahn documentation <https://autobahn.readthedocs.io/en/latest/reference/autobahn.websocket.html?highlight=ConnectionRequest#autobahn.websocket.types.ConnectionRequest>`_ for details.
+        Prints the IP address of the connecting client and selects the codec for the packets
+        via :meth:`musicdb.lib.ws.codec.SelectCodec` from the subprotocols offered by the client.
+        See `ConnectionRequest in the Autobahn documentation <https://autobahn.readthedocs.io/en/latest/reference/autobahn.websocket.html?highlight=ConnectionRequest#autobahn.websocket.types.ConnectionRequest>`_ for details.
 
         Returns:
-            *Nothing*
+            The accepted subprotocol, or ``None`` if the client did not offer a supported one
         """
         logging.debug("Client connecting fron: %s"%(str(request.peer)))
-        return
+        self.codec = SelectCodec(request.protocols)
+        logging.debug("Using %s codec for the connection", self.codec.backend)
+
+        if self.codec.subprotocol in request.protocols:
+            return self.codec.subprotocol
+        return None
 
 
     def onOpen(self):
@@ -314,7 +616,14 @@ class WebSocket(WebSocketServerProtocol):
         This method calls an ``onWSConnect()`` Method that must be implemented by the programmer who uses this class.
         """
         logging.info("Websocket connection established.")
+        extensions = [extension.EXTENSION_NAME for extension in self.websocket_extensions_in_use]
+        if extensions:
+            logging.debug("Extensions in use: %s", ", ".join(extensions))
+
         self.connected = True
+        self.factory.statistics["connections"] += 1
+        if PerMessageDeflateOffer.EXTENSION_NAME in extensions:
+            self.factory.statistics["deflate"] += 1
         self.factory.AddToBroadcast(self)
         self.onWSConnect()
         return
@@ -331,6 +640,7 @@ class WebSocket(WebSocketServerProtocol):
         if self.connected:
             self.connected = False
             self.factory.RemoveFromBroadcast(self)
+            self.factory.statistics["wirebytes"] += self.GetWireBytes()
             self.onWSDisconnect(wasClean, code, reason)
 
         if code == WebSocketServerProtocol.CLOSE_STATUS_CODE_NORMAL:
@@ -364,39 +674,37 @@ class WebSocket(WebSocketServerProtocol):
 
             .. code-block:: python
 
-                # Check if payload is text
-                if isBinary == True:
+                # Check if payload is text (or binary for MessagePack)
+                if isBinary != self.codec.isbinary:
                     return None
 
                 # Create packet
-                rawdata = payload.decode("utf-8")
-                packet  = json.loads(rawdata)
+                packet  = self.codec.Decode(payload)
 
                 # Provide packet to high level interface
                 self.onCall(packet)
 
         Args:
             payload: The payload of a WebSocket message received from a client
-            isBinary: ``True`` if binary data got received, False`` when text. This implementation allows only text.
+            isBinary: ``True`` if binary data got received, ``False`` when text. Binary data is only allowed when MessagePack is used.
 
         Return:
             ``None``
         """
 
-        # I do not expect binary data
-        if isBinary == True:
-            logging.warning("Got a binary encoded message. \033[0;33m(Message will be ignored)")
+        # Binary data is only expected for binary codecs like MessagePack
+        if isBinary != self.codec.isbinary:
+            logging.warning("Got a %s message but expected %s messages. \033[0;33m(Message will be ignored)",
+                    "binary" if isBinary else "text", "binary" if self.codec.isbinary else "text")
             return None
 
         try:
-            rawdata = payload.decode("utf-8")
-        except:
+            packet = self.codec.Decode(payload)
+        except Exception as e:
             # hm… better do nothing :D
-            logging.warning("Got a none utf-8 encoded message. \033[0;33m(Message will be ignored)")
+            logging.warning("Got a message that cannot be decoded by the %s codec: %s \033[0;33m(Message will be ignored)", self.codec.backend, str(e))
             return None
 
-        packet = json.loads(rawdata)
-
         # Handle packet
         try:
             self.onCall(packet)
@@ -325,12 +325,116 @@ class DatabaseTools(Database):
         return;
 
 
+    def CreateIndex(self, indexname, tablename, columns):
+        """
+        Creates a new index *indexname* on the table *tablename* covering the given *columns*.
+        The order of the columns is relevant for the query planner.
+
+        When the index exists, nothing happens.
+        This function executed the following statement:
+
+        .. code-block:: sql
+
+            CREATE INDEX IF NOT EXISTS indexname ON tablename (column1, column2, …);
+
+        Example:
+
+            .. code-block:: python
+
+                database.CreateIndex("songs_albumid", "songs", ["albumid"])
+
+        Args:
+            indexname (str): Name of the new index
+            tablename (str): Name of the table the index belongs to
+            columns (list): A list of column names (str) the index covers
+
+        Returns:
+            *Nothing*
+
+        Raises:
+            TypeError: When *indexname* or *tablename* are not of type string, or *columns* not a list
+            ValueError: When *indexname* or *tablename* is an empty string, or *columns* an empty list
+        """
+        if type(indexname) != str or type(tablename) != str:
+            raise TypeError("Index and table name must be of type string")
+        if type(columns) != list:
+            raise TypeError("Columns must be a list of column names")
+        if indexname == "" or tablename == "" or len(columns) == 0:
+            raise ValueError("Index name, table name and columns must not be empty")
+
+        sql  = "CREATE INDEX IF NOT EXISTS " + indexname
+        sql += " ON " + tablename
+        sql += " (" + ", ".join(columns) + ");"
+
+        self.Execute(sql)
+        return
+
+
+    def CreateTrigger(self, triggername, tablename, event, statement, condition=None):
+        """
+        Creates a new trigger *triggername* that executes *statement* after *event* on the table *tablename*.
+        If a *condition* is given, the statement only gets executed when the condition is true.
+
+        When the trigger exists, nothing happens.
+        This function executed the following statement:
+
+        .. code-block:: sql
+
+            CREATE TRIGGER IF NOT EXISTS triggername AFTER event ON tablename WHEN condition
+            BEGIN
+                statement;
+            END;
+
+        Example:
+
+            .. code-block:: python
+
+                database.CreateTrigger("songs_namechanges_update", "songs", "UPDATE OF name",
+                        "UPDATE meta SET value = value + 1 WHERE key = 'namechanges'",
+                        "OLD.name IS NOT NEW.name")
+
+        Args:
+            triggername (str): Name of the new trigger
+            tablename (str): Name of the table the trigger belongs to
+            event (str): ``"INSERT"``, ``"DELETE"``, ``"UPDATE"`` or ``"UPDATE OF column"``
+            statement (str): The SQL statement that shall be executed (without trailing semicolon)
+            condition (str): Optional condition for executing the statement
+
+        Returns:
+            *Nothing*
+
+        Raises:
+            TypeError: When *triggername*, *tablename*, *event* or *statement* are not of type string
+            ValueError: When *triggername*, *tablename*, *event* or *statement* is an empty string
+        """
+        for argument in [triggername, tablename, event, statement]:
+            if type(argument) != str:
+                raise TypeError("Trigger name, table name, event and statement must be of type string")
+            if argument == "":
+                raise ValueError("Trigger name, table name, event and statement must not be empty")
+
+        sql  = "CREATE TRIGGER IF NOT EXISTS " + triggername
+        sql += " AFTER " + event
+        sql += " ON " + tablename
+        if condition:
+            sql += " WHEN " + condition
+        sql += " BEGIN " + statement + "; END;"
+
+        self.Execute(sql)
+        return
+
+
     def Backup(self):
         """
         Creates a backup of the database file.
         The path of the backup will be the same as the source file.
         It gets the following extension: ``.YYYY-MM-DDTHH:MM.bak``
 
+        The databases run in WAL mode (see :mod:`musicdb.lib.db.database`).
+        Committed changes may still be in the ``-wal`` file next to the database file.
+        Therefore the backup gets created with the backup API of SQLite instead of copying the database file.
+        This includes all committed changes, even while other processes use the database.
+
         Returns:
             *Nothing*
         """
@@ -339,8 +443,11 @@ class DatabaseTools(Database):
         backuppath += datetime.now().isoformat(timespec='minutes')
         backuppath += ".bak"
 
-        fs = Filesystem()
-        fs.CopyFile(self.databasepath, backuppath)
+        backup = sqlite3.connect(backuppath)
+        try:
+            self.db_connection.backup(backup)
+        finally:
+            backup.close()
         return
 
 # vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
@@ -50,6 +50,7 @@ class DataDirectoryMaintainer(object):
         self.AddDirectory(self.config.directories.uploads, self.user, self.group, "rwxr-x---")
         self.AddDirectory(self.config.directories.tasks,   self.user, self.group, "rwxr-x---")
         self.AddDirectory(self.config.directories.config,  self.user, self.group, "rwxr-xr-x")
+        self.AddDirectory(self.config.directories.mp3cache,self.user, self.group, "rwxr-x---")
 
         # Collect all files (expected directory, initial file source)
         sourcedir = self.config.directories.share
@@ -71,6 +71,12 @@ class MusicDatabaseMaintainer(DatabaseMaintainer):
             return
         if actualversion < 5:
             self.UpgradeTo5()
+        if actualversion < 6:
+            self.UpgradeTo6()
+        if actualversion < 7:
+            self.UpgradeTo7()
+        if actualversion < 8:
+            self.UpgradeTo8()
         return
 
 
@@ -120,5 +126,102 @@ class MusicDatabaseMaintainer(DatabaseMaintainer):
         return
 
 
+
+    def UpgradeTo6(self):
+        """
+        Creates secondary indexes for the ID, path and tag ID look ups.
+        Without them, looking up the songs of an album or the tags of a song required a full table scan.
+        The tag-map indexes cover the target ID and tag ID, so that tag queries can be answered from the index only.
+        """
+        dbtool = self.GetDatabaseTool()
+        dbtool.CreateIndex("artists_path     ", "artists",   ["path"]);
+        dbtool.CreateIndex("albums_artistid  ", "albums",    ["artistid", "hidden"]);
+        dbtool.CreateIndex("albums_path      ", "albums",    ["path"]);
+        dbtool.CreateIndex("songs_albumid    ", "songs",     ["albumid"]);
+        dbtool.CreateIndex("songs_artistid   ", "songs",     ["artistid"]);
+        dbtool.CreateIndex("songs_path       ", "songs",     ["path"]);
+        dbtool.CreateIndex("videos_artistid  ", "videos",    ["artistid"]);
+        dbtool.CreateIndex("videos_path      ", "videos",    ["path"]);
+        dbtool.CreateIndex("lyrics_songid    ", "lyrics",    ["songid"]);
+        dbtool.CreateIndex("tags_parentid    ", "tags",      ["parentid"]);
+        dbtool.CreateIndex("albumtags_albumid", "albumtags", ["albumid", "tagid"]);
+        dbtool.CreateIndex("albumtags_tagid  ", "albumtags", ["tagid", "albumid"]);
+        dbtool.CreateIndex("songtags_songid  ", "songtags",  ["songid", "tagid"]);
+        dbtool.CreateIndex("songtags_tagid   ", "songtags",  ["tagid", "songid"]);
+        dbtool.CreateIndex("videotags_videoid", "videotags", ["videoid", "tagid"]);
+        dbtool.CreateIndex("videotags_tagid  ", "videotags", ["tagid", "videoid"]);
+
+        dbtool.SetDatabaseVersion(6)
+        return
+
+
+
+    def UpgradeTo7(self):
+        """
+        Adds the ``namechanges`` counter to the *meta* table and the triggers that increment it.
+        The counter gets incremented whenever an artist, album or song gets added, removed or renamed.
+        It is used to validate the persistent search index of the MusicDB server.
+        """
+        dbtool = self.GetDatabaseTool()
+        dbtool.Execute("INSERT INTO meta (key, value) VALUES ('namechanges', 0)")
+
+        counter = "UPDATE meta SET value = value + 1 WHERE key = 'namechanges'"
+        for table in ["artists", "albums", "songs"]:
+            dbtool.CreateTrigger(table + "_namechanges_insert", table, "INSERT", counter)
+            dbtool.CreateTrigger(table + "_namechanges_delete", table, "DELETE", counter)
+            dbtool.CreateTrigger(table + "_namechanges_update", table, "UPDATE OF name", counter, "OLD.name IS NOT NEW.name")
+
+        dbtool.SetDatabaseVersion(7)
+        return
+
+
+
+    def UpgradeTo8(self):
+        """
+        Creates the FTS5 table *fulltext* for the full-text search through lyrics and names of songs, albums and artists.
+        The table gets filled with all songs and the triggers that keep it up to date get created.
+        """
+        dbtool = self.GetDatabaseTool()
+        dbtool.Execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS fulltext USING fts5
+            (songname, albumname, artistname, lyrics, tokenize = 'unicode61 remove_diacritics 2')
+            """)
+        dbtool.Execute("""
+            INSERT INTO fulltext (rowid, songname, albumname, artistname, lyrics)
+            SELECT songs.songid, songs.name, albums.name, artists.name, lyrics.lyrics FROM songs
+            LEFT JOIN albums  ON albums.albumid   = songs.albumid
+            LEFT JOIN artists ON artists.artistid = songs.artistid
+            LEFT JOIN lyrics  ON lyrics.songid    = songs.songid
+            """)
+
+        albumname  = "(SELECT name FROM albums  WHERE albumid  = NEW.albumid)"
+        artistname = "(SELECT name FROM artists WHERE artistid = NEW.artistid)"
+        songlyrics = "(SELECT lyrics FROM lyrics WHERE songid  = NEW.songid)"
+        dbtool.CreateTrigger("songs_fulltext_insert  ", "songs", "INSERT",
+                "INSERT INTO fulltext (rowid, songname, albumname, artistname, lyrics) VALUES (NEW.songid, NEW.name, "
+                + albumname + ", " + artistname + ", " + songlyrics + ")")
+        dbtool.CreateTrigger("songs_fulltext_delete  ", "songs", "DELETE",
+                "DELETE FROM fulltext WHERE rowid = OLD.songid")
+        dbtool.CreateTrigger("songs_fulltext_update  ", "songs", "UPDATE OF name, albumid, artistid",
+                "UPDATE fulltext SET songname = NEW.name, albumname = " + albumname + ", artistname = " + artistname
+                + " WHERE rowid = NEW.songid",
+                "OLD.name IS NOT NEW.name OR OLD.albumid IS NOT NEW.albumid OR OLD.artistid IS NOT NEW.artistid")
+        dbtool.CreateTrigger("albums_fulltext_update ", "albums", "UPDATE OF name",
+                "UPDATE fulltext SET albumname = NEW.name WHERE rowid IN (SELECT songid FROM songs WHERE albumid = NEW.albumid)",
+                "OLD.name IS NOT NEW.name")
+        dbtool.CreateTrigger("artists_fulltext_update", "artists", "UPDATE OF name",
+                "UPDATE fulltext SET artistname = NEW.name WHERE rowid IN (SELECT songid FROM songs WHERE artistid = NEW.artistid)",
+                "OLD.name IS NOT NEW.name")
+        dbtool.CreateTrigger("lyrics_fulltext_insert ", "lyrics", "INSERT",
+                "UPDATE fulltext SET lyrics = NEW.lyrics WHERE rowid = NEW.songid")
+        dbtool.CreateTrigger("lyrics_fulltext_update ", "lyrics", "UPDATE OF lyrics",
+                "UPDATE fulltext SET lyrics = NEW.lyrics WHERE rowid = NEW.songid")
+        dbtool.CreateTrigger("lyrics_fulltext_delete ", "lyrics", "DELETE",
+                "UPDATE fulltext SET lyrics = NULL WHERE rowid = OLD.songid")
+
+        dbtool.SetDatabaseVersion(8)
+        return
+
+
 # vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
 
@@ -29,7 +29,7 @@ from musicdb.maintain.sslcert           import CertificateTools
 def AssertDatabases(musicdbpath, trackerdbpath, validate=False):
     logging.info("Checking \033[0;36mDatabases")
     # 2nd argument is the expected version number
-    musicdbmaintainer   = MusicDatabaseMaintainer(  musicdbpath,   5)
+    musicdbmaintainer   = MusicDatabaseMaintainer(  musicdbpath,   8)
     trackerdbmaintainer = TrackerDatabaseMaintainer(trackerdbpath, 4)
 
     # Validate Databases - Create them if they do not exist
@@ -62,6 +62,32 @@ It contains the following information:
     * ``isconnected`` (bool): ``True`` when connected to Icecast, otherwise ``False``
     * ``isplaying`` (bool): ``True`` when streaming, otherwise ``False``
 
+Look-Ahead Transcoding
+^^^^^^^^^^^^^^^^^^^^^^
+
+While a song gets streamed, the next song in the Song Queue already gets transcoded
+into a :class:`~musicdb.lib.stream.mp3stream.BufferedMP3Stream`.
+So starting the GStreamer pipeline for the next song does not lead to a gap between the two songs.
+When the current song ends, the prepared stream gets used if it still belongs to the new current queue entry.
+
+Whenever the Song Queue changes (for example by :meth:`musicdb.mdbapi.songqueue.SongQueue.MoveSong` or
+:meth:`musicdb.mdbapi.songqueue.SongQueue.RemoveSong`), the thread checks if the next entry is still the prepared one.
+If not, the look-ahead transcoding gets canceled and restarted for the new next entry.
+See :meth:`~UpdateLookAheadStream`.
+
+Transcoded songs get stored in the :doc:`/lib/mp3cache`.
+When a song is already in the cache, it does not get transcoded again.
+The size of the cache can be configured via ``[mp3cache]->size``.
+
+Further Mountpoints
+^^^^^^^^^^^^^^^^^^^
+
+Beside the main mount, further mounts with other bit rates can be configured via ``[Icecast]->extramounts``.
+All mounts get fed from the same Song Queue and the same decoding process.
+The songs get transcoded into all bit rates at once (see :class:`~musicdb.lib.stream.mp3stream.MP3Stream`)
+and :class:`~musicdb.lib.stream.icecast.IcecastInterface` sends the data of all bit rates chunk by chunk.
+So all mounts stay in sync.
+
 
 Audio Stream Command Queue
 --------------------------
@@ -136,6 +162,8 @@ from musicdb.lib.cfg.musicdb    import MusicDBConfig
 from musicdb.lib.db.musicdb     import MusicDatabase
 from musicdb.mdbapi.songqueue      import SongQueue
 from musicdb.mdbapi.randy       import Randy
+from musicdb.lib.stream.mp3stream import MP3Stream, BufferedMP3Stream
+from musicdb.lib.stream.mp3cache  import MP3Cache
 
 
 Config          = None
@@ -248,6 +276,8 @@ def AudioStreamingThread():
         * ``TimeChanged``: To update the current streaming progress of a song
 
     The ``TimeChanged`` event gets triggered approximately every second.
+
+    While streaming a song, the next song in the queue gets already transcoded via :meth:`~UpdateLookAheadStream`.
     """
     from musicdb.lib.stream.icecast import IcecastInterface
     from musicdb.mdbapi.tracker     import SongTracker
@@ -263,11 +293,16 @@ def AudioStreamingThread():
     filesystem = Filesystem(Config.directories.music)
     queue      = SongQueue(Config, musicdb)
     randy      = Randy(Config, musicdb)
+    mp3cache   = MP3Cache(Config.directories.mp3cache, Config.mp3cache.size * 1024**2)
+    extrabitrates = [bitrate for mountname, bitrate in Config.icecast.extramounts]
     icecast    = IcecastInterface(
             port      = Config.icecast.port,
             user      = Config.icecast.user,
             password  = Config.icecast.password,
-            mountname = Config.icecast.mountname
+            mountname = Config.icecast.mountname,
+            chunktime = Config.icecast.chunktime,
+            extramounts = [mountname for mountname, bitrate in Config.icecast.extramounts],
+            extrabitrates = extrabitrates
             )
     icecast.Mute()
 
@@ -295,6 +330,14 @@ def AudioStreamingThread():
         return
 
 
+    # Keep track of changes of the queue to update the look-ahead transcoding
+    lookahead    = None     # (entry ID, BufferedMP3Stream) of the next song in the queue
+    queuechanged = threading.Event()
+    def onSongQueueEvent(event, arg):
+        if event == "SongQueueChanged":
+            queuechanged.set()
+    queue.RegisterCallback(onSongQueueEvent)
+
     # Start streaming …
     while RunThread:
         # Sleep a bit to reduce the load on the CPU. If disconnected, sleep a bit longer
@@ -326,13 +369,27 @@ def AudioStreamingThread():
         mdbsong  = musicdb.GetSongById(queueentry["songid"])
         songpath = filesystem.AbsolutePath(mdbsong["path"])
 
+        # Use the look-ahead stream if it was prepared for this queue entry
+        mp3stream = None
+        if lookahead:
+            entryid, stream = lookahead
+            if entryid == queueentry["entryid"]:
+                logging.debug("Using look-ahead stream for %s", songpath)
+                mp3stream = stream
+            else:
+                stream.Cancel()
+            lookahead = None
+        if mp3stream == None:
+            mp3stream = MP3Stream(songpath, mdbsong["checksum"], mp3cache, extrabitrates)
+        queuechanged.set()  # Start look-ahead transcoding of the next song
+
 
         # Stream song
         icecast.UpdateTitle(mdbsong["path"])
         logging.debug("Start streaming %s", songpath)
         timeplayed    = 0
         lasttimestamp = time.time()
-        for frameinfo in icecast.StreamFile(songpath):
+        for frameinfo in icecast.StreamFile(mp3stream):
             # Send every second the estimated time position of the song.
             if not frameinfo["muted"]:
                 timeplayed += frameinfo["header"]["frametime"]
@@ -346,6 +403,11 @@ def AudioStreamingThread():
             if not RunThread:
                 break
 
+            # Make sure the next song gets prepared
+            if queuechanged.is_set():
+                queuechanged.clear()
+                lookahead = UpdateLookAheadStream(queue, lookahead, musicdb, filesystem, mp3cache, extrabitrates)
+
             # read and handle queue commands if there is one
             if len(CommandQueue) == 0:
                 continue
@@ -381,12 +443,68 @@ def AudioStreamingThread():
                 State["isconnected"] = False
                 Event_StatusChanged()
 
+        statistics = icecast.GetStatistics()
+        logging.debug("Icecast statistics: %i bytes in %i chunks sent, jitter ⌀%.1fms, max %.1fms",
+                statistics["bytes"], statistics["chunks"], statistics["jitter"], statistics["maxjitter"])
+
         # Current song completely streamed. Get next one.
         # When the song was stopped to shutdown the server, do not skip to the next one
         # In case the loop stopped because of an Icecast error, stay at the last song.
         if RunThread and icecast.IsConnected():
             queue.NextSong()
 
+    # Clean up
+    queue.RemoveCallback(onSongQueueEvent)
+    if lookahead:
+        entryid, stream = lookahead
+        stream.Cancel()
+    return
+
+
+
+def UpdateLookAheadStream(queue, lookahead, musicdb, filesystem, mp3cache=None, extrabitrates=None):
+    """
+    This function makes sure that the next song in the queue gets transcoded in advance.
+    It gets called by the :meth:`~AudioStreamingThread` whenever the Song Queue changed.
+
+    If the look-ahead stream already belongs to the next queue entry, nothing happens.
+    Otherwise the look-ahead stream gets canceled and a new one gets started for the next queue entry.
+    If there is no next entry, no new look-ahead stream gets started.
+
+    Args:
+        queue: The :class:`~musicdb.mdbapi.songqueue.SongQueue` the streamed songs come from
+        lookahead (tuple): A tuple with the queue entry ID and the :class:`~musicdb.lib.stream.mp3stream.BufferedMP3Stream` prepared for this entry, or ``None``
+        musicdb: A :class:`~musicdb.lib.db.musicdb.MusicDatabase` instance
+        filesystem: A :class:`~musicdb.lib.filesystem.Filesystem` instance relative to the music directory
+        mp3cache: An optional :class:`~musicdb.lib.stream.mp3cache.MP3Cache` instance
+        extrabitrates (list): Optional list of further bit rates the song shall be transcoded in
+
+    Returns:
+        The new look-ahead tuple or ``None``
+    """
+    entries   = queue.GetQueue()
+    nextentry = entries[1] if len(entries) > 1 else None
+
+    if lookahead:
+        entryid, stream = lookahead
+        if nextentry and entryid == nextentry["entryid"]:
+            return lookahead    # Still the correct song
+
+        logging.debug("Next song in queue changed \033[1;30m(Canceling look-ahead transcoding)")
+        stream.Cancel()
+        lookahead = None
+
+    if not nextentry:
+        return None
+
+    mdbsong = musicdb.GetSongById(nextentry["songid"])
+    if not mdbsong:
+        return None
+
+    stream = BufferedMP3Stream(filesystem.AbsolutePath(mdbsong["path"]), mdbsong["checksum"], mp3cache, extrabitrates)
+    stream.Start()
+    return (nextentry["entryid"], stream)
+
 
 
 #####################################################################
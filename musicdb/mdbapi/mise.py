@@ -21,13 +21,80 @@ This not only allows typos, it also adapts the search to the natural situation t
 Before an object can be used, the :meth:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine.UpdateCache`
 method must be called to generate the cache.
 
-The cache consists of three lists of tuples. One list for Artists, Albums and Songs.
-The Tuples contain the *ID* and the *normalized Name* (see :meth:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine.NormalizeString`).
+The cache consists of three :class:`~SearchCache` objects. One for Artists, Albums and Songs.
+They contain the *ID* and the *normalized Name* (see :meth:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine.NormalizeString`) of each entry.
 User input gets normalized as well.
 The search term comparison is applied to normalized strings and aims for best similarity.
 
-If the `Levenshtein module <https://pypi.python.org/pypi/python-Levenshtein>`_ is installed, the search through all artists, albums and song is usually done in less than 100ms.
-Without this module, you better not use this module only if time does matter.
+Trigram Index
+-------------
+
+Comparing the search string with each name of a large collection takes too long for a search-as-you-type user interface.
+Therefore an inverted index gets built for each cache.
+It maps each trigram (three successive characters) of the normalized names to the positions of the names inside the cache.
+
+Only names that share enough trigrams with the search string are candidates for the fuzzy comparison.
+A name is a candidate when at least ``MinTrigramShare`` (30%) of the trigrams of the search string
+or of the name, depending on which one has less trigrams, are shared.
+The latter covers search strings that contain a whole name, like an artist name followed by a song name.
+Names with less than three characters do not have trigrams and are always candidates.
+Search strings with less than three characters get compared with all names.
+The pruning can miss weak matches with a ratio slightly above the threshold of 80,
+for example a short search string with a typo in its middle that does not share a single trigram with the name.
+Good matches are still found.
+
+The candidates get scored with a single call of :func:`rapidfuzz.process.extract`.
+When a limit is given to :meth:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine.Find`,
+only the best matching entries get returned.
+
+The script ``scripts/BenchmarkMiSE.py`` compares the indexed search with a search through all names on a synthetic collection.
+
+Incremental Updates
+-------------------
+
+Rebuilding the whole cache requires reading and normalizing all names from the database.
+So after the initial :meth:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine.UpdateCache`,
+changes get applied via :meth:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine.AddEntries`,
+:meth:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine.RemoveEntries` and :meth:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine.RenameEntry`.
+These methods get called by :class:`musicdb.mdbapi.music.MusicDBMusic` when it adds, renames or removes artists, albums and songs.
+
+Removed entries only get marked as removed.
+When a quarter of the entries of a cache are marked, the cache gets compacted.
+This is done in memory without accessing the database.
+New entries get appended to the cache.
+So among results with the same ratio, they are listed behind the alphabetically sorted entries of the last full update.
+
+When an incremental update fails, the cache gets marked as invalid via :meth:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine.InvalidateCache`.
+:meth:`musicdb.mdbapi.server.UpdateCaches` then does a full update.
+
+Snapshot
+--------
+
+After a full update, the caches get written into the file ``mise.snapshot`` inside the state directory
+via :meth:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine.SaveSnapshot`.
+When the server starts, :meth:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine.LoadSnapshot` maps this file into memory
+instead of reading and normalizing all names from the database.
+The trigram index gets used directly from the mapped file.
+
+The snapshot contains the name change counter of the database at the time the names were read
+(see :meth:`musicdb.lib.db.musicdb.MusicDatabase.GetNameChangeCounter`).
+If the counter in the database differs, names have been changed since then and the snapshot is stale.
+In this case the caches must be updated from the database.
+
+Song Filter
+-----------
+
+The search results of the WebUI shall not contain disabled or hated songs.
+Therefore the engine keeps the set of IDs of these songs.
+When :meth:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine.Find` gets called with ``filtersongs=True``,
+these songs get removed from the candidates before they get compared with the search string.
+So a limited list of songs is not shortened by songs that get skipped afterwards.
+
+The set gets read from the database by :meth:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine.UpdateSongFilter`.
+This method also registers a callback at the :class:`~musicdb.lib.db.musicdb.MusicDatabase`
+(see :meth:`~musicdb.lib.db.musicdb.MusicDatabase.RegisterCallback`).
+Afterwards it only reloads the songs the database notified about.
+It is not part of the snapshot, because the name change counter does not cover the state of songs.
 
 Example:
 
@@ -48,12 +115,297 @@ Example:
 import unicodedata
 import re
 from rapidfuzz          import fuzz
+from rapidfuzz          import process
+from array              import array
+from collections        import Counter
+import bisect
+import os
+import mmap
+import struct
 import datetime
 import logging
+import threading
 import string as pystring # string is already used by NormalizeString where the name makes too much sense to replace it
 from musicdb.lib.db.musicdb     import MusicDatabase
 from musicdb.lib.cfg.musicdb    import MusicDBConfig
 
+MinTrigramShare = 0.3   # Minimum share of trigrams a name must have in common with the search string
+SnapshotMagic   = b"MDBMISE\0"
+SnapshotVersion = 1
+
+
+
+class SearchCache(object):
+    """
+    This class holds the normalized names of either all artists, all albums or all songs,
+    and the trigram index of these names (see `Trigram Index`_).
+
+    Each entry has a position inside the cache.
+    The order of the positions is the order the entries got added.
+
+    Args:
+        entries (list): Optional list of tuples of a normalized name and an ID
+    """
+    def __init__(self, entries=()):
+        self.names       = []           # normalized name for each position, None for removed entries
+        self.ids         = array("q")   # ID for each position
+        self.positions   = {}           # ID -> position, None until needed when read from a snapshot
+        self.postings    = {}           # trigram -> array of positions of the names that contain the trigram
+        self.numtrigrams = array("I")   # number of different trigrams of each name
+        self.shortnames  = array("I")   # positions of names without trigrams
+        self.removed     = 0            # number of removed entries
+
+        # trigram index read from a snapshot (see ReadSnapshot)
+        self.snapshot         = None    # the memory mapped snapshot file
+        self.snapshottrigrams = []      # sorted list of trigrams
+        self.snapshotoffsets  = None    # offset of the postings of each trigram
+        self.snapshotpostings = None    # positions of all postings
+
+        for name, entryid in entries:
+            self.Add(name, entryid)
+
+
+
+    @staticmethod
+    def GetTrigrams(string):
+        """
+        Returns the set of all trigrams of a string.
+
+        Args:
+            string (str): A normalized string
+
+        Returns:
+            A set of strings with three characters. The set is empty for strings with less than three characters.
+        """
+        return {string[i:i+3] for i in range(len(string) - 2)}
+
+
+
+    def __GetPosting(self, trigram):
+        # Changed postings are in the dictionary, the others still in the snapshot
+        posting = self.postings.get(trigram)
+        if posting is None and self.snapshottrigrams:
+            index = bisect.bisect_left(self.snapshottrigrams, trigram)
+            if index < len(self.snapshottrigrams) and self.snapshottrigrams[index] == trigram:
+                posting = self.snapshotpostings[self.snapshotoffsets[index] : self.snapshotoffsets[index + 1]]
+        return posting
+
+
+
+    def __GetPositions(self):
+        if self.positions is None:
+            self.positions = {entryid: position for position, entryid in enumerate(self.ids) if self.names[position] is not None}
+        return self.positions
+
+
+
+    def Add(self, name, entryid):
+        """
+        Adds an entry to the cache.
+        If there is already an entry with the same ID, it gets replaced.
+
+        Args:
+            name (str): The normalized name
+            entryid (int): The ID of the entry
+
+        Returns:
+            *Nothing*
+        """
+        # Removing may compact the cache, which replaces the positions dictionary
+        if entryid in self.__GetPositions():
+            self.Remove(entryid)
+        positions = self.__GetPositions()
+
+        position = len(self.names)
+        trigrams = self.GetTrigrams(name)
+        self.names.append(name)
+        self.ids.append(entryid)
+        positions[entryid] = position
+        self.numtrigrams.append(len(trigrams))
+        if not trigrams:
+            self.shortnames.append(position)
+
+        for trigram in trigrams:
+            posting = self.postings.get(trigram)
+            if posting is None:
+                # Postings read from a snapshot are read-only memory views
+                posting = array("I", self.__GetPosting(trigram) or [])
+                self.postings[trigram] = posting
+            posting.append(position)
+        return
+
+
+
+    def Remove(self, entryid):
+        """
+        Removes an entry from the cache.
+        The entry only gets marked as removed.
+        When a quarter of all entries are marked, the cache gets compacted.
+
+        Args:
+            entryid (int): The ID of the entry
+
+        Returns:
+            ``True`` if the entry was in the cache, otherwise ``False``
+        """
+        position = self.__GetPositions().pop(entryid, None)
+        if position is None:
+            return False
+
+        self.names[position] = None
+        self.removed += 1
+        if self.removed * 4 > len(self.names):
+            self.__Compact()
+        return True
+
+
+
+    def __Compact(self):
+        entries = self.GetEntries()
+        self.__init__(entries)
+        return
+
+
+
+    def GetEntries(self):
+        """
+        Returns:
+            A list of tuples of the normalized name and the ID of all entries that are not removed, in the order of their positions
+        """
+        return [(name, entryid) for name, entryid in zip(self.names, self.ids) if name is not None]
+
+
+
+    def GetCandidates(self, searchstring):
+        """
+        Returns the positions of all names that may match the search string.
+        For search strings with less than three characters, the positions of all names get returned.
+
+        Args:
+            searchstring (str): The normalized search string
+
+        Returns:
+            A sorted list of positions
+        """
+        trigrams = self.GetTrigrams(searchstring)
+        if not trigrams:
+            return [position for position, name in enumerate(self.names) if name is not None]
+
+        counts = Counter()
+        for trigram in trigrams:
+            posting = self.__GetPosting(trigram)
+            if posting:
+                counts.update(posting)
+
+        numquerytrigrams = len(trigrams)
+        candidates = list(self.shortnames)
+        for position, count in counts.items():
+            if count >= MinTrigramShare * min(numquerytrigrams, self.numtrigrams[position]):
+                candidates.append(position)
+
+        if self.removed:
+            candidates = [position for position in candidates if self.names[position] is not None]
+        candidates.sort()
+        return candidates
+
+
+
+    def WriteSnapshot(self, snapshotfile):
+        """
+        Writes the entries and the trigram index into a file.
+        Removed entries are not written.
+        The written data can be read via :meth:`~ReadSnapshot`.
+
+        Args:
+            snapshotfile: A file object opened for writing in binary mode
+
+        Returns:
+            *Nothing*
+        """
+        if self.removed:
+            self.__Compact()
+
+        trigrams = sorted(set(self.postings.keys()).union(self.snapshottrigrams))
+        offsets  = array("I", [0])
+        postings = array("I")
+        for trigram in trigrams:
+            postings.extend(self.__GetPosting(trigram))
+            offsets.append(len(postings))
+
+        self.__WriteSection(snapshotfile, "\0".join(self.names).encode("utf-8"))
+        self.__WriteSection(snapshotfile, self.ids.tobytes())
+        self.__WriteSection(snapshotfile, self.numtrigrams.tobytes())
+        self.__WriteSection(snapshotfile, self.shortnames.tobytes())
+        self.__WriteSection(snapshotfile, "\0".join(trigrams).encode("utf-8"))
+        self.__WriteSection(snapshotfile, offsets.tobytes())
+        self.__WriteSection(snapshotfile, postings.tobytes())
+        return
+
+
+
+    @staticmethod
+    def __WriteSection(snapshotfile, data):
+        # Each section starts with its size and gets padded to a multiple of 8 bytes
+        snapshotfile.write(struct.pack("<Q", len(data)))
+        snapshotfile.write(data)
+        snapshotfile.write(bytes(-len(data) % 8))
+        return
+
+
+
+    @staticmethod
+    def __ReadSection(snapshot, offset):
+        size   = struct.unpack_from("<Q", snapshot, offset)[0]
+        offset+= 8
+        data   = memoryview(snapshot)[offset : offset + size]
+        return data, offset + size + (-size % 8)
+
+
+
+    @staticmethod
+    def ReadSnapshot(snapshot, offset):
+        """
+        Creates a cache from data written by :meth:`~WriteSnapshot`.
+        The postings of the trigram index are not copied.
+        They get looked up in the memory mapped snapshot until they get changed by :meth:`~Add`.
+        The mapping of IDs to positions gets created when it is needed the first time.
+
+        Args:
+            snapshot (mmap.mmap): The memory mapped snapshot file
+            offset (int): Position of the data of this cache inside the snapshot
+
+        Returns:
+            A tuple of the new :class:`~SearchCache` object and the position behind its data inside the snapshot
+
+        Raises:
+            ValueError: When the data is inconsistent
+        """
+        sections = []
+        for i in range(7):
+            data, offset = SearchCache.__ReadSection(snapshot, offset)
+            sections.append(data)
+
+        cache = SearchCache()
+        names = bytes(sections[0]).decode("utf-8")
+        cache.names = names.split("\0") if names else []
+        cache.ids.frombytes(sections[1])
+        cache.numtrigrams.frombytes(sections[2])
+        cache.shortnames.frombytes(sections[3])
+        cache.positions = None
+
+        trigrams = bytes(sections[4]).decode("utf-8")
+        cache.snapshot         = snapshot
+        cache.snapshottrigrams = trigrams.split("\0") if trigrams else []
+        cache.snapshotoffsets  = sections[5].cast("I")
+        cache.snapshotpostings = sections[6].cast("I")
+
+        if len(cache.names) != len(cache.ids) or len(cache.names) != len(cache.numtrigrams):
+            raise ValueError("Inconsistent MiSE snapshot")
+        if len(cache.snapshotoffsets) != len(cache.snapshottrigrams) + 1:
+            raise ValueError("Inconsistent MiSE snapshot")
+        return cache, offset
+
+
 
 class MusicDBMicroSearchEngine(object):
     """
@@ -62,6 +414,7 @@ class MusicDBMicroSearchEngine(object):
 
     Because a cache update can be triggered from any thread, a new database instance will be created
     for reading information from the database.
+    The caches are protected by a lock, so that they can be searched and updated from different threads.
 
     Args:
         config: :class:`musicdb.lib.cfg.musicdb.MusicDBConfig` object for the path to the music database.
@@ -78,10 +431,25 @@ class MusicDBMicroSearchEngine(object):
 
         self.punctuationfilter = str.maketrans("", "", pystring.punctuation) # 🦈
 
-        # the caches are lists of tuple of name and id (name, id)
+        # the caches are SearchCache objects with the normalized names and their trigram index
         self.songcache   = None
         self.albumcache  = None
         self.artistcache = None
+        self.cachevalid  = False
+        self.cachelock   = threading.Lock()
+
+        # name change counter of the database the caches correspond to (see SaveSnapshot)
+        self.changecounter = None
+        self.snapshotpath  = os.path.join(self.config.directories.state, "mise.snapshot")
+
+        # IDs of disabled and hated songs (see UpdateSongFilter).
+        # Changes notified by the database get protected by their own lock,
+        # because the notifications come from other threads that may hold the MusicDatabaseLock.
+        self.excludedsongs = set()
+        self.databasepath  = None
+        self.filterlock    = threading.Lock()
+        self.filterreload  = True
+        self.filterchanges = set()
 
 
     def UpdateCache(self):
@@ -101,14 +469,15 @@ class MusicDBMicroSearchEngine(object):
         t_start = datetime.datetime.now()
 
         # 1. get all data from the database
+        # The counter gets read first, so that changes while reading make the snapshot stale
+        changecounter = musicdb.GetNameChangeCounter()
         artists = musicdb.GetAllArtists()
         albums  = musicdb.GetAllAlbums()
         songs   = musicdb.GetAllSongs()
 
         # 2. build caches
-        self.artistcache = self.__BuildCache(artists)
-        self.albumcache  = self.__BuildCache(albums)
-        self.songcache   = self.__BuildCache(songs)
+        self.BuildCaches(artists, albums, songs)
+        self.changecounter = changecounter
 
         t_stop = datetime.datetime.now()
         logging.debug("Updating MiSE caches took %s.", str(t_stop - t_start))
@@ -117,13 +486,202 @@ class MusicDBMicroSearchEngine(object):
 
 
 
+    def BuildCaches(self, artists, albums, songs):
+        """
+        Builds the caches and their trigram indices from lists of artists, albums and songs.
+        Each entry of the lists must be a dictionary with at least the keys ``"id"`` and ``"name"``.
+
+        This method gets called by :meth:`~UpdateCache` with all artists, albums and songs of the database.
+
+        Args:
+            artists (list): List of artists
+            albums (list): List of albums
+            songs (list): List of songs
+
+        Returns:
+            ``None``
+        """
+        artistcache = SearchCache(self.__PrepareEntries(artists))
+        albumcache  = SearchCache(self.__PrepareEntries(albums))
+        songcache   = SearchCache(self.__PrepareEntries(songs))
+
+        with self.cachelock:
+            self.artistcache = artistcache
+            self.albumcache  = albumcache
+            self.songcache   = songcache
+            self.cachevalid  = True
+            self.changecounter = None
+        return None
+
+
+
+    def SaveSnapshot(self):
+        """
+        Writes the caches and their trigram indices into the snapshot file ``mise.snapshot`` inside the state directory.
+        The snapshot can be loaded via :meth:`~LoadSnapshot` to avoid rebuilding the caches when the server starts.
+
+        The snapshot only gets written directly after :meth:`~UpdateCache`.
+        Afterwards the caches may differ from the state of the database the name change counter belongs to.
+        Writing goes to a temporary file that replaces the snapshot file when it is complete.
+
+        Returns:
+            ``True`` on success, otherwise ``False``
+        """
+        with self.cachelock:
+            if not self.cachevalid or self.changecounter == None:
+                logging.debug("MiSE caches do not correspond to a known database state. \033[1;30m(No snapshot will be written)")
+                return False
+
+            temppath = self.snapshotpath + ".tmp"
+            try:
+                with open(temppath, "wb") as snapshotfile:
+                    snapshotfile.write(struct.pack("<8sQQ", SnapshotMagic, SnapshotVersion, self.changecounter))
+                    for cache in [self.artistcache, self.albumcache, self.songcache]:
+                        cache.WriteSnapshot(snapshotfile)
+                os.replace(temppath, self.snapshotpath)
+            except Exception as e:
+                logging.warning("Writing MiSE snapshot to %s failed with error: %s \033[1;30m(Search cache will be rebuilt with the next start)", self.snapshotpath, str(e))
+                return False
+        return True
+
+
+
+    def LoadSnapshot(self):
+        """
+        Loads the caches and their trigram indices from the snapshot file written by :meth:`~SaveSnapshot`.
+        The file gets memory mapped, so that the trigram index does not need to be copied.
+
+        The snapshot only gets loaded when its name change counter is the same as the one in the database
+        (see :meth:`musicdb.lib.db.musicdb.MusicDatabase.GetNameChangeCounter`).
+        Otherwise the names of artists, albums or songs changed since the snapshot was written,
+        and :meth:`~UpdateCache` must be called.
+
+        Returns:
+            ``True`` when the snapshot got loaded, ``False`` when there is no valid snapshot.
+        """
+        t_start = datetime.datetime.now()
+        try:
+            musicdb       = MusicDatabase(self.config.files.musicdatabase)
+            changecounter = musicdb.GetNameChangeCounter()
+
+            with open(self.snapshotpath, "rb") as snapshotfile:
+                snapshot = mmap.mmap(snapshotfile.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            logging.debug("There is no MiSE snapshot at %s", self.snapshotpath)
+            return False
+        except Exception as e:
+            logging.warning("Opening MiSE snapshot %s failed with error: %s", self.snapshotpath, str(e))
+            return False
+
+        try:
+            magic, version, snapshotcounter = struct.unpack_from("<8sQQ", snapshot, 0)
+            if magic != SnapshotMagic or version != SnapshotVersion:
+                logging.debug("MiSE snapshot %s has an unknown format", self.snapshotpath)
+                return False
+            if snapshotcounter != changecounter:
+                logging.debug("MiSE snapshot is stale \033[1;30m(Database name change counter is %i, snapshot belongs to %i)", changecounter, snapshotcounter)
+                return False
+
+            offset = struct.calcsize("<8sQQ")
+            artistcache, offset = SearchCache.ReadSnapshot(snapshot, offset)
+            albumcache,  offset = SearchCache.ReadSnapshot(snapshot, offset)
+            songcache,   offset = SearchCache.ReadSnapshot(snapshot, offset)
+        except Exception as e:
+            logging.warning("Reading MiSE snapshot %s failed with error: %s", self.snapshotpath, str(e))
+            return False
+
+        with self.cachelock:
+            self.artistcache = artistcache
+            self.albumcache  = albumcache
+            self.songcache   = songcache
+            self.cachevalid  = True
+            self.changecounter = snapshotcounter
+
+        t_stop = datetime.datetime.now()
+        logging.debug("Loading MiSE snapshot took %s.", str(t_stop - t_start))
+        return True
+
+
+
+    def OnDatabaseChange(self, databasepath, entrytype, entryid):
+        """
+        This method gets registered as callback at the :class:`~musicdb.lib.db.musicdb.MusicDatabase`
+        by :meth:`~UpdateSongFilter`.
+        It only remembers which songs changed.
+        The song filter gets updated the next time :meth:`~UpdateSongFilter` gets called.
+
+        Args:
+            databasepath (str): Path of the changed database
+            entrytype (str): Type of the changed entry or ``None``
+            entryid (int): ID of the changed entry or ``None``
+
+        Returns:
+            *Nothing*
+        """
+        if databasepath != self.databasepath:
+            return
+
+        with self.filterlock:
+            if entrytype == "song" and entryid != None:
+                self.filterchanges.add(int(entryid))
+            elif entrytype in [None, "song"]:
+                self.filterreload = True
+        return
+
+
+
+    def UpdateSongFilter(self, database):
+        """
+        Updates the set of disabled and hated songs that get excluded from the search results
+        when :meth:`~Find` gets called with ``filtersongs=True`` (see `Song Filter`_).
+
+        With the first call, all disabled and hated songs get read from the database
+        and a callback gets registered to get notified about changed songs.
+        Afterwards only the songs that changed since the last call get read.
+
+        Args:
+            database: A :class:`~musicdb.lib.db.musicdb.MusicDatabase` instance
+
+        Returns:
+            *Nothing*
+        """
+        with self.filterlock:
+            if self.databasepath == None:
+                self.databasepath = database.databasepath
+                database.RegisterCallback(self.OnDatabaseChange)
+
+            reload  = self.filterreload
+            changes = self.filterchanges
+            self.filterreload  = False
+            self.filterchanges = set()
+
+        if reload:
+            excludedsongs = set(database.GetDisabledOrHatedSongIds())
+            with self.cachelock:
+                self.excludedsongs = excludedsongs
+            logging.debug("MiSE song filter excludes %i songs", len(excludedsongs))
+
+        elif changes:
+            songs = database.GetSongsByIds(list(changes))
+            with self.cachelock:
+                for songid in changes:
+                    song = songs.get(songid)
+                    if song and (song["disabled"] or song["favorite"] == -1):
+                        self.excludedsongs.add(songid)
+                    else:
+                        self.excludedsongs.discard(songid)
+        return
+
+
+
     # data has to be a list of dicts with "id" and "name" as elements
-    def __BuildCache(self, data):
+    # returns a list of tuples (normalized name, id)
+    def __PrepareEntries(self, data, sort=True):
         # first, sort the data
-        data = sorted(data, key = lambda k: k["name"].lower())
+        if sort:
+            data = sorted(data, key = lambda k: k["name"].lower())
 
-        # now create a cache with the id and the normalized name
-        cache = []
+        entries = []
         for item in data:
             itemname = item["name"]
             itemid   = item["id"]
@@ -133,10 +691,127 @@ class MusicDBMicroSearchEngine(object):
             if len(itemname) == 0 or itemname == " ":
                 continue
 
-            # add to cache
-            cache.append((itemname, itemid))
+            entries.append((itemname, itemid))
+
+        return entries
+
+
+
+    def __GetCache(self, category):
+        if category == "artist":
+            return self.artistcache
+        elif category == "album":
+            return self.albumcache
+        elif category == "song":
+            return self.songcache
+        raise ValueError("Unknown MiSE cache category \"%s\""%(str(category)))
+
+
+
+    def AddEntries(self, category, entries):
+        """
+        Adds new entries to the cache of a category.
+        Entries that are already in the cache get replaced.
+
+        Args:
+            category (str): ``"artist"``, ``"album"`` or ``"song"``
+            entries (list): List of dictionaries with at least the keys ``"id"`` and ``"name"``
+
+        Returns:
+            ``None``
+
+        Raises:
+            ValueError: When *category* is unknown
+        """
+        entries = self.__PrepareEntries(entries, sort=False)
+        with self.cachelock:
+            cache = self.__GetCache(category)
+            if cache is None:
+                return None
+            for name, entryid in entries:
+                cache.Add(name, entryid)
+            self.changecounter = None
+        return None
+
+
+
+    def RemoveEntries(self, category, entryids):
+        """
+        Removes entries from the cache of a category.
+        IDs that are not in the cache get ignored.
+
+        Args:
+            category (str): ``"artist"``, ``"album"`` or ``"song"``
+            entryids (list): List of IDs of the entries to remove
+
+        Returns:
+            ``None``
+
+        Raises:
+            ValueError: When *category* is unknown
+        """
+        with self.cachelock:
+            cache = self.__GetCache(category)
+            if cache is None:
+                return None
+            for entryid in entryids:
+                cache.Remove(entryid)
+            self.changecounter = None
+        return None
+
+
+
+    def RenameEntry(self, category, entryid, newname):
+        """
+        Updates the name of an entry in the cache of a category.
+        Only the new name gets normalized.
+        If the entry is not in the cache yet, it gets added.
 
-        return cache
+        Args:
+            category (str): ``"artist"``, ``"album"`` or ``"song"``
+            entryid (int): ID of the entry
+            newname (str): The new name of the entry
+
+        Returns:
+            ``None``
+
+        Raises:
+            ValueError: When *category* is unknown
+        """
+        entries = self.__PrepareEntries([{"id": entryid, "name": newname}], sort=False)
+        with self.cachelock:
+            cache = self.__GetCache(category)
+            if cache is None:
+                return None
+            cache.Remove(entryid)
+            for name, entryid in entries:
+                cache.Add(name, entryid)
+            self.changecounter = None
+        return None
+
+
+
+    def InvalidateCache(self):
+        """
+        Marks the cache as invalid.
+        This method gets called when an incremental update of the cache failed.
+        The cache can still be used for searching until :meth:`~UpdateCache` gets called.
+
+        Returns:
+            ``None``
+        """
+        logging.warning("MiSE cache is no longer up to date. \033[1;30m(It will be rebuilt with the next cache update)")
+        self.cachevalid = False
+        return None
+
+
+
+    def IsCacheValid(self):
+        """
+        Returns:
+            ``True`` if the cache is up to date, ``False`` if it was never built or :meth:`~InvalidateCache` got called
+        """
+        return self.cachevalid
 
 
 
@@ -170,14 +845,18 @@ class MusicDBMicroSearchEngine(object):
 
 
     # returns a tuple of artists albums and songs
-    def Find(self, userinput):
+    def Find(self, userinput, limit=None, filtersongs=False):
         """
         This method searches through the caches of song, album and artist names.
         A fuzzy search gets applied and so the results matches only with a certain probability.
 
+        Only names that share enough trigrams with the search string get compared (see `Trigram Index`_).
+
         Args:
             userinput (str): Search-Sting to search for. 
                              This string gets normalized before it is used to search.
+            limit (int): Optional maximum number of entries for each list. ``None`` returns all entries that were found.
+            filtersongs (bool): Optional. When ``True``, disabled and hated songs are not included (see `Song Filter`_).
 
         Returns:
             A tuple of lists of artists, albums and songs that were found.
@@ -198,9 +877,11 @@ class MusicDBMicroSearchEngine(object):
             return (None,None,None)
 
         t_start = datetime.datetime.now()
-        artists = self.__FindInData(searchstring, self.artistcache)
-        albums  = self.__FindInData(searchstring, self.albumcache)
-        songs   = self.__FindInData(searchstring, self.songcache)
+        with self.cachelock:
+            artists = self.__FindInData(searchstring, self.artistcache, limit=limit)
+            albums  = self.__FindInData(searchstring, self.albumcache,  limit=limit)
+            songs   = self.__FindInData(searchstring, self.songcache,   limit=limit,
+                    excludedids=self.excludedsongs if filtersongs else None)
         t_stop  = datetime.datetime.now()
         t_diff  = t_stop - t_start
 
@@ -214,16 +895,18 @@ class MusicDBMicroSearchEngine(object):
 
 
     # return a tuple of id and ratio
-    def __FindInData(self, searchstring, cache, threshold=80):
+    def __FindInData(self, searchstring, cache, threshold=80, limit=None, excludedids=None):
+        candidates = cache.GetCandidates(searchstring)
+        if excludedids:
+            candidates = [position for position in candidates if cache.ids[position] not in excludedids]
+        choices    = [cache.names[position] for position in candidates]
+
+        # process.extract sorts for highest ratio, equal ratios stay in cache order
+        matches = process.extract(searchstring, choices, scorer=fuzz.partial_ratio, score_cutoff=threshold, limit=limit)
+
         result = []
-        for element in cache:
-            ratio = fuzz.partial_ratio(element[0], searchstring)
-            if ratio >= threshold:
-                result.append((element[1], ratio))
-
-        # sort for highest ratio
-        if result:
-            result = sorted(result, key = lambda k: k[1], reverse=True)
+        for name, ratio, choiceindex in matches:
+            result.append((cache.ids[candidates[choiceindex]], ratio))
 
         return result
 
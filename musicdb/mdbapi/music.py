@@ -52,14 +52,19 @@ class MusicDBMusic(object):
             * :meth:`~UpdateChecksum`: Calculates and adds the checksum of a song file into the database
         * Other
 
+    When a :class:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine` object is given,
+    its cache gets updated for each artist, album and song that gets added, renamed or removed
+    (see :meth:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine.AddEntries`).
+
     Args:
         config: MusicDB configuration object
         database: MusicDB database
+        mise: Optional :class:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine` object that shall be kept up to date
 
     Raises:
         TypeError: when *config* or *database* not of type :class:`~musicdb.lib.cfg.musicdb.MusicDBConfig` or :class:`~musicdb.lib.db.musicdb.MusicDatabase`
     """
-    def __init__(self, config, database):
+    def __init__(self, config, database, mise=None):
 
         if type(config) != MusicDBConfig:
             print("\033[1;31mFATAL ERROR: Config-class of unknown type!\033[0m")
@@ -70,6 +75,7 @@ class MusicDBMusic(object):
 
         self.db     = database
         self.cfg    = config
+        self.mise   = mise
         self.fileprocessing = Fileprocessing(self.cfg.directories.music)
         self.musicdirectory = MusicDirectory(config)
         self.meta   = MetaTags(self.cfg.directories.music)
@@ -107,6 +113,31 @@ class MusicDBMusic(object):
 
 
 
+    def _UpdateSearchCache(self, method, *arguments):
+        """
+        Calls a method of the MiSE object to update its cache.
+        If this fails, the MiSE cache gets invalidated, so that it gets rebuilt with the next cache update.
+        If there is no MiSE object, nothing happens.
+
+        Args:
+            method (str): Name of the method, ``"AddEntries"``, ``"RemoveEntries"`` or ``"RenameEntry"``
+            arguments: Arguments for the method
+
+        Returns:
+            ``None``
+        """
+        if self.mise == None:
+            return None
+
+        try:
+            getattr(self.mise, method)(*arguments)
+        except Exception as e:
+            logging.warning("Updating the MiSE cache via %s failed with error: %s", method, str(e))
+            self.mise.InvalidateCache()
+        return None
+
+
+
     def FindLostPaths(self):
         """
         This method checks all artist, album song and video entries if the paths to their related directories and files are still valid.
@@ -325,6 +356,7 @@ class MusicDBMusic(object):
         if not artist:
             self.db.AddArtist(name, name)
             artist = self.db.GetArtistByPath(name)
+            self._UpdateSearchCache("AddEntries", "artist", [artist])
         return artist
 
 
@@ -376,6 +408,7 @@ class MusicDBMusic(object):
         # add artist to database
         self.db.AddArtist(artistname, artistpath)
         artist = self.db.GetArtistByPath(artistpath)
+        self._UpdateSearchCache("AddEntries", "artist", [artist])
 
         # Add all albums to the artist
         albumpaths = self.musicdirectory.GetSubdirectories(artistpath, self.ignorealbums)
@@ -412,6 +445,7 @@ class MusicDBMusic(object):
         artist["path"] = artistpath
         artist["name"] = os.path.basename(artistpath)
         self.db.WriteArtist(artist)
+        self._UpdateSearchCache("RenameEntry", "artist", artistid, artist["name"])
 
         albums = self.db.GetAlbumsByArtistId(artistid)
         for album in albums:
@@ -516,10 +550,11 @@ class MusicDBMusic(object):
             #. Get modification date using :meth:`~musicdb.lib.filesystem.FileSystem.GetModificationDate`
             #. Set file attributes and ownership using :meth:`~musicdb.mdbapi.musicdirectory.MusicDirectory.FixAttributes`
             #. Create new entry for the new album in the database and get the default values
-            #. Add each song of the album to the database by calling :meth:`~musicdb.mdbapi.music.MusicDBMusic.AddSong`
+            #. Read all songs of the album and add them with one transaction using :meth:`musicdb.lib.db.musicdb.MusicDatabase.AddFullSongs`
             #. Write all collected information of the album into the database
 
         If adding the songs to the database raises an exception, that song gets skipped.
+        When adding all songs at once fails, they get added one by one inside the transaction, so that only the failing songs are missing.
         The *numofsongs* value for the album is the number of actual existing songs for this album in the database.
         It is save to add the failed song later by using the :meth:`~musicdb.mdbapi.music.MusicDBMusic.AddSong` method.
 
@@ -608,12 +643,52 @@ class MusicDBMusic(object):
         # update the album entry
         album["artistid"]   = artistid
 
-        # now add all the albums songs to the database
+        # now collect all the albums songs. Reading the files is done before accessing the database.
+        newsongs  = []
+        newlyrics = []
         for songpath in songpaths:
             try:
-                self.AddSong(songpath, artistid, album["id"])
+                song, lyrics = self._CreateSongEntry(songpath, artistid, album["id"])
             except Exception as e:
                 logging.exception("CRITICAL ERROR! Adding a song to the new added album \"%s\" failed with the exception \"%s\"! \033[1;30m(ignoring that song (%s) and continue with next)", str(album["name"]), str(e), str(songpath))
+                continue
+
+            if song == None:
+                continue
+            newsongs.append(song)
+            newlyrics.append(lyrics)
+
+        # add all songs and their lyrics with one transaction
+        try:
+            with self.db.Transaction():
+                try:
+                    retval = self.db.AddFullSongs(newsongs)
+                except ValueError as e:
+                    logging.warning("Adding all songs of album \"%s\" at once failed with error \"%s\". \033[1;30m(Adding them one by one)", str(album["name"]), str(e))
+                    retval = False
+
+                # When adding all songs failed, nothing changed. Then the songs get added one by one, so that only the failing ones get skipped.
+                if retval == False:
+                    for song in newsongs:
+                        try:
+                            retval = self.db.AddFullSongs([song])
+                        except ValueError as e:
+                            retval = False
+                            logging.error("Adding song %s failed with error \"%s\"", str(song["path"]), str(e))
+                        if retval == False:
+                            logging.error("CRITICAL ERROR! Adding a song to the new added album \"%s\" failed! \033[1;30m(ignoring that song (%s) and continue with next)", str(album["name"]), str(song["path"]))
+                            song["id"] = None
+
+                for song, lyrics in zip(newsongs, newlyrics):
+                    if lyrics == None or song.get("id") == None:
+                        continue
+                    try:
+                        self.db.SetLyrics(song["id"], lyrics, SONG_LYRICSSTATE_FROMFILE)
+                    except Exception as e:
+                        logging.warning("Adding lyrics for song %s failed with error \"%s\". \033[1;30m(Does not break anything)",
+                                song["name"], str(e))
+        except Exception as e:
+            logging.exception("CRITICAL ERROR! Adding the songs to the new added album \"%s\" failed with the exception \"%s\"! \033[1;30m(The album will not have any songs)", str(album["name"]), str(e))
 
         # get some final information after adding the songs
         songs = self.db.GetSongsByAlbumId(album["id"])
@@ -629,6 +704,9 @@ class MusicDBMusic(object):
             self.db.WriteAlbum(album)
         except Exception as e:
             logging.exception("CRITICAL ERROR! Updating album information failed with error \"%s\". Use the musicdb database command to remove this album and see the log file for further details.", str(e))
+
+        self._UpdateSearchCache("AddEntries", "album", [album])
+        self._UpdateSearchCache("AddEntries", "song",  songs)
         return None
 
 
@@ -696,6 +774,7 @@ class MusicDBMusic(object):
         album["release"] = fsmeta["release"]
         album["origin"]  = tagmeta["origin"]
         self.db.WriteAlbum(album)
+        self._UpdateSearchCache("RenameEntry", "album", albumid, album["name"])
 
         songs = self.db.GetSongsByAlbumId(albumid)
         for song in songs:
@@ -716,10 +795,10 @@ class MusicDBMusic(object):
 
 
 
-    def AddSong(self, songpath, artistid=None, albumid=None):
+    def _CreateSongEntry(self, songpath, artistid=None, albumid=None):
         """
-        This method adds a song to the MusicDB database.
-        To do so, the following steps were done:
+        This method collects all information for a new song entry without changing the database.
+        It does the following steps of :meth:`~musicdb.mdbapi.music.MusicDBMusic.AddSong`:
 
             #. Check if the song already exists in the database
             #. Load the metadata from the song using :meth:`musicdb.lib.metatags.MetaTags.GetAllMetadata`
@@ -727,21 +806,18 @@ class MusicDBMusic(object):
             #. If *artistid* is not given as parameter, it gets read from the database identifying the artist by its path.
             #. If *albumid* is not given as parameter, it gets read from the database identifying the album by its path.
             #. Set file attributes and ownership using :meth:`~musicdb.mdbapi.musicdirectory.MusicDirectory.FixAttributes`
-            #. Add song to database
-            #. If the parameter *albumid* was ``None`` the *numofsongs* entry of the determined album gets incremented
-            #. If there are lyrics in the song file, they get also inserted into the database
 
-        In case the album ID is set, this method assumes that its database entry gets managed by the :meth:`~musicdb.mdbapi.music.MusicDBMusic.AddAlbum` method.
-        So, nothing will be changed regarding the album.
-        If album ID was ``None``, this method also updates the album-entry, namely the *numofsongs* value gets incremented.
+        The returned song entry can be added to the database using :meth:`musicdb.lib.db.musicdb.MusicDatabase.AddFullSong`
+        or :meth:`musicdb.lib.db.musicdb.MusicDatabase.AddFullSongs`.
 
         Args:
-            songpath (str): Absolute path, or path relative to the music root directory, to the song that shall be added to the database.
+            songpath (str): Absolute path, or path relative to the music root directory, to the song.
             artistid (int): Optional, default value is ``None``. The ID of the artist this song belongs to.
             albumid (int): Optional, default value is ``None``. The ID of the album this song belongs to.
 
         Returns:
-            ``None``
+            A tuple of the new song entry (without ``"id"``) and the lyrics from the song file (or ``None``).
+            If the file is not a valid song file, ``(None, None)`` gets returned.
 
         Raises:
             ValueError: If song already exists in the database
@@ -764,7 +840,7 @@ class MusicDBMusic(object):
         except Exception:
             logging.debug("Metadata of file %s cannot be load. Assuming this is not a song file!", str(songpath))
             # Ignore this file, it is not a valid song file
-            return None
+            return None, None
 
         tagmeta = self.meta.GetAllMetadata()
         fsmeta  = self.musicdirectory.AnalysePath(songpath)
@@ -816,14 +892,6 @@ class MusicDBMusic(object):
                     break
             else:
                 raise AssertionError("The album for the song \"" + songpath + "\" is not avaliable in the database.")
-            # if the albumid was unknown, the numofsongs was not updated before.
-            # So the next section is necessary to determin the new numofsongs
-            # (Will not be written to DB yet, only if AddFullSong at the end succeeds)
-            newalbumentry   = self.db.GetAlbumById(song["albumid"])
-            songlist        = self.db.GetSongsByAlbumId(song["albumid"])
-            newalbumentry["numofsongs"] = len(songlist) + 1
-        else:
-            newalbumentry   = None  # there is no update for the album-entry
 
         # fix attributes to fit in mdb environment before adding it to the database
         try:
@@ -832,22 +900,75 @@ class MusicDBMusic(object):
             logging.warning("Fixing file attributes failed with error: %s \033[1;30m(leaving permissions as they are)",
                     str(e))
 
-        # add to database
-        retval = self.db.AddFullSong(song)
-        if retval == False:
-            raise AssertionError("Adding song %s failed!", song["path"])
+        return song, tagmeta["lyrics"]
 
-        if newalbumentry:
-            self.db.WriteAlbum(newalbumentry)
 
-        # Add lyrics for this song
-        if tagmeta["lyrics"] != None:
-            try:
-                self.db.SetLyrics(song["id"], tagmeta["lyrics"], SONG_LYRICSSTATE_FROMFILE)
-            except Exception as e:
-                logging.warning("Adding lyrics for song %s failed with error \"%s\". \033[1;30m(Does not break anything)",
-                        song["name"], str(e))
 
+    def AddSong(self, songpath, artistid=None, albumid=None):
+        """
+        This method adds a song to the MusicDB database.
+        To do so, the following steps were done:
+
+            #. Check if the song already exists in the database
+            #. Load the metadata from the song using :meth:`musicdb.lib.metatags.MetaTags.GetAllMetadata`
+            #. Analyze the path of one of the song using :meth:`~musicdb.mdbapi.musicdirectory.MusicDirectory.AnalysePath`
+            #. If *artistid* is not given as parameter, it gets read from the database identifying the artist by its path.
+            #. If *albumid* is not given as parameter, it gets read from the database identifying the album by its path.
+            #. Set file attributes and ownership using :meth:`~musicdb.mdbapi.musicdirectory.MusicDirectory.FixAttributes`
+            #. Add song to database
+            #. If the parameter *albumid* was ``None`` the *numofsongs* entry of the determined album gets incremented
+            #. If there are lyrics in the song file, they get also inserted into the database
+
+        In case the album ID is set, this method assumes that its database entry gets managed by the :meth:`~musicdb.mdbapi.music.MusicDBMusic.AddAlbum` method.
+        So, nothing will be changed regarding the album.
+        If album ID was ``None``, this method also updates the album-entry, namely the *numofsongs* value gets incremented.
+
+        Args:
+            songpath (str): Absolute path, or path relative to the music root directory, to the song that shall be added to the database.
+            artistid (int): Optional, default value is ``None``. The ID of the artist this song belongs to.
+            albumid (int): Optional, default value is ``None``. The ID of the album this song belongs to.
+
+        Returns:
+            ``None``
+
+        Raises:
+            ValueError: If song already exists in the database
+            AssertionError: If analyzing the path fails
+            AssertionError: If there is no album for this song in the database
+        """
+        song, lyrics = self._CreateSongEntry(songpath, artistid, albumid)
+        if song == None:
+            # Ignore this file, it is not a valid song file
+            return None
+
+        if albumid == None:
+            # if the albumid was unknown, the numofsongs was not updated before.
+            # So the next section is necessary to determin the new numofsongs
+            # (Will not be written to DB yet, only if AddFullSong at the end succeeds)
+            newalbumentry   = self.db.GetAlbumById(song["albumid"])
+            songlist        = self.db.GetSongsByAlbumId(song["albumid"])
+            newalbumentry["numofsongs"] = len(songlist) + 1
+        else:
+            newalbumentry   = None  # there is no update for the album-entry
+
+        # add to database
+        with self.db.Transaction():
+            retval = self.db.AddFullSong(song)
+            if retval == False:
+                raise AssertionError("Adding song %s failed!", song["path"])
+
+            if newalbumentry:
+                self.db.WriteAlbum(newalbumentry)
+
+            # Add lyrics for this song
+            if lyrics != None:
+                try:
+                    self.db.SetLyrics(song["id"], lyrics, SONG_LYRICSSTATE_FROMFILE)
+                except Exception as e:
+                    logging.warning("Adding lyrics for song %s failed with error \"%s\". \033[1;30m(Does not break anything)",
+                            song["name"], str(e))
+
+        self._UpdateSearchCache("AddEntries", "song", [song])
         return None
 
 
@@ -924,6 +1045,7 @@ class MusicDBMusic(object):
         song["checksum"] = self.fileprocessing.Checksum(songpath)
 
         self.db.WriteSong(song)
+        self._UpdateSearchCache("RenameEntry", "song", songid, song["name"])
 
         # Fix album information
         album = self.db.GetAlbumById(song["albumid"])
@@ -1146,6 +1268,7 @@ class MusicDBMusic(object):
         # remove from tracker.db
         tracker.RemoveSong(songid)
 
+        self._UpdateSearchCache("RemoveEntries", "song", [songid])
         return None
 
 
@@ -1175,6 +1298,7 @@ class MusicDBMusic(object):
         for song in songs:
             self.RemoveSong(song["id"])
         self.db.RemoveAlbum(albumid)
+        self._UpdateSearchCache("RemoveEntries", "album", [albumid])
         return None
 
 
@@ -1204,6 +1328,7 @@ class MusicDBMusic(object):
         for album in albums:
             self.RemoveAlbum(album["id"])
         self.db.RemoveArtist(artistid)
+        self._UpdateSearchCache("RemoveEntries", "artist", [artistid])
         return None
 
 
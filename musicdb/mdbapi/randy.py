@@ -36,7 +36,9 @@ In each stage, a song can be rejected and the algorithm starts at the beginning.
 Database Stage
 ^^^^^^^^^^^^^^
 
-In the first stage, a song gets chosen by the database via :meth:`musicdb.lib.db.musicdb.MusicDatabase.GetRandomSong`.
+In the first stage, a song gets chosen from the :class:`~RandyCandidatePool`.
+The pool follows the same rules as :meth:`musicdb.lib.db.musicdb.MusicDatabase.GetRandomSong`,
+but keeps all information needed for the selection in memory.
 There are 3 sets of parameters that define the constraints applied on set of possible songs:
 
     - The activated genres and sub genres as maintained by the :mod:`musicdb.lib.cfg.mdbstate` module.
@@ -54,9 +56,10 @@ because the algorithm that set the genre may be wrong.
 Blacklist Stage
 ^^^^^^^^^^^^^^^
 
-The selected song from the first stage now gets compared to the blacklists via 
-:meth:`musicdb.mdbapi.blacklist.BlacklistInterface.CheckAllListsForSong` or
-:meth:`musicdb.mdbapi.blacklist.BlacklistInterface.CheckSongList`.
+The selected song from the first stage now gets compared to the blacklists.
+The valid IDs of the blacklists get read once via :meth:`musicdb.mdbapi.blacklist.BlacklistInterface.GetValidIDsFromBlacklists`
+before the search starts.
+Then each candidate gets checked by looking up its IDs in these sets.
 If the song, or its album or artist, is listed in one of blacklist, 
 then the song, a song from the same album or from the same artist was played recently.
 So, the chosen song gets dropped and the finding-process starts again.
@@ -64,6 +67,41 @@ So, the chosen song gets dropped and the finding-process starts again.
 Is the blacklist length set to 0, the specific blacklist is disabled
 
 
+Candidate Pool
+^^^^^^^^^^^^^^
+
+Selecting songs via :meth:`musicdb.lib.db.musicdb.MusicDatabase.GetRandomSong` requires to read all albums and their tags,
+and the tags of the songs for each try.
+To avoid this, all instances of :class:`~Randy` share one :class:`~RandyCandidatePool`.
+The pool holds all albums with their genre and sub genre tags as well as the attributes and approved tags of all songs.
+From this information, it derives the list of albums that have at least one eligible song and the eligible songs of each album.
+The derived lists only get recomputed when the genre filter or the constraints change.
+Choosing a random album and a random song of this album is then done in constant time.
+
+The pool registers a callback at the :class:`~musicdb.lib.db.musicdb.MusicDatabase` (see :meth:`~musicdb.lib.db.musicdb.MusicDatabase.RegisterCallback`).
+When songs, albums or their tags change, only the affected albums get reloaded from the database the next time a song gets selected.
+When tag definitions change or the database cache gets cleared, the whole pool gets rebuilt.
+
+
+Random Song Reservoir
+^^^^^^^^^^^^^^^^^^^^^
+
+The :class:`~musicdb.mdbapi.songqueue.SongQueue` adds a random song whenever the queue runs short of songs.
+This happens at the end of each song while the ``QueueLock`` is held.
+To avoid searching for a song at this moment, the :meth:`~RandomSongReservoirThread` selects some random songs in advance.
+The amount of songs held in the reservoir can be configured by the ``ReservoirDepth`` option in the ``Limits`` section of the randy.ini file.
+A depth of ``0`` disables the reservoir.
+
+The reservoir gets used via :meth:`~Randy.GetPrefetchedSong`.
+Because the blacklists, the genre filter and the constraints may change while a song waits in the reservoir,
+each song gets checked again when it gets taken out of the reservoir.
+Songs that were selected for a different genre filter or set of constraints are dropped.
+Songs that are now on the blacklists are dropped as well.
+When the reservoir does not provide a valid song, a new one gets selected via :meth:`~Randy.GetSong`.
+
+The thread gets started via :meth:`~StartRandomSongReservoirThread` and stopped via :meth:`~StopRandomSongReservoirThread`.
+
+
 Video Selection Algorithm
 -------------------------
 
@@ -72,14 +110,492 @@ For the blacklist stage it does not considers any Artist and Album associations
 
 """
 
+import random
 import logging
 import datetime
+import threading
+from collections import deque
 from musicdb.lib.cfg.musicdb    import MusicDBConfig
 from musicdb.lib.db.musicdb     import MusicDatabase
 from musicdb.lib.cfg.mdbstate   import MDBState
 from musicdb.lib.cfg.randy      import RandyConfiguration
 from musicdb.mdbapi.blacklist   import BlacklistInterface
 
+CandidatePool     = None                # Shared by all Randy instances
+CandidatePoolLock = threading.RLock()   # Only one thread shall update the pool at a time
+
+Config            = None
+ReservoirThread   = None
+RunReservoirThread= False
+Reservoir         = deque()                 # (songid, filterkey) of prefetched songs
+ReservoirCondition= threading.Condition()   # Wakes up the reservoir thread when a song got taken
+
+
+
+#####################################################################
+# Random Song Reservoir Thread                                      #
+#####################################################################
+
+
+def StartRandomSongReservoirThread(config, musicdb):
+    """
+    This function starts the :meth:`~RandomSongReservoirThread`.
+    You should use this function instead of calling the thread function directly.
+
+    By calling this function, the reservoir gets cleared.
+
+    Args:
+        config: :class:`~musicdb.lib.cfg.musicdb.MusicDBConfig` object holding the MusicDB Configuration
+        musicdb: A :class:`~musicdb.lib.db.musicdb.MusicDatabase` instance
+
+    Returns:
+        ``True`` on Success, otherwise ``False``
+
+    Raises:
+        TypeError: When the arguments are not of the correct type.
+    """
+    global Config
+    global ReservoirThread
+    global RunReservoirThread
+
+    if ReservoirThread != None:
+        logging.warning("Random Song Reservoir Thread already running")
+        return False
+
+    if type(config) != MusicDBConfig:
+        raise TypeError("config argument not of type MusicDBConfig")
+    if type(musicdb) != MusicDatabase:
+        raise TypeError("database argument not of type MusicDatabase")
+
+    Config = config
+    with ReservoirCondition:
+        Reservoir.clear()
+
+    logging.debug("Starting Random Song Reservoir Thread")
+    RunReservoirThread = True
+    ReservoirThread    = threading.Thread(target=RandomSongReservoirThread)
+    ReservoirThread.start()
+    return True
+
+
+
+def StopRandomSongReservoirThread():
+    """
+    This function stops the Random Song Reservoir Thread.
+    The function is blocking and waits until the thread is closed.
+
+    Returns:
+        ``True`` on success, otherwise ``False``
+    """
+    global ReservoirThread
+    global RunReservoirThread
+
+    if ReservoirThread == None:
+        logging.warning("There is no Random Song Reservoir Thread running!")
+        return False
+
+    logging.debug("Waiting for Random Song Reservoir Thread to stop…")
+
+    with ReservoirCondition:
+        RunReservoirThread = False
+        ReservoirCondition.notify_all()
+    ReservoirThread.join()
+    ReservoirThread = None
+
+    logging.debug("Random Song Reservoir Thread shut down.")
+    return True
+
+
+
+def RandomSongReservoirThread():
+    """
+    This thread keeps the reservoir of random songs filled.
+    For details see the module description at the top of this document.
+
+    Whenever a song got taken out of the reservoir, the thread gets woken up and selects new songs via :meth:`~Randy.GetSong`
+    until the configured depth is reached.
+    Every 5 seconds the thread checks if the genre filter or the constraints changed.
+    If so, the songs selected before get removed from the reservoir.
+    If Randy does not find a song, the thread waits 5 seconds until it tries again.
+    """
+    global Config
+    global RunReservoirThread
+
+    musicdb = MusicDatabase(Config.files.musicdatabase)
+    randy   = Randy(Config, musicdb)
+
+    while RunReservoirThread:
+        filterkey = randy.GetFilterKey()
+        depth     = randy.reservoirdepth
+
+        with ReservoirCondition:
+            # Songs selected for a different genre filter are useless
+            for entry in [ entry for entry in Reservoir if entry[1] != filterkey ]:
+                Reservoir.remove(entry)
+
+            if len(Reservoir) >= depth:
+                ReservoirCondition.wait(5)
+                continue
+
+        song = randy.GetSong()
+
+        with ReservoirCondition:
+            if not RunReservoirThread:
+                break
+
+            if not song:
+                logging.warning("Random Song Reservoir could not be filled! \033[1;30m(Trying again in 5s)")
+                ReservoirCondition.wait(5)
+                continue
+
+            Reservoir.append((song["id"], filterkey))
+            logging.debug("Random Song Reservoir holds %i of %i songs", len(Reservoir), depth)
+
+    return
+
+
+
+
+
+
+class RandyCandidatePool(object):
+    """
+    This class maintains the set of songs Randy can choose from.
+    It gets updated incrementally when the database notifies about changes.
+    For details see the module description at the top of this document.
+
+    The pool itself is not thread safe.
+    Its methods must be called while holding ``CandidatePoolLock``.
+    Only :meth:`~OnDatabaseChange` can be called at any time.
+
+    Args:
+        databasepath (str): Path of the database the pool belongs to. Notifications of other databases get ignored.
+    """
+
+    def __init__(self, databasepath):
+        self.databasepath = databasepath
+
+        self.albums     = {}    # albumid -> {"hidden", "artistid", "genres", "subgenres", "songs"}
+        self.songs      = {}    # songid  -> {"albumid", "artistid", "disabled", "favorite", …, "genres", "subgenres"}
+
+        # Derived candidates for the current filter and constraints
+        self.candidates      = {}    # albumid -> list of eligible song IDs
+        self.candidatealbums = []    # list of album IDs with at least one eligible song
+        self.filterkey       = None  # (tag filter, constraints) the candidates were derived for
+        self.tagfilterset    = None  # Set of genre and sub genre IDs of the tag filter list
+        self.genretree       = None  # Genre tree of the tag filter list
+        self.constraints     = None
+
+        # Changes notified by the database.
+        # They get protected by their own lock because the notifications come from other threads
+        # that may hold the MusicDatabaseLock.
+        self.changelock   = threading.Lock()
+        self.dirtyalbums  = set()
+        self.dirtysongs   = set()
+        self.rebuild      = True
+
+
+
+    def OnDatabaseChange(self, databasepath, entrytype, entryid):
+        """
+        This method gets registered as callback at the :class:`~musicdb.lib.db.musicdb.MusicDatabase`.
+        It only remembers what changed.
+        The pool gets updated the next time :meth:`~Update` gets called.
+
+        Args:
+            databasepath (str): Path of the changed database
+            entrytype (str): Type of the changed entry or ``None``
+            entryid (int): ID of the changed entry or ``None``
+
+        Returns:
+            *Nothing*
+        """
+        if databasepath != self.databasepath:
+            return
+
+        with self.changelock:
+            if entrytype in ["album", "albumtags"] and entryid != None:
+                self.dirtyalbums.add(int(entryid))
+            elif entrytype in ["song", "songtags"] and entryid != None:
+                self.dirtysongs.add(int(entryid))
+            elif entrytype in [None, "album", "albumtags", "song", "songtags"]:
+                self.rebuild = True
+        return
+
+
+
+    def __SplitTagIDs(self, tags, approvedonly):
+        genreids    = set()
+        subgenreids = set()
+        for tag in tags:
+            if approvedonly and tag["approval"] < 1:
+                continue
+            if tag["class"] == MusicDatabase.TAG_CLASS_GENRE:
+                genreids.add(tag["id"])
+            elif tag["class"] == MusicDatabase.TAG_CLASS_SUBGENRE:
+                subgenreids.add(tag["id"])
+        return genreids, subgenreids
+
+
+    def __AddSongs(self, database, songs):
+        songids  = [ song["id"] for song in songs ]
+        songtags = database.GetTargetTagsBulk("song", songids)
+        for song in songs:
+            # Only approved song tags lead to rejection
+            genreids, subgenreids = self.__SplitTagIDs(songtags[song["id"]], True)
+
+            entry = {}
+            entry["albumid"]       = song["albumid"]
+            entry["artistid"]      = song["artistid"]
+            entry["disabled"]      = song["disabled"]
+            entry["favorite"]      = song["favorite"]
+            entry["badaudio"]      = song["badaudio"]
+            entry["liverecording"] = song["liverecording"]
+            entry["playtime"]      = song["playtime"]
+            entry["genres"]        = genreids
+            entry["subgenres"]     = subgenreids
+            self.songs[song["id"]] = entry
+
+            if song["albumid"] in self.albums:
+                self.albums[song["albumid"]]["songs"].add(song["id"])
+
+
+    def __AddAlbums(self, database, albums):
+        albumids  = [ album["id"] for album in albums ]
+        albumtags = database.GetTargetTagsBulk("album", albumids)
+        for album in albums:
+            # For albums, the approval gets ignored
+            genreids, subgenreids = self.__SplitTagIDs(albumtags[album["id"]], False)
+
+            entry = {}
+            entry["hidden"]    = bool(album["hidden"])
+            entry["artistid"]  = album["artistid"]
+            entry["genres"]    = genreids
+            entry["subgenres"] = subgenreids
+            entry["songs"]     = set()
+            self.albums[album["id"]] = entry
+
+
+    def __RemoveAlbum(self, albumid):
+        album = self.albums.pop(albumid, None)
+        if album:
+            for songid in album["songs"]:
+                self.songs.pop(songid, None)
+        self.candidates.pop(albumid, None)
+
+
+    def __Rebuild(self, database):
+        self.albums     = {}
+        self.songs      = {}
+        self.candidates = {}
+        self.__AddAlbums(database, database.GetAllAlbums())
+        self.__AddSongs(database, database.GetAllSongs())
+        self.filterkey  = None  # Enforce deriving the candidates
+        logging.debug("Randy candidate pool built with %i albums and %i songs", len(self.albums), len(self.songs))
+
+
+    def __ReloadAlbums(self, database, albumids):
+        for albumid in albumids:
+            self.__RemoveAlbum(albumid)
+
+            album = database.GetAlbumById(albumid)
+            if not album:
+                continue
+
+            self.__AddAlbums(database, [album])
+            self.__AddSongs(database, database.GetSongsByAlbumId(albumid))
+
+
+
+    def Update(self, database):
+        """
+        Applies all changes the database notified about since the last update.
+        Albums that changed, or albums whose songs changed get reloaded from the database.
+        If necessary, the whole pool gets rebuilt.
+
+        Args:
+            database: A :class:`~musicdb.lib.db.musicdb.MusicDatabase` instance
+
+        Returns:
+            *Nothing*
+        """
+        with self.changelock:
+            rebuild     = self.rebuild
+            dirtyalbums = self.dirtyalbums
+            dirtysongs  = self.dirtysongs
+            self.rebuild     = False
+            self.dirtyalbums = set()
+            self.dirtysongs  = set()
+
+        if rebuild:
+            self.__Rebuild(database)
+            return
+
+        if not dirtyalbums and not dirtysongs:
+            return
+
+        # A song may have been moved to another album, so its old and new album are affected
+        for songid in dirtysongs:
+            if songid in self.songs:
+                dirtyalbums.add(self.songs[songid]["albumid"])
+            song = database.GetSongById(songid)
+            if song:
+                dirtyalbums.add(song["albumid"])
+
+        self.__ReloadAlbums(database, dirtyalbums)
+
+        # Update derived candidates of the reloaded albums
+        if self.filterkey != None:
+            for albumid in dirtyalbums:
+                self.__DeriveAlbumCandidates(albumid)
+            self.candidatealbums = list(self.candidates.keys())
+
+        logging.debug("Randy candidate pool updated %i albums", len(dirtyalbums))
+        return
+
+
+
+    def __IsSongEligible(self, song, tagfilterset, constraints):
+        if constraints.get("nodisabled") == True and song["disabled"]:
+            return False
+        if constraints.get("nohated") == True and song["favorite"] < 0:
+            return False
+        if constraints.get("nobadfile") == True and song["badaudio"]:
+            return False
+        if constraints.get("nolivemusic") == True and song["liverecording"]:
+            return False
+
+        minlen = constraints.get("minlen")
+        maxlen = constraints.get("maxlen")
+        if type(minlen) == int and minlen >= 0 and (song["playtime"] == None or song["playtime"] < minlen):
+            return False
+        if type(maxlen) == int and maxlen >= 0 and (song["playtime"] == None or song["playtime"] > maxlen):
+            return False
+
+        # Check if song is of unwanted genre
+        if tagfilterset:
+            if song["genres"] and not song["genres"] & tagfilterset:
+                return False
+            if song["subgenres"] and not song["subgenres"] & tagfilterset:
+                return False
+        return True
+
+
+    def __IsAlbumEligible(self, album):
+        if album["hidden"]:
+            return False
+
+        if self.genretree == None:
+            return True
+
+        for genreid, subgenreids in self.genretree.items():
+            if genreid in album["genres"]:
+                if len(subgenreids) == 0:
+                    return True     # Genre does not have sub genres -> 100% match
+                elif subgenreids & album["subgenres"]:
+                    return True     # Album tagged with correct sub genre -> match
+                elif len(album["subgenres"]) == 0:
+                    return True     # No sub genres set -> keep
+        return False
+
+
+    def __DeriveAlbumCandidates(self, albumid):
+        self.candidates.pop(albumid, None)
+
+        album = self.albums.get(albumid)
+        if not album or not self.__IsAlbumEligible(album):
+            return
+
+        songids = [ songid for songid in album["songs"]
+                if self.__IsSongEligible(self.songs[songid], self.tagfilterset, self.constraints) ]
+
+        if songids:
+            self.candidates[albumid] = songids
+
+
+    def __DeriveCandidates(self, database, tagfilterlist, constraints):
+        filterkey = (frozenset(tagfilterlist), tuple(sorted(constraints.items())))
+        if filterkey == self.filterkey:
+            return
+
+        if tagfilterlist:
+            genretree = database.GenreListToGenreTree(tagfilterlist)
+            self.genretree = { int(genreid): set(subgenreids) for genreid, subgenreids in genretree.items() }
+        else:
+            self.genretree = None
+
+        self.filterkey    = filterkey
+        self.tagfilterset = set(tagfilterlist)
+        self.constraints  = dict(constraints)
+        self.candidates   = {}
+        for albumid in self.albums:
+            self.__DeriveAlbumCandidates(albumid)
+        self.candidatealbums = list(self.candidates.keys())
+
+        logging.debug("Randy candidate pool provides %i albums for the current filter", len(self.candidatealbums))
+
+
+
+    def GetRandomSongId(self, database, tagfilterlist, constraints):
+        """
+        Returns the ID of a random song that fulfills the constraints.
+        Like for :meth:`musicdb.lib.db.musicdb.MusicDatabase.GetRandomSong`, a random album gets chosen first.
+        Then a random song of this album gets chosen.
+        Only albums that have at least one eligible song are considered.
+
+        Before choosing, the pool gets updated via :meth:`~Update`.
+
+        Args:
+            database: A :class:`~musicdb.lib.db.musicdb.MusicDatabase` instance
+            tagfilterlist (list): A list of genre and sub genre tag IDs or ``None``
+            constraints (dict): Constraints as described for :meth:`musicdb.lib.db.musicdb.MusicDatabase.GetFilteredSongIds`
+
+        Returns:
+            A song ID or ``None`` if there is no song fulfilling the constraints
+        """
+        if tagfilterlist == None:
+            tagfilterlist = []
+
+        self.Update(database)
+        self.__DeriveCandidates(database, tagfilterlist, constraints)
+
+        if not self.candidatealbums:
+            return None
+
+        albumid = random.choice(self.candidatealbums)
+        songid  = random.choice(self.candidates[albumid])
+        return songid
+
+
+
+    def GetRandomSongIdFromAlbum(self, database, albumid, constraints):
+        """
+        Returns the ID of a random song of a specific album that fulfills the constraints.
+        The genre of the songs and the hidden state of the album get ignored.
+
+        Args:
+            database: A :class:`~musicdb.lib.db.musicdb.MusicDatabase` instance
+            albumid (int): ID of the album the song shall come from
+            constraints (dict): Constraints as described for :meth:`musicdb.lib.db.musicdb.MusicDatabase.GetFilteredSongIds`
+
+        Returns:
+            A song ID or ``None`` if there is no song fulfilling the constraints
+        """
+        self.Update(database)
+
+        album = self.albums.get(albumid)
+        if not album:
+            return None
+
+        songids = [ songid for songid in album["songs"]
+                if self.__IsSongEligible(self.songs[songid], None, constraints) ]
+        if not songids:
+            return None
+
+        return random.choice(songids)
+
+
+
 
 
 class Randy(object):
@@ -106,6 +622,14 @@ class Randy(object):
         self.blacklist  = BlacklistInterface(self.cfg, self.db)
         self.randyconfig= RandyConfiguration(self.cfg.files.randyconfig)
 
+        global CandidatePool
+        global CandidatePoolLock
+
+        with CandidatePoolLock:
+            if CandidatePool == None:
+                CandidatePool = RandyCandidatePool(self.db.databasepath)
+                self.db.RegisterCallback(CandidatePool.OnDatabaseChange)
+
 
 
     def ReloadConfiguration(self):
@@ -125,6 +649,7 @@ class Randy(object):
         self.minlen      = self.randyconfig.constraints.minsonglength
         self.maxlen      = self.randyconfig.constraints.maxsonglength
         self.maxtries    = self.randyconfig.limits.maxtries
+        self.reservoirdepth = self.randyconfig.limits.reservoirdepth
 
         self.constraints = {}
         self.constraints["nodisabled"]  = self.nodisabled
@@ -138,6 +663,39 @@ class Randy(object):
 
 
 
+    def GetFilterKey(self):
+        """
+        Returns a value that represents the current genre filter and constraints.
+        When this value changes, songs selected before are no longer valid candidates.
+
+        Returns:
+            A hashable object representing the genre filter and the constraints
+        """
+        self.ReloadConfiguration()
+        tagfilterlist = self.mdbstate.GetActiveTagIDs()
+        return (frozenset(tagfilterlist), tuple(sorted(self.constraints.items())))
+
+
+
+    def GetBlacklistSets(self):
+        """
+        Returns the valid IDs of all blacklists as sets, so that candidates can be checked by simple lookups.
+        Disabled blacklists (length set to 0) are returned as empty sets.
+        See :meth:`musicdb.mdbapi.blacklist.BlacklistInterface.GetValidIDsFromBlacklists`
+
+        Returns:
+            A tuple ``(VideoIDs, SongIDs, AlbumIDs, ArtistIDs)`` of sets of IDs
+        """
+        videobl, songbl, albumbl, artistbl = self.blacklist.GetValidIDsFromBlacklists()
+
+        videobl  = set(videobl)  if self.blacklist.videobllen  > 0 else set()
+        songbl   = set(songbl)   if self.blacklist.songbllen   > 0 else set()
+        albumbl  = set(albumbl)  if self.blacklist.albumbllen  > 0 else set()
+        artistbl = set(artistbl) if self.blacklist.artistbllen > 0 else set()
+        return videobl, songbl, albumbl, artistbl
+
+
+
     def GetSong(self):
         """
         This method chooses a random song in a two-stage process as described in the module description.
@@ -151,8 +709,8 @@ class Randy(object):
         Returns:
             A song from the :class:`~musicdb.lib.db.musicdb.MusicDatabase` or ``None`` if an error occurred.
         """
-        global BlacklistLock
-        global Blacklist
+        global CandidatePool
+        global CandidatePoolLock
 
         logging.debug("Randy starts looking for a random song …")
         t_start = datetime.datetime.now()
@@ -163,40 +721,92 @@ class Randy(object):
         if not tagfilterlist:
             logging.warning("No Genre selected! \033[1;30m(Selecting random song from the whole collection)")
 
+        videobl, songbl, albumbl, artistbl = self.GetBlacklistSets()
+
         # Get Random Song - this may take several tries 
         song  = None
         tries = 0
-        while not song:
-            tries += 1
-            if tries > self.maxtries:
-                logging.error("There was no valid song found within %i tries! \033[1;30m(Check the constraints)", self.maxtries)
-                return None
-
-            # STAGE 1: Get Mathematical random song (under certain constraints)
-            try:
-                song = self.db.GetRandomSong(tagfilterlist, self.constraints)
-            except Exception as e:
-                logging.exception("Getting random song failed with error: \"%s\"!", str(e))
-                return None
-
-            if not song:
-                logging.debug("No song found that fulfills the constraints! \033[1;30m(Trying again)")
-                continue
-
-            logging.debug("Candidate for next song: \033[0;35m" + song["path"])
-
-            # STAGE 2: Make randomness feeling random by checking if the song/album/artist was recently played
-            if self.blacklist.CheckAllListsForSong(song):
-                song = None
-                continue
+        with CandidatePoolLock:
+            while not song:
+                tries += 1
+                if tries > self.maxtries:
+                    logging.error("There was no valid song found within %i tries! \033[1;30m(Check the constraints)", self.maxtries)
+                    return None
+
+                # STAGE 1: Get Mathematical random song (under certain constraints)
+                try:
+                    songid = CandidatePool.GetRandomSongId(self.db, tagfilterlist, self.constraints)
+                except Exception as e:
+                    logging.exception("Getting random song failed with error: \"%s\"!", str(e))
+                    return None
+
+                if songid == None:
+                    logging.error("There is no song fulfilling the constraints! \033[1;30m(Check the stage 1 constraints)")
+                    return None
+
+                # STAGE 2: Make randomness feeling random by checking if the song/album/artist was recently played
+                candidate = CandidatePool.songs[songid]
+                if songid in songbl or candidate["albumid"] in albumbl or candidate["artistid"] in artistbl:
+                    continue
+
+                song = self.db.GetSongById(songid)
+                if not song:
+                    logging.debug("Candidate with ID %i does no longer exist! \033[1;30m(Trying again)", songid)
+                    continue
 
         # New song found \o/
+        logging.debug("Randy found a song after %i tries", tries)
         t_stop = datetime.datetime.now()
         logging.debug("Randy found the following song after %s : \033[0;36m%s", str(t_stop-t_start), song["path"])
         return song
 
 
 
+    def GetPrefetchedSong(self):
+        """
+        This method returns a song from the reservoir that gets filled by the :meth:`~RandomSongReservoirThread`.
+        If the song is no longer a valid candidate, it gets dropped and the next one gets taken.
+        If there is no valid song in the reservoir, a new song gets selected via :meth:`~GetSong`.
+
+        For details see the module description at the top of this document.
+
+        Returns:
+            A song from the :class:`~musicdb.lib.db.musicdb.MusicDatabase` or ``None`` if an error occurred.
+        """
+        filterkey = self.GetFilterKey()
+        videobl, songbl, albumbl, artistbl = self.GetBlacklistSets()
+
+        song = None
+        with ReservoirCondition:
+            while Reservoir and not song:
+                songid, songfilterkey = Reservoir.popleft()
+                if songfilterkey != filterkey:
+                    logging.debug("Dropping song from reservoir \033[1;30m(Genre filter or constraints changed)")
+                    continue
+                if songid in songbl:
+                    logging.debug("Dropping song from reservoir \033[1;30m(Song on blacklist)")
+                    continue
+
+                song = self.db.GetSongById(songid)
+                if not song:
+                    continue
+
+                if song["albumid"] in albumbl or song["artistid"] in artistbl:
+                    logging.debug("Dropping song from reservoir \033[1;30m(Album or artist on blacklist)")
+                    song = None
+                    continue
+
+            # Let the reservoir thread refill the reservoir
+            ReservoirCondition.notify_all()
+
+        if song:
+            logging.debug("Randy took the following song from the reservoir: \033[0;36m%s", song["path"])
+            return song
+
+        return self.GetSong()
+
+
+
     def GetSongFromAlbum(self, albumid):
         """
         Get a random song from a specific album.
@@ -225,11 +835,13 @@ class Randy(object):
         Returns:
             A song from the :class:`~musicdb.lib.db.musicdb.MusicDatabase` or ``None`` if an error occurred.
         """
-        global BlacklistLock
-        global Blacklist
+        global CandidatePool
+        global CandidatePoolLock
 
         self.ReloadConfiguration()
 
+        videobl, songbl, albumbl, artistbl = self.GetBlacklistSets()
+
         # Get parameters
         song     = None
         fallback = None # a song that is on the blacklist - better than no song
@@ -239,31 +851,33 @@ class Randy(object):
             tries += 1
             # STAGE 1: Get Mathematical random song (under certain constraints)
             try:
-                song = self.db.GetRandomSong(None, self.constraints, albumid)
+                with CandidatePoolLock:
+                    songid = CandidatePool.GetRandomSongIdFromAlbum(self.db, albumid, self.constraints)
             except Exception as e:
                 logging.error("Getting random song failed with error: \"%s\"!", str(e))
                 return None
 
-            if not song:
+            if songid == None:
                 logging.debug("No song found that fulfills the constraints! \033[1;30m(Trying again)")
                 continue
 
-            logging.debug("Candidate for next song: \033[0;35m" + song["path"])
-            
             # STAGE 2: Make randomness feeling random by checking if the song was recently played
             # only check, if that song is in the blacklist. Artist and album is forced by the user
-            if self.blacklist.CheckSongList(song):
-                fallback = song # in case no valid song gets found, this one is better than none
-                song     = None
+            if songid in songbl:
+                fallback = songid # in case no valid song gets found, this one is better than none
                 continue 
 
+            song = self.db.GetSongById(songid)
+
         if not song:
             if not fallback:
                 logging.warning("The loop that should find a new random song did not deliver a song! \033[1;30m(This happens when there are too many songs of the given album are already on the blacklist.)")
                 return None
             else:
                 logging.warning("The loop that should find a new random song did not deliver a song! \033[1;30m(Using one from the blacklist instead.)")
-                song = fallback
+                song = self.db.GetSongById(fallback)
+                if not song:
+                    return None
 
 
         # Add song to queue
@@ -34,19 +34,22 @@ If the server is not started, the objects are all ``None``.
     * :class:`musicdb.lib.db.musicdb.MusicDatabase` as ``database``
     * :class:`musicdb.mdbapi.mise.MusicDBMicroSearchEngine` as ``mise``
     * :class:`musicdb.lib.cfg.musicdb.MusicDBConfig` as ``cfg``
+    * ``concurrent.futures.ThreadPoolExecutor`` as ``executor`` for blocking WebSocket calls (see :doc:`/basics/webapi`)
 
 """
 
 import traceback
 import random
-import time
 import signal
+from concurrent.futures         import ThreadPoolExecutor
 from musicdb.lib.cfg.musicdb    import MusicDBConfig
 from musicdb.lib.db.musicdb     import MusicDatabase
 from musicdb.lib.filesystem     import Filesystem
 from musicdb.lib.ws.server      import MusicDBWebSocketServer
+from musicdb.lib.ws.callregistry    import GetCallStatistics
 from musicdb.mdbapi.mise        import MusicDBMicroSearchEngine
 from musicdb.mdbapi.audiostream import StartAudioStreamingThread, StopAudioStreamingThread
+from musicdb.mdbapi.randy       import StartRandomSongReservoirThread, StopRandomSongReservoirThread
 from musicdb.mdbapi.videostream import StartVideoStreamingThread, StopVideoStreamingThread
 from musicdb.taskmanagement.managementthread    import StartTaskManagementThread, StopTaskManagementThread
 import logging
@@ -57,6 +60,7 @@ import logging
 database    = None  # music.db object
 mise        = None  # micro search engine object
 cfg         = None  # overall configuration file
+executor    = None  # thread pool for blocking websocket calls
 # WS Server
 tlswsserver = None
 shutdown    = False
@@ -127,7 +131,10 @@ def UpdateCaches():
 
     On server side:
     
-        * The MiSE Cache gets updated by calling :meth:`musicdb.mdbapi.mise.MusicDBMicroSearchEngine.UpdateCache`
+        * The MiSE Cache gets updated by calling :meth:`musicdb.mdbapi.mise.MusicDBMicroSearchEngine.UpdateCache`,
+          but only if it is not valid anymore (see :meth:`musicdb.mdbapi.mise.MusicDBMicroSearchEngine.IsCacheValid`).
+          Usually it gets updated incrementally by :class:`musicdb.mdbapi.music.MusicDBMusic`.
+        * The entity cache of the music database gets cleared by calling :meth:`musicdb.lib.db.musicdb.MusicDatabase.ClearCache`
 
 
     To inform the clients a broadcast packet get sent with the following content: ``{method:"broadcast", fncname:"sys:refresh", fncsig:"UpdateCaches", arguments:null, pass:null}``
@@ -145,7 +152,14 @@ def UpdateCaches():
     global tlswsserver
 
     try:
-        mise.UpdateCache()
+        database.ClearCache()
+    except Exception as e:
+        logging.warning("Unexpected error clearing the database cache: %s \033[0;33m(will be ignored)\033[0m", str(e))
+
+    try:
+        if not mise.IsCacheValid():
+            mise.UpdateCache()
+            mise.SaveSnapshot()
     except Exception as e:
         logging.warning("Unexpected error updating MiSE cache: %s \033[0;33m(will be ignored)\033[0m", str(e))
 
@@ -169,6 +183,21 @@ def SIGTERM_Handler():
     logging.info("\033[1;36mSIGTERM:\033[1;34m Initiate Shutdown …\033[0m")
     global shutdown
     shutdown = True
+    if tlswsserver:
+        tlswsserver.StopEventLoop()
+
+
+
+def SIGINT_Handler():
+    """
+    This function is the handler for the system signal INT (*Ctrl-C*).
+    Like :meth:`~SIGTERM_Handler` it signals the server to shut down.
+    """
+    logging.warning("user initiated server shutdown");
+    global shutdown
+    shutdown = True
+    if tlswsserver:
+        tlswsserver.StopEventLoop()
 
 
 
@@ -180,12 +209,14 @@ def Initialize(configobj, databaseobj):
     The following things happen when this method gets called:
 
         #. Assign the *configobj* and *databaseobj* to global variables ``cfg`` and ``database`` to share them between multiple connections
+        #. Enable the entity cache of the music database via :meth:`musicdb.lib.db.musicdb.MusicDatabase.SetCacheSize`
         #. Seed Python's random number generator
         #. Instantiate a global :meth:`musicdb.mdbapi.mise.MusicDBMicroSearchEngine` object
         #. Starting the upload, integration and import management via :meth:`musicdb.taskmanagement.managementthread.StartTaskManagementThread`
+        #. Start the Random Song Reservoir Thread via :meth:`musicdb.mdbapi.randy.StartRandomSongReservoirThread`
         #. Start the Audio Streaming Thread via :meth:`musicdb.mdbapi.audiostream.StartAudioStreamingThread` (see :doc:`/mdbapi/audiostream` for details)
         #. Start the Video Streaming Thread via :meth:`musicdb.mdbapi.videostream.StartVideoStreamingThread` (see :doc:`/mdbapi/audiostream` for details)
-        #. Update MiSE cache via :meth:`musicdb.mdbapi.mise.MusicDBMicroSearchEngine.UpdateCache`
+        #. Load the MiSE cache via :meth:`musicdb.mdbapi.mise.MusicDBMicroSearchEngine.LoadSnapshot`, or, if the snapshot is stale, update it via :meth:`musicdb.mdbapi.mise.MusicDBMicroSearchEngine.UpdateCache`
 
     Args:
         configobj: :class:`~musicdb.lib.cfg.musicdb.MusicDBConfig` that gets shared between connections
@@ -210,6 +241,7 @@ def Initialize(configobj, databaseobj):
 
     cfg      = configobj
     database = databaseobj
+    database.SetCacheSize(cfg.database.entitycache)
 
     random.seed()
 
@@ -221,13 +253,19 @@ def Initialize(configobj, databaseobj):
     logging.debug("Starting Task Management…")
     StartTaskManagementThread(cfg, database)
 
+    logging.debug("Starting Random Song Reservoir…")
+    StartRandomSongReservoirThread(cfg, database)
+
     # Start/Connect all interfaces
     logging.debug("Starting Streaming Thread…")
     StartAudioStreamingThread(cfg, database)
     StartVideoStreamingThread(cfg, database)
     
-    logging.debug("Updating MiSE Cache…")
-    mise.UpdateCache()
+    logging.debug("Loading MiSE Cache…")
+    if not mise.LoadSnapshot():
+        logging.debug("Updating MiSE Cache…")
+        mise.UpdateCache()
+        mise.SaveSnapshot()
     
     # Signal Handler
     signal.signal(signal.SIGTERM, SignalHandler)
@@ -237,13 +275,32 @@ def Initialize(configobj, databaseobj):
 
 
 
+def InitializeWorkerThread():
+    """
+    This function gets called in each worker thread of the ``executor`` before it executes its first call.
+    It establishes the connection of the thread to the music database (see :doc:`/lib/database`).
+    """
+    MusicDatabase(cfg.files.musicdatabase)
+
+
+
 def StartWebSocketServer():
     """
     This function creates and starts the actual MusicDB Websocket Server.
 
+    Before, the thread pool for blocking calls gets created with ``[websocket]->workers`` threads.
+    If this number is ``0``, no thread pool gets created and all calls get executed in the main thread.
+
     Returns:
         ``True`` on success, otherwise ``False``
     """
+    global executor
+    if cfg.websocket.workers > 0:
+        executor = ThreadPoolExecutor(
+                max_workers        = cfg.websocket.workers,
+                thread_name_prefix = "WebSocketWorker",
+                initializer        = InitializeWorkerThread)
+
     global tlswsserver
     tlswsserver = MusicDBWebSocketServer()
     
@@ -274,6 +331,8 @@ def Shutdown():
         #. Stopping task management via :meth:`musicdb.taskmanagement.managementthread.StopTaskManagementThread`
         #. Stop the Audio Streaming Thread via :meth:`musicdb.mdbapi.audiostream.StopAudioStreamingThread`
         #. Stop the Video Streaming Thread via :meth:`musicdb.mdbapi.videostream.StopVideoStreamingThread`
+        #. Stop the Random Song Reservoir Thread via :meth:`musicdb.mdbapi.randy.StopRandomSongReservoirThread`
+        #. Stop the worker threads for blocking websocket calls
         #. Stop the websocket server
 
     At the end, the program gets terminated. So, this function gets never left.
@@ -296,11 +355,31 @@ def Shutdown():
     logging.debug("Stopping Streaming Threads…")
     StopAudioStreamingThread()
     StopVideoStreamingThread()
+
+    logging.debug("Stopping Random Song Reservoir Thread…")
+    StopRandomSongReservoirThread()
     
+    if executor:
+        logging.debug("Stopping WebSocket Worker Threads…")
+        executor.shutdown(wait=True, cancel_futures=True)
+
     if tlswsserver:
         logging.debug("Stopping TLS WS Server…")
         tlswsserver.Stop()
 
+    if database:
+        statistics = database.GetCacheStatistics()
+        logging.debug("Entity cache: %i hits, %i misses, %i evictions", statistics["hits"], statistics["misses"], statistics["evictions"])
+
+    for fncname, statistics in sorted(GetCallStatistics().items()):
+        logging.debug("WebSocket call %s: %i calls, %.2fms average", fncname, statistics["calls"], statistics["average"])
+
+    if tlswsserver:
+        statistics = tlswsserver.factory.GetTrafficStatistics()
+        logging.debug("WebSocket traffic: %i messages (%i compressible), %i bytes payload, %i bytes sent, %i of %i connections used compression",
+                statistics["messages"], statistics["compressed"], statistics["payloadbytes"], statistics["wirebytes"],
+                statistics["deflate"], statistics["connections"])
+
     # dead end
     global shutdown
     if shutdown:
@@ -314,10 +393,13 @@ def Run():
     """
     This is the servers main loop.
 
-    Inside the loop all MusicDB Websocket Server events get handled by calling :meth:`musicdb.lib.ws.server.MusicDBWebSocketServer.HandleEvents`.
-    When a shutdown gets triggered the :meth:`~mdbapi.server.Shutdown` function gets called and the server stops.
+    The asyncio event loop of the MusicDB Websocket Server gets executed via :meth:`musicdb.lib.ws.server.MusicDBWebSocketServer.Run`.
+    So incoming messages get handled immediately.
+    The signals ``SIGTERM`` and ``SIGINT`` get handled inside the event loop by :meth:`~SIGTERM_Handler` and :meth:`~SIGINT_Handler`.
+    They stop the event loop.
+    Then the :meth:`~mdbapi.server.Shutdown` function gets called and the server stops.
 
-    The :meth:`~musicdb.mdbapi.server.Shutdown` gets also called the user presses *Ctrl-C* This leads to a regular shutdown.
+    So the :meth:`~musicdb.mdbapi.server.Shutdown` gets also called the user presses *Ctrl-C* This leads to a regular shutdown.
 
     In as an exception occurs the :meth:`~musicdb.mdbapi.server.Shutdown` gets called, too. In this case the exit-code will be ``1``.
     """
@@ -328,16 +410,14 @@ def Run():
         logging.critical("TLS Websocket Server was not started!")
         return
 
-    try:
-
-        global shutdown
-        while True:
-            tlswsserver.HandleEvents()
-            
-            if shutdown:
-                Shutdown()
+    global shutdown
+    tlswsserver.eventloop.add_signal_handler(signal.SIGTERM, SIGTERM_Handler)
+    tlswsserver.eventloop.add_signal_handler(signal.SIGINT,  SIGINT_Handler)
 
-            time.sleep(.1)  # Avoid high CPU load
+    try:
+        if not shutdown:    # SIGTERM may already be received during initialization
+            tlswsserver.Run()
+        Shutdown()
 
     except KeyboardInterrupt:
         logging.warning("user initiated server shutdown");
@@ -64,11 +64,44 @@ A return value gets not handled.
 The following events exist:
 
     SongQueueChanged:
-        Gets triggered when the Song Queue changes
+        Gets triggered when the Song Queue changes.
+        The argument is a dictionary describing the changes (see below).
 
     SongChanged:
         When the current playing song changes.
 
+Song Queue Revisions
+--------------------
+
+Each change of the queue increments the revision of the queue.
+The ``SongQueueChanged`` event gets a dictionary with the following keys as argument:
+
+    base:
+        The revision of the queue before the changes
+
+    revision:
+        The revision of the queue after the changes
+
+    changes:
+        A list of operations that transform the queue of revision ``base`` into the queue of revision ``revision``
+
+Each operation is a dictionary with the key ``"operation"`` and further keys depending on the operation:
+
+    ``"insert"``:
+        A new entry got inserted behind the entry ``afterid``.
+        ``afterid`` is ``None`` when the entry got inserted at the beginning of the queue.
+        The other keys are the same as the entry has: ``entryid``, ``songid``, ``israndom``
+
+    ``"remove"``:
+        The entry ``entryid`` got removed from the queue
+
+    ``"move"``:
+        The entry ``entryid`` got moved behind the entry ``afterid``
+
+So clients can update their copy of the queue without requesting the whole queue again.
+When they missed a revision, they can get the whole queue and its revision via :meth:`~SongQueue.GetSnapshot`.
+The revision starts with ``0`` each time MusicDB gets started.
+
 Examples
 --------
 
@@ -104,6 +137,8 @@ from musicdb.mdbapi.blacklist   import BlacklistInterface
 Queue     = None
 QueueLock = threading.RLock()   # RLock allows nested calls. It locks only different threads.
 Callbacks = []                  # For events like QueueChanged or SongChanged
+Revision  = 0                   # Incremented with each change of the queue
+Changes   = []                  # Changes of the queue that were not yet announced via SongQueueChanged
 
 
 
@@ -222,12 +257,26 @@ class SongQueue(object):
         More details in the module description at the top of this document.
 
         This method also tries to save the queue into the MusicDB State Directory.
+
+        The changes of the queue since the last event get passed as argument to the callback functions.
+        See the module description for details.
         """
-        try:
-            self.Save()
-        except Exception as e:
-            logging.warning("Saving the current song queue failed with error: %s. \033[1;30m(Continuing without saving)", str(e))
-        self.TriggerEvent("SongQueueChanged")
+        global Changes
+        global QueueLock
+
+        with QueueLock:
+            try:
+                self.Save()
+            except Exception as e:
+                logging.warning("Saving the current song queue failed with error: %s. \033[1;30m(Continuing without saving)", str(e))
+
+            delta = {}
+            delta["base"]     = Revision - len(Changes)
+            delta["revision"] = Revision
+            delta["changes"]  = Changes
+            Changes = []
+
+        self.TriggerEvent("SongQueueChanged", delta)
 
     def Event_SongChanged(self):
         """
@@ -274,6 +323,45 @@ class SongQueue(object):
 
 
 
+    def __RecordChange(self, operation, entryid, **arguments):
+        # Must be called with QueueLock acquired
+        global Revision
+        global Changes
+
+        change = {}
+        change["operation"] = operation
+        change["entryid"]   = entryid
+        change.update(arguments)
+
+        Revision += 1
+        Changes.append(change)
+
+
+
+    def __GetPreviousID(self, index):
+        # Must be called with QueueLock acquired
+        if index == 0:
+            return None
+        return Queue[index-1]["entryid"]
+
+
+
+    def GetSnapshot(self):
+        """
+        This method returns a copy of the song queue together with its revision.
+        See the module description for details about revisions.
+
+        Returns:
+            A tuple ``(revision, queue)`` with the revision as integer and the queue as described in :meth:`~GetQueue`
+        """
+        global Queue
+        global QueueLock
+
+        with QueueLock:
+            return Revision, list(Queue)
+
+
+
     def GenerateID(self):
         """
         This method generate a unique ID.
@@ -415,11 +503,12 @@ class SongQueue(object):
 
             # Get next song
             if len(Queue) == 1:
-                Queue.pop(0)
+                lastentry = Queue.pop(0)
                 entry = None
             else:   # > 1
-                Queue.pop(0)
+                lastentry = Queue.pop(0)
                 entry = Queue[0]
+            self.__RecordChange("remove", lastentry["entryid"])
 
             # Make sure the queue never runs empty
             if len(Queue) < 2:
@@ -504,23 +593,30 @@ class SongQueue(object):
 
         with QueueLock:
             if position == "next":
-                Queue.insert(1, newentry)
+                index = min(1, len(Queue))
+                Queue.insert(index, newentry)
 
             elif position == "last":
+                index = len(Queue)
                 Queue.append(newentry)
 
             elif type(position) == int:
                 for index, entry in enumerate(Queue):
                     if entry["entryid"] == position:
-                        Queue.insert(index+1, newentry)
+                        index += 1
+                        Queue.insert(index, newentry)
                         break;
                 else:
                     logging.warning("Queue Entry ID %s does not exist. \033[1;30m(Doing nothing)", str(position))
+                    index = None
 
             else:
                 logging.warning("Position must have the value \"next\", \"last\" or an Queue Entry ID. Given was \"%s\". \033[1;30m(Doing nothing)", str(position))
                 return
 
+            if index != None:
+                self.__RecordChange("insert", entryid, songid=songid, israndom=israndom, afterid=self.__GetPreviousID(index))
+
         # add to blacklist
         self.blacklist.AddSong(songid)
 
@@ -539,7 +635,8 @@ class SongQueue(object):
             * ``"next"``: Inserts the song right after the current playing song.
 
         When there is an album ID, the randoms song gets selected from that album using :meth:`musicdb.mdbapi.randy.Randy.GetSongFromAlbum`.
-        If the album ID is ``None``, the method :meth:`musicdb.mdbapi.randy.Randy.GetSong` will be used to get a random song from the activated genres.
+        If the album ID is ``None``, the method :meth:`musicdb.mdbapi.randy.Randy.GetPrefetchedSong` will be used to get a random song from the activated genres.
+        This song usually comes from the random song reservoir, so that there is no need to wait for Randy.
 
         After selecting the random song, the :meth:`~AddSong` method gets used to insert the new song into the queue.
         If there is no song found by Randy, then nothing gets added to the queue and ``False`` will be returned.
@@ -562,7 +659,7 @@ class SongQueue(object):
         if albumid:
             mdbsong = self.randy.GetSongFromAlbum(albumid)
         else:
-            mdbsong = self.randy.GetSong()
+            mdbsong = self.randy.GetPrefetchedSong()
 
         if not mdbsong:
             return False
@@ -635,7 +732,10 @@ class SongQueue(object):
                 logging.warning("The entry ID addresses the current song. This entry cannot be removed!")
                 return False
 
-            Queue = [entry for entry in Queue if entry["entryid"] != entryid]
+            length = len(Queue)
+            Queue  = [entry for entry in Queue if entry["entryid"] != entryid]
+            if len(Queue) < length:
+                self.__RecordChange("remove", entryid)
 
             # Make sure the queue never runs empty
             if len(Queue) < 2:
@@ -700,6 +800,7 @@ class SongQueue(object):
             # Move element
             entry = Queue.pop(frompos)
             Queue.insert(topos, entry)
+            self.__RecordChange("move", entryid, afterid=afterid)
 
         self.Event_SongQueueChanged()
         return True
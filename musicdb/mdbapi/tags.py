@@ -70,11 +70,13 @@ class MusicDBTags(object):
             *Nothing*
         """
         songs = self.db.GetSongsByAlbumId(albumid)
+        songids = [song["id"] for song in songs]
+        alltags = self.db.GetTargetTagsBulk("song", songids)
 
         histogram = {}
         # Get genres of all songs on the album
         for song in songs:
-            tags = self.db.GetTargetTags("song", song["id"])
+            tags = alltags[song["id"]]
             if not tags:
                 continue
 
@@ -96,12 +98,15 @@ class MusicDBTags(object):
 
         # Set new tags
         numofsongs = len(songs)
+        newtags    = []
         for key in histogram:
             tagid = int(key)
             count = histogram[key]
             confidence = count / numofsongs
 
-            self.db.SetTargetTag("album", albumid, tagid, approval=0, confidence=confidence)
+            newtags.append((albumid, tagid, 0, confidence))
+
+        self.db.SetTargetTags("album", newtags)
             
 
 
@@ -25,6 +25,7 @@ Its main task is to add new albums, artists or music videos to the Music Databas
 This command line interface expects two positional arguments. 
 A subcommand and a path to the target (artist, album, song, video): ``musicdb database $SUBCOMMAND $PATH``.
 The target gets determined by its path.
+Only the ``analyze`` subcommand does not expect a path.
 
 The following subcommands are provided:
 
@@ -37,6 +38,12 @@ The following subcommands are provided:
         Check the given path if it is a valid artist, album or song path.
         This is done by calling :meth:`musicdb.mdbapi.music.MusicDBMusic.AnalysePath`.
 
+    ``analyze``:
+        Prints the query plans of the most frequently executed queries of the WebUI.
+        This is done by calling :meth:`musicdb.lib.db.database.Database.GetQueryPlan`.
+        Steps that scan a whole table instead of searching via an index are highlighted.
+        The database gets not modified.
+
 .. attention::
 
     After removing entries from the database they may be still in some caches.
@@ -56,6 +63,11 @@ Examples:
         musicdb database remove /var/music/Bad\ Artist
         sudo systemctl restart musicdb
 
+
+    .. code-block:: bash
+
+        musicdb database analyze
+
 """
 
 import argparse
@@ -65,11 +77,52 @@ from musicdb.lib.filesystem import Filesystem
 from musicdb.mdbapi.music   import MusicDBMusic
 
 class database(MDBModule, MusicDBMusic):
+    # Queries as executed by the related MusicDatabase methods (name, sql, example value)
+    HOTQUERIES = [
+        ("GetArtistByPath",     "SELECT * FROM artists WHERE path = ?", "Artist"),
+        ("GetAlbumByPath",      "SELECT * FROM albums WHERE path = ?", "Artist/2000 - Album"),
+        ("GetAlbumsByArtistId", "SELECT * FROM albums WHERE 1=1 AND artistid = ? AND hidden = 0", 1),
+        ("GetAlbums(genretree)","SELECT * FROM albums WHERE 1=1 AND hidden = 0 AND albumid IN (SELECT albumid FROM albumtags WHERE tagid IN (?))", 1),
+        ("GetSongByPath",       "SELECT * FROM songs WHERE path = ?", "Artist/2000 - Album/01 Song.flac"),
+        ("GetSongs(albumid)",   "SELECT * FROM songs WHERE albumid = ?", 1),
+        ("GetSongsByArtistId",  "SELECT * FROM songs WHERE artistid = ?", 1),
+        ("GetVideosByArtistId", "SELECT * FROM videos WHERE artistid = ?", 1),
+        ("GetLyrics",           "SELECT lyrics FROM lyrics WHERE songid = ?", 1),
+        ("GetTargetTags(song)", "SELECT map.*, tags.* FROM songtags AS map LEFT JOIN tags ON tags.tagid = map.tagid WHERE map.songid IN (?) ORDER BY map.entryid", 1),
+        ("GetTargetTags(album)","SELECT map.*, tags.* FROM albumtags AS map LEFT JOIN tags ON tags.tagid = map.tagid WHERE map.albumid IN (?) ORDER BY map.entryid", 1),
+        ("GetTargetTags(video)","SELECT map.*, tags.* FROM videotags AS map LEFT JOIN tags ON tags.tagid = map.tagid WHERE map.videoid IN (?) ORDER BY map.entryid", 1),
+        ("GetTagStatistics",    "SELECT COUNT(*) FROM songtags  WHERE tagid = ?", 1),
+        ("GetTagStatistics",    "SELECT COUNT(*) FROM albumtags WHERE tagid = ?", 1),
+        ("GetTagStatistics",    "SELECT COUNT(*) FROM videotags WHERE tagid = ?", 1),
+        ("GetTagStatistics",    "SELECT COUNT(*) FROM tags      WHERE parentid = ?", 1),
+        ]
+
     def __init__(self, config, database):
         MusicDBMusic.__init__(self, config, database)
 
 
 
+    def CMD_Analyze(self):
+        numofscans = 0
+        for name, sql, value in self.HOTQUERIES:
+            print("\033[1;34m%s\033[1;30m: %s"%(name, sql))
+            plan = self.db.GetQueryPlan(sql, value)
+            for step in plan:
+                # A SCAN over a table (not over an index) means reading the whole table
+                if step.startswith("SCAN") and "INDEX" not in step:
+                    print("\033[1;33m    %s\033[0m"%(step))
+                    numofscans += 1
+                else:
+                    print("\033[0;32m    %s\033[0m"%(step))
+
+        if numofscans > 0:
+            print("\033[1;33m%i full table scans found. \033[1;30m(Check if all indexes exist)\033[0m"%(numofscans))
+        else:
+            print("\033[1;32mAll queries are answered via indexes.\033[0m")
+        return 0
+
+
+
     def CMD_Remove(self, target, abspath):
 
         try:
@@ -167,6 +220,9 @@ class database(MDBModule, MusicDBMusic):
         chkparser.add_argument("path", help="path to an artist, album, song or root music directory")
         chkparser.set_defaults(command="CheckPath")
 
+        anaparser = subp.add_parser("analyze", help="print the query plans of frequently executed queries")
+        anaparser.set_defaults(command="Analyze")
+
 
     # return exit-code
     def MDBM_Main(self, args):
@@ -178,6 +234,16 @@ class database(MDBModule, MusicDBMusic):
 
         command = args.command
 
+        # The analyze command works on the whole database and does not need a path
+        if command == "Analyze":
+            try:
+                return self.CMD_Analyze()
+            except Exception as e:
+                print("\033[1;31mFATAL ERROR:");
+                print(e)
+                traceback.print_exc()
+                return 1
+
         # Determine absolute path by relative path
         fs = Filesystem()
         try:
@@ -167,7 +167,8 @@ class mise(MDBModule, MusicDBMicroSearchEngine):
     def MDBM_Main(self, args):
 
         logging.debug("Initialize MiSE cache…")
-        self.UpdateCache()
+        if not self.LoadSnapshot():
+            self.UpdateCache()
         logging.debug("Searching…")
         results = self.Find(args.searchstring)
 
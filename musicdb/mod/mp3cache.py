@@ -0,0 +1,174 @@
+# MusicDB,  a music manager with web-bases UI that focus on music.
+# Copyright (C) 2017 - 2022  Ralf Stemmer <ralf.stemmer@gmx.net>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+This module manages the cache of transcoded songs (see :doc:`/lib/mp3cache`).
+
+The following subcommands are provided:
+
+    ``prewarm``:
+        Transcodes the most played songs into the cache, so that they do not need to be transcoded when they get streamed.
+        The songs are taken from the tracker database via :meth:`musicdb.lib.db.trackerdb.TrackerDatabase.GetMostPlayed`.
+        With the ``-n`` option the number of songs can be defined. Default is 100.
+        When further Icecast mountpoints are configured (``[Icecast]->extramounts``), the songs get cached in their bit rates as well.
+        Songs that are already cached in all these bit rates are skipped.
+        The songs get transcoded beginning with the least played one,
+        so that the most played songs are the last ones to get evicted from the cache.
+
+    ``info``:
+        Prints the number of cached songs and the size of the cache.
+
+    ``clear``:
+        Removes all songs from the cache.
+
+Examples:
+
+    .. code-block:: bash
+
+        musicdb mp3cache prewarm -n 500
+
+    .. code-block:: bash
+
+        musicdb mp3cache info
+"""
+
+import argparse
+import traceback
+from tqdm                       import tqdm
+from musicdb.lib.modapi         import MDBModule
+from musicdb.lib.filesystem     import Filesystem
+from musicdb.lib.db.trackerdb   import TrackerDatabase
+from musicdb.lib.stream.mp3cache    import MP3Cache
+from musicdb.lib.stream.mp3stream   import MP3Stream
+
+
+class mp3cache(MDBModule):
+    def __init__(self, config, database):
+        MDBModule.__init__(self)
+        self.cfg        = config
+        self.db         = database
+        self.filesystem = Filesystem(self.cfg.directories.music)
+        self.cache      = MP3Cache(self.cfg.directories.mp3cache, self.cfg.mp3cache.size * 1024**2)
+
+
+    @staticmethod
+    def MDBM_CreateArgumentParser(parserset, modulename):
+        parser = parserset.add_parser(modulename, help="manage the cache of transcoded songs")
+        parser.set_defaults(module=modulename)
+
+        subp   = parser.add_subparsers(title="Commands", metavar="command", help="mp3 cache commands")
+
+        preparser = subp.add_parser("prewarm", help="transcode the most played songs into the cache")
+        preparser.add_argument("-n", "--number", action="store", type=int, default=100,
+                help="number of most played songs to cache (default: 100)")
+        preparser.set_defaults(command="PreWarm")
+
+        infparser = subp.add_parser("info", help="print size of the cache")
+        infparser.set_defaults(command="Info")
+
+        clrparser = subp.add_parser("clear", help="remove all songs from the cache")
+        clrparser.set_defaults(command="Clear")
+
+
+
+    def CMD_PreWarm(self, number):
+        trackerdb = TrackerDatabase(self.cfg.files.trackerdatabase)
+        mostplayed= trackerdb.GetMostPlayed("song", number)
+        mostplayed.reverse()    # Transcode the most played song last so it gets evicted last
+
+        # The audio stream needs the songs in the bit rates of all mountpoints
+        extrabitrates = [bitrate for mountname, bitrate in self.cfg.icecast.extramounts]
+        bitrates      = [None] + extrabitrates  # None is the default bit rate
+
+        print("\033[1;34mPre-warming mp3 cache with the \033[1;36m%i\033[1;34m most played songs\033[0;36m"%(len(mostplayed)))
+        numtranscoded = 0
+        numfailed     = 0
+        for entry in tqdm(mostplayed, unit="Songs"):
+            song = self.db.GetSongById(entry["id"])
+            if not song:
+                continue
+
+            if None not in [self.cache.Lookup(song["checksum"], bitrate) for bitrate in bitrates]:
+                continue    # Already cached
+
+            path = self.filesystem.AbsolutePath(song["path"])
+            if not self.filesystem.IsFile(path):
+                numfailed += 1
+                continue
+
+            try:
+                mp3stream = MP3Stream(path, song["checksum"], self.cache, extrabitrates)
+                for frame in mp3stream.Frames():
+                    pass
+            except Exception as e:
+                tqdm.write("\033[1;31mTranscoding %s failed with error: %s\033[0;36m"%(song["path"], str(e)))
+                numfailed += 1
+                continue
+
+            numtranscoded += 1
+
+        print("\033[1;34mTranscoded \033[1;36m%i\033[1;34m songs\033[0m"%(numtranscoded))
+        if numfailed > 0:
+            print("\033[1;33m%i songs could not be transcoded\033[0m"%(numfailed))
+            return 1
+        return 0
+
+
+
+    def CMD_Info(self):
+        statistics = self.cache.GetStatistics()
+        print("\033[1;34mCached songs: \033[1;36m%i\033[0m"%(statistics["files"]))
+        print("\033[1;34mCache size:   \033[1;36m%.1f\033[1;34m MiB of \033[1;36m%.1f\033[1;34m MiB\033[0m"
+                %(statistics["size"] / 1024**2, statistics["maxsize"] / 1024**2))
+        return 0
+
+
+
+    def CMD_Clear(self):
+        numfiles = self.cache.Clear()
+        print("\033[1;34mRemoved \033[1;36m%i\033[1;34m songs from the cache\033[0m"%(numfiles))
+        return 0
+
+
+
+    # return exit-code
+    def MDBM_Main(self, args):
+
+        if not args.command:
+            print("\033[1;31mNo command given to module mp3cache!\033[0m")
+            return 1
+
+        if not self.cache.IsEnabled() and args.command == "PreWarm":
+            print("\033[1;33mThe mp3 cache is disabled. \033[1;30m(See [mp3cache]->size)\033[0m")
+            return 1
+
+        try:
+            if args.command == "PreWarm":
+                return self.CMD_PreWarm(args.number)
+            elif args.command == "Info":
+                return self.CMD_Info()
+            elif args.command == "Clear":
+                return self.CMD_Clear()
+        except Exception as e:
+            print("\033[1;31mFATAL ERROR:")
+            print(e)
+            traceback.print_exc()
+            return 1
+
+        return 1
+
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
+
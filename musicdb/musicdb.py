@@ -27,6 +27,7 @@ import traceback
 from musicdb.lib.filesystem     import Filesystem
 from musicdb.lib.cfg.musicdb    import MusicDBConfig
 from musicdb.lib.db.musicdb     import MusicDatabase
+from musicdb.lib.db.database    import DatabaseConnections
 from musicdb.lib.logging        import MusicDBLogger
 
 from musicdb.maintain.datadirectory import DataDirectoryMaintainer
@@ -159,6 +160,10 @@ def main():
 
     # get, check and open the database from path
     databasepath = config.files.musicdatabase
+    DatabaseConnections.Configure(
+            config.database.wal,
+            config.database.mmapsize  * 1024 * 1024,    # MiB -> B
+            config.database.cachesize * 1024)           # MiB -> KiB
 
 
     # The server requires a bit more attention if everything is secure
@@ -40,18 +40,19 @@ class ImportManager(TaskManager):
     Args:
         config: :class:`~musicdb.lib.cfg.musicdb.MusicDBConfig` object holding the MusicDB Configuration
         database: (optional) A :class:`~musicdb.lib.db.musicdb.MusicDatabase` instance
+        mise: (optional) A :class:`~musicdb.mdbapi.mise.MusicDBMicroSearchEngine` instance whose cache gets updated with the imported music
 
     Raises:
         TypeError: When the arguments are not of the correct type.
     """
 
-    def __init__(self, config, database):
+    def __init__(self, config, database, mise=None):
         TaskManager.__init__(self, config, database)
 
         self.musicdirectory   = MusicDirectory(self.cfg)
         self.artworkdirectory = Filesystem(self.cfg.directories.artwork)
         self.fileprocessing   = Fileprocessing(self.cfg.directories.uploads)
-        self.musicmanager     = MusicDBMusic(config, database)
+        self.musicmanager     = MusicDBMusic(config, database, mise)
 
 
 
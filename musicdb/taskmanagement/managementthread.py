@@ -203,7 +203,7 @@ def TaskManagementThread():
         taskmanager     = TaskManager(Config, musicdb)
         uploadmanager   = UploadManager(Config, musicdb)
         integrationmanager = IntegrationManager(Config, musicdb)
-        importmanager   = ImportManager(Config, musicdb)
+        importmanager   = ImportManager(Config, musicdb, server.mise)
         artworkmanager  = ArtworkManager(Config, musicdb)
         filesystemmanager  = FilesystemManager(Config, musicdb)
     except Exception as e:
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+# Call ./BenchmarkBounce.py [$Count [$Config]]
+# Measures the round trip latency of the WebSocket API by sending Bounce requests to a running MusicDB server.
+# The requests are sent one after the other (default 100), each one after the response to the previous one arrived.
+# The server address and the API key are taken from the MusicDB configuration (default /etc/musicdb.ini).
+
+import os
+import sys
+import ssl
+import json
+import time
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import txaio
+txaio.use_asyncio()
+from autobahn.asyncio.websocket import WebSocketClientProtocol, WebSocketClientFactory
+from musicdb.lib.cfg.musicdb    import MusicDBConfig
+from musicdb.lib.cfg.wsapikey   import WebSocketAPIKey
+
+
+class BounceProtocol(WebSocketClientProtocol):
+    def onOpen(self):
+        self.roundtrips = []
+        self.SendBounce()
+
+
+    def SendBounce(self):
+        packet = {}
+        packet["method"]    = "request"
+        packet["fncname"]   = "Bounce"
+        packet["fncsig"]    = "Benchmark"
+        packet["arguments"] = {"count": len(self.roundtrips)}
+        packet["pass"]      = None
+        packet["key"]       = self.factory.apikey
+        self.sendtime = time.perf_counter()
+        self.sendMessage(json.dumps(packet).encode("utf-8"), False)
+
+
+    def onMessage(self, payload, isBinary):
+        packet = json.loads(payload.decode("utf-8"))
+        if packet["method"] != "response" or packet["fncname"] != "Bounce":
+            return  # Broadcasts from the server
+
+        self.roundtrips.append(time.perf_counter() - self.sendtime)
+        if len(self.roundtrips) < self.factory.count:
+            self.SendBounce()
+        else:
+            self.factory.result.set_result(self.roundtrips)
+            self.sendClose(1000)
+
+
+def Percentile(values, percent):
+    values = sorted(values)
+    index  = min(len(values) - 1, int(len(values) * percent / 100))
+    return values[index]
+
+
+def main():
+    count      = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    configpath = sys.argv[2] if len(sys.argv) > 2 else "/etc/musicdb.ini"
+
+    config     = MusicDBConfig(configpath)
+    url        = "wss://%s:%i"%(config.websocket.bind, config.websocket.port)
+
+    tlscontext = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    tlscontext.check_hostname = False
+    tlscontext.verify_mode    = ssl.CERT_NONE   # The server uses a self signed certificate
+
+    eventloop  = asyncio.new_event_loop()
+    asyncio.set_event_loop(eventloop)
+
+    factory          = WebSocketClientFactory(url)
+    factory.protocol = BounceProtocol
+    factory.apikey   = WebSocketAPIKey(config).Read()
+    factory.count    = count
+    factory.result   = eventloop.create_future()
+
+    eventloop.run_until_complete(eventloop.create_connection(factory, config.websocket.bind, config.websocket.port, ssl=tlscontext))
+    roundtrips = eventloop.run_until_complete(asyncio.wait_for(factory.result, timeout=count * 1.0 + 10))
+    eventloop.close()
+
+    roundtrips = [roundtrip * 1000 for roundtrip in roundtrips]
+    print("\033[1;34mBounce round trips: \033[1;36m%i\033[0m"%(len(roundtrips)))
+    print("\033[1;34m    Average: \033[1;36m%7.2f\033[1;34mms\033[0m"%(sum(roundtrips) / len(roundtrips)))
+    print("\033[1;34m    Median:  \033[1;36m%7.2f\033[1;34mms\033[0m"%(Percentile(roundtrips, 50)))
+    print("\033[1;34m    95%%:     \033[1;36m%7.2f\033[1;34mms\033[0m"%(Percentile(roundtrips, 95)))
+    print("\033[1;34m    Maximum: \033[1;36m%7.2f\033[1;34mms\033[0m"%(max(roundtrips)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
+
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+# Call ./BenchmarkCodec.py [$Artists [$Repetitions]]
+# Measures encoding and decoding of a GetArtistsWithAlbums response with all available codecs of the WebSocket layer.
+# The response is synthetic with the structure of a real one (default 500 artists with 1 to 8 albums each, each album with tags).
+# The stdlib json module is always measured as reference, orjson and msgpack only if they are installed.
+
+import os
+import sys
+import json
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from musicdb.lib.ws import codec
+
+
+def CreateTag(tagid, tagclass, parentid=None):
+    tag = {}
+    tag["id"]         = tagid
+    tag["name"]       = "Tag %i"%(tagid)
+    tag["class"]      = tagclass
+    tag["parentid"]   = parentid
+    tag["icontype"]   = 1 if tagclass == 1 else None
+    tag["icon"]       = "🎸" if tagclass == 1 else None
+    tag["color"]      = "#%06X"%(random.randrange(0x1000000)) if tagclass == 1 else None
+    tag["posx"]       = None
+    tag["posy"]       = None
+    tag["confidence"] = 1.0
+    tag["approval"]   = 1
+    return tag
+
+
+def CreatePacket(numartists):
+    random.seed(1)
+    albumid  = 0
+    artists  = []
+    for artistid in range(1, numartists + 1):
+        artist = {}
+        artist["id"]   = artistid
+        artist["name"] = "Artist Name %i"%(artistid)
+        artist["path"] = "Artist Name %i"%(artistid)
+
+        albums = []
+        for n in range(random.randint(1, 8)):
+            albumid += 1
+            album = {}
+            album["id"]          = albumid
+            album["artistid"]    = artistid
+            album["name"]        = "Album Name Number %i"%(albumid)
+            album["path"]        = "%s/%i - Album Name Number %i"%(artist["path"], 1990 + n, albumid)
+            album["numofsongs"]  = random.randint(5, 15)
+            album["numofcds"]    = 1
+            album["origin"]      = "iTunes"
+            album["release"]     = 1990 + n
+            album["artworkpath"] = "%i/%i.jpg"%(artistid, albumid)
+            album["bgcolor"]     = "#101010"
+            album["fgcolor"]     = "#F0F0F0"
+            album["hlcolor"]     = "#909090"
+            album["added"]       = 1600000000 + albumid
+            album["hidden"]      = 0
+
+            tags = [CreateTag(random.randint(1, 5), 1)]
+            tags+= [CreateTag(random.randint(6, 40), 2, tags[0]["id"]) for i in range(random.randint(0, 3))]
+            albums.append({"album": album, "tags": tags})
+
+        artist["albums"] = albums
+        artists.append(artist)
+
+    packet = {}
+    packet["method"]    = "response"
+    packet["fncname"]   = "GetArtistsWithAlbums"
+    packet["fncsig"]    = "ShowArtists"
+    packet["arguments"] = artists
+    packet["pass"]      = None
+    return packet
+
+
+def Measure(name, encode, decode, packet, repetitions):
+    starttime = time.perf_counter()
+    for i in range(repetitions):
+        rawdata = encode(packet)
+    encodetime = (time.perf_counter() - starttime) / repetitions
+
+    starttime = time.perf_counter()
+    for i in range(repetitions):
+        decode(rawdata)
+    decodetime = (time.perf_counter() - starttime) / repetitions
+
+    print("\033[1;34m%-10s\033[1;36m%8.2f\033[1;34mms encode  \033[1;36m%8.2f\033[1;34mms decode  \033[1;36m%9i\033[1;34m bytes\033[0m"
+            %(name, encodetime * 1000, decodetime * 1000, len(rawdata)))
+
+
+def main():
+    numartists  = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    packet = CreatePacket(numartists)
+    print("\033[1;34mGetArtistsWithAlbums with \033[1;36m%i\033[1;34m artists, \033[1;36m%i\033[1;34m repetitions\033[0m"%(numartists, repetitions))
+
+    Measure("json", lambda p: json.dumps(p).encode("utf-8"), lambda r: json.loads(r.decode("utf-8")), packet, repetitions)
+    if codec.orjson:
+        Measure("orjson", codec.JSON.Encode, codec.JSON.Decode, packet, repetitions)
+    else:
+        print("\033[1;30morjson not installed\033[0m")
+    if codec.MessagePack:
+        Measure("msgpack", codec.MessagePack.Encode, codec.MessagePack.Decode, packet, repetitions)
+    else:
+        print("\033[1;30mmsgpack not installed\033[0m")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
+
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+# Call ./BenchmarkMP3Stream.py [$Seconds]
+# Compares the frame splitting of MP3Stream.FrameViews with the former frame by frame implementation.
+# The mp3 data (default 3600s of audio) are read from a synthetic file inside a temporary MP3 cache,
+# so that no transcoding is involved and only the frame splitting gets measured.
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from musicdb.lib.stream.mp3stream import MP3Stream
+from musicdb.lib.stream.mp3cache  import MP3Cache
+
+
+def CreateMP3Data(seconds):
+    # MPEG-1 Layer III, 320kb/s, 44.1kHz, Joint Stereo.
+    # Every third frame is padded like lamemp3enc does to keep the bit rate.
+    frame       = b"\xFF\xFB\xE0\x64" + bytes(1040)
+    paddedframe = b"\xFF\xFB\xE2\x64" + bytes(1041)
+    numframes   = int(seconds * 1000 / 26.122)
+    frames      = [paddedframe if n % 3 == 0 else frame for n in range(numframes)]
+    return b"".join(frames), numframes
+
+
+def LegacyFrames(mp3stream, path):
+    # The frame splitting as it was done before reading block wise
+    with open(path, "rb") as mp3file:
+        while True:
+            mp3header = mp3file.read(4)
+            if len(mp3header) == 0:
+                break
+
+            headerchunk = int.from_bytes(mp3header[:2], byteorder='big', signed=False)
+            syncbits    = headerchunk &  0xFFE0
+            if syncbits != 0xFFE0:
+                raise ValueError("Expected Frame Sync Bits wrong!")
+
+            infos    = mp3stream.AnalyzeHeader(mp3header)
+            datasize = infos["framesize"] - 4
+
+            mp3frame = mp3header + mp3file.read(datasize)
+            frame = {}
+            frame["frame"] = mp3frame
+            frame["header"]= infos
+            yield frame
+
+
+def Measure(name, generator, numframes):
+    cpustart  = time.process_time()
+    wallstart = time.perf_counter()
+    count     = 0
+    size      = 0
+    for frame in generator:
+        count += 1
+        size  += len(frame["frame"])
+    cputime   = time.process_time() - cpustart
+    walltime  = time.perf_counter() - wallstart
+
+    if count != numframes:
+        print("\033[1;31m%s returned %i frames instead of %i!\033[0m"%(name, count, numframes))
+
+    print("\033[1;34m%-12s \033[1;36m%7.3f\033[1;34ms CPU \033[1;36m%7.3f\033[1;34ms wall \033[1;36m%6.2f\033[1;34mµs/frame \033[1;30m(%i frames, %i bytes)\033[0m"
+            %(name, cputime, walltime, (cputime * 1e6) / count, count, size))
+    return cputime
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3600
+    data, numframes = CreateMP3Data(seconds)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache    = MP3Cache(directory, len(data) * 2)
+        checksum = "benchmark"
+        path     = cache.GetPath(checksum)
+        path.parent.mkdir(parents=True)
+        with open(path, "wb") as mp3file:
+            mp3file.write(data)
+
+        mp3stream = MP3Stream("/dev/null", checksum, cache)
+        legacy    = Measure("frame-wise", LegacyFrames(mp3stream, path), numframes)
+        blockwise = Measure("block-wise", mp3stream.Frames(), numframes)
+
+    print("\033[1;34mSpeedup: \033[1;32m%.2fx\033[0m"%(legacy / blockwise))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
+
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+# Call ./BenchmarkMP3Transcoder.py $AudioFile [$AudioFile …]
+# Transcodes the given audio files one after another via MP3Transcoder and prints for each file
+#  - the start-of-song latency: time until the first mp3 frame header can be read
+#  - the transcoding time and speed relative to the play time
+#  - the wake-ups of the reading thread per second (voluntary context switches)
+
+import os
+import sys
+import time
+import resource
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from musicdb.lib.stream.mp3transcoder import MP3Transcoder
+from musicdb.lib.stream.mp3stream     import ReadBlockSize
+
+
+def Benchmark(path):
+    usagestart = resource.getrusage(resource.RUSAGE_THREAD)
+    wallstart  = time.perf_counter()
+
+    with MP3Transcoder(path) as transcoder:
+        header  = transcoder.GetChunk(4)
+        latency = time.perf_counter() - wallstart
+        size    = len(header)
+        while True:
+            chunk = transcoder.GetChunk(ReadBlockSize)
+            size += len(chunk)
+            if len(chunk) < ReadBlockSize:
+                break
+
+    walltime = time.perf_counter() - wallstart
+    usage    = resource.getrusage(resource.RUSAGE_THREAD)
+    cputime  = (usage.ru_utime - usagestart.ru_utime) + (usage.ru_stime - usagestart.ru_stime)
+    wakeups  = usage.ru_nvcsw - usagestart.ru_nvcsw
+    playtime = (size * 8) / 320000  # Constant bit rate of 320kb/s
+
+    print("\033[1;37m%s\033[0m"%(path))
+    print("\033[1;34m    Start latency: \033[1;36m%7.2f\033[1;34mms\033[0m"%(latency * 1000))
+    print("\033[1;34m    Transcoding:   \033[1;36m%7.2f\033[1;34ms for \033[1;36m%.2f\033[1;34ms of audio \033[1;30m(%.1fx real time)\033[0m"
+            %(walltime, playtime, playtime / walltime if walltime > 0 else 0))
+    print("\033[1;34m    Reader thread: \033[1;36m%7.2f\033[1;34m wake-ups/s, \033[1;36m%.3f\033[1;34ms CPU\033[0m"
+            %(wakeups / walltime if walltime > 0 else 0, cputime))
+    return latency
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("\033[1;31mAt least one audio file expected!\033[0m")
+        return 1
+
+    latencies = [Benchmark(path) for path in sys.argv[1:]]
+    print("\033[1;34mAverage start latency: \033[1;36m%.2f\033[1;34mms\033[0m"%(sum(latencies) * 1000 / len(latencies)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
+
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+# Call ./BenchmarkMiSE.py [$Songs [$Limit]]
+# Compares the indexed search of MusicDBMicroSearchEngine.Find with the former search through all cached names.
+# The collection is synthetic (default 200000 songs, 12 songs per album, 8 albums per artist) with names made of random words.
+# The search strings are parts of names with typos, as they get typed into the search input of the WebUI.
+# Besides the time per search, the share of the former results that are also found by the indexed search gets printed,
+# for all results and for the good matches with a ratio of at least 90.
+# Furthermore writing and reading the caches as snapshot gets measured.
+
+import os
+import sys
+import mmap
+import time
+import random
+import logging
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rapidfuzz                  import fuzz
+from musicdb.lib.cfg.musicdb    import MusicDBConfig
+from musicdb.mdbapi.mise        import MusicDBMicroSearchEngine, SearchCache
+
+SYLLABLES = [c + v + e for c in "bdfghklmnprstvwz" for v in "aeiou" for e in ["", "", "n", "r", "s"]]
+
+
+def CreateWord():
+    return "".join(random.choice(SYLLABLES) for i in range(random.randint(1, 4)))
+
+
+def CreateName():
+    return " ".join(CreateWord() for i in range(random.randint(1, 4))).title()
+
+
+def CreateCollection(numsongs):
+    random.seed(1)
+    numalbums  = max(1, numsongs  // 12)
+    numartists = max(1, numalbums // 8)
+    artists = [{"id": i, "name": CreateName()} for i in range(1, numartists + 1)]
+    albums  = [{"id": i, "name": CreateName()} for i in range(1, numalbums  + 1)]
+    songs   = [{"id": i, "name": CreateName()} for i in range(1, numsongs   + 1)]
+    return artists, albums, songs
+
+
+def CreateSearchString(name):
+    # A part of the name with one typo
+    name  = name.lower()
+    start = random.randint(0, max(0, len(name) - 6))
+    query = name[start:start + random.randint(4, 14)]
+    if len(query) > 4:
+        position = random.randrange(len(query))
+        query    = query[:position] + random.choice("aeiourst") + query[position + 1:]
+    return query
+
+
+def LegacyFind(mise, searchstring, threshold=80):
+    # The search through all names as it was done before the trigram index
+    results = []
+    for cache in [mise.artistcache, mise.albumcache, mise.songcache]:
+        result = []
+        for element in cache.GetEntries():
+            ratio = fuzz.partial_ratio(element[0], searchstring)
+            if ratio >= threshold:
+                result.append((element[1], ratio))
+        results.append(sorted(result, key = lambda k: k[1], reverse=True))
+    return results
+
+
+def main():
+    numsongs = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    limit    = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    logging.basicConfig(level=logging.ERROR)
+    configpath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "share", "musicdb.ini")
+    mise = MusicDBMicroSearchEngine(MusicDBConfig(configpath))
+
+    artists, albums, songs = CreateCollection(numsongs)
+    starttime = time.perf_counter()
+    mise.BuildCaches(artists, albums, songs)
+    buildtime = time.perf_counter() - starttime
+    print("\033[1;34mCollection with \033[1;36m%i\033[1;34m artists, \033[1;36m%i\033[1;34m albums, \033[1;36m%i\033[1;34m songs, index built in \033[1;36m%.2f\033[1;34ms\033[0m"
+            %(len(artists), len(albums), len(songs), buildtime))
+
+    with tempfile.TemporaryFile() as snapshotfile:
+        starttime = time.perf_counter()
+        for cache in [mise.artistcache, mise.albumcache, mise.songcache]:
+            cache.WriteSnapshot(snapshotfile)
+        snapshotfile.flush()
+        writetime = time.perf_counter() - starttime
+
+        starttime = time.perf_counter()
+        snapshot  = mmap.mmap(snapshotfile.fileno(), 0, access=mmap.ACCESS_READ)
+        offset    = 0
+        for i in range(3):
+            cache, offset = SearchCache.ReadSnapshot(snapshot, offset)
+        readtime  = time.perf_counter() - starttime
+    print("\033[1;34mSnapshot with \033[1;36m%i\033[1;34m KiB written in \033[1;36m%.2f\033[1;34mms, read in \033[1;36m%.2f\033[1;34mms\033[0m"
+            %(offset // 1024, writetime * 1000, readtime * 1000))
+
+    names   = [entry["name"] for entry in artists + albums + songs]
+    queries = [CreateSearchString(random.choice(names)) for i in range(20)]
+    queries+= ["ka", "sol", "ashli"]
+
+    legacytime = 0.0
+    indextime  = 0.0
+    limittime  = 0.0
+    expected   = 0
+    found      = 0
+    expectedgood = 0
+    foundgood    = 0
+    for query in queries:
+        searchstring = mise.NormalizeString(query)
+
+        starttime   = time.perf_counter()
+        legacy      = LegacyFind(mise, searchstring)
+        legacytime += time.perf_counter() - starttime
+
+        starttime   = time.perf_counter()
+        indexed     = mise.Find(query)
+        indextime  += time.perf_counter() - starttime
+
+        starttime   = time.perf_counter()
+        mise.Find(query, limit)
+        limittime  += time.perf_counter() - starttime
+
+        for legacyresult, indexedresult in zip(legacy, indexed):
+            indexedresult = set(indexedresult)
+            goodresult    = [entry for entry in legacyresult if entry[1] >= 90]
+            expected     += len(legacyresult)
+            found        += len(indexedresult.intersection(legacyresult))
+            expectedgood += len(goodresult)
+            foundgood    += len(indexedresult.intersection(goodresult))
+
+    print("\033[1;34m%-18s\033[1;36m%8.2f\033[1;34mms per search\033[0m"%("all names",  legacytime * 1000 / len(queries)))
+    print("\033[1;34m%-18s\033[1;36m%8.2f\033[1;34mms per search\033[0m"%("trigram index", indextime * 1000 / len(queries)))
+    print("\033[1;34m%-18s\033[1;36m%8.2f\033[1;34mms per search\033[0m"%("index, limit %i"%(limit), limittime * 1000 / len(queries)))
+    print("\033[1;34mFound \033[1;36m%i\033[1;34m of \033[1;36m%i\033[1;34m results of the search through all names\033[0m"%(found, expected))
+    print("\033[1;34mFound \033[1;36m%i\033[1;34m of \033[1;36m%i\033[1;34m results with a ratio of at least 90\033[0m"%(foundgood, expectedgood))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
+
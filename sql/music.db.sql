@@ -4,7 +4,8 @@ CREATE TABLE IF NOT EXISTS meta
     key         TEXT,
     value       TEXT DEFAULT ''
 );
-INSERT INTO meta (key, value) VALUES ("version", 5);
+INSERT INTO meta (key, value) VALUES ("version", 8);
+INSERT INTO meta (key, value) VALUES ("namechanges", 0);
 
 
 CREATE TABLE IF NOT EXISTS artists
@@ -143,5 +144,109 @@ CREATE TABLE IF NOT EXISTS videotags
     approval    INTEGER DEFAULT 1
 );
 
+CREATE INDEX IF NOT EXISTS artists_path         ON artists   (path);
+CREATE INDEX IF NOT EXISTS albums_artistid      ON albums    (artistid, hidden);
+CREATE INDEX IF NOT EXISTS albums_path          ON albums    (path);
+CREATE INDEX IF NOT EXISTS songs_albumid        ON songs     (albumid);
+CREATE INDEX IF NOT EXISTS songs_artistid       ON songs     (artistid);
+CREATE INDEX IF NOT EXISTS songs_path           ON songs     (path);
+CREATE INDEX IF NOT EXISTS videos_artistid      ON videos    (artistid);
+CREATE INDEX IF NOT EXISTS videos_path          ON videos    (path);
+CREATE INDEX IF NOT EXISTS lyrics_songid        ON lyrics    (songid);
+CREATE INDEX IF NOT EXISTS tags_parentid        ON tags      (parentid);
+CREATE INDEX IF NOT EXISTS albumtags_albumid    ON albumtags (albumid, tagid);
+CREATE INDEX IF NOT EXISTS albumtags_tagid      ON albumtags (tagid, albumid);
+CREATE INDEX IF NOT EXISTS songtags_songid      ON songtags  (songid, tagid);
+CREATE INDEX IF NOT EXISTS songtags_tagid       ON songtags  (tagid, songid);
+CREATE INDEX IF NOT EXISTS videotags_videoid    ON videotags (videoid, tagid);
+CREATE INDEX IF NOT EXISTS videotags_tagid      ON videotags (tagid, videoid);
+
+CREATE TRIGGER IF NOT EXISTS artists_namechanges_insert AFTER INSERT ON artists
+BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'namechanges';
+END;
+CREATE TRIGGER IF NOT EXISTS artists_namechanges_delete AFTER DELETE ON artists
+BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'namechanges';
+END;
+CREATE TRIGGER IF NOT EXISTS artists_namechanges_update AFTER UPDATE OF name ON artists WHEN OLD.name IS NOT NEW.name
+BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'namechanges';
+END;
+
+CREATE TRIGGER IF NOT EXISTS albums_namechanges_insert AFTER INSERT ON albums
+BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'namechanges';
+END;
+CREATE TRIGGER IF NOT EXISTS albums_namechanges_delete AFTER DELETE ON albums
+BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'namechanges';
+END;
+CREATE TRIGGER IF NOT EXISTS albums_namechanges_update AFTER UPDATE OF name ON albums WHEN OLD.name IS NOT NEW.name
+BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'namechanges';
+END;
+
+CREATE TRIGGER IF NOT EXISTS songs_namechanges_insert AFTER INSERT ON songs
+BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'namechanges';
+END;
+CREATE TRIGGER IF NOT EXISTS songs_namechanges_delete AFTER DELETE ON songs
+BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'namechanges';
+END;
+CREATE TRIGGER IF NOT EXISTS songs_namechanges_update AFTER UPDATE OF name ON songs WHEN OLD.name IS NOT NEW.name
+BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'namechanges';
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS fulltext USING fts5
+(
+    songname,
+    albumname,
+    artistname,
+    lyrics,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS songs_fulltext_insert AFTER INSERT ON songs
+BEGIN
+    INSERT INTO fulltext (rowid, songname, albumname, artistname, lyrics) VALUES (NEW.songid, NEW.name,
+        (SELECT name FROM albums WHERE albumid = NEW.albumid),
+        (SELECT name FROM artists WHERE artistid = NEW.artistid),
+        (SELECT lyrics FROM lyrics WHERE songid = NEW.songid));
+END;
+CREATE TRIGGER IF NOT EXISTS songs_fulltext_delete AFTER DELETE ON songs
+BEGIN
+    DELETE FROM fulltext WHERE rowid = OLD.songid;
+END;
+CREATE TRIGGER IF NOT EXISTS songs_fulltext_update AFTER UPDATE OF name, albumid, artistid ON songs WHEN OLD.name IS NOT NEW.name OR OLD.albumid IS NOT NEW.albumid OR OLD.artistid IS NOT NEW.artistid
+BEGIN
+    UPDATE fulltext SET songname = NEW.name,
+        albumname  = (SELECT name FROM albums WHERE albumid = NEW.albumid),
+        artistname = (SELECT name FROM artists WHERE artistid = NEW.artistid)
+        WHERE rowid = NEW.songid;
+END;
+CREATE TRIGGER IF NOT EXISTS albums_fulltext_update AFTER UPDATE OF name ON albums WHEN OLD.name IS NOT NEW.name
+BEGIN
+    UPDATE fulltext SET albumname = NEW.name WHERE rowid IN (SELECT songid FROM songs WHERE albumid = NEW.albumid);
+END;
+CREATE TRIGGER IF NOT EXISTS artists_fulltext_update AFTER UPDATE OF name ON artists WHEN OLD.name IS NOT NEW.name
+BEGIN
+    UPDATE fulltext SET artistname = NEW.name WHERE rowid IN (SELECT songid FROM songs WHERE artistid = NEW.artistid);
+END;
+CREATE TRIGGER IF NOT EXISTS lyrics_fulltext_insert AFTER INSERT ON lyrics
+BEGIN
+    UPDATE fulltext SET lyrics = NEW.lyrics WHERE rowid = NEW.songid;
+END;
+CREATE TRIGGER IF NOT EXISTS lyrics_fulltext_update AFTER UPDATE OF lyrics ON lyrics
+BEGIN
+    UPDATE fulltext SET lyrics = NEW.lyrics WHERE rowid = NEW.songid;
+END;
+CREATE TRIGGER IF NOT EXISTS lyrics_fulltext_delete AFTER DELETE ON lyrics
+BEGIN
+    UPDATE fulltext SET lyrics = NULL WHERE rowid = OLD.songid;
+END;
+
 -- vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
 
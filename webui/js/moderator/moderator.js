@@ -26,6 +26,8 @@ function InitializeWebUI(iconsjson=null)
     WebUI.AddManager("Icons",       new IconManager(iconsjson));
     WebUI.AddManager("Tags",        new TagManager());
     WebUI.AddManager("Artists",     new ArtistsCache());
+    WebUI.AddManager("SongQueue",   new SongQueueCache());
+    WebUI.AddManager("MDBState",    new MDBStateCache());
     WebUI.AddManager("Color",       new ColorManager());
     WebUI.AddManager("Fullscreen",  new FullscreenManager());
     WebUI.AddManager("MusicMode",   new MDBModeManager());
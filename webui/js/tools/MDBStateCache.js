@@ -0,0 +1,72 @@
+// MusicDB,  a music manager with web-bases UI that focus on music.
+// Copyright (C) 2017-2022  Ralf Stemmer <ralf.stemmer@gmx.net>
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"use strict";
+
+// Keeps a copy of the MusicDB state up to date by merging the changes broadcast via SetMDBState.
+// The updated state gets distributed as GetMDBState message with the signature of the SetMDBState call.
+class MDBStateCache
+{
+    constructor()
+    {
+        this.state = null;
+    }
+
+
+
+    onMusicDBMessage(fnc, sig, args, pass)
+    {
+        if(fnc == "GetMDBState")
+        {
+            this.state = args;
+        }
+        else if(fnc == "SetMDBState")
+        {
+            if(this.state !== null && args.revision < this.state.revision)
+                return; // Outdated
+
+            if(this.state !== null && args.revision === this.state.revision)
+            {
+                // Nothing changed because the server rejected the change.
+                // The views still need the state to undo the rejected change.
+                if(args.base === this.state.revision)
+                    WebUI.onMusicDBMessage("GetMDBState", sig, this.state, pass);
+                return; // Already included
+            }
+
+            // When the UI mode changes, the stream state is needed as well
+            if(this.state === null || args.base !== this.state.revision || args.changes.MusicDB !== undefined)
+            {
+                MusicDB.Request("GetMDBState", sig, null, pass);
+                return;
+            }
+
+            if(args.changes.GenreFilter !== undefined)
+                this.state.GenreFilter = args.changes.GenreFilter;
+
+            if(args.changes.SubgenreFilter !== undefined)
+                Object.assign(this.state.SubgenreFilter, args.changes.SubgenreFilter);
+
+            this.state.revision = args.revision;
+            WebUI.onMusicDBMessage("GetMDBState", sig, this.state, pass);
+        }
+    }
+}
+
+
+
+// vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
+
@@ -0,0 +1,172 @@
+// MusicDB,  a music manager with web-bases UI that focus on music.
+// Copyright (C) 2017-2022  Ralf Stemmer <ralf.stemmer@gmx.net>
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"use strict";
+
+// Keeps a copy of the song queue up to date by applying the changes announced by the server.
+// The whole queue only gets requested when a revision got missed.
+// Whenever the copy changes, it gets distributed as GetSongQueue/ShowSongQueue message.
+class SongQueueCache
+{
+    constructor()
+    {
+        this.revision       = null;         // null: No valid copy of the queue
+        this.entries        = new Array();  // {entryid, israndom, songid}
+        this.songs          = new Object(); // songid -> {song, album, artist}
+        this.missingsongs   = new Set();    // Song IDs requested via GetSong
+        this.pendingchanges = new Array();  // Changes that arrived while waiting for a snapshot
+    }
+
+
+
+    RequestSnapshot()
+    {
+        this.revision       = null;
+        this.pendingchanges = new Array();
+        MusicDB.Request("GetSongQueueSnapshot", "UpdateSongQueueCache");
+    }
+
+
+
+    _UpdateSongs(MDBQueue)
+    {
+        for(let entry of MDBQueue)
+            this.songs[entry.song.id] = {song: entry.song, album: entry.album, artist: entry.artist};
+    }
+
+
+
+    _ApplyDelta(delta)
+    {
+        if(delta.revision <= this.revision)
+            return true;    // Already included
+        if(delta.base !== this.revision)
+            return false;   // Missed a revision
+
+        for(let change of delta.changes)
+        {
+            let index = this.entries.findIndex((entry)=>{return entry.entryid === change.entryid;});
+            let entry = null;
+
+            if(change.operation == "insert")
+            {
+                entry = {entryid: change.entryid, israndom: change.israndom, songid: change.songid};
+                if(this.songs[change.songid] === undefined && !this.missingsongs.has(change.songid))
+                {
+                    this.missingsongs.add(change.songid);
+                    MusicDB.Request("GetSong", "UpdateSongQueueCache", {songid: change.songid});
+                }
+            }
+            else if(index >= 0)
+            {
+                entry = this.entries.splice(index, 1)[0];
+            }
+
+            if(entry === null || change.operation == "remove")
+                continue;
+
+            let afterindex = this.entries.findIndex((entry)=>{return entry.entryid === change.afterid;});
+            this.entries.splice(afterindex + 1, 0, entry);  // afterid == null -> afterindex == -1
+        }
+
+        this.revision = delta.revision;
+        return true;
+    }
+
+
+
+    _ShowQueue()
+    {
+        if(this.missingsongs.size > 0)
+            return; // Wait for the song information
+
+        let MDBQueue = new Array();
+        let songs    = new Object();
+        for(let entry of this.entries)
+        {
+            let song = this.songs[entry.songid];
+            songs[entry.songid] = song;
+            MDBQueue.push({entryid: entry.entryid, israndom: entry.israndom, song: song.song, album: song.album, artist: song.artist});
+        }
+        this.songs = songs;
+
+        WebUI.onMusicDBMessage("GetSongQueue", "ShowSongQueue", MDBQueue, null);
+    }
+
+
+
+    onMusicDBNotification(fnc, sig, data)
+    {
+        if(fnc == "MusicDB:SongQueue" && sig == "onSongQueueChanged")
+        {
+            if(data === null)
+            {
+                this.RequestSnapshot();
+                return;
+            }
+
+            if(this.revision === null)
+            {
+                this.pendingchanges.push(data);
+                return;
+            }
+
+            if(this._ApplyDelta(data))
+                this._ShowQueue();
+            else
+                this.RequestSnapshot();
+        }
+    }
+
+
+
+    onMusicDBMessage(fnc, sig, args, pass)
+    {
+        if(fnc == "GetSongQueue" && sig == "ShowSongQueue")
+        {
+            // Keep the song information up to date (for example after renaming songs)
+            this._UpdateSongs(args);
+        }
+        else if(fnc == "GetSongQueueSnapshot" && sig == "UpdateSongQueueCache")
+        {
+            this._UpdateSongs(args.entries);
+            this.entries  = args.entries.map((entry)=>{return {entryid: entry.entryid, israndom: entry.israndom, songid: entry.song.id};});
+            this.revision = args.revision;
+
+            for(let delta of this.pendingchanges)
+            {
+                if(!this._ApplyDelta(delta))
+                {
+                    this.RequestSnapshot();
+                    return;
+                }
+            }
+            this.pendingchanges = new Array();
+            this._ShowQueue();
+        }
+        else if(fnc == "GetSong" && sig == "UpdateSongQueueCache")
+        {
+            this.songs[args.song.id] = {song: args.song, album: args.album, artist: args.artist};
+            this.missingsongs.delete(args.song.id);
+            this._ShowQueue();
+        }
+    }
+}
+
+
+
+// vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4
+
@@ -81,10 +81,7 @@ class WebUIManager
             {
                 MusicDB.Request("GetAudioStreamState", "UpdateStreamState");
             }
-            else if(sig == "onSongQueueChanged")
-            {
-                MusicDB.Request("GetSongQueue", "ShowSongQueue");
-            }
+            // onSongQueueChanged gets handled by the SongQueueCache
         }
         else if (fnc == "MusicDB:VideoQueue")
         {
@@ -134,7 +131,7 @@ class WebUIManager
             if(uimode == "audio")
             {
                 MusicDB.Request("GetAudioStreamState",   "UpdateStreamState");
-                MusicDB.Request("GetSongQueue",          "ShowSongQueue"); // Force Queue Update
+                WebUI.GetManager("SongQueue").RequestSnapshot(); // Force Queue Update
             }
             else if(uimode == "video")
             {